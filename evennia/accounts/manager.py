@@ -10,10 +10,13 @@ from django.utils import timezone
 
 from evennia.server import signals
 from evennia.typeclasses.managers import TypeclassManager, TypedObjectManager
+from evennia.typeclasses.searchindex import SEARCH_INDEX
 from evennia.utils.utils import class_from_module, dbid_to_obj, make_iter
 
 __all__ = ("AccountManager", "AccountDBManager")
 
+_SEARCH_NAME_INDEX = settings.SEARCH_NAME_INDEX
+
 
 #
 # Account Manager
@@ -177,6 +180,17 @@ class AccountDBManager(TypedObjectManager, UserManager):
             else:
                 typeclass = str(typeclass)
             query["db_typeclass_path"] = typeclass
+        if _SEARCH_NAME_INDEX:
+            # resolve keys and then aliases via the in-memory name index
+            mode = "exact" if exact else "contains"
+            query.pop("username__iexact" if exact else "username__icontains")
+            pks = SEARCH_INDEX.search(self.model, ostring, mode=mode, aliases=False)
+            matches = self.filter(pk__in=pks, **query)
+            if not matches:
+                pks = SEARCH_INDEX.search(self.model, ostring, mode=mode, keys=False)
+                matches = self.filter(pk__in=pks)
+            return matches
+
         if exact:
             matches = self.filter(**query)
         else:
@@ -27,6 +27,7 @@ command line. The processing of a command works as follows:
 
 """
 
+import inspect
 import types
 from collections import defaultdict
 from copy import copy
@@ -36,12 +37,16 @@ from traceback import format_exc
 from django.conf import settings
 from django.utils.translation import gettext as _
 from twisted.internet import reactor
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import Deferred, inlineCallbacks
 from twisted.internet.task import deferLater
+from twisted.python.failure import Failure
 
 from evennia.commands.cmdset import CmdSet
 from evennia.commands.command import InterruptCommand
+from evennia.server.profiling.cmdstats import COMMAND_STATS
+from evennia.typeclasses.prefetch import HANDLER_PREFETCH
 from evennia.utils import logger, utils
+from evennia.utils.aio import run_coroutine
 from evennia.utils.utils import string_suggestions
 
 _IN_GAME_ERRORS = settings.IN_GAME_ERRORS
@@ -205,7 +210,31 @@ def _process_input(caller, prompt, result, cmd, generator):
     return False
 
 
-def _progressive_cmd_run(cmd, generator, response=None):
+def _resume_cmd_run(result, cmd, generator):
+    """
+    Continue a Command's `func()` with the result of a Deferred it yielded,
+    such as one from `evennia.utils.pools.run_in_pool`.
+
+    Args:
+        result (any or Failure): The result of the Deferred. A Failure is
+            raised inside `func()` at the `yield`.
+        cmd (Command): The command itself.
+        generator (GeneratorType): The generator describing the processing.
+
+    """
+    try:
+        if isinstance(result, Failure):
+            _progressive_cmd_run(cmd, generator, error=result.value)
+        else:
+            _progressive_cmd_run(cmd, generator, response=result)
+    except InterruptCommand:
+        pass
+    except Exception:
+        # we are outside of the cmdhandler's error handling here
+        _msg_err(cmd.caller, _ERROR_UNTRAPPED)
+
+
+def _progressive_cmd_run(cmd, generator, response=None, error=None):
     """
     Progressively call the command that was given in argument. Used
     when `yield` is present in the Command's `func()` method.
@@ -214,10 +243,11 @@ def _progressive_cmd_run(cmd, generator, response=None):
         cmd (Command): the command itself.
         generator (GeneratorType): the generator describing the processing.
         reponse (str, optional): the response to send to the generator.
+        error (Exception, optional): An error to raise inside the generator.
 
     Raises:
         ValueError: If the func call yields something not identifiable as a
-            time-delay or a string prompt.
+            time-delay, a string prompt or a Deferred.
 
     Note:
         This function is responsible for executing the command, if
@@ -225,6 +255,8 @@ def _progressive_cmd_run(cmd, generator, response=None):
         value will be accessible at each step and will affect the
         process.  If the value is a number, just delay the execution
         of the command.  If it's a string, wait for the user input.
+        If it's a Deferred (like from `run_in_pool`), wait for it
+        and send its result back.
 
     """
     global _GET_INPUT
@@ -232,7 +264,9 @@ def _progressive_cmd_run(cmd, generator, response=None):
         from evennia.utils.evmenu import get_input as _GET_INPUT
 
     try:
-        if response is None:
+        if error is not None:
+            value = generator.throw(error)
+        elif response is None:
             value = next(generator)
         else:
             value = generator.send(response)
@@ -251,10 +285,62 @@ def _progressive_cmd_run(cmd, generator, response=None):
             utils.delay(value, _progressive_cmd_run, cmd, generator)
         elif isinstance(value, str):
             _GET_INPUT(cmd.caller, value, _process_input, cmd=cmd, generator=generator)
+        elif isinstance(value, Deferred):
+            value.addBoth(_resume_cmd_run, cmd, generator)
         else:
             raise ValueError("unknown type for a yielded value in command: {}".format(type(value)))
 
 
+def _async_cmd_done(result, cmd):
+    """
+    Finish a Command whose async `func()` has returned.
+
+    Args:
+        result (any): The return value of `func()`.
+        cmd (Command): The command itself.
+
+    """
+    # duplicated from cmdhandler._run_command, like in _progressive_cmd_run
+    cmd.at_post_cmd()
+    if cmd.save_for_next:
+        cmd.caller.ndb.last_cmd = copy(cmd)
+    else:
+        cmd.caller.ndb.last_cmd = None
+
+
+def _async_cmd_error(failure, cmd):
+    """
+    Report an error raised by a Command's async `func()`.
+
+    Args:
+        failure (Failure): The error.
+        cmd (Command): The command itself.
+
+    """
+    try:
+        failure.raiseException()
+    except InterruptCommand:
+        pass
+    except Exception:
+        # we are outside of the cmdhandler's error handling here
+        _msg_err(cmd.caller, _ERROR_UNTRAPPED)
+
+
+def _async_cmd_run(cmd, coroutine):
+    """
+    Run a Command's `func()` defined with `async def`. It runs on its own, so
+    this returns right away, and `at_post_cmd` is called once it is done.
+
+    Args:
+        cmd (Command): The command itself.
+        coroutine (coroutine): The coroutine returned by calling `func()`.
+
+    """
+    deferred = run_coroutine(coroutine)
+    deferred.addCallback(_async_cmd_done, cmd)
+    deferred.addErrback(_async_cmd_error, cmd)
+
+
 # custom Exceptions
 
 
@@ -615,14 +701,18 @@ def cmdhandler(
                 )
                 raise RuntimeError(err)
 
+            timer.lap("match")
+
             # pre-command hook
             abort = yield cmd.at_pre_cmd()
+            timer.lap("at_pre_cmd")
             if abort:
                 # abort sequence
                 return abort
 
             # Parse and execute
             yield cmd.parse()
+            timer.lap("parse")
 
             # main command code
             # (return value is normally None)
@@ -635,9 +725,17 @@ def cmdhandler(
                 # code duplication but there seems to be no way to
                 # catch the StopIteration here (it's not in the same
                 # frame since this is in a deferred chain)
+            elif inspect.iscoroutine(ret):
+                # cmd.func() is an async def; like a generator, it runs
+                # on its own and calls at_post_cmd when it is done
+                _async_cmd_run(cmd, ret)
             else:
+                # generators and coroutines run on after this, so only a plain
+                # func is timed (see evennia.server.profiling.cmdstats)
+                timer.lap("func")
                 # post-command hook
                 yield cmd.at_post_cmd()
+                timer.lap("at_post_cmd")
 
                 if cmd.save_for_next:
                     # store a reference to this command, possibly
@@ -654,6 +752,11 @@ def cmdhandler(
             raise ErrorReported(cmd.raw_string)
         finally:
             _COMMAND_NESTING[called_by] -= 1
+            if not _testing:
+                timer.finish(cmd.key)
+
+    # times the phases of the command (see evennia.server.profiling.cmdstats)
+    timer = COMMAND_STATS.timer()
 
     (
         cmdset_providers,
@@ -665,6 +768,9 @@ def cmdhandler(
 
     account = cmdset_providers.get("account", None)
 
+    # group the entities involved, to batch-load their tag/attribute caches
+    prefetch_token = HANDLER_PREFETCH.push(cmdset_providers_list)
+
     try:  # catch bugs in cmdhandler itself
         try:  # catch special-type commands
             if cmdobj:
@@ -683,6 +789,7 @@ def cmdhandler(
                 cmdset = yield get_and_merge_cmdsets(
                     caller, cmdset_providers_list, callertype, raw_string, cmdid=cmdid
                 )
+                timer.lap("merge")
                 if not cmdset:
                     # this is bad and shouldn't happen.
                     raise NoCmdSets
@@ -797,3 +904,5 @@ def cmdhandler(
     except Exception:
         # This catches exceptions in cmdhandler exceptions themselves
         _msg_err(error_to, _ERROR_CMDHANDLER)
+    finally:
+        HANDLER_PREFETCH.pop(prefetch_token)
@@ -427,6 +427,48 @@ class Command(metaclass=CommandMeta):
                 session = to_obj.sessions.get()
         to_obj.msg(text=text, from_obj=from_obj, session=session, **kwargs)
 
+    async def amsg(self, text=None, to_obj=None, from_obj=None, session=None, **kwargs):
+        """
+        Like `msg`, but for use in an `async def func`. It waits while the
+        receiver's client is not keeping up with its output (see
+        `evennia.utils.aio.msg`).
+
+        Args:
+            text (str, optional): Text string of message to send.
+            to_obj (Object, optional): Target object of message. Defaults to self.caller.
+            from_obj (Object, optional): Source of message. Defaults to to_obj.
+            session (Session, optional): Supply data only to a unique
+                session (ignores the value of `self.msg_all_sessions`).
+
+        Keyword Args:
+            any (any): Passed on to `msg`.
+
+        """
+        from evennia.utils import aio
+
+        to_obj = to_obj or self.caller
+        self.msg(text=text, to_obj=to_obj, from_obj=from_obj, session=session, **kwargs)
+        await aio.wait_for_output(session or to_obj)
+
+    async def asearch(self, searchdata, **kwargs):
+        """
+        Search with `self.caller.search` from an `async def func`, without
+        stopping the Server on database queries (see `evennia.utils.aio.search`).
+
+        Args:
+            searchdata (str): The search criterion.
+
+        Keyword Args:
+            any (any): Passed on to `self.caller.search`.
+
+        Returns:
+            Object, Account, list or None: As for `self.caller.search`.
+
+        """
+        from evennia.utils import aio
+
+        return await aio.search(self.caller, searchdata, **kwargs)
+
     def execute_cmd(self, raw_string, session=None, obj=None, **kwargs):
         """
         A shortcut of execute_cmd on the caller. It appends the
@@ -519,6 +561,9 @@ Command \"{cmdname}\" has no defined `func()` method. Available properties on th
         module for which object properties are available (beyond those
         set in self.parse())
 
+        This can also be defined as `async def func(self)`, see
+        `evennia.utils.aio`.
+
         """
         self.get_command_info()
 
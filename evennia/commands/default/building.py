@@ -7,7 +7,6 @@ import typing
 
 import evennia
 from django.conf import settings
-from django.core.paginator import Paginator
 from django.db.models import Max, Min, Q
 from evennia import InterruptCommand
 from evennia.commands.cmdhandler import generate_cmdset_providers, get_and_merge_cmdsets
@@ -17,6 +16,7 @@ from evennia.prototypes import menus as olc_menus
 from evennia.prototypes import prototypes as protlib
 from evennia.prototypes import spawner
 from evennia.scripts.models import ScriptDB
+from evennia.typeclasses.searchindex import MAX_INDEX_IDS, SEARCH_INDEX
 from evennia.utils import create, funcparser, logger, search, utils
 from evennia.utils.ansi import raw as ansi_raw
 from evennia.utils.dbserialize import deserialize
@@ -3353,8 +3353,19 @@ class CmdFind(COMMAND_DEFAULT_CLASS):
                     id__lte=high,
                 )
 
+            query = keyquery | aliasquery
+            if settings.SEARCH_NAME_INDEX:
+                # resolve the matches from the in-memory name index instead
+                mode = next(
+                    (switch for switch in ("exact", "startswith") if switch in switches),
+                    "contains",
+                )
+                pks = SEARCH_INDEX.search(ObjectDB, searchstring, mode=mode)
+                if len(pks) <= MAX_INDEX_IDS:
+                    query = Q(id__in=pks, id__gte=low, id__lte=high)
+
             # Keep the initial queryset handy for later reuse
-            result_qs = ObjectDB.objects.filter(keyquery | aliasquery).distinct()
+            result_qs = ObjectDB.objects.filter(query).distinct()
             nresults = result_qs.count()
 
             # Use iterator to minimize memory ballooning on large result sets
@@ -3416,15 +3427,15 @@ class CmdFind(COMMAND_DEFAULT_CLASS):
 class ScriptEvMore(EvMore):
     """
     Listing 1000+ Scripts can be very slow and memory-consuming. So
-    we use this custom EvMore child to build en EvTable only for
-    each page of the list.
+    we use this custom EvMore child to stream the scripts one page at a
+    time and build an EvTable only for each page of the list.
 
     """
 
     def init_pages(self, scripts):
         """Prepare the script list pagination"""
-        script_pages = Paginator(scripts, max(1, int(self.height / 2)))
-        super().init_pages(script_pages)
+        self.init_stream(scripts, pagesize=max(1, int(self.height / 2)))
+        self._paginator = self.paginator_stream
 
     def page_formatter(self, scripts):
         """Takes a page of scripts and formats the output
@@ -3612,7 +3623,7 @@ class CmdScripts(COMMAND_DEFAULT_CLASS):
         if not self.args:
             # show all scripts
             scripts = ScriptDB.objects.all().exclude(db_typeclass_path__in=self.hide_script_paths)
-            if not scripts:
+            if not scripts.exists():
                 caller.msg("No scripts found.")
                 return
             ScriptEvMore(caller, scripts.order_by("id"), session=self.session)
@@ -3645,7 +3656,7 @@ class CmdScripts(COMMAND_DEFAULT_CLASS):
                     scripts = ScriptDB.objects.filter(db_obj=obj).exclude(
                         db_typeclass_path__in=self.hide_script_paths
                     )
-                    if scripts:
+                    if scripts.exists():
                         ScriptEvMore(caller, scripts.order_by("id"), session=self.session)
                     else:
                         caller.msg(f"No scripts defined on {obj}")
@@ -54,6 +54,7 @@ class CharacterCmdSet(CmdSet):
         self.add(system.CmdServerLoad())
         # self.add(system.CmdPs())
         self.add(system.CmdTickers())
+        self.add(system.CmdCommandStats())
         self.add(system.CmdTasks())
 
         # Admin commands
@@ -19,6 +19,7 @@ from django.conf import settings
 import evennia
 from evennia.accounts.models import AccountDB
 from evennia.scripts.taskhandler import TaskHandlerTask
+from evennia.typeclasses.prefetch import HANDLER_PREFETCH
 from evennia.utils import gametime, logger, search, utils
 from evennia.utils.eveditor import EvEditor
 from evennia.utils.evmenu import ask_yes_no
@@ -46,6 +47,7 @@ __all__ = (
     "CmdServerLoad",
     "CmdTasks",
     "CmdTickers",
+    "CmdCommandStats",
 )
 
 
@@ -785,7 +787,9 @@ class CmdServerLoad(COMMAND_DEFAULT_CLASS):
     loaded by use of the idmapper functionality. This allows Evennia
     to maintain the same instances of an entity and allowing
     non-persistent storage schemes. The total amount of cached objects
-    are displayed plus a breakdown of database object types.
+    are displayed plus a breakdown of database object types. The
+    |wtag/attribute cache-fill queries|n shows how many database queries
+    the Tag- and Attribute-handlers needed per command, on average.
 
     The |wflushmem|n switch allows to flush the object cache. Please
     note that due to how Python's memory management works, releasing
@@ -936,6 +940,15 @@ class CmdServerLoad(COMMAND_DEFAULT_CLASS):
 
         string += "\n|w Entity idmapper cache:|n %i items\n%s" % (total_num, memtable)
 
+        # handler cache-fill queries
+        prefetch_stats = HANDLER_PREFETCH.stats
+        string += (
+            "\n|w Tag/Attribute cache-fill queries:|n "
+            f"{HANDLER_PREFETCH.queries_per_command():.2f} per command "
+            f"(last command: {prefetch_stats['last_command']}, "
+            f"batched prefetches: {prefetch_stats['prefetches']})"
+        )
+
         # return to caller
         self.msg(string)
 
@@ -980,6 +993,108 @@ class CmdTickers(COMMAND_DEFAULT_CLASS):
         self.msg("|wActive tickers|n:\n" + str(table))
 
 
+def _ms(seconds):
+    return f"{seconds * 1000:.2f}"
+
+
+class CmdCommandStats(COMMAND_DEFAULT_CLASS):
+    """
+    show how long commands take to run
+
+    Usage:
+      cmdstats[/reset] [<command>]
+
+    Switches:
+      reset - forget all stats collected so far
+
+    Without an argument, this lists all commands run since the server
+    started (or the stats were reset), with the mean time (in
+    milliseconds) of a run, slowest first, and the time that the
+    median, 90%, 99% and the slowest of them took. Give a command key
+    to see how the time of that command is spent: getting and merging
+    cmdsets (|wmerge|n), finding the command (|wmatch|n) and running
+    its at_pre_cmd, parse, func and at_post_cmd methods. Queries are
+    the number of database queries done by the command.
+
+    For commands that wait (with yield or await), func and at_post_cmd
+    are not timed.
+
+    """
+
+    key = "@cmdstats"
+    switch_options = ("reset",)
+    locks = "cmd:perm(cmdstats) or perm(Developer)"
+    help_category = "System"
+
+    def func(self):
+        from evennia.server.profiling.cmdstats import COMMAND_STATS, PHASES
+
+        if not COMMAND_STATS.enabled:
+            self.msg("Command stats are off (settings.COMMAND_STATS).")
+            return
+
+        if "reset" in self.switches:
+            COMMAND_STATS.reset()
+            self.msg("Command stats were reset.")
+            return
+
+        since = utils.time_format(time.time() - COMMAND_STATS.started, 4)
+        if self.args:
+            key = self.args.strip().lower()
+            for prefix in ("",) + tuple(settings.CMD_IGNORE_PREFIXES):
+                # also find keys like @cmdstats
+                stats = COMMAND_STATS.get(prefix + key)
+                if stats:
+                    key = prefix + key
+                    break
+            if not stats:
+                self.msg(f"No stats for a command '{key}'.")
+                return
+            table = self.styled_table("phase", "median", "90%", "99%", "max", "mean")
+            for phase in PHASES + ("total",):
+                histogram = stats[phase]
+                if histogram.count:
+                    table.add_row(
+                        phase,
+                        _ms(histogram.percentile(50)),
+                        _ms(histogram.percentile(90)),
+                        _ms(histogram.percentile(99)),
+                        _ms(histogram.max),
+                        _ms(histogram.mean()),
+                    )
+            queries = stats["queries"]
+            self.msg(
+                f"|wCommand '{key}'|n (run {stats['total'].count} times in the last {since}, ms):\n"
+                f"{table}\nQueries per run: median {queries.percentile(50):g}, "
+                f"99% {queries.percentile(99):g}, max {queries.max:g}, mean {queries.mean():.1f}"
+            )
+            return
+
+        all_stats = COMMAND_STATS.all()
+        if not all_stats:
+            self.msg("No commands were run yet.")
+            return
+        table = self.styled_table(
+            "command", "runs", "mean", "median", "90%", "99%", "max", "queries"
+        )
+        # slowest per run first, not the ones that took the most time in all
+        for key, stats in sorted(
+            all_stats.items(), key=lambda item: item[1]["total"].mean(), reverse=True
+        ):
+            total = stats["total"]
+            table.add_row(
+                key,
+                total.count,
+                _ms(total.mean()),
+                _ms(total.percentile(50)),
+                _ms(total.percentile(90)),
+                _ms(total.percentile(99)),
+                _ms(total.max),
+                f"{stats['queries'].mean():.1f}",
+            )
+        self.msg(f"|wCommand times|n (last {since}, ms, slowest first):\n{table}")
+
+
 class CmdTasks(COMMAND_DEFAULT_CLASS):
     """
     Display or terminate active tasks (delays).
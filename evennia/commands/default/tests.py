@@ -384,6 +384,43 @@ class TestSystem(BaseEvenniaCommandTest):
     def test_server_load(self):
         self.call(system.CmdServerLoad(), "", "Server CPU and Memory load:")
 
+    def test_cmdstats(self):
+        from evennia.server.profiling.cmdstats import COMMAND_STATS, PHASES
+
+        COMMAND_STATS.reset()
+        self.call(system.CmdCommandStats(), "", "No commands were run yet.")
+        self.char1.execute_cmd("look")
+        stats = COMMAND_STATS.get("look")
+        self.assertEqual(stats["total"].count, 1)
+        self.assertTrue(all(stats[phase].count == 1 for phase in PHASES))
+        self.call(system.CmdCommandStats(), "", "Command times")
+        self.call(system.CmdCommandStats(), "look", "Command 'look' (run 1 times")
+        self.call(system.CmdCommandStats(), "nothing", "No stats for a command 'nothing'.")
+        self.call(system.CmdCommandStats(), "/reset", "Command stats were reset.")
+        # sorted by the time of a run, not the total time of all runs
+        COMMAND_STATS.record("slow", {"func": 0.1}, 0)
+        for _ in range(100):
+            COMMAND_STATS.record("often", {"func": 0.01}, 0)
+        ret = self.call(system.CmdCommandStats(), "", "Command times")
+        self.assertLess(ret.index("slow"), ret.index("often"))
+        COMMAND_STATS.reset()
+
+        # a func that yields runs on later, so it is not timed
+        class CmdWait(Command):
+            key = "wait"
+
+            def func(self):
+                yield 10
+
+        with patch("evennia.commands.cmdhandler.utils.delay"):
+            self.char1.execute_cmd("", cmdobj=CmdWait())
+        stats = COMMAND_STATS.get("wait")
+        self.assertEqual(stats["total"].count, 1)
+        self.assertEqual(stats["parse"].count, 1)
+        self.assertEqual(stats["func"].count, 0)
+        self.assertEqual(stats["at_post_cmd"].count, 0)
+        COMMAND_STATS.reset()
+
 
 _TASK_HANDLER = None
 
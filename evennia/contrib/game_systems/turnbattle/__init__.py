@@ -4,6 +4,7 @@ Turnbattle system - Tim Ashley Jenkins 2017
 """
 
 from . import tb_basic  # noqa
+from . import tb_engine  # noqa
 from . import tb_equip  # noqa
 from . import tb_items  # noqa
 from . import tb_magic  # noqa
@@ -0,0 +1,163 @@
+"""
+Turnbattle benchmark
+
+Compares running many fights at the same time with one `TBBasicTurnHandler`
+Script per fight (`tb_basic`) and with the in-memory `COMBAT_ENGINE` (`tb_engine`).
+
+For each mode, this creates a room with two fighters per fight, starts all fights
+and then plays a number of rounds where each fighter attacks on their turn
+(doing the same checks as the `attack` command). It also times one tick of the
+turn timers of all fights. The time and number of database queries of each
+step is reported.
+
+Run it from `evennia shell`, on a development database (it creates and then
+deletes three objects per fight):
+
+    from evennia.contrib.game_systems.turnbattle import benchmark
+    benchmark.run(nfights=1000)
+
+"""
+
+import time
+
+from django.db import connection
+
+from evennia.objects.objects import DefaultRoom
+from evennia.utils.create import create_object
+
+from . import tb_basic, tb_engine
+
+
+class _Step:
+    """
+    Time a step of the benchmark and count its database queries.
+
+    """
+
+    def __init__(self, results, name):
+        self.results = results
+        self.name = name
+        self.nqueries = 0
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.nqueries += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.wrapper = connection.execute_wrapper(self._count_query)
+        self.wrapper.__enter__()
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *args):
+        duration = time.perf_counter() - self.t0
+        self.wrapper.__exit__(*args)
+        self.results[self.name] = (duration, self.nqueries)
+
+
+def _setup(nfights, character_typeclass):
+    fights = []
+    for ifight in range(nfights):
+        room = create_object(DefaultRoom, key=f"benchmark room {ifight}")
+        fighters = [
+            create_object(character_typeclass, key=f"fighter {ifight}-{ifighter}", location=room)
+            for ifighter in range(2)
+        ]
+        for fighter in fighters:
+            # make sure no-one is defeated during the benchmark
+            fighter.db.hp = fighter.db.max_hp = 10**9
+        fights.append((room, fighters))
+    return fights
+
+
+def _play_rounds(fights, rules, nrounds):
+    for _ in range(nrounds):
+        for room, fighters in fights:
+            for _ in range(len(fighters)):
+                # the checks done by the attack command
+                attacker = next(
+                    fighter
+                    for fighter in fighters
+                    if rules.is_in_combat(fighter) and rules.is_turn(fighter) and fighter.db.hp
+                )
+                defender = fighters[1] if attacker == fighters[0] else fighters[0]
+                rules.resolve_attack(attacker, defender)
+                rules.spend_action(attacker, 1, action_name="attack")
+
+
+def _cleanup(fights):
+    for room, fighters in fights:
+        for fighter in fighters:
+            fighter.delete()
+        room.delete()
+
+
+def _run_script_mode(nfights, nrounds):
+    results = {}
+    fights = _setup(nfights, tb_basic.TBBasicCharacter)
+    rules = tb_basic.COMBAT_RULES
+    try:
+        with _Step(results, "start fights"):
+            handlers = [room.scripts.add(tb_basic.TBBasicTurnHandler) for room, _ in fights]
+        with _Step(results, f"play {nrounds} rounds"):
+            _play_rounds(fights, rules, nrounds)
+        with _Step(results, "tick turn timers"):
+            for handler in handlers:
+                handler.at_repeat()
+        with _Step(results, "end fights"):
+            for handler in handlers:
+                handler.stop()
+                handler.delete()
+    finally:
+        _cleanup(fights)
+    return results
+
+
+def _run_engine_mode(nfights, nrounds):
+    results = {}
+    engine = tb_engine.COMBAT_ENGINE
+    use_ticker, engine.use_ticker = engine.use_ticker, False
+    fights = _setup(nfights, tb_engine.TBEngineCharacter)
+    rules = tb_engine.COMBAT_RULES
+    try:
+        with _Step(results, "start fights"):
+            for room, fighters in fights:
+                engine.start_fight(room, fighters)
+            engine.save()
+        with _Step(results, f"play {nrounds} rounds"):
+            _play_rounds(fights, rules, nrounds)
+        with _Step(results, "tick turn timers"):
+            # this also saves the state of all fights that finished a round
+            engine.tick()
+        with _Step(results, "end fights"):
+            for room, _ in fights:
+                engine.end_fight(engine.get_fight(room))
+    finally:
+        _cleanup(fights)
+        engine.use_ticker = use_ticker
+    return results
+
+
+def run(nfights=1000, nrounds=5, modes=("script", "engine"), verbose=True):
+    """
+    Run the benchmark.
+
+    Args:
+        nfights (int, optional): How many fights to run at the same time.
+        nrounds (int, optional): How many rounds to play in every fight.
+        modes (tuple, optional): Which modes to benchmark, "script" and/or "engine".
+        verbose (bool, optional): Print the results.
+
+    Returns:
+        dict: `{mode: {step: (seconds, queries), ...}, ...}`.
+
+    """
+    runners = {"script": _run_script_mode, "engine": _run_engine_mode}
+    results = {mode: runners[mode](nfights, nrounds) for mode in modes}
+
+    if verbose:
+        print(f"Turnbattle benchmark: {nfights} fights, {nrounds} rounds each")
+        for mode, steps in results.items():
+            print(f"\n {mode} mode:")
+            for step, (duration, nqueries) in steps.items():
+                print(f"   {step:<20} {duration:9.3f}s {nqueries:9d} queries")
+    return results
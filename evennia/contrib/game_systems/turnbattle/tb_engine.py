@@ -0,0 +1,791 @@
+"""
+Turn-based combat engine
+
+This runs the combat of `tb_basic` in 'engine mode'. The game rules and the
+commands are the same, but how the fights are run is different:
+
+In `tb_basic` (and the other turnbattle modules) every fight is run by its own
+`TBBasicTurnHandler` Script, which stores the turn order, the current turn, the
+turn timer and the actions left of each fighter in Attributes. These are read
+and saved again on every action. This works well for a few fights, but not for
+a game with hundreds of fights going on at the same time.
+
+In engine mode:
+
+- The state of all active fights is kept in memory, in compact `Fight` objects
+  managed by the `COMBAT_ENGINE` singleton. No Attributes are read or saved
+  when fighters act.
+- A single ticker (from the TickerHandler) drives all fights, instead of one
+  Script per fight. Fights are scheduled by the tick in which their turn timer
+  needs attention, so every tick only handles the fights due in it, all in one
+  batch.
+- A fight's state is persisted (as an Attribute `combat_fight` on the room) only
+  at round boundaries, and all fights finishing a round are saved in one
+  database transaction at the end of the tick. After a server reload, fights
+  continue from the start of the round that was in progress.
+
+To install, use this module's typeclasses and cmdset instead of those from
+`tb_basic`. Import `TBEngineCharacter` into your game's character.py module:
+
+    from evennia.contrib.game_systems.turnbattle.tb_engine import TBEngineCharacter
+
+And change your game's character typeclass to inherit from TBEngineCharacter
+instead of the default:
+
+    class Character(TBEngineCharacter):
+
+Next, import this module into your default_cmdsets.py module:
+
+    from evennia.contrib.game_systems.turnbattle import tb_engine
+
+And add the battle command set to your default command set:
+
+    #
+    # any commands you add below will overload the default ones.
+    #
+    self.add(tb_engine.BattleCmdSet())
+
+The `EngineCombatRules` are the `tb_basic` rules, with the turn-related parts
+(`is_in_combat`, `is_turn` and `spend_action`) looking at the engine instead of
+at Attributes. Rules from the other turnbattle modules can be combined with it
+(`class MyRules(EngineCombatRules, MyOtherRules)`), as long as they don't access
+the `combat_*` Attributes or the turn handler Script directly.
+
+See `benchmark.py` in this folder for comparing the two modes.
+
+"""
+
+import math
+import time
+from collections import defaultdict
+
+from evennia import TICKER_HANDLER, default_cmds
+from evennia.objects.models import ObjectDB
+from evennia.utils import logger
+from evennia.utils.idmapper.models import save_session
+from evennia.utils.utils import class_from_module
+
+from . import tb_basic
+
+"""
+----------------------------------------------------------------------------
+OPTIONS
+----------------------------------------------------------------------------
+"""
+
+TURN_TIMEOUT = 30  # Time before turns automatically end, in seconds
+ACTIONS_PER_TURN = 1  # Number of actions allowed per turn
+ENGINE_INTERVAL = 5  # How often the engine ticks, in seconds
+TIMEOUT_WARNING = 10  # Warn fighters this many seconds before their turn times out
+
+# Attribute on the room storing the fight's state between rounds
+FIGHT_ATTRIBUTE = ("combat_fight", "tb_engine")
+
+"""
+----------------------------------------------------------------------------
+COMBAT FUNCTIONS START HERE
+----------------------------------------------------------------------------
+"""
+
+
+class EngineCombatRules(tb_basic.BasicCombatRules):
+    """
+    The basic combat rules, using the combat engine to track turns and actions.
+
+    """
+
+    def is_in_combat(self, character):
+        """
+        Returns true if the given character is in combat.
+
+        Args:
+            character (obj): Character to determine if is in combat or not
+
+        Returns:
+            (bool): True if in combat or False if not in combat
+        """
+        return bool(COMBAT_ENGINE.get_fight(character))
+
+    def is_turn(self, character):
+        """
+        Returns true if it's currently the given character's turn in combat.
+
+        Args:
+            character (obj): Character to determine if it is their turn or not
+
+        Returns:
+            (bool): True if it is their turn or False otherwise
+        """
+        fight = COMBAT_ENGINE.get_fight(character)
+        return bool(fight and fight.fighters[fight.turn] == character)
+
+    def spend_action(self, character, actions, action_name=None):
+        """
+        Spends a character's available combat actions and checks for end of turn.
+
+        Args:
+            character (obj): Character spending the action
+            actions (int) or 'all': Number of actions to spend, or 'all' to spend all actions
+
+        Keyword Args:
+            action_name (str or None): If a string is given, sets character's last action in
+            combat to provided string
+        """
+        fight = COMBAT_ENGINE.get_fight(character)
+        if not fight:
+            return
+        index = fight.fighters.index(character)
+        if action_name:
+            fight.lastaction[index] = action_name
+        if actions == "all":  # If spending all actions
+            fight.actionsleft[index] = 0
+        else:
+            # Use up actions, can't have fewer than 0 actions
+            fight.actionsleft[index] = max(0, fight.actionsleft[index] - actions)
+        fight.turn_end_check(character)  # Signal potential end of turn.
+
+
+COMBAT_RULES = EngineCombatRules()
+
+"""
+----------------------------------------------------------------------------
+COMBAT ENGINE STARTS HERE
+----------------------------------------------------------------------------
+"""
+
+
+class Fight:
+    """
+    The in-memory state of one fight. This does what the `TBBasicTurnHandler`
+    Script does in `tb_basic`, but stores the actions left and last action of each
+    fighter in lists alongside the turn order instead of in Attributes.
+
+    """
+
+    __slots__ = (
+        "engine",
+        "rules",
+        "room",
+        "fighters",
+        "actionsleft",
+        "lastaction",
+        "turn",
+        "round",
+        "timeout_tick",
+        "warning_tick",
+        "timeout_warning_given",
+        "ended",
+    )
+
+    def __init__(self, engine, room, fighters, rules=COMBAT_RULES):
+        """
+        Args:
+            engine (CombatEngine): The engine running the fight.
+            room (Object): Where the fight takes place.
+            fighters (list): The fighters, in turn order.
+            rules (BasicCombatRules, optional): The rules to fight by.
+
+        """
+        self.engine = engine
+        self.rules = rules
+        self.room = room
+        self.fighters = list(fighters)
+        self.actionsleft = [0] * len(self.fighters)
+        self.lastaction = ["null"] * len(self.fighters)
+        self.turn = 0
+        self.round = 0
+        self.timeout_tick = 0
+        self.warning_tick = 0
+        self.timeout_warning_given = False
+        self.ended = False
+
+    def __repr__(self):
+        return f"<Fight in {self.room} (round {self.round}, {len(self.fighters)} fighters)>"
+
+    def serialize(self):
+        """
+        Get the state of the fight for storing in an Attribute.
+
+        Returns:
+            dict: The fight state.
+
+        """
+        rules = self.rules.__class__
+        return {
+            "fighters": list(self.fighters),
+            "actionsleft": list(self.actionsleft),
+            "lastaction": list(self.lastaction),
+            "turn": self.turn,
+            "round": self.round,
+            "timer": self.get_timer(),
+            "rules": f"{rules.__module__}.{rules.__name__}",
+        }
+
+    @classmethod
+    def deserialize(cls, engine, room, data):
+        """
+        Recreate a fight from stored state.
+
+        Args:
+            engine (CombatEngine): The engine to run the fight.
+            room (Object): Where the fight takes place.
+            data (dict): State from `Fight.serialize`.
+
+        Returns:
+            Fight: The restored fight.
+
+        """
+        rules = engine.get_rules(data.get("rules"))
+        fight = cls(engine, room, [], rules=rules)
+        # skip fighters that were deleted since the fight was saved
+        for fighter, actionsleft, lastaction in zip(
+            data["fighters"], data["actionsleft"], data["lastaction"]
+        ):
+            if fighter:
+                fight.fighters.append(fighter)
+                fight.actionsleft.append(actionsleft)
+                fight.lastaction.append(lastaction)
+        fight.turn = min(data["turn"], max(0, len(fight.fighters) - 1))
+        fight.round = data["round"]
+        fight.set_timer(data["timer"])
+        return fight
+
+    def get_timer(self):
+        """
+        Get the time left of the current turn.
+
+        Returns:
+            float: The time left, in seconds.
+
+        """
+        return max(0, self.timeout_tick - self.engine.tickcount) * self.engine.interval
+
+    def set_timer(self, timer):
+        """
+        Set the time left for the current turn, scheduling the fight for the ticks
+        where the timer will run out or a warning should be given.
+
+        Args:
+            timer (float): Seconds until the turn times out.
+
+        """
+        interval = self.engine.interval
+        tickcount = self.engine.tickcount
+        self.timeout_tick = tickcount + max(1, math.ceil(timer / interval))
+        self.warning_tick = tickcount + max(1, math.ceil((timer - TIMEOUT_WARNING) / interval))
+        self.timeout_warning_given = False
+        self.engine.schedule(self, self.warning_tick)
+        self.engine.schedule(self, self.timeout_tick)
+
+    def at_tick(self, tickcount):
+        """
+        Called by the engine at the ticks this fight was scheduled for.
+
+        Args:
+            tickcount (int): The current engine tick.
+
+        """
+        currentchar = self.fighters[self.turn]
+        if tickcount >= self.timeout_tick:
+            # Force current character to disengage if timer runs out.
+            self.room.msg_contents("%s's turn timed out!" % currentchar)
+            self.rules.spend_action(currentchar, "all", action_name="disengage")
+        elif tickcount >= self.warning_tick and not self.timeout_warning_given:
+            # Warn the current character if they're about to time out.
+            currentchar.msg("WARNING: About to time out!")
+            self.timeout_warning_given = True
+
+    def start(self):
+        """
+        Roll initiative and start the first turn.
+
+        """
+        # Roll initiative and sort the list of fighters depending on who rolls highest to
+        # determine turn order.
+        self.fighters = sorted(self.fighters, key=self.rules.roll_init, reverse=True)
+        self.actionsleft = [0] * len(self.fighters)
+        self.lastaction = ["null"] * len(self.fighters)
+
+        # Announce the turn order.
+        self.room.msg_contents("Turn order is: %s " % ", ".join(obj.key for obj in self.fighters))
+        self.turn = 0
+        self.start_turn(self.fighters[0])
+        self.set_timer(TURN_TIMEOUT)
+
+    def start_turn(self, character):
+        """
+        Readies a character for the start of their turn by replenishing their
+        available actions and notifying them that their turn has come up.
+
+        Args:
+            character (obj): Character to be readied.
+
+        """
+        self.actionsleft[self.fighters.index(character)] = ACTIONS_PER_TURN
+        # Prompt the character for their turn and give some information.
+        character.msg("|wIt's your turn! You have %i HP remaining.|n" % character.db.hp)
+
+    def next_turn(self):
+        """
+        Advances to the next character in the turn order.
+
+        """
+        # Check to see if every character disengaged as their last action. If so, end combat.
+        if all(lastaction == "disengage" for lastaction in self.lastaction):
+            self.room.msg_contents("All fighters have disengaged! Combat is over!")
+            self.engine.end_fight(self)
+            return
+
+        # Check to see if only one character is left standing. If so, end combat.
+        standing = [fighter for fighter in self.fighters if fighter.db.hp != 0]
+        if len(standing) == 1:
+            self.room.msg_contents("Only %s remains! Combat is over!" % standing[0])
+            self.engine.end_fight(self)
+            return
+
+        # Cycle to the next turn.
+        currentchar = self.fighters[self.turn]
+        self.turn += 1
+        new_round = self.turn > len(self.fighters) - 1
+        if new_round:
+            # Back to the first in the turn order - a new round begins.
+            self.turn = 0
+            self.round += 1
+        newchar = self.fighters[self.turn]
+        self.set_timer(TURN_TIMEOUT + self.engine.time_until_next_tick())
+        self.room.msg_contents("%s's turn ends - %s's turn begins!" % (currentchar, newchar))
+        self.start_turn(newchar)
+        if new_round:
+            self.engine.save_at_tick(self)
+
+    def turn_end_check(self, character):
+        """
+        Tests to see if a character's turn is over, and cycles to the next turn if it is.
+
+        Args:
+            character (obj): Character to test for end of turn
+
+        """
+        if not self.actionsleft[self.fighters.index(character)]:
+            self.next_turn()
+
+    def join_fight(self, character):
+        """
+        Adds a new character to the fight, right behind whoever's turn it currently is.
+
+        Args:
+            character (obj): Character to be added to the fight.
+
+        """
+        self.fighters.insert(self.turn, character)
+        self.actionsleft.insert(self.turn, 0)
+        self.lastaction.insert(self.turn, "null")
+        # Tick the turn counter forward one to compensate.
+        self.turn += 1
+        self.engine.fighters[character.id] = self
+
+
+class CombatEngine:
+    """
+    Runs all fights from a single ticker.
+
+    Fights are kept in memory and scheduled by the engine tick at which they need
+    attention (a turn timing out or a timeout warning). Each tick handles the
+    fights due in it, then saves all fights that finished a round since the last
+    tick in one transaction.
+
+    """
+
+    def __init__(self, interval=ENGINE_INTERVAL, use_ticker=True):
+        """
+        Args:
+            interval (int, optional): Seconds between engine ticks.
+            use_ticker (bool, optional): Tick from the TickerHandler. If unset, `tick`
+                must be called manually (like when testing).
+
+        """
+        self.interval = interval
+        self.use_ticker = use_ticker
+        # {room id: Fight}
+        self.fights = {}
+        # {fighter id: Fight}
+        self.fighters = {}
+        # {tickcount: set of Fights due}
+        self.due = defaultdict(set)
+        # {Fight: state} to persist at the end of the tick
+        self.to_save = {}
+        self.tickcount = 0
+        self.last_tick = None
+        self.loaded = False
+        self.rules_cache = {}
+
+    def get_rules(self, path):
+        """
+        Get the rules to use for a restored fight.
+
+        Args:
+            path (str): Python-path to the rules class.
+
+        Returns:
+            BasicCombatRules: The rules.
+
+        """
+        if not path:
+            return COMBAT_RULES
+        if path not in self.rules_cache:
+            rules = COMBAT_RULES
+            try:
+                rules_class = class_from_module(path)
+            except ImportError:
+                logger.log_trace(f"tb_engine: Could not load combat rules {path}.")
+            else:
+                rules = rules_class()
+            self.rules_cache[path] = rules
+        return self.rules_cache[path]
+
+    def load(self):
+        """
+        Restore the fights saved in the database, like after a reload.
+
+        """
+        self.loaded = True
+        key, category = FIGHT_ATTRIBUTE
+        for room in ObjectDB.objects.get_by_attribute(key=key, category=category):
+            if room.id in self.fights:
+                continue
+            data = room.attributes.get(key, category=category)
+            fight = Fight.deserialize(self, room, data) if data else None
+            if not fight or len(fight.fighters) < 2:
+                room.attributes.remove(key, category=category)
+                continue
+            self._add(fight)
+        if self.fights:
+            self.start_ticker()
+
+    def _add(self, fight):
+        self.fights[fight.room.id] = fight
+        for fighter in fight.fighters:
+            self.fighters[fighter.id] = fight
+
+    def get_fight(self, obj):
+        """
+        Get the fight an object is part of.
+
+        Args:
+            obj (Object): A fighter, or a room.
+
+        Returns:
+            Fight or None: The fight going on.
+
+        """
+        if not self.loaded:
+            self.load()
+        fight = self.fighters.get(obj.id) or self.fights.get(obj.id)
+        return fight if fight and not fight.ended else None
+
+    def start_fight(self, room, fighters, rules=COMBAT_RULES):
+        """
+        Start a new fight.
+
+        Args:
+            room (Object): Where the fight takes place.
+            fighters (list): The characters fighting.
+            rules (BasicCombatRules, optional): The rules to fight by.
+
+        Returns:
+            Fight: The new fight.
+
+        """
+        if not self.loaded:
+            self.load()
+        fight = Fight(self, room, fighters, rules=rules)
+        self._add(fight)
+        if len(self.fights) == 1:
+            self.start_ticker()
+        fight.start()
+        self.save_at_tick(fight)
+        return fight
+
+    def join_fight(self, fight, character):
+        """
+        Add a character to a fight in progress.
+
+        Args:
+            fight (Fight): The fight to join.
+            character (Object): The character joining.
+
+        """
+        fight.join_fight(character)
+
+    def end_fight(self, fight):
+        """
+        Stop a fight and forget about it.
+
+        Args:
+            fight (Fight): The fight to end.
+
+        """
+        fight.ended = True
+        self.fights.pop(fight.room.id, None)
+        for fighter in fight.fighters:
+            if self.fighters.get(fighter.id) is fight:
+                del self.fighters[fighter.id]
+        self.to_save.pop(fight, None)
+        fight.room.attributes.remove(FIGHT_ATTRIBUTE[0], category=FIGHT_ATTRIBUTE[1])
+        if not self.fights:
+            self.stop_ticker()
+
+    def schedule(self, fight, tickcount):
+        """
+        Have the engine call `fight.at_tick` at a given tick.
+
+        Args:
+            fight (Fight): The fight to handle.
+            tickcount (int): The tick to handle it at.
+
+        """
+        self.due[tickcount].add(fight)
+
+    def save_at_tick(self, fight):
+        """
+        Take a snapshot of the state of a fight, to be persisted at the end of
+        the current (or next) tick.
+
+        Args:
+            fight (Fight): The fight to save.
+
+        """
+        self.to_save[fight] = fight.serialize()
+
+    def save(self):
+        """
+        Save all fights waiting to be persisted, in one transaction.
+
+        """
+        to_save = [(fight, data) for fight, data in self.to_save.items() if not fight.ended]
+        self.to_save = {}
+        if not to_save:
+            return
+        key, category = FIGHT_ATTRIBUTE
+        with save_session():
+            for fight, data in to_save:
+                fight.room.attributes.add(key, data, category=category)
+
+    def time_until_next_tick(self):
+        """
+        Get the time until the engine ticks next.
+
+        Returns:
+            float: Seconds to the next tick.
+
+        """
+        if self.last_tick is None:
+            return self.interval
+        return max(0, self.interval - (time.time() - self.last_tick))
+
+    def tick(self):
+        """
+        Handle all fights due this tick, then save the fights that finished a round.
+
+        """
+        if not self.loaded:
+            self.load()
+        self.tickcount += 1
+        self.last_tick = time.time()
+        for fight in self.due.pop(self.tickcount, ()):
+            if fight.ended or self.tickcount not in (fight.timeout_tick, fight.warning_tick):
+                # ended, or rescheduled since
+                continue
+            try:
+                fight.at_tick(self.tickcount)
+            except Exception:
+                logger.log_trace(f"tb_engine: Error in {fight}.")
+        self.save()
+
+    def start_ticker(self):
+        """
+        Start ticking the engine.
+
+        """
+        if self.use_ticker:
+            TICKER_HANDLER.add(self.interval, _tick_combat_engine, idstring="tb_engine")
+
+    def stop_ticker(self):
+        """
+        Stop ticking the engine, when there are no more fights.
+
+        """
+        if not self.use_ticker:
+            return
+        try:
+            TICKER_HANDLER.remove(self.interval, _tick_combat_engine, idstring="tb_engine")
+        except KeyError:
+            pass
+
+
+COMBAT_ENGINE = CombatEngine()
+
+
+def _tick_combat_engine(*args, **kwargs):
+    """
+    Called by the TickerHandler.
+
+    """
+    COMBAT_ENGINE.tick()
+
+
+"""
+----------------------------------------------------------------------------
+CHARACTER TYPECLASS
+----------------------------------------------------------------------------
+"""
+
+
+class TBEngineCharacter(tb_basic.TBBasicCharacter):
+    """
+    A character able to participate in turn-based combat. Has attributes for current
+    and maximum HP, and access to combat commands.
+    """
+
+    rules = COMBAT_RULES
+
+
+"""
+----------------------------------------------------------------------------
+COMMANDS START HERE
+----------------------------------------------------------------------------
+"""
+
+
+class CmdFight(tb_basic.CmdFight):
+    """
+    Starts a fight with everyone in the same room as you.
+
+    Usage:
+      fight
+
+    When you start a fight, everyone in the room who is able to
+    fight is added to combat, and a turn order is randomly rolled.
+    When it's your turn, you can attack other characters.
+    """
+
+    rules = COMBAT_RULES
+
+    def func(self):
+        """
+        This performs the actual command.
+        """
+        here = self.caller.location
+        fighters = []
+
+        if not self.caller.db.hp:  # If you don't have any hp
+            self.caller.msg("You can't start a fight if you've been defeated!")
+            return
+        if self.rules.is_in_combat(self.caller):  # Already in a fight
+            self.caller.msg("You're already in a fight!")
+            return
+        for thing in here.contents:  # Test everything in the room to add it to the fight.
+            if thing.db.HP:  # If the object has HP...
+                fighters.append(thing)  # ...then add it to the fight.
+        if len(fighters) <= 1:  # If you're the only able fighter in the room
+            self.caller.msg("There's nobody here to fight!")
+            return
+        fight = COMBAT_ENGINE.get_fight(here)
+        if fight:  # If there's already a fight going on...
+            here.msg_contents("%s joins the fight!" % self.caller)
+            COMBAT_ENGINE.join_fight(fight, self.caller)  # Join the fight!
+            return
+        here.msg_contents("%s starts a fight!" % self.caller)
+        COMBAT_ENGINE.start_fight(here, fighters, rules=self.rules)
+
+
+class CmdAttack(tb_basic.CmdAttack):
+    """
+    Attacks another character.
+
+    Usage:
+      attack <target>
+
+    When in a fight, you may attack another character. The attack has
+    a chance to hit, and if successful, will deal damage.
+    """
+
+    rules = COMBAT_RULES
+
+
+class CmdPass(tb_basic.CmdPass):
+    """
+    Passes on your turn.
+
+    Usage:
+      pass
+
+    When in a fight, you can use this command to end your turn early, even
+    if there are still any actions you can take.
+    """
+
+    rules = COMBAT_RULES
+
+
+class CmdDisengage(tb_basic.CmdDisengage):
+    """
+    Passes your turn and attempts to end combat.
+
+    Usage:
+      disengage
+
+    Ends your turn early and signals that you're trying to end
+    the fight. If all participants in a fight disengage, the
+    fight ends.
+    """
+
+    rules = COMBAT_RULES
+
+
+class CmdRest(tb_basic.CmdRest):
+    """
+    Recovers damage.
+
+    Usage:
+      rest
+
+    Resting recovers your HP to its maximum, but you can only
+    rest if you're not in a fight.
+    """
+
+    rules = COMBAT_RULES
+
+
+class CmdCombatHelp(tb_basic.CmdCombatHelp):
+    """
+    View help or a list of topics
+
+    Usage:
+      help <topic or command>
+      help list
+      help all
+
+    This will search for help on commands and other
+    topics related to the game.
+    """
+
+    rules = COMBAT_RULES
+
+
+class BattleCmdSet(default_cmds.CharacterCmdSet):
+    """
+    This command set includes all the commmands used in the battle system.
+    """
+
+    key = "DefaultCharacter"
+
+    def at_cmdset_creation(self):
+        """
+        Populates the cmdset
+        """
+        self.add(CmdFight())
+        self.add(CmdAttack())
+        self.add(CmdRest())
+        self.add(CmdPass())
+        self.add(CmdDisengage())
+        self.add(CmdCombatHelp())
@@ -10,7 +10,7 @@ from evennia.objects.objects import DefaultRoom
 from evennia.utils.create import create_object
 from evennia.utils.test_resources import BaseEvenniaTest
 
-from . import tb_basic, tb_equip, tb_items, tb_magic, tb_range
+from . import benchmark, tb_basic, tb_engine, tb_equip, tb_items, tb_magic, tb_range
 
 
 class TestTurnBattleBasicCmd(BaseEvenniaCommandTest):
@@ -613,3 +613,126 @@ class TestTurnBattleMagicFunc(BaseEvenniaTest):
         self.turnhandler.join_fight(self.joiner)
         self.assertTrue(self.turnhandler.db.turn == 1)
         self.assertTrue(self.turnhandler.db.fighters == [self.joiner, self.attacker, self.defender])
+
+
+class TestTurnBattleEngineCmd(BaseEvenniaCommandTest):
+    def setUp(self):
+        super().setUp()
+        self.engine = tb_engine.CombatEngine(use_ticker=False)
+        patcher = patch.object(tb_engine, "COMBAT_ENGINE", self.engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # Test engine-mode commands
+    def test_turnbattleenginecmd(self):
+        self.call(tb_engine.CmdFight(), "", "You can't start a fight if you've been defeated!")
+        self.call(tb_engine.CmdAttack(), "", "You can only do that in combat. (see: help fight)")
+        self.call(tb_engine.CmdPass(), "", "You can only do that in combat. (see: help fight)")
+        self.call(tb_engine.CmdDisengage(), "", "You can only do that in combat. (see: help fight)")
+        self.call(tb_engine.CmdRest(), "", "Char rests to recover HP.")
+        self.char1.db.hp = self.char2.db.hp = 100
+        self.call(tb_engine.CmdFight(), "", "Char starts a fight!")
+        self.assertTrue(self.engine.get_fight(self.room1))
+        self.call(tb_engine.CmdFight(), "", "You're already in a fight!")
+
+
+class TestTurnBattleEngineFunc(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.engine = tb_engine.CombatEngine(use_ticker=False)
+        patcher = patch.object(tb_engine, "COMBAT_ENGINE", self.engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.testroom = create_object(DefaultRoom, key="Test Room")
+        self.attacker = create_object(
+            tb_engine.TBEngineCharacter, key="Attacker", location=self.testroom
+        )
+        self.defender = create_object(
+            tb_engine.TBEngineCharacter, key="Defender", location=self.testroom
+        )
+        self.joiner = create_object(tb_engine.TBEngineCharacter, key="Joiner", location=None)
+        self.rules = tb_engine.COMBAT_RULES
+
+    def tearDown(self):
+        super().tearDown()
+        self.attacker.delete()
+        self.defender.delete()
+        self.joiner.delete()
+        self.testroom.delete()
+
+    def test_tbenginefunc(self):
+        self.assertFalse(self.rules.is_in_combat(self.attacker))
+        fight = self.engine.start_fight(self.testroom, [self.attacker, self.defender])
+        self.assertTrue(self.rules.is_in_combat(self.attacker))
+        self.assertEqual(self.engine.get_fight(self.testroom), fight)
+        first, second = fight.fighters
+        self.assertTrue(self.rules.is_turn(first))
+        self.assertFalse(self.rules.is_turn(second))
+        self.assertEqual(fight.actionsleft, [1, 0])
+        # the start of the fight is saved at the next tick
+        self.assertIn(fight, self.engine.to_save)
+        self.engine.tick()
+        self.assertEqual(
+            self.testroom.attributes.get("combat_fight", category="tb_engine")["round"], 0
+        )
+
+        # Spend actions - this is only tracked in memory
+        self.rules.spend_action(first, 1, action_name="attack")
+        self.assertEqual(fight.lastaction[0], "attack")
+        self.assertEqual(fight.turn, 1)
+        self.assertTrue(self.rules.is_turn(second))
+        self.assertFalse(first.attributes.has("combat_actionsleft"))
+        self.assertFalse(self.engine.to_save)
+        # the end of a round is saved at the next tick
+        self.rules.spend_action(second, "all", action_name="pass")
+        self.assertEqual((fight.turn, fight.round), (0, 1))
+        self.assertIn(fight, self.engine.to_save)
+        self.rules.spend_action(first, 1, action_name="attack")
+        self.engine.tick()
+        data = self.testroom.attributes.get("combat_fight", category="tb_engine")
+        self.assertEqual((data["turn"], data["round"]), (0, 1))
+
+        # the fight can be restored from the round start, like after a reload
+        engine2 = tb_engine.CombatEngine(use_ticker=False)
+        engine2.load()
+        fight2 = engine2.get_fight(self.testroom)
+        self.assertEqual(fight2.fighters, fight.fighters)
+        self.assertEqual((fight2.turn, fight2.round), (0, 1))
+        self.assertEqual(fight2.lastaction, ["attack", "pass"])
+        self.assertEqual(fight2.rules.__class__, tb_engine.EngineCombatRules)
+
+        # Join fight
+        self.joiner.location = self.testroom
+        self.engine.join_fight(fight, self.joiner)
+        self.assertEqual(fight.fighters, [first, self.joiner, second])
+        self.assertEqual(fight.turn, 2)
+        self.assertTrue(self.rules.is_in_combat(self.joiner))
+
+        # All fighters disengage to end the fight
+        for fighter in (second, first, self.joiner):
+            self.rules.spend_action(fighter, "all", action_name="disengage")
+        self.assertTrue(fight.ended)
+        self.assertFalse(self.rules.is_in_combat(self.attacker))
+        self.assertFalse(self.testroom.attributes.has("combat_fight", category="tb_engine"))
+
+    def test_turn_timeout(self):
+        fight = self.engine.start_fight(self.testroom, [self.attacker, self.defender])
+        first, second = fight.fighters
+        first.msg = MagicMock()
+        # only ticks where the fight is due are handling it
+        self.assertEqual(sorted(self.engine.due), [4, 6])
+        for _ in range(4):
+            self.engine.tick()
+        first.msg.assert_called_with("WARNING: About to time out!")
+        self.engine.tick()
+        self.assertTrue(self.rules.is_turn(first))
+        self.engine.tick()
+        # timed out
+        self.assertTrue(self.rules.is_turn(second))
+        self.assertEqual(fight.lastaction[0], "disengage")
+
+    def test_benchmark(self):
+        results = benchmark.run(nfights=2, nrounds=2, verbose=False)
+        self.assertEqual(set(results), {"script", "engine"})
+        self.assertEqual(len(results["engine"]), 4)
+        self.assertFalse(self.engine.fights)
@@ -167,3 +167,70 @@ class TestWilderness(BaseEvenniaTest):
         self.assertEqual(2, len(w.db.rooms))
         # and verify that obj1 is still at 1,1
         self.assertEqual(self.obj1.location, w.db.rooms[(1, 1)])
+
+    def test_chunked_coordinates(self):
+        wilderness.create_wilderness()
+        w = self.get_wilderness_script()
+        w.chunk_size = 4
+
+        wilderness.enter_wilderness(self.char1, coordinates=(1, 1))
+        wilderness.enter_wilderness(self.char2, coordinates=(5, 1))
+        wilderness.enter_wilderness(self.obj1, coordinates=(5, 1))
+        coordinates = w.itemcoordinates
+        self.assertEqual(coordinates.get_chunk((5, 1)), (1, 0))
+        self.assertEqual(w.attributes.get("0,0", category="wilderness_chunk"), {self.char1: (1, 1)})
+        self.assertEqual(
+            w.attributes.get("1,0", category="wilderness_chunk"),
+            {self.char2: (5, 1), self.obj1: (5, 1)},
+        )
+        self.assertCountEqual(w.get_objs_at_coordinates((5, 1)), [self.char2, self.obj1])
+        self.assertCountEqual(
+            w.get_objs_near((3, 1), distance=2), [self.char1, self.char2, self.obj1]
+        )
+        self.assertEqual(w.get_objs_near((3, 1), distance=1), [])
+
+        # moving to another chunk only saves the chunks involved
+        w.move_obj(self.char1, (4, 2))
+        self.assertFalse(w.attributes.has("0,0", category="wilderness_chunk"))
+        self.assertEqual(len(w.attributes.get("1,0", category="wilderness_chunk")), 3)
+
+        # reloading the coordinates from the database, with another chunk size
+        w.chunk_size = 2
+        w.itemcoordinates.reload()
+        self.assertEqual(w.itemcoordinates[self.char1], (4, 2))
+        self.assertEqual(w.attributes.get("2,1", category="wilderness_chunk"), {self.char1: (4, 2)})
+        self.assertFalse(w.attributes.has("1,0", category="wilderness_chunk"))
+
+    def test_legacy_itemcoordinates(self):
+        wilderness.create_wilderness()
+        w = self.get_wilderness_script()
+        w.db.itemcoordinates = {self.obj1: (3, 4)}
+        w.itemcoordinates.reload()
+        self.assertEqual(w.get_objs_at_coordinates((3, 4)), [self.obj1])
+        self.assertFalse(w.attributes.has("itemcoordinates"))
+        self.assertTrue(w.attributes.has("0,0", category="wilderness_chunk"))
+
+    def test_room_pool(self):
+        self.char1.sessions.add(1)
+        self.char2.sessions.add(1)
+        wilderness.create_wilderness(room_pool_size=2)
+        w = self.get_wilderness_script()
+        self.assertEqual(len(w.db.unused_rooms), 2)
+        pooled = list(w.db.unused_rooms)
+
+        w.move_obj(self.char1, (0, 0))
+        w.move_obj(self.char2, (1, 1))
+        self.assertEqual(len(w.db.unused_rooms), 0)
+        self.assertCountEqual(w.db.rooms.values(), pooled)
+
+        # a lone mover keeps its room
+        room = self.char1.location
+        w.move_obj(self.char1, (0, 1))
+        self.assertEqual(self.char1.location, room)
+        self.assertEqual(w.db.rooms, {(0, 1): room, (1, 1): self.char2.location})
+
+        # storage is full - the room is deleted instead
+        w.room_pool_max = 0
+        w.move_obj(self.char2, (0, 1))
+        self.assertEqual(len(w.db.unused_rooms), 0)
+        self.assertEqual(len(w.db.rooms), 1)
@@ -119,10 +119,21 @@ create a new wilderness (with the name "default") but using our new map provider
     separate rooms.
 
     Rooms are created as needed. Unneeded rooms are stored away to avoid the
-    overhead cost of creating new rooms again in the future.
+    overhead cost of creating new rooms again in the future. Set `room_pool_size`
+    on the wilderness script to keep a number of rooms created ahead of time, and
+    `room_pool_max` to limit how many unneeded rooms are kept around.
+
+    The coordinates of every object in the wilderness are bucketed into square
+    chunks of the map (`chunk_size` coordinates wide). Each chunk is saved as a
+    separate Attribute on the wilderness script, so moving an object only needs
+    to save the chunks it moved between, and finding the objects at (or near)
+    some coordinates only needs to look at the chunks around them.
 
 """
 
+from collections import defaultdict
+from collections.abc import MutableMapping
+
 from evennia import (
     DefaultExit,
     DefaultRoom,
@@ -132,9 +143,10 @@ from evennia import (
 )
 from evennia.typeclasses.attributes import AttributeProperty
 from evennia.utils import inherits_from
+from evennia.utils.utils import lazy_property
 
 
-def create_wilderness(name="default", mapprovider=None, preserve_items=False):
+def create_wilderness(name="default", mapprovider=None, preserve_items=False, room_pool_size=0):
     """
     Creates a new wilderness map. Does nothing if a wilderness map already
     exists with the same name.
@@ -145,6 +157,10 @@ def create_wilderness(name="default", mapprovider=None, preserve_items=False):
             WildernessMap class (or subclass) that will be used to provide the
             layout of this wilderness map. If none is provided, the default
             infinite grid map will be used.
+        preserve_items (bool, optional): If rooms with non-player objects left in
+            them should be kept instead of recycled.
+        room_pool_size (int, optional): How many rooms to create ahead of time, so
+            they are ready to use when objects move around the wilderness.
 
     """
     if WildernessScript.objects.filter(db_key=name).exists():
@@ -157,6 +173,9 @@ def create_wilderness(name="default", mapprovider=None, preserve_items=False):
     script.db.mapprovider = mapprovider
     if preserve_items:
         script.preserve_items = True
+    if room_pool_size:
+        script.room_pool_size = room_pool_size
+        script.warm_room_pool()
 
 
 def enter_wilderness(obj, coordinates=(0, 0), name="default"):
@@ -212,6 +231,173 @@ def get_new_coordinates(coordinates, direction):
     return (x, y)
 
 
+class WildernessCoordinates(MutableMapping):
+    """
+    The coordinates of every object inside a wilderness, used like a dict
+    `{obj: (x, y)}`. Internally the objects are bucketed into square chunks of
+    the map, each saved as its own Attribute on the wilderness script, so a
+    change only needs to save the chunks involved.
+
+    """
+
+    attribute_category = "wilderness_chunk"
+
+    def __init__(self, script):
+        """
+        Load the coordinates from the wilderness script.
+
+        Args:
+            script (WildernessScript): The wilderness storing the coordinates.
+
+        """
+        self.script = script
+        self.reload()
+
+    def reload(self):
+        """
+        Read all chunks from the database. Chunks with deleted objects, chunks saved
+        with another `chunk_size`, or coordinates stored the old way (all in one
+        `itemcoordinates` Attribute) are re-saved as needed.
+
+        """
+        self.chunk_size = max(1, int(self.script.chunk_size))
+        # {obj: (x, y)}
+        self._coordinates = {}
+        # {(cx, cy): {obj: (x, y)}}
+        self._chunks = defaultdict(dict)
+
+        attributes = self.script.attributes
+        dirty = set()
+        for attr in attributes.all(category=self.attribute_category):
+            for obj, coordinates in attr.value.items():
+                if obj is None:
+                    # items deleted while in the wilderness leave None-type 'ghosts'
+                    dirty.add(attr.key)
+                    continue
+                chunk = self._add(obj, tuple(coordinates))
+                if self._chunk_key(chunk) != attr.key:
+                    dirty.update((attr.key, self._chunk_key(chunk)))
+
+        if attributes.has("itemcoordinates"):
+            for obj, coordinates in (attributes.get("itemcoordinates") or {}).items():
+                if obj is not None:
+                    dirty.add(self._chunk_key(self._add(obj, tuple(coordinates))))
+            attributes.remove("itemcoordinates")
+
+        for key in dirty:
+            self._save_chunk(tuple(int(part) for part in key.split(",")))
+
+    def get_chunk(self, coordinates):
+        """
+        Get which chunk some coordinates belong to.
+
+        Args:
+            coordinates (tuple): A coordinate tuple like (x, y).
+
+        Returns:
+            tuple: The (cx, cy) of the chunk.
+
+        """
+        x, y = coordinates
+        return (x // self.chunk_size, y // self.chunk_size)
+
+    def _chunk_key(self, chunk):
+        return f"{chunk[0]},{chunk[1]}"
+
+    def _add(self, obj, coordinates):
+        chunk = self.get_chunk(coordinates)
+        self._coordinates[obj] = coordinates
+        self._chunks[chunk][obj] = coordinates
+        return chunk
+
+    def _remove(self, obj):
+        chunk = self.get_chunk(self._coordinates.pop(obj))
+        items = self._chunks[chunk]
+        items.pop(obj, None)
+        if not items:
+            del self._chunks[chunk]
+        return chunk
+
+    def _save_chunk(self, chunk):
+        """
+        Save a single chunk to the database, or remove it if it's empty.
+
+        """
+        key = self._chunk_key(chunk)
+        items = self._chunks.get(chunk)
+        if items:
+            self.script.attributes.add(key, dict(items), category=self.attribute_category)
+        else:
+            self.script.attributes.remove(key, category=self.attribute_category)
+
+    def __getitem__(self, obj):
+        return self._coordinates[obj]
+
+    def __setitem__(self, obj, coordinates):
+        coordinates = tuple(coordinates)
+        old_coordinates = self._coordinates.get(obj)
+        if old_coordinates == coordinates:
+            return
+        old_chunk = self._remove(obj) if old_coordinates is not None else None
+        chunk = self._add(obj, coordinates)
+        self._save_chunk(chunk)
+        if old_chunk is not None and old_chunk != chunk:
+            self._save_chunk(old_chunk)
+
+    def __delitem__(self, obj):
+        self._save_chunk(self._remove(obj))
+
+    def __iter__(self):
+        return iter(list(self._coordinates))
+
+    def __len__(self):
+        return len(self._coordinates)
+
+    def __contains__(self, obj):
+        return obj in self._coordinates
+
+    def get_objs_at(self, coordinates):
+        """
+        Get all objects at some coordinates.
+
+        Args:
+            coordinates (tuple): A coordinate tuple like (x, y).
+
+        Returns:
+            list: The objects at these coordinates.
+
+        """
+        coordinates = tuple(coordinates)
+        return [
+            obj
+            for obj, obj_coordinates in self._chunks.get(self.get_chunk(coordinates), {}).items()
+            if obj_coordinates == coordinates
+        ]
+
+    def get_objs_near(self, coordinates, distance):
+        """
+        Get all objects within a square area around some coordinates.
+
+        Args:
+            coordinates (tuple): A coordinate tuple like (x, y) at the center.
+            distance (int): How many steps away in x and y to look.
+
+        Returns:
+            list: The objects in the area.
+
+        """
+        x, y = coordinates
+        cxmin, cymin = self.get_chunk((x - distance, y - distance))
+        cxmax, cymax = self.get_chunk((x + distance, y + distance))
+        found = []
+        for cx in range(cxmin, cxmax + 1):
+            for cy in range(cymin, cymax + 1):
+                for obj, (ox, oy) in self._chunks.get((cx, cy), {}).items():
+                    if abs(ox - x) <= distance and abs(oy - y) <= distance:
+                        found.append(obj)
+        return found
+
+
 class WildernessScript(DefaultScript):
     """
     This is the main "handler" for the wilderness system: inside here the
@@ -223,15 +409,30 @@ class WildernessScript(DefaultScript):
     # Stores the MapProvider class
     mapprovider = AttributeProperty()
 
-    # Stores a dictionary of items on the map with their coordinates
-    # The key is the item, the value are the coordinates as (x, y) tuple.
-    itemcoordinates = AttributeProperty()
-
     # Determines whether or not rooms are recycled despite containing non-player objects
     # True means that leaving behind a non-player object will prevent the room from being recycled
     # in order to preserve the object
     preserve_items = AttributeProperty(default=False)
 
+    # How many coordinates wide each chunk of the map is. The objects in each chunk are
+    # saved together. The chunks are rebuilt if this changes.
+    chunk_size = AttributeProperty(default=16)
+
+    # How many unused rooms to create ahead of time (see `warm_room_pool`).
+    room_pool_size = AttributeProperty(default=0)
+
+    # Max number of unused rooms to keep in storage - any more are deleted. None for no limit.
+    room_pool_max = AttributeProperty(default=None)
+
+    @lazy_property
+    def itemcoordinates(self):
+        """
+        The coordinates of every item inside the wilderness, used like a dict with the
+        items as keys and their coordinates as (x, y) tuples as values.
+
+        """
+        return WildernessCoordinates(self)
+
     def at_script_creation(self):
         """
         Only called once, when the script is created. This is a default Evennia
@@ -239,10 +440,6 @@ class WildernessScript(DefaultScript):
         """
         self.persistent = True
 
-        # Store the coordinates of every item that is inside the wilderness
-        # Key: object, Value: (x, y)
-        self.db.itemcoordinates = {}
-
         # Store the rooms that are used as views into the wilderness
         # Key: (x, y), Value: room object
         self.db.rooms = {}
@@ -259,13 +456,9 @@ class WildernessScript(DefaultScript):
         for coordinates, room in self.db.rooms.items():
             room.ndb.wildernessscript = self
             room.ndb.active_coordinates = coordinates
-        for item in self.db.itemcoordinates.keys():
-            # Items deleted while in the wilderness can leave None-type 'ghosts'
-            # These need to be cleaned up
-            if item is None:
-                del self.db.itemcoordinates[item]
-                continue
+        for item in self.itemcoordinates:
             item.ndb.wilderness = self
+        self.warm_room_pool()
 
     def is_valid_coordinates(self, coordinates):
         """
@@ -298,22 +491,27 @@ class WildernessScript(DefaultScript):
         """
         Returns a list of every object at certain coordinates.
 
-        Imeplementation detail: this uses a naive iteration through every
-        object inside the wilderness which could cause slow downs when there
-        are a lot of objects in the map.
-
         Args:
             coordinates (tuple): a coordinate tuple like (x, y)
 
         Returns:
             [Object, ]: list of Objects at coordinates
         """
-        result = [
-            item
-            for item, item_coords in self.itemcoordinates.items()
-            if item_coords == coordinates and item is not None
-        ]
-        return list(result)
+        return self.itemcoordinates.get_objs_at(coordinates)
+
+    def get_objs_near(self, coordinates, distance=1):
+        """
+        Returns a list of every object within a square area around certain
+        coordinates.
+
+        Args:
+            coordinates (tuple): a coordinate tuple like (x, y)
+            distance (int, optional): how many steps away in x and y to look
+
+        Returns:
+            [Object, ]: list of Objects in the area
+        """
+        return self.itemcoordinates.get_objs_near(coordinates, distance)
 
     def move_obj(self, obj, new_coordinates):
         """
@@ -345,8 +543,14 @@ class WildernessScript(DefaultScript):
 
         if not from_outside:
             # the old room is in the same wilderness
-            # free up the old room if it's no longer needed
-            self._destroy_room(old_room)
+            if not room and self._can_recycle_room(old_room):
+                # nobody else needs the old room - just show the new coordinates in it
+                # instead of putting it into storage and getting it back out again
+                room = old_room
+                room.set_active_coordinates(new_coordinates, obj)
+            else:
+                # free up the old room if it's no longer needed
+                self._destroy_room(old_room)
 
         if not room:
             # we need claim a new room
@@ -377,63 +581,103 @@ class WildernessScript(DefaultScript):
             room = self.db.unused_rooms.pop()
         else:
             # No more unused rooms...time to make a new one.
-
-            # First, create the room
-            room = create_object(
-                typeclass=self.mapprovider.room_typeclass, key="Wilderness", report_to=report_to
-            )
-
-            # Then the exits
-            exits = [
-                ("north", "n"),
-                ("northeast", "ne"),
-                ("east", "e"),
-                ("southeast", "se"),
-                ("south", "s"),
-                ("southwest", "sw"),
-                ("west", "w"),
-                ("northwest", "nw"),
-            ]
-            for key, alias in exits:
-                create_object(
-                    typeclass=self.mapprovider.exit_typeclass,
-                    key=key,
-                    aliases=[alias],
-                    location=room,
-                    destination=room,
-                    report_to=report_to,
-                )
+            room = self._new_room(report_to)
         room.ndb.wildernessscript = self
         room.set_active_coordinates(coordinates, report_to)
 
         return room
 
-    def _destroy_room(self, room):
+    def _new_room(self, report_to=None):
         """
-        Moves a room back to storage. If room is not a WildernessRoom or there
-        is something left inside the room, then this does nothing.
+        Creates a new WildernessRoom with all its exits.
 
-        Implementation note: If `preserve_items` is False (the default) then any
-        objects left in the rooms will be moved to None. You may want to implement
-        your own cleanup or recycling routine for these objects.
+        Args:
+            report_to (object, optional): the obj to return error messages to
+
+        Returns:
+            WildernessRoom: the new room
+        """
+        # First, create the room
+        room = create_object(
+            typeclass=self.mapprovider.room_typeclass, key="Wilderness", report_to=report_to
+        )
+
+        # Then the exits
+        exits = [
+            ("north", "n"),
+            ("northeast", "ne"),
+            ("east", "e"),
+            ("southeast", "se"),
+            ("south", "s"),
+            ("southwest", "sw"),
+            ("west", "w"),
+            ("northwest", "nw"),
+        ]
+        for key, alias in exits:
+            create_object(
+                typeclass=self.mapprovider.exit_typeclass,
+                key=key,
+                aliases=[alias],
+                location=room,
+                destination=room,
+                report_to=report_to,
+            )
+        return room
+
+    def warm_room_pool(self):
+        """
+        Creates new rooms until there are at least `room_pool_size` unused rooms
+        in storage, ready to be used. Called when the wilderness is created and
+        when the server starts.
+        """
+        missing = (self.room_pool_size or 0) - len(self.db.unused_rooms or [])
+        if missing > 0 and self.mapprovider:
+            newrooms = [self._new_room() for _ in range(missing)]
+            self.db.unused_rooms = list(self.db.unused_rooms or []) + newrooms
+
+    def _can_recycle_room(self, room):
+        """
+        Checks if a room can be put back into storage.
 
         Args:
-            room (WildernessRoom): the room to put in storage
+            room (WildernessRoom): the room to check
+
+        Returns:
+            bool: True if the room is not needed anymore
         """
         if not room or not inherits_from(room, WildernessRoom):
-            return
+            return False
 
         # Check the contents of the room before recycling
         for item in room.contents:
             if item.has_account:
                 # There is still a player in this room, we can't delete it yet.
-                return
+                return False
 
             if not (item.destination and item.destination == room):
                 # There is still a non-exit object in the room. Should we preserve it?
                 if self.preserve_items:
                     # Yes, so we can't get rid of the room just yet
-                    return
+                    return False
+        return True
+
+    def _destroy_room(self, room):
+        """
+        Moves a room back to storage. If room is not a WildernessRoom or there
+        is something left inside the room, then this does nothing.
+
+        Implementation note: If `preserve_items` is False (the default) then any
+        objects left in the rooms will be moved to None. You may want to implement
+        your own cleanup or recycling routine for these objects.
+
+        If there are already `room_pool_max` rooms in storage, the room is
+        deleted instead.
+
+        Args:
+            room (WildernessRoom): the room to put in storage
+        """
+        if not self._can_recycle_room(room):
+            return
 
         # If we get here, the room can be recycled
         # Clear the location of any objects left in that room first
@@ -447,6 +691,10 @@ class WildernessScript(DefaultScript):
         del self.db.rooms[room.ndb.active_coordinates]
         # ...on both sides
         del room.ndb.active_coordinates
+        if self.room_pool_max is not None and len(self.db.unused_rooms) >= self.room_pool_max:
+            # Storage is full, so get rid of the room (and its exits)
+            room.delete()
+            return
         # And finally put this room away in storage
         self.db.unused_rooms.append(room)
 
@@ -458,7 +706,7 @@ class WildernessScript(DefaultScript):
             obj (object): the object that left
         """
         # Try removing the object from the coordinates system
-        if loc := self.db.itemcoordinates.pop(obj, None):
+        if loc := self.itemcoordinates.pop(obj, None):
             # The object was removed successfully
             # Make sure there was a room at that location
             if room := self.db.rooms.get(loc):
@@ -697,7 +945,7 @@ class WildernessExit(DefaultExit):
             bool: True if the traverse is allowed to happen
 
         """
-        itemcoordinates = self.location.wilderness.db.itemcoordinates
+        itemcoordinates = self.location.wilderness.itemcoordinates
 
         current_coordinates = itemcoordinates[traversing_object]
         new_coordinates = get_new_coordinates(current_coordinates, self.key)
@@ -8,6 +8,8 @@ from random import randint
 from unittest import mock
 
 from django.test import TestCase
+from evennia.server.models import ServerConfig
+from evennia.utils.create import create_object
 from evennia.utils.test_resources import BaseEvenniaCommandTest, BaseEvenniaTest
 from parameterized import parameterized
 
@@ -509,6 +511,33 @@ class TestMap1(_MapTest):
         mapstr = self.map.get_visual_range(coord, dist=dist, mode="nodes", character="@")
         self.assertEqual(expected, mapstr.replace("||", "|"))
 
+    def test_get_visual_range__cache(self):
+        """
+        Rendered windows are cached and shared, without leaking the markers.
+
+        """
+        mapstr = self.map.get_visual_range((0, 0), dist=2, mode="nodes", character="@")
+        self.assertIs(
+            mapstr, self.map.get_visual_range((0, 0), dist=2, mode="nodes", character="@")
+        )
+        self.assertEqual(
+            "#-#\n| |\n#-#",
+            self.map.get_visual_range((0, 0), dist=2, mode="nodes", character=None).replace(
+                "||", "|"
+            ),
+        )
+        maplst = self.map.get_visual_range(
+            (0, 0), dist=2, mode="nodes", character="@", return_str=False
+        )
+        maplst[0][0] = "X"
+        self.assertEqual(mapstr, self.map.get_visual_range((0, 0), dist=2, mode="nodes"))
+        # the whole map is not modified by the marker either
+        self.map.get_visual_range((1, 1), dist=None, character="@")
+        self.assertNotIn("@", str(self.map))
+
+        self.map.parse()
+        self.assertFalse(self.map.visual_range_cache)
+
     def test_spawn(self):
         """
         Spawn the map into actual objects.
@@ -1335,6 +1364,42 @@ class TestMapStressTest(TestCase):
         #     print(f"Visual Range calculation for ({Xmax}x{Ymax}) grid "
         #           f"slower than expected {max_time}s.")
 
+    def test_grid_pathfind_ondemand(self):
+        """
+        Test that the on-demand pathfinder gives the same results as the all-pairs one.
+
+        """
+        Xmax, Ymax = 10, 10
+        grid = self._get_grid(Xmax, Ymax)
+        allpairs = xymap.XYMap({"map": grid}, Z="testmap")
+        allpairs.parse()
+        allpairs.calculate_path_matrix()
+
+        ondemand = xymap.XYMap({"map": grid}, Z="testmap")
+        ondemand.pathfinding_engine = "ondemand"
+        ondemand.pathfinding_cache_size = 5
+        ondemand.parse()
+        ondemand.calculate_path_matrix(force=True)
+        self.assertIsNone(ondemand.dist_matrix)
+
+        for _ in range(10):
+            startcoord = (randint(0, Xmax), randint(0, Ymax))
+            endcoord = (randint(0, Xmax), randint(0, Ymax))
+            # there can be several equally short paths, so only compare lengths
+            self.assertEqual(
+                len(allpairs.get_shortest_path(startcoord, endcoord)[0]),
+                len(ondemand.get_shortest_path(startcoord, endcoord)[0]),
+            )
+        self.assertLessEqual(len(ondemand.pathfinding_trees), 5)
+
+        # re-load the graph from the memory-mapped cache
+        ondemand.calculate_path_matrix()
+        self.assertEqual(ondemand.pathfinding_trees, {})
+        self.assertEqual(
+            len(allpairs.get_shortest_path((0, 0), (Xmax, Ymax))[0]),
+            len(ondemand.get_shortest_path((0, 0), (Xmax, Ymax))[0]),
+        )
+
 
 class TestXYZGrid(BaseEvenniaTest):
     """
@@ -1370,6 +1435,81 @@ class TestXYZGrid(BaseEvenniaTest):
         self.assertEqual(xyzroom.XYZRoom.objects.all().count(), 4)
         self.assertEqual(xyzroom.XYZExit.objects.all().count(), 8)
 
+    def test_coordinate_index(self):
+        """Look up spawned rooms/exits via the coordinate index"""
+        self.grid.spawn()
+        xyzroom.XYZ_INDEX.clear()
+
+        room = xyzroom.XYZRoom.objects.get_xyz(xyz=(1, 1, "MAP1"))
+        self.assertEqual(room.xyz, (1, 1, "map1"))
+        self.assertTrue(xyzroom.XYZ_INDEX.built)
+        self.assertEqual(xyzroom.XYZRoom.objects.filter_xyz(xyz=("*", 1, "map1")).count(), 2)
+        self.assertEqual(
+            xyzroom.XYZExit.objects.filter_xyz_exit(
+                xyz=(0, 0, "map1"), xyz_destination=("*", "*", "map1")
+            ).count(),
+            2,
+        )
+        exi = xyzroom.XYZExit.objects.get_xyz_exit(
+            xyz=(0, 0, "map1"), xyz_destination=(1, 0, "map1")
+        )
+        self.assertEqual(exi.destination.xyz, (1, 0, "map1"))
+        self.assertEqual(
+            set(xyzroom.XYZRoom.objects.filter_xyz_range((0, 0), (0, 1), "map1")),
+            {
+                xyzroom.XYZRoom.objects.get_xyz(xyz=(0, 0, "map1")),
+                xyzroom.XYZRoom.objects.get_xyz(xyz=(0, 1, "map1")),
+            },
+        )
+
+        # create/delete are tracked
+        newroom, _ = xyzroom.XYZRoom.create("New room", xyz=(5, 5, "map1"))
+        self.assertEqual(xyzroom.XYZRoom.objects.get_xyz(xyz=(5, 5, "map1")), newroom)
+        self.assertEqual(
+            xyzroom.XYZRoom.objects.filter_xyz_range((4, 6), (4, 6), "map1").count(), 1
+        )
+        newroom.delete()
+        self.assertFalse(xyzroom.XYZRoom.objects.filter_xyz(xyz=(5, 5, "map1")).exists())
+        newroom, _ = xyzroom.XYZRoom.create("New room", xyz=(6, 6, "map1"))
+        xyzroom.XYZRoom.objects.filter_xyz(xyz=(6, 6, "map1")).delete()
+        self.assertNotIn(newroom.id, xyzroom.XYZ_INDEX.find(xyz=("*", "*", "map1")))
+
+        # so are coordinate-tags added or removed in other ways
+        tagroom = create_object(xyzroom.XYZRoom, key="Tag room")
+        tagroom.tags.add("7", category=xyzroom.MAP_X_TAG_CATEGORY)
+        tagroom.tags.add("7", category=xyzroom.MAP_Y_TAG_CATEGORY)
+        self.assertNotIn(tagroom.id, xyzroom.XYZ_INDEX.find(xyz=("*", "*", "map1")))
+        tagroom.tags.add("map1", category=xyzroom.MAP_Z_TAG_CATEGORY)
+        self.assertEqual(xyzroom.XYZ_INDEX.find(xyz=(7, 7, "map1")), {tagroom.id})
+        self.assertIn(tagroom, xyzroom.XYZRoom.objects.filter_xyz(xyz=("*", 7, "map1")))
+        tagroom.tags.remove("7", category=xyzroom.MAP_Y_TAG_CATEGORY)
+        tagroom.tags.add("8", category=xyzroom.MAP_Y_TAG_CATEGORY)
+        self.assertEqual(xyzroom.XYZRoom.objects.get_xyz(xyz=(7, 8, "map1")), tagroom)
+        self.assertFalse(xyzroom.XYZ_INDEX.find(xyz=(7, 7, "map1")))
+        tagroom.tags.clear()
+        self.assertNotIn(tagroom.id, xyzroom.XYZ_INDEX.find(xyz=("*", "*", "map1")))
+
+        # a room the index missed is still found in the database
+        tagroom.tags.batch_add(
+            ("9", xyzroom.MAP_X_TAG_CATEGORY),
+            ("9", xyzroom.MAP_Y_TAG_CATEGORY),
+            ("map1", xyzroom.MAP_Z_TAG_CATEGORY),
+        )
+        xyzroom.XYZ_INDEX.remove(tagroom.id)
+        self.assertEqual(xyzroom.XYZRoom.objects.get_xyz(xyz=(9, 9, "map1")), tagroom)
+
+        # deleting other kinds of entities with the same id as a room doesn't affect it
+        nrooms = xyzroom.XYZRoom.objects.filter_xyz(xyz=("*", "*", "map1")).count()
+        used_ids = set(ServerConfig.objects.values_list("id", flat=True))
+        room = next(
+            room
+            for room in xyzroom.XYZRoom.objects.filter_xyz(xyz=("*", "*", "map1"))
+            if room.id not in used_ids
+        )
+        ServerConfig.objects.create(id=room.id, db_key="xyz_collision").delete()
+        self.assertEqual(xyzroom.XYZRoom.objects.filter_xyz(xyz=("*", "*", "map1")).count(), nrooms)
+        self.assertIn(room.id, xyzroom.XYZ_INDEX.find(xyz=("*", "*", "map1")))
+
 
 # map transitions
 class Map12aTransition(xymap_legend.TransitionMapNode):
@@ -94,13 +94,14 @@ See `./example.py` for a full grid example.
 """
 
 import pickle
-from collections import defaultdict
-from os import mkdir
+import zlib
+from collections import OrderedDict, defaultdict
+from os import mkdir, replace
 from os.path import isdir, isfile
 from os.path import join as pathjoin
 
 try:
-    from numpy import zeros
+    from numpy import array, float64, load, save, zeros
     from scipy.sparse import csr_matrix
     from scipy.sparse.csgraph import dijkstra
 except ImportError as err:
@@ -122,6 +123,12 @@ _NO_DB_PROTOTYPES = True
 if hasattr(settings, "XYZGRID_USE_DB_PROTOTYPES"):
     _NO_DB_PROTOTYPES = not settings.XYZGRID_USE_DB_PROTOTYPES
 
+# 'allpairs' solves and caches the shortest paths between all nodes up front. This
+# is fast to query but needs memory/disk space growing with the square of the
+# number of nodes. 'ondemand' only stores the (sparse) link-graph and solves paths
+# from each start-node when needed, caching the most recently used solutions.
+_PATHFINDING_ENGINE = getattr(settings, "XYZGRID_PATHFINDING_ENGINE", "allpairs")
+
 _CACHE_DIR = settings.CACHE_DIR
 _LOADED_PROTOTYPES = None
 _XYZROOMCLASS = None
@@ -177,6 +184,12 @@ class XYMap:
 
     mapcorner_symbol = "+"
     max_pathfinding_length = 500
+    # 'allpairs' or 'ondemand', see `calculate_path_matrix`
+    pathfinding_engine = _PATHFINDING_ENGINE
+    # how many start-node solutions the 'ondemand' pathfinder keeps in memory
+    pathfinding_cache_size = 100
+    # how many visual-range windows/rendered map-displays to keep in memory
+    visual_range_cache_size = 500
     empty_symbol = " "
     # we normally only accept one single character for the legend key
     legend_key_exceptions = "\\"
@@ -246,12 +259,19 @@ class XYMap:
         self.node_index_map = None
         self.dist_matrix = None
         self.pathfinding_routes = None
+        # on-demand pathfinding variables
+        self.pathfinding_graph = None
+        self.pathfinding_trees = OrderedDict()
+        # visual-range windows and rendered map-displays
+        self.visual_range_cache = OrderedDict()
 
         self.pathfinder_baked_filename = None
+        self.pathfinder_graph_filename = None
         if Z:
             if not isdir(_CACHE_DIR):
                 mkdir(_CACHE_DIR)
             self.pathfinder_baked_filename = pathjoin(_CACHE_DIR, f"{Z}.P")
+            self.pathfinder_graph_filename = pathjoin(_CACHE_DIR, f"{Z}.graph.npy")
 
         # load data and parse it
         self.reload()
@@ -541,6 +561,7 @@ class XYMap:
 
         # store
         self.display_map = display_map
+        self.visual_range_cache.clear()
 
     def _get_topology_around_coord(self, xy, dist=2):
         """
@@ -605,7 +626,16 @@ class XYMap:
         Args:
             force (bool, optional): If the cache should always be rebuilt.
 
+        Notes:
+            With the 'allpairs' `pathfinding_engine`, the shortest paths between
+            all nodes are solved here. With 'ondemand', this only prepares the
+            link-graph and paths are solved by `get_shortest_path` as needed.
+
         """
+        if self.pathfinding_engine == "ondemand":
+            self.calculate_path_graph(force=force)
+            return
+
         if not force and self.pathfinder_baked_filename and isfile(self.pathfinder_baked_filename):
             # check if the solution for this grid was already solved previously.
 
@@ -651,6 +681,90 @@ class XYMap:
                     (self.mapstring, self.dist_matrix, self.pathfinding_routes), fil, protocol=4
                 )
 
+    def calculate_path_graph(self, force=False):
+        """
+        Build the sparse link-graph used by the 'ondemand' pathfinding engine,
+        directly from the links of each node. The graph is cached to disk as a
+        flat array of `(from_node, to_node, weight)` rows that is memory-mapped
+        when loaded again. The first row holds `(nnodes, nlinks, checksum)`,
+        used to check the cache is still valid for this map.
+
+        Args:
+            force (bool, optional): If the cache should always be rebuilt.
+
+        """
+        self.pathfinding_trees = OrderedDict()
+        nnodes = len(self.node_index_map)
+        checksum = zlib.crc32(self.mapstring.encode("utf-8"))
+        filename = self.pathfinder_graph_filename
+
+        edges = None
+        if not force and filename and isfile(filename):
+            try:
+                edges = load(filename, mmap_mode="r")
+            except Exception:
+                logger.log_trace()
+            else:
+                if (
+                    edges.ndim != 2
+                    or not len(edges)
+                    or tuple(edges[0]) != (nnodes, len(edges) - 1, checksum)
+                ):
+                    # this is for an old version of the map
+                    edges = None
+
+        if edges is None:
+            rows = [(nnodes, 0, checksum)]
+            for inode, node in self.node_index_map.items():
+                rows.extend((inode, inext, weight) for inext, weight in node.weights.items())
+            rows[0] = (nnodes, len(rows) - 1, checksum)
+            edges = array(rows, dtype=float64)
+            if filename:
+                # write to a temp-file first, to not corrupt a mem-mapped old version
+                tmpname = filename[:-4] + ".tmp.npy"
+                save(tmpname, edges)
+                replace(tmpname, filename)
+
+        self.pathfinding_graph = csr_matrix(
+            (edges[1:, 2], (edges[1:, 0].astype(int), edges[1:, 1].astype(int))),
+            shape=(nnodes, nnodes),
+        )
+
+    def _get_pathfinding_tree(self, istartnode):
+        """
+        Get the shortest-path tree from a start node to all other nodes, as used
+        by the 'ondemand' pathfinding engine. The most recently used trees are
+        cached.
+
+        Args:
+            istartnode (int): The node-index to start from.
+
+        Returns:
+            numpy.ndarray: An array of predecessors, where the element at each node-index
+                is the index of the previous node on the shortest path from the start
+                node, or -9999 if there is no path.
+
+        """
+        trees = self.pathfinding_trees
+        if istartnode in trees:
+            trees.move_to_end(istartnode)
+            return trees[istartnode]
+
+        if self.pathfinding_graph is None:
+            self.calculate_path_graph()
+
+        _, predecessors = dijkstra(
+            self.pathfinding_graph,
+            directed=True,
+            indices=istartnode,
+            return_predecessors=True,
+            limit=self.max_pathfinding_length,
+        )
+        trees[istartnode] = predecessors
+        if len(trees) > self.pathfinding_cache_size:
+            trees.popitem(last=False)
+        return predecessors
+
     def spawn_nodes(self, xy=("*", "*")):
         """
         Convert the nodes of this XYMap into actual in-world rooms by spawning their
@@ -798,20 +912,23 @@ class XYMap:
                 f"{endnode}. They must both be MapNodes (not Links)"
             )
 
-        if self.pathfinding_routes is None:
-            self.calculate_path_matrix()
+        if self.pathfinding_engine == "ondemand":
+            predecessors = self._get_pathfinding_tree(istartnode)
+        else:
+            if self.pathfinding_routes is None:
+                self.calculate_path_matrix()
+            predecessors = self.pathfinding_routes[istartnode]
 
-        pathfinding_routes = self.pathfinding_routes
         node_index_map = self.node_index_map
 
         path = [endnode]
         directions = []
 
-        while pathfinding_routes[istartnode, inextnode] != -9999:
+        while predecessors[inextnode] != -9999:
             # the -9999 is set by algorithm for unreachable nodes or if trying
             # to go a node we are already at (the start node in this case since
             # we are working backwards).
-            inextnode = pathfinding_routes[istartnode, inextnode]
+            inextnode = predecessors[inextnode]
             nextnode = node_index_map[inextnode]
             shortest_route_to = nextnode.shortest_route_to_node[path[-1].node_index]
 
@@ -905,6 +1022,77 @@ class XYMap:
                 | |
                 # @-#
 
+            The visible window around each coordinate is cached, as is the rendered
+            display when no `target` is given, so everyone looking from the same spot
+            shares the same result. Only the `character` and path-markers are added
+            on top of the cached window.
+
+        """
+        iX, iY = xy
+        window = self._get_cached_visual_range(
+            ("window", iX, iY, dist, mode), lambda: self._get_visual_window(xy, dist, mode)
+        )
+        if window is None:
+            # There is no node at these coordinates. Show
+            # nothing but ourselves or emptiness
+            return character if character else self.empty_symbol
+
+        if target or not return_str:
+            return self._render_visual_range(
+                window,
+                xy,
+                dist,
+                mode,
+                character,
+                target,
+                target_path_style,
+                max_size,
+                indent,
+                return_str,
+            )
+
+        # without a path to mark, everyone looking from the same spot sees the same display
+        return self._get_cached_visual_range(
+            ("str", iX, iY, dist, mode, character, max_size and tuple(max_size), indent),
+            lambda: self._render_visual_range(
+                window, xy, dist, mode, character, None, None, max_size, indent, True
+            ),
+        )
+
+    def _get_cached_visual_range(self, key, create):
+        """
+        Get a visual-range window or rendered display from the cache, creating it
+        if needed. The most recently used items are kept.
+
+        Args:
+            key (tuple): The cache-key.
+            create (callable): Called without arguments to create the item if it
+                is not in the cache.
+
+        Returns:
+            any: The cached item.
+
+        """
+        cache = self.visual_range_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        cache[key] = item = create()
+        if len(cache) > self.visual_range_cache_size:
+            cache.popitem(last=False)
+        return item
+
+    def _get_visual_window(self, xy, dist, mode):
+        """
+        Get the part of the display-map visible from a coordinate, without any
+        markers. See `get_visual_range` for the arguments.
+
+        Returns:
+            tuple or None: `(gridmap, ixc, iyc, xmin, xmax, ymin, ymax, width, height)`,
+            where `gridmap` is a tuple of lines (each a tuple of characters) and
+            `(ixc, iyc)` is the position of `xy` in it. This is `None` if there is
+            nothing to show at `xy`.
+
         """
         iX, iY = xy
         # convert inputs to xygrid
@@ -915,13 +1103,11 @@ class XYMap:
 
         if dist is None:
             # show the entire grid
-            gridmap = self.display_map
+            gridmap = display_map
             ixc, iyc = ix, iy
 
         elif dist is None or dist <= 0 or not self.get_node_from_coord(xy):
-            # There is no node at these coordinates. Show
-            # nothing but ourselves or emptiness
-            return character if character else self.empty_symbol
+            return None
 
         elif mode == "nodes":
             # dist measures only full, reachable nodes.
@@ -948,8 +1134,40 @@ class XYMap:
                 f"Map.get_visual_range 'mode' was '{mode}' "
                 "- it must be either 'scan' or 'nodes'."
             )
+        # the window is shared, so make it read-only
+        gridmap = tuple(tuple(line) for line in gridmap)
+        return gridmap, ixc, iyc, xmin, xmax, ymin, ymax, width, height
+
+    def _render_visual_range(
+        self,
+        window,
+        xy,
+        dist,
+        mode,
+        character,
+        target,
+        target_path_style,
+        max_size,
+        indent,
+        return_str,
+    ):
+        """
+        Overlay the character and path-markers on a visual-range window and
+        crop/format it for display. See `get_visual_range` for the arguments.
+
+        """
+        gridmap, ixc, iyc, xmin, xmax, ymin, ymax, width, height = window
+        # only the lines we put markers on are copied from the shared window
+        gridmap = list(gridmap)
+
+        def _mark(ix, iy, symbol):
+            line = gridmap[iy]
+            if isinstance(line, tuple):
+                line = gridmap[iy] = list(line)
+            line[ix] = symbol
+
         if character:
-            gridmap[iyc][ixc] = character  # correct indexing; it's a list of lines
+            _mark(ixc, iyc, character)
 
         if target:
             # stylize path to target
@@ -974,7 +1192,7 @@ class XYMap:
                 # don't decorate current (character?) location
                 ix, iy = node_or_link.x, node_or_link.y
                 if xmin <= ix <= xmax and ymin <= iy <= ymax:
-                    gridmap[iy - ymin][ix - xmin] = _target_path_style(node_or_link)
+                    _mark(ix - xmin, iy - ymin, _target_path_style(node_or_link))
 
         if max_size:
             # crop grid to make sure it doesn't grow too far
@@ -990,4 +1208,4 @@ class XYMap:
             indent = indent * " "
             return indent + f"\n{indent}".join("".join(line) for line in gridmap[::-1])
         else:
-            return gridmap
+            return [list(line) for line in gridmap]
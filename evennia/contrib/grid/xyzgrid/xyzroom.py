@@ -7,11 +7,16 @@ used as stand-alone XYZ-coordinate-aware rooms.
 
 """
 
+from collections import defaultdict
+
 from django.conf import settings
 from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete
 
 from evennia.objects.manager import ObjectManager
+from evennia.objects.models import ObjectDB
 from evennia.objects.objects import DefaultExit, DefaultRoom
+from evennia.typeclasses.tags import Tag
 
 # name of all tag categories. Note that the Z-coordinate is
 # the `map_name` of the XYZgrid
@@ -27,6 +32,298 @@ GET_XYZGRID = None
 
 CLIENT_DEFAULT_WIDTH = settings.CLIENT_DEFAULT_WIDTH
 
+# above this many index-matches, let the database do the matching instead
+_XYZ_INDEX_MAX_IDS = 1000
+
+# the coordinate-tag categories, by their position in the (X, Y, Z, Xdest, Ydest, Zdest) tuple
+_COORDINATE_CATEGORIES = {
+    MAP_X_TAG_CATEGORY: 0,
+    MAP_Y_TAG_CATEGORY: 1,
+    MAP_Z_TAG_CATEGORY: 2,
+    MAP_XDEST_TAG_CATEGORY: 3,
+    MAP_YDEST_TAG_CATEGORY: 4,
+    MAP_ZDEST_TAG_CATEGORY: 5,
+}
+
+
+class XYZCoordinateIndex:
+    """
+    In-memory index of the coordinates of all XYZRooms and XYZExits, to avoid
+    having to resolve the coordinates via several Tag-joins in the database.
+
+    The index is built from the coordinate-tags in the database the first time
+    it's used. After that it follows the coordinate-tags being added to and
+    removed from objects (however that is done, such as with `.create`,
+    `create_object` or `obj.tags.add`) and objects being deleted. It only
+    sees changes made in this process. If another process (like
+    `evennia shell`) adds coordinates, call `XYZ_INDEX.clear()` or reload to
+    see them. As a safeguard, a query the index has no match for is also
+    made in the database.
+
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Empty the index. It will be rebuilt from the database on next use.
+
+        """
+        self.built = False
+        # {pk: [x, y, z, xdest, ydest, zdest]}, the coordinate-tags of each entity
+        self._tags = {}
+        # {tag_pk: (position in coordinate, tag key) or None if not a coordinate-tag}
+        self._tag_info = {}
+        # {pk: (x, y, z) or (x, y, z, xdest, ydest, zdest)}
+        self._coords = {}
+        # {(x, y, z): {pk, ...}}
+        self._xyz = defaultdict(set)
+        # {(x, y, z, xdest, ydest, zdest): {pk, ...}}, exits only
+        self._xyz_exit = defaultdict(set)
+        # {z: {(X, Y): {pk, ...}}}, for integer X, Y, used for range-queries
+        self._zgrid = defaultdict(lambda: defaultdict(set))
+
+    @staticmethod
+    def _normalize(x, y, z):
+        # tags are stored as strings and Z is matched case-insensitively
+        return str(x), str(y), str(z).lower()
+
+    def build(self):
+        """
+        (Re)build the index from the coordinate-tags in the database.
+
+        """
+        self.clear()
+        for pk, tag_pk, category, key in (
+            ObjectDB.db_tags.through.objects.filter(tag__db_category__in=_COORDINATE_CATEGORIES)
+            .values_list("objectdb_id", "tag_id", "tag__db_category", "tag__db_key")
+            .iterator()
+        ):
+            position = _COORDINATE_CATEGORIES[category]
+            self._tag_info[tag_pk] = (position, key)
+            self._tags.setdefault(pk, [None] * 6)[position] = key
+        for pk in self._tags:
+            self._update(pk)
+        self.built = True
+
+    def _update(self, pk):
+        """
+        Re-index an entity from its coordinate-tags.
+
+        """
+        self._unindex(pk)
+        coord = self._tags.get(pk)
+        if not coord or None in coord[:3]:
+            return
+        xyz = self._normalize(*coord[:3])
+        self._xyz[xyz].add(pk)
+        x, y, z = xyz
+        if x.lstrip("-").isdigit() and y.lstrip("-").isdigit():
+            self._zgrid[z][(int(x), int(y))].add(pk)
+        if None not in coord[3:]:
+            xyz += self._normalize(*coord[3:])
+            self._xyz_exit[xyz].add(pk)
+        self._coords[pk] = xyz
+
+    def _unindex(self, pk):
+        coord = self._coords.pop(pk, None)
+        if not coord:
+            return
+        xyz = coord[:3]
+        self._xyz[xyz].discard(pk)
+        if not self._xyz[xyz]:
+            del self._xyz[xyz]
+        x, y, z = xyz
+        if x.lstrip("-").isdigit() and y.lstrip("-").isdigit():
+            self._zgrid[z][(int(x), int(y))].discard(pk)
+        if len(coord) > 3:
+            self._xyz_exit[coord].discard(pk)
+            if not self._xyz_exit[coord]:
+                del self._xyz_exit[coord]
+
+    def _get_tag_info(self, tag_pks):
+        """
+        Get the position in the coordinate and key of tags, only asking the
+        database about tags not seen before.
+
+        """
+        unknown = [tag_pk for tag_pk in tag_pks if tag_pk not in self._tag_info]
+        if unknown:
+            self._tag_info.update({tag_pk: None for tag_pk in unknown})
+            for tag_pk, category, key in Tag.objects.filter(
+                pk__in=unknown, db_category__in=_COORDINATE_CATEGORIES
+            ).values_list("id", "db_category", "db_key"):
+                self._tag_info[tag_pk] = (_COORDINATE_CATEGORIES[category], key)
+        return [self._tag_info[tag_pk] for tag_pk in tag_pks if self._tag_info[tag_pk]]
+
+    def _set_tag(self, pk, position, key, add):
+        coord = self._tags.setdefault(pk, [None] * 6)
+        if add:
+            coord[position] = key
+        elif coord[position] == key:
+            coord[position] = None
+        if not any(coord):
+            del self._tags[pk]
+        self._update(pk)
+
+    def tags_changed(self, instance, action, reverse=False, pk_set=None):
+        """
+        Update the index after tags were added to or removed from objects. This
+        is called by the `m2m_changed` signal.
+
+        Args:
+            instance (ObjectDB or Tag): The object whose tags changed or, if
+                `reverse`, the Tag that was added to or removed from objects.
+            action (str): The `m2m_changed` action.
+            reverse (bool, optional): If the change was made from the Tag's side.
+            pk_set (set, optional): The ids of the Tags (or, if `reverse`, the
+                objects) that were added or removed.
+
+        """
+        if not self.built or action not in ("post_add", "post_remove", "post_clear"):
+            return
+        add = action == "post_add"
+        if reverse:
+            position = _COORDINATE_CATEGORIES.get(instance.db_category)
+            if position is None:
+                return
+            key = instance.db_key
+            pks = list(self._tags) if pk_set is None else pk_set
+            for pk in pks:
+                self._set_tag(pk, position, key, add)
+        elif action == "post_clear":
+            self.remove(instance.pk)
+        else:
+            for position, key in self._get_tag_info(pk_set or ()):
+                self._set_tag(instance.pk, position, key, add)
+
+    def add(self, obj):
+        """
+        Add an XYZRoom or XYZExit to the index. This is not usually needed,
+        since the index follows the coordinate-tags being added.
+
+        Args:
+            obj (XYZRoom or XYZExit): The entity to add.
+
+        """
+        if self.built:
+            self._tags[obj.pk] = [
+                *obj.xyz,
+                *(getattr(obj, "xyz_destination", None) or (None, None, None)),
+            ]
+            self._update(obj.pk)
+
+    def remove(self, pk):
+        """
+        Remove an entity from the index.
+
+        Args:
+            pk (int): The id of the entity to remove.
+
+        """
+        self._tags.pop(pk, None)
+        self._unindex(pk)
+
+    @staticmethod
+    def _matches(coord, pattern):
+        return all(part == "*" or part == key for key, part in zip(coord, pattern))
+
+    def find(self, xyz=("*", "*", "*"), xyz_destination=None):
+        """
+        Find the ids of everything at the given coordinates.
+
+        Args:
+            xyz (tuple): The (X, Y, Z) coordinate. Each element can be `'*'` to match
+                any value.
+            xyz_destination (tuple, optional): If given, only match exits leading to these
+                coordinates (wildcards allowed).
+
+        Returns:
+            set: The matching ids.
+
+        """
+        if not self.built:
+            self.build()
+        pattern = tuple(
+            "*" if part == "*" else key for part, key in zip(xyz, self._normalize(*xyz))
+        )
+        if xyz_destination is not None:
+            pattern += tuple(
+                "*" if part == "*" else key
+                for part, key in zip(xyz_destination, self._normalize(*xyz_destination))
+            )
+            index = self._xyz_exit
+        else:
+            index = self._xyz
+
+        if "*" not in pattern:
+            return set(index.get(pattern, ()))
+        pks = set()
+        for coord, coordpks in index.items():
+            if self._matches(coord, pattern):
+                pks.update(coordpks)
+        return pks
+
+    def find_range(self, xrange, yrange, z):
+        """
+        Find the ids of everything within a rectangular area of a map.
+
+        Args:
+            xrange (tuple): The `(xmin, xmax)` to search, inclusive.
+            yrange (tuple): The `(ymin, ymax)` to search, inclusive.
+            z (str): The Z coordinate (name of map) to search.
+
+        Returns:
+            set: The matching ids.
+
+        """
+        if not self.built:
+            self.build()
+        (xmin, xmax), (ymin, ymax) = xrange, yrange
+        zgrid = self._zgrid.get(str(z).lower(), {})
+        pks = set()
+        if (xmax - xmin + 1) * (ymax - ymin + 1) < len(zgrid):
+            # small area - check each coordinate in it
+            for X in range(xmin, xmax + 1):
+                for Y in range(ymin, ymax + 1):
+                    pks.update(zgrid.get((X, Y), ()))
+        else:
+            for (X, Y), coordpks in zgrid.items():
+                if xmin <= X <= xmax and ymin <= Y <= ymax:
+                    pks.update(coordpks)
+        return pks
+
+
+XYZ_INDEX = XYZCoordinateIndex()
+
+
+def _at_post_delete(sender, instance, **kwargs):
+    """
+    Keep the coordinate-index updated also when deleting via a queryset.
+
+    """
+    # all models send this signal, and their ids overlap with those of objects
+    if isinstance(instance, ObjectDB):
+        XYZ_INDEX.remove(instance.pk)
+    elif isinstance(instance, Tag):
+        # a new Tag could get the same id
+        XYZ_INDEX._tag_info.pop(instance.pk, None)
+
+
+def _at_m2m_changed(sender, instance, action, reverse=False, pk_set=None, **kwargs):
+    """
+    Keep the coordinate-index updated when coordinate-tags are added or removed.
+
+    """
+    XYZ_INDEX.tags_changed(instance, action, reverse=reverse, pk_set=pk_set)
+
+
+post_delete.connect(_at_post_delete, dispatch_uid="xyzgrid_coordinate_index")
+m2m_changed.connect(
+    _at_m2m_changed, sender=ObjectDB.db_tags.through, dispatch_uid="xyzgrid_coordinate_index"
+)
+
 
 class XYZManager(ObjectManager):
     """
@@ -56,6 +353,14 @@ class XYZManager(ObjectManager):
         x, y, z = xyz
         wildcard = "*"
 
+        if (x, y, z) == (wildcard, wildcard, wildcard):
+            return self.filter_family(**kwargs)
+
+        pks = XYZ_INDEX.find(xyz=xyz)
+        if 0 < len(pks) <= _XYZ_INDEX_MAX_IDS:
+            return self.filter_family(**kwargs).filter(pk__in=pks)
+        # too many matches, or none (which could be made in another process)
+
         return (
             self.filter_family(**kwargs)
             .filter(
@@ -76,6 +381,25 @@ class XYZManager(ObjectManager):
             .distinct()
         )
 
+    def filter_xyz_range(self, xrange, yrange, z, **kwargs):
+        """
+        Filter queryset to everything within a rectangular area of a map, such as the
+        area displayed by `XYMap.get_visual_range`. This will also find children
+        of the typeclass.
+
+        Args:
+            xrange (tuple): The `(xmin, xmax)` X-coordinates to include, inclusive.
+            yrange (tuple): The `(ymin, ymax)` Y-coordinates to include, inclusive.
+            z (str): The Z-coordinate (the name of the map in the XYZgrid contrib).
+            **kwargs: All other kwargs are passed on to the query.
+
+        Returns:
+            django.db.queryset.Queryset: A queryset that can be combined
+            with further filtering.
+
+        """
+        return self.filter_family(**kwargs).filter(pk__in=XYZ_INDEX.find_range(xrange, yrange, z))
+
     def get_xyz(self, xyz=(0, 0, "map"), **kwargs):
         """
         Always return a single matched entity directly. This accepts no `*`-wildcards.
@@ -154,6 +478,11 @@ class XYZExitManager(XYZManager):
         xdest, ydest, zdest = xyz_destination
         wildcard = "*"
 
+        pks = XYZ_INDEX.find(xyz=xyz, xyz_destination=xyz_destination)
+        if 0 < len(pks) <= _XYZ_INDEX_MAX_IDS:
+            return self.filter_family(**kwargs).filter(pk__in=pks)
+        # too many matches, or none (which could be made in another process)
+
         return (
             self.filter_family(**kwargs)
             .filter(
@@ -226,6 +555,9 @@ class XYZExitManager(XYZManager):
         kwargs["db_typeclass_path__in"] = paths
 
         try:
+            pks = XYZ_INDEX.find(xyz=xyz, xyz_destination=xyz_destination)
+            if 0 < len(pks) <= _XYZ_INDEX_MAX_IDS:
+                return self.filter(pk__in=pks).get(**kwargs)
             return (
                 self.filter(db_tags__db_key__iexact=str(z), db_tags__db_category=MAP_Z_TAG_CATEGORY)
                 .filter(db_tags__db_key=str(x), db_tags__db_category=MAP_X_TAG_CATEGORY)
@@ -97,8 +97,14 @@ methods instead.
 You can see all the features of the `BaseBuff` class below, or browse `samplebuffs.py` to see how to create some common buffs. Buffs have
 many attributes and hook methods you can overload to create complex, interrelated buffs.
 
+The handler keeps its buff instances around, indexed by the stats they modify, the triggers they react to and
+when they expire, so checking a stat or cleaning up expired buffs doesn't need to re-create every buff. The
+instances are re-created whenever the buff cache Attribute is saved by anything other than the handler's own
+`add`/`remove` methods, so a buff instance may be shared between calls but is never out of date.
+
 """
 
+import heapq
 import time
 from random import random
 
@@ -340,8 +346,17 @@ class BuffHandler:
             autopause:  (optional) Whether this handler autopauses playtime buffs on owning object's unpuppet
         """
         self.ownerref = owner.dbref
+        self._owner = owner
         self.dbkey = dbkey
         self.autopause = autopause
+        # Instanced buffs and indexes, valid for the buff cache version they were made from
+        self._cache_version = None
+        self._instances = None
+        self._stat_index = {}
+        self._trigger_index = {}
+        self._expiry_heap = []
+        self._expiry_entries = {}
+        self._nostacks = set()
         if autopause:
             self._validate_state()
             signals.SIGNAL_OBJECT_POST_UNPUPPET.connect(self._pause_playtime)
@@ -351,12 +366,10 @@ class BuffHandler:
     @property
     def owner(self):
         """The object this handler is attached to."""
-        if self.ownerref:
-            _owner = search.search_object(self.ownerref)
-        if _owner:
-            return _owner[0]
-        else:
-            return None
+        if not self._owner or not self._owner.pk:
+            _owner = search.search_object(self.ownerref) if self.ownerref else None
+            self._owner = _owner[0] if _owner else None
+        return self._owner
 
     @property
     def buffcache(self):
@@ -398,15 +411,26 @@ class BuffHandler:
     @property
     def expired(self):
         """All buffs on this handler that have expired (no duration or no stacks)."""
-        _cache = self.all
-        _e = {
-            k: buff
-            for k, buff in _cache.items()
-            if not buff.paused
-            if buff.duration > -1
-            if buff.duration < time.time() - buff.start
-        }
-        _nostacks = {k: buff for k, buff in _cache.items() if buff.stacks <= 0}
+        _cache = self._get_instances()
+        now = time.time()
+        heap = self._expiry_heap
+        _e = {}
+        _due = []
+        # Pop the expiry heap from the soonest end time while ends are in the past
+        while heap and heap[0][0] < now:
+            entry = heapq.heappop(heap)
+            k = entry[1]
+            if self._expiry_entries.get(k) is not entry:
+                # left behind by a buff that was removed or changed since
+                continue
+            _due.append(entry)
+            buff = _cache[k]
+            if -1 < buff.duration < now - buff.start:
+                _e[k] = buff
+        # expired buffs stay on the heap until they are removed
+        for entry in _due:
+            heapq.heappush(heap, entry)
+        _nostacks = {k: _cache[k] for k in self._nostacks if k in _cache}
         _e.update(_nostacks)
         return _e
 
@@ -512,10 +536,12 @@ class BuffHandler:
             b["duration"] = duration
 
         # Apply the buff!
+        current = self._is_current()
         self.buffcache[buffkey] = b
 
         # Create the buff instance and run the on-application hook method
         instance: BaseBuff = buff(self, buffkey, b)
+        self._update_index(buffkey, instance, current)
         instance.at_apply(**_context)
         if instance.ticking:
             tick_buff(self, buffkey, _context)
@@ -540,12 +566,10 @@ class BuffHandler:
         """
         if not context:
             context = {}
-        if key not in self.buffcache:
+        instance: BaseBuff = self._get_instances().get(key)
+        if not instance:
             return
 
-        buff: BaseBuff = self.buffcache[key]
-        instance: BaseBuff = buff["ref"](self, key, buff)
-
         if loud:
             if dispel:
                 instance.at_dispel(**context)
@@ -554,12 +578,18 @@ class BuffHandler:
             instance.at_remove(**context)
 
         del instance
+        current = self._is_current()
+        remaining = None
         if not stacks:
             del self.buffcache[key]
         elif stacks:
             self.buffcache[key]["stacks"] -= stacks
             if self.buffcache[key]["stacks"] <= 0:
                 del self.buffcache[key]
+            else:
+                buff = self.buffcache[key]
+                remaining = buff["ref"](self, key, buff)
+        self._update_index(key, remaining, current)
 
     def remove_by_type(
         self,
@@ -682,22 +712,20 @@ class BuffHandler:
     # region getters
     def get(self, key: str):
         """If the specified key is on this handler, return the instanced buff. Otherwise return None.
-        You should delete this when you're done with it, so that garbage collection doesn't have to.
+
+        The instance is shared with the handler's indexes and other callers until the buff cache
+        changes. Setting one of its cache values (like `stacks`) saves it to the buff cache, which
+        re-makes the instances. Any other attribute you set on it is not saved, but is seen by
+        everything using the instance until then, so don't use it for temporary values.
 
         Args:
             key:    The key for the buff you wish to get"""
-        buff = self.buffcache.get(key)
-        if buff:
-            return buff["ref"](self, key, buff)
-        else:
-            return None
+        return self._get_instances().get(key)
 
     def get_all(self):
-        """Returns a dictionary of instanced buffs (all of them) on this handler in the format {buffkey: instance}"""
-        _cache = dict(self.buffcache)
-        if not _cache:
-            return {}
-        return {k: buff["ref"](self, k, buff) for k, buff in _cache.items()}
+        """Returns a dictionary of instanced buffs (all of them) on this handler in the format {buffkey: instance}.
+        The instances are shared, as for `get`."""
+        return dict(self._get_instances())
 
     def get_by_type(self, buff: BaseBuff, to_filter=None):
         """Finds all buffs matching the given type.
@@ -720,8 +748,10 @@ class BuffHandler:
 
         Returns a dictionary of instanced buffs which modify the specified stat in the format {buffkey: instance}.
         """
-        _cache = self.traits if not to_filter else to_filter
-        buffs = {k: buff for k, buff in _cache.items() for m in buff.mods if m.stat == stat}
+        if not to_filter:
+            self._get_instances()
+            return dict(self._stat_index.get(stat, {}))
+        buffs = {k: buff for k, buff in to_filter.items() for m in buff.mods if m.stat == stat}
         return buffs
 
     def get_by_trigger(self, trigger: str, to_filter=None):
@@ -733,8 +763,10 @@ class BuffHandler:
 
         Returns a dictionary of instanced buffs which fire off the designated trigger, in the format {buffkey: instance}.
         """
-        _cache = self.effects if not to_filter else to_filter
-        buffs = {k: buff for k, buff in _cache.items() if trigger in buff.triggers}
+        if not to_filter:
+            self._get_instances()
+            return dict(self._trigger_index.get(trigger, {}))
+        buffs = {k: buff for k, buff in to_filter.items() if trigger in buff.triggers}
         return buffs
 
     def get_by_source(self, source, to_filter=None):
@@ -781,13 +813,12 @@ class BuffHandler:
         if not (isinstance(buff, type) or isinstance(buff, str)):
             raise TypeError
 
+        _cache = self._get_instances()
         if isinstance(buff, str):
-            for k in self.buffcache.keys():
-                if k == buff:
-                    return True
+            return buff in _cache
         if isinstance(buff, type):
-            for b in self.buffcache.values():
-                if b.get("ref") == buff:
+            for b in _cache.values():
+                if type(b) == buff:
                     return True
         return False
 
@@ -998,6 +1029,91 @@ class BuffHandler:
         cleanup_buffs(self)
 
     # region private methods
+    def _get_buffcache_version(self):
+        """Returns the stored value of the buff cache Attribute. This is replaced by a new
+        object every time the Attribute is saved, so it tells if the buff cache changed."""
+        owner = self.owner
+        attr = owner.attributes.get(self.dbkey, return_obj=True) if owner else None
+        return attr.db_value if attr else None
+
+    def _is_current(self):
+        """Returns True if the instanced buffs are up to date with the buff cache."""
+        return self._instances is not None and self._get_buffcache_version() is self._cache_version
+
+    def _get_instances(self):
+        """Returns the instanced buffs on this handler as a dictionary in the format {buffkey: instance}.
+        The instances and the indexes by stat, trigger and expiry are re-made if the buff cache changed.
+        """
+        version = self._get_buffcache_version()
+        if self._instances is not None and version is self._cache_version:
+            return self._instances
+
+        self._instances = {}
+        self._stat_index = {}
+        self._trigger_index = {}
+        self._expiry_heap = []
+        self._expiry_entries = {}
+        self._nostacks = set()
+        _cache = dict(self.buffcache) if version is not None else {}
+        for k, buff in _cache.items():
+            self._index(k, buff["ref"](self, k, buff), push=False)
+        heapq.heapify(self._expiry_heap)
+        # reading the buff cache may create its Attribute, so check the version again
+        self._cache_version = self._get_buffcache_version()
+        return self._instances
+
+    def _index(self, key, instance, push=True):
+        """Adds an instanced buff to the indexes."""
+        self._instances[key] = instance
+        for mod in instance.mods:
+            self._stat_index.setdefault(mod.stat, {})[key] = instance
+        for trigger in instance.triggers:
+            self._trigger_index.setdefault(trigger, {})[key] = instance
+        if instance.stacks <= 0:
+            self._nostacks.add(key)
+        elif not instance.paused and instance.duration > -1:
+            entry = (instance.start + instance.duration, key)
+            self._expiry_entries[key] = entry
+            if push:
+                heapq.heappush(self._expiry_heap, entry)
+            else:
+                self._expiry_heap.append(entry)
+
+    def _unindex(self, key):
+        """Removes a buff from the indexes. Its expiry heap entry is left, and skipped when popped,
+        unless there are more such entries than live ones, in which case the heap is re-made."""
+        instance = self._instances.pop(key, None)
+        if not instance:
+            return
+        for index in (self._stat_index, self._trigger_index):
+            for name in list(index):
+                index[name].pop(key, None)
+                if not index[name]:
+                    del index[name]
+        self._nostacks.discard(key)
+        if self._expiry_entries.pop(key, None) and len(self._expiry_heap) > 2 * len(
+            self._expiry_entries
+        ):
+            self._expiry_heap = list(self._expiry_entries.values())
+            heapq.heapify(self._expiry_heap)
+
+    def _update_index(self, key, instance, current):
+        """Updates the indexes after this handler changed a buff in the buff cache, instead of
+        re-making all instances.
+
+        Args:
+            key:        The key of the changed buff
+            instance:   The new buff instance, or None if it was removed
+            current:    If the indexes were up to date right before the change
+        """
+        if not current:
+            # something else changed the buff cache too - re-make everything when next needed
+            return
+        self._unindex(key)
+        if instance:
+            self._index(key, instance)
+        self._cache_version = self._get_buffcache_version()
+
     def _validate_state(self):
         """Validates the state of paused/unpaused playtime buffs."""
         if not self.autopause:
@@ -1097,7 +1213,9 @@ class BuffHandler:
                     instance.at_expire(**context)
                 instance.at_remove(**context)
             del instance
+            current = self._is_current()
             del self.buffcache[k]
+            self._update_index(k, None, current)
 
     # endregion
     # endregion
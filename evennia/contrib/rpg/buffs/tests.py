@@ -2,6 +2,7 @@
 Tests for the buff system contrib
 """
 
+import time
 from unittest.mock import Mock, call, patch
 
 from evennia import DefaultObject, create_object
@@ -425,3 +426,49 @@ class TestBuffsAndHandler(EvenniaTest):
         self.assertEqual(
             handler.get("gentest").flavor, "This buff affects the following stats: gentest"
         )
+
+    @patch("evennia.contrib.rpg.buffs.buff.utils.delay", new=Mock())
+    def test_instance_cache(self):
+        """tests that buff instances and indexes are kept until the buff cache changes"""
+        # setup
+        handler: BuffHandler = self.testobj.buffs
+        handler.add(_TestModBuff)
+        handler.add(_TestTrigBuff)
+        handler.add(_TestTimeBuff)
+        instance = handler.get("tmb")
+        self.assertIs(handler.get_by_stat("stat1")["tmb"], instance)
+        self.assertEqual(list(handler.get_by_stat("stat2")), ["tmb"])
+        self.assertEqual(list(handler.get_by_trigger("test2")), ["ttb"])
+        with patch.object(_TestModBuff, "at_init") as mock_init:
+            self.assertEqual(handler.check(10, "stat1"), 25)
+            self.assertEqual(handler.check(10, "stat1"), 25)
+            mock_init.assert_not_called()
+        # adding and removing updates the indexes
+        handler.add(_TestModBuff2)
+        self.assertIs(handler.get("tmb"), instance)
+        self.assertEqual(sorted(handler.get_by_stat("stat1")), ["tmb", "tmb2"])
+        handler.remove("tmb2")
+        self.assertIs(handler.get("tmb"), instance)
+        self.assertEqual(list(handler.get_by_stat("stat1")), ["tmb"])
+        # changing the buff cache outside of the handler re-makes the instances
+        self.testobj.db.buffs["tmb"]["stacks"] = 3
+        self.assertIsNot(handler.get("tmb"), instance)
+        self.assertEqual(handler.check(10, "stat1"), 35)
+        # expiry
+        self.assertFalse(handler.expired)
+        handler.get("ttib").start = time.time() - 10
+        self.assertEqual(list(handler.expired), ["ttib"])
+        handler.cleanup()
+        self.assertFalse(handler.has("ttib"))
+        self.assertTrue(handler.has(_TestModBuff))
+        # removed buffs don't pile up in the expiry heap
+        for _ in range(20):
+            handler.add(_TestTimeBuff)
+            handler.remove("ttib")
+        self.assertLessEqual(len(handler._expiry_heap), 2 * len(handler._expiry_entries) + 1)
+        handler.add(_TestTimeBuff, duration=0.5)
+        handler.get("ttib").start = time.time() - 10
+        self.assertEqual(list(handler.expired), ["ttib"])
+        handler.cleanup()
+        self.assertFalse(handler.expired)
+        self.assertFalse([entry for entry in handler._expiry_heap if entry[0] < time.time()])
@@ -30,6 +30,8 @@ from .rpsystem import (
     RPCommand,
     SdescError,
     SdescHandler,
+    SdescMatcher,
+    get_sdesc_matcher,
     parse_language,
     parse_sdescs_and_recogs,
     send_emote,
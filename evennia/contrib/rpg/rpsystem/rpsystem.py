@@ -150,7 +150,9 @@ Extra Installation Instructions:
 """
 
 import re
-from collections import defaultdict
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from itertools import count
 from string import punctuation
 
 import inflect
@@ -226,6 +228,15 @@ _RE_REF_LANG = re.compile(r"\{+\##([0-9]+)\}+")
 # this regex returns in groups (langname, say), where langname can be empty.
 _RE_LANGUAGE = re.compile(r'(\w+)?(".*?")')
 
+# a word in a sdesc/recog, as used by the sdesc matcher
+_RE_WORD = re.compile(r"\w+", re.UNICODE)
+
+# how many compiled sdesc matchers to keep cached on each location
+_SDESC_MATCHER_CACHE_SIZE = 100
+
+# running version counter for recog-changes, used to invalidate cached matchers
+_RECOG_VERSION = count()
+
 
 # the emote parser works in two steps:
 #  1) convert the incoming emote into an intermediary
@@ -332,6 +343,198 @@ def parse_language(speaker, emote):
     return emote, mapping
 
 
+class SdescMatcher:
+    """
+    The sdescs, recogs, keys and aliases of a set of candidates, prepared for
+    quickly matching the words of an emote-reference (like `/tall man`) against them.
+
+    Each word of the reference must match the beginning of a word in the text, in
+    order. This gives the same result as searching each text with a regex like
+    `\\b(tall).*\\b(man).*`, but an index of all word-prefixes lets us skip the
+    candidates that can't match without looking at them.
+
+    """
+
+    def __init__(self, candidate_map):
+        """
+        Initialize the matcher.
+
+        Args:
+            candidate_map (list): A list of tuples `(obj, text)`, where `text` is a string
+                (sdesc, recog, key or alias) that `obj` can be referenced by. An object
+                may be listed more than once.
+
+        """
+        self.candidate_map = list(candidate_map)
+        # {word-prefix: {index, ...}}
+        self.prefixes = defaultdict(set)
+        # texts that can't be matched by position, these are always matched by regex
+        self.regex_only = set()
+        # per candidate, (lowercase text, [start of each word, ...])
+        self.words = []
+
+        for index, (_, text) in enumerate(self.candidate_map):
+            lowtext = text.lower()
+            if "\n" in text or len(lowtext) != len(text):
+                self.regex_only.add(index)
+                self.words.append(None)
+                continue
+            starts = []
+            for word_match in _RE_WORD.finditer(lowtext):
+                word = word_match.group()
+                starts.append(word_match.start())
+                for iend in range(1, len(word) + 1):
+                    self.prefixes[word[:iend]].add(index)
+            self.words.append((lowtext, starts))
+
+    def _regex_match(self, words, indices):
+        """
+        Match words with a regex. Used for the words and texts the index can't
+        handle.
+
+        """
+        rquery = "".join(r"\b(" + re.escape(word) + r").*" for word in words)
+        matches = []
+        for index in indices:
+            match = re.search(rquery, self.candidate_map[index][1], _RE_FLAGS)
+            if match:
+                matches.append((index, match.group()))
+        return matches
+
+    def _index_match(self, words, index):
+        """
+        Match lowercase words in order against the words of one text.
+
+        Returns:
+            str or None: The matched part of the text, from the first matched word
+                to the end, or `None` if there was no match.
+
+        """
+        lowtext, starts = self.words[index]
+        istart, pos = None, 0
+        for word in words:
+            for iword in range(bisect_left(starts, pos), len(starts)):
+                start = starts[iword]
+                if lowtext.startswith(word, start):
+                    break
+            else:
+                return None
+            if istart is None:
+                istart = start
+            pos = start + len(word)
+        return self.candidate_map[index][1][istart:]
+
+    def match(self, words, indices=None):
+        """
+        Find the candidates matching a reference.
+
+        Args:
+            words (list): The words of the reference, in order.
+            indices (iterable, optional): Only check the candidates with these
+                indices in `candidate_map`. Since a candidate matching N words must
+                also match the first N-1 of them, this is useful for narrowing
+                down matches while adding words one at a time.
+
+        Returns:
+            list: A list of tuples `(index, matched_text)`, ordered as in
+                `candidate_map`.
+
+        """
+        if indices is None:
+            indices = range(len(self.candidate_map))
+        words = list(words)
+        prefixes = [_RE_WORD.match(word) for word in words]
+        if not words or not all(prefixes):
+            # the index only knows about words starting with a word-character
+            return self._regex_match(words, indices)
+
+        # only candidates with words starting like each of the words can match
+        possible = None
+        for prefix in prefixes:
+            found = self.prefixes.get(prefix.group().lower(), set())
+            possible = found if possible is None else possible & found
+        possible = possible | self.regex_only
+
+        lowwords = [word.lower() for word in words]
+        matches = []
+        for index in indices:
+            if index not in possible:
+                continue
+            if index in self.regex_only:
+                matches.extend(self._regex_match(words, (index,)))
+                continue
+            matched_text = self._index_match(lowwords, index)
+            if matched_text is not None:
+                matches.append((index, matched_text))
+        return matches
+
+
+def get_sdesc_matcher(sender, candidates):
+    """
+    Get the `SdescMatcher` for the candidates `sender` can reference.
+
+    Args:
+        sender (Object): The one referencing the candidates. This object's recogs
+            are included in the matcher.
+        candidates (iterable): The objects valid for referencing.
+
+    Returns:
+        SdescMatcher: The matcher.
+
+    Notes:
+        The matchers are cached on the sender's location, per sender and set of
+        candidates. A matcher is rebuilt when the candidates (like the contents of
+        the room), their sdescs/keys/aliases/`enable_recog` locks or the
+        sender's recogs change.
+
+    """
+    candidates = list(candidates)
+    recog_handler = sender.recog if hasattr(sender, "recog") else None
+
+    signature = (
+        recog_handler.version if recog_handler else None,
+        tuple(
+            ((obj.sdesc.get(),) if hasattr(obj, "sdesc") else (obj.key, tuple(obj.aliases.all())))
+            + (obj.locks.get("enable_recog"),)
+            for obj in candidates
+        ),
+    )
+    cache_key = (sender.id, tuple(obj.id for obj in candidates))
+
+    location = getattr(sender, "location", None)
+    cache = location.ndb._sdesc_matchers if location else None
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached and cached[0] == signature:
+            cache.move_to_end(cache_key)
+            return cached[1]
+
+    # build a list of candidates with all possible referrable names
+    candidate_map = []
+    for obj in candidates:
+        # check if sender has any recogs for obj and add
+        if recog_handler:
+            if recog := recog_handler.get(obj):
+                candidate_map.append((obj, recog))
+        # check if obj has an sdesc and add
+        if hasattr(obj, "sdesc"):
+            candidate_map.append((obj, obj.sdesc.get()))
+        # if no sdesc, include key plus aliases instead
+        else:
+            candidate_map.append((obj, obj.key))
+            candidate_map.extend([(obj, alias) for alias in obj.aliases.all()])
+    matcher = SdescMatcher(candidate_map)
+
+    if location:
+        if cache is None:
+            cache = location.ndb._sdesc_matchers = OrderedDict()
+        cache[cache_key] = (signature, matcher)
+        cache.move_to_end(cache_key)
+        while len(cache) > _SDESC_MATCHER_CACHE_SIZE:
+            cache.popitem(last=False)
+    return matcher
+
+
 def parse_sdescs_and_recogs(
     sender, candidates, string, search_mode=False, case_sensitive=True, fallback=None
 ):
@@ -378,21 +581,9 @@ def parse_sdescs_and_recogs(
         - says, "..." are
 
     """
-    # build a list of candidates with all possible referrable names
-    # include 'me' keyword for self-ref
-    candidate_map = []
-    for obj in candidates:
-        # check if sender has any recogs for obj and add
-        if hasattr(sender, "recog"):
-            if recog := sender.recog.get(obj):
-                candidate_map.append((obj, recog))
-        # check if obj has an sdesc and add
-        if hasattr(obj, "sdesc"):
-            candidate_map.append((obj, obj.sdesc.get()))
-        # if no sdesc, include key plus aliases instead
-        else:
-            candidate_map.append((obj, obj.key))
-            candidate_map.extend([(obj, alias) for alias in obj.aliases.all()])
+    # get all possible referrable names of the candidates, prepared for matching
+    matcher = get_sdesc_matcher(sender, candidates)
+    candidate_map = matcher.candidate_map
 
     # escape mapping syntax on the form {#id} if it exists already in emote,
     # if so it is replaced with just "id".
@@ -432,17 +623,8 @@ def parse_sdescs_and_recogs(
 
         if search_mode:
             # match the candidates against the whole search string after the marker
-            rquery = "".join(
-                [
-                    r"\b(" + re.escape(word.strip(punctuation)) + r").*"
-                    for word in iter(tail.split())
-                ]
-            )
-            matches = (
-                (re.search(rquery, text, _RE_FLAGS), obj, text) for obj, text in candidate_map
-            )
-            # filter out any non-matching candidates
-            bestmatches = [(obj, mtch.group()) for mtch, obj, text in matches if mtch]
+            matches = matcher.match([word.strip(punctuation) for word in tail.split()])
+            bestmatches = [(candidate_map[index][0], text) for index, text in matches]
 
         else:
             # to find the longest match, we start from the marker and lengthen the
@@ -452,22 +634,21 @@ def parse_sdescs_and_recogs(
             # preserve punctuation when splitting
             tail = re.split(r"(\W)", tail)
             iend = 0
+            indices = None
             for i, item in enumerate(tail):
                 # don't add non-word characters to the search query
                 if not item.isalpha():
                     continue
                 word_list.append(item)
-                rquery = "".join([r"\b(" + re.escape(word) + r").*" for word in word_list])
-                # match candidates against the current set of words
-                matches = (
-                    (re.search(rquery, text, _RE_FLAGS), obj, text) for obj, text in candidate_map
-                )
-                matches = [(obj, match.group()) for match, obj, text in matches if match]
+                # match candidates against the current set of words; only those that
+                # matched the shorter query can match this one
+                matches = matcher.match(word_list, indices)
                 if len(matches) == 0:
                     # no matches at this length, keep previous iteration as best
                     break
+                indices = [index for index, _ in matches]
                 # since this is the longest match so far, set latest match set as best matches
-                bestmatches = matches
+                bestmatches = [(candidate_map[index][0], text) for index, text in matches]
                 # save current index as end point of matched text
                 iend = i
 
@@ -555,6 +736,32 @@ def parse_sdescs_and_recogs(
     return string, mapping
 
 
+def _get_emote_render_key(receiver, obj_mapping):
+    """
+    Get a key describing how a receiver sees the objects referenced in an emote.
+    Receivers with the same key will see the same sdescs/recogs.
+
+    Args:
+        receiver (Object): The one receiving the emote.
+        obj_mapping (dict): The mapping `{"#dbref": obj, ...}` of the emote.
+
+    Returns:
+        tuple: The render-key.
+
+    """
+    objs = list(obj_mapping.values())
+    # you always see your own key
+    self_ref = receiver.id if receiver in objs else None
+    recogs = None
+    if hasattr(receiver, "recog"):
+        recog_handler = receiver.recog
+        # only look up (and check the lock of) the recogs actually set
+        recogs = tuple(
+            recog_handler.get(obj) if obj in recog_handler.obj2recog else None for obj in objs
+        )
+    return (type(receiver), self_ref, recogs)
+
+
 def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first", **kwargs):
     """
     Main access function for distribute an emote.
@@ -580,12 +787,18 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
             'tall man' while /Tall will lead to 'Tall man' and
             /TALL will lead to 'TALL MAN'. If disabled, the sdesc's
             case will always be used, regardless of the /ref case used.
+        group_receivers (bool): Defaults to True. Receivers of the same typeclass
+            with the same recogs for the objects referenced in the emote will see
+            those objects the same way, so their sdescs/recogs are only rendered
+            once for the whole group. Unset this if your `get_display_name` or
+            `process_sdesc/recog` depend on other properties of the receiver.
         any: Other kwargs will be passed on into the receiver's process_sdesc and
             process_recog methods, and can thus be used to customize those.
 
     """
     case_sensitive = kwargs.pop("case_sensitive", True)
     fallback = kwargs.pop("fallback", None)
+    group_receivers = kwargs.pop("group_receivers", True)
     try:
         emote, obj_mapping = parse_sdescs_and_recogs(
             sender, receivers, emote, case_sensitive=case_sensitive, fallback=fallback
@@ -619,6 +832,9 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
         emote = femote.format(key="{{" + skey + "}}", emote=emote)
         obj_mapping[skey] = sender
 
+    # the sdesc-renderings shared by receivers seeing the referenced objects the same way
+    sdesc_mappings = {}
+
     # broadcast emote to everyone
     for receiver in receivers:
         # first handle the language mapping, which always produce different keys ##nn
@@ -636,13 +852,18 @@ def send_emote(sender, receivers, emote, msg_type="pose", anonymous_add="first",
         sendemote = emote.format_map(receiver_lang_mapping)
 
         # map the ref keys to sdescs
-        receiver_sdesc_mapping = dict(
-            (
-                ref,
-                obj.get_display_name(receiver, ref=ref, noid=True),
+        render_key = _get_emote_render_key(receiver, obj_mapping) if group_receivers else None
+        receiver_sdesc_mapping = sdesc_mappings.get(render_key) if render_key else None
+        if receiver_sdesc_mapping is None:
+            receiver_sdesc_mapping = dict(
+                (
+                    ref,
+                    obj.get_display_name(receiver, ref=ref, noid=True),
+                )
+                for ref, obj in obj_mapping.items()
             )
-            for ref, obj in obj_mapping.items()
-        )
+            if render_key:
+                sdesc_mappings[render_key] = receiver_sdesc_mapping
 
         # do the template replacement of the sdesc/recog {#num} markers
         receiver.msg(
@@ -776,12 +997,15 @@ class RecogHandler:
         # mappings
         self.ref2recog = {}
         self.obj2recog = {}
+        # changed whenever the recogs change, to know when cached data is stale
+        self.version = None
         self._cache()
 
     def _cache(self):
         """
         Load data to handler cache
         """
+        self.version = next(_RECOG_VERSION)
         self.ref2recog = self.obj.attributes.get("_recog_ref2recog", default={})
         obj2recog = self.obj.attributes.get("_recog_obj2recog", default={})
         self.obj2recog = dict((obj, recog) for obj, recog in obj2recog.items() if obj)
@@ -838,6 +1062,7 @@ class RecogHandler:
         # local caching
         self.ref2recog[key] = recog
         self.obj2recog[obj] = recog
+        self.version = next(_RECOG_VERSION)
         return recog
 
     def get(self, obj):
@@ -4,6 +4,7 @@ Tests for RP system
 """
 
 import time
+from unittest import mock
 
 from anything import Anything
 
@@ -218,6 +219,106 @@ class TestRPSystem(BaseEvenniaTest):
             result,
         )
 
+    def test_sdesc_matcher(self):
+        self.receiver1.sdesc.add(sdesc1)
+        self.receiver2.sdesc.add(sdesc2)
+        candidate_map = [
+            (self.receiver1, sdesc1),
+            (self.receiver2, sdesc2),
+            (self.speaker, "Mr Sender"),
+            (self.room, "Ünïcode İstanbul"),
+        ]
+        matcher = rpsystem.SdescMatcher(candidate_map)
+        for words in (
+            ["first"],
+            ["the", "rec"],
+            ["FIRST", "emotes"],
+            ["emotes", "first"],
+            ["colliding", "sdesc-guy"],
+            ["sdesc", "guy"],
+            ["nice"],
+            ["ce"],
+            ["ünï"],
+            ["istanbul"],
+            [],
+        ):
+            rquery = "".join(r"\b(" + rpsystem.re.escape(word) + r").*" for word in words)
+            expected = [
+                (index, match.group())
+                for index, (_, text) in enumerate(candidate_map)
+                if (match := rpsystem.re.search(rquery, text, rpsystem._RE_FLAGS))
+            ]
+            self.assertEqual(matcher.match(words), expected, words)
+        # narrowing down the candidates to check
+        self.assertEqual(matcher.match(["nice"], [1]), [(1, "nice colliding sdesc-guy for tests")])
+
+    def test_sdesc_matcher_cache(self):
+        self.receiver1.sdesc.add(sdesc1)
+        candidates = self.room.contents
+        matcher = rpsystem.get_sdesc_matcher(self.speaker, candidates)
+        self.assertIs(rpsystem.get_sdesc_matcher(self.speaker, candidates), matcher)
+
+        # changing an sdesc invalidates the matcher
+        self.receiver1.sdesc.add("A new sdesc")
+        matcher2 = rpsystem.get_sdesc_matcher(self.speaker, candidates)
+        self.assertIsNot(matcher2, matcher)
+        self.assertIn((self.receiver1, "A new sdesc"), matcher2.candidate_map)
+
+        # so does adding a recog
+        self.speaker.recog.add(self.receiver1, recog01)
+        matcher3 = rpsystem.get_sdesc_matcher(self.speaker, candidates)
+        self.assertIsNot(matcher3, matcher2)
+        self.assertIn((self.receiver1, recog01), matcher3.candidate_map)
+
+        # and changing the contents of the room
+        create_object(rpsystem.ContribRPObject, key="thing", location=self.room)
+        matcher4 = rpsystem.get_sdesc_matcher(self.speaker, self.room.contents)
+        self.assertIsNot(matcher4, matcher3)
+        self.assertEqual(
+            rpsystem.parse_sdescs_and_recogs(self.speaker, self.room.contents, "/thing", True),
+            [self.room.contents[-1]],
+        )
+
+    def test_send_emote_grouped(self):
+        self.speaker.sdesc.add(sdesc0)
+        self.receiver1.sdesc.add(sdesc1)
+        self.receiver2.sdesc.add(sdesc2)
+        others = [
+            create_object(rpsystem.ContribRPCharacter, key=f"Other{inum}", location=self.room)
+            for inum in range(3)
+        ]
+        others[0].recog.add(self.speaker, recog10)
+        receivers = [self.speaker, self.receiver1, self.receiver2] + others
+        outputs = {}
+        for receiver in receivers:
+            receiver.msg = lambda text, receiver=receiver, **kwargs: outputs.update(
+                {receiver: text[0]}
+            )
+
+        calls = []
+        get_display_name = rpsystem.ContribRPCharacter.get_display_name
+
+        def _get_display_name(obj, looker, **kwargs):
+            calls.append((obj, looker))
+            return get_display_name(obj, looker, **kwargs)
+
+        with mock.patch.object(rpsystem.ContribRPCharacter, "get_display_name", _get_display_name):
+            rpsystem.send_emote(self.speaker, receivers, "/me looks at /first.")
+
+        # 2 referenced objects, rendered for the speaker, receiver1, others[0] and once
+        # for receiver2 + the others not recognizing anyone
+        self.assertEqual(len(calls), 8)
+        self.assertEqual(
+            outputs[others[0]], "|mMr Sender|n looks at |bthe first receiver of emotes.|n."
+        )
+        expected = "|ba nice sender of emotes|n looks at |bthe first receiver of emotes.|n."
+        self.assertEqual(outputs[self.receiver2], expected)
+        self.assertEqual(outputs[others[1]], expected)
+        self.assertEqual(outputs[others[2]], expected)
+        self.assertEqual(
+            outputs[self.receiver1], "|ba nice sender of emotes|n looks at |mReceiver1|n."
+        )
+
     def test_get_sdesc(self):
         looker = self.speaker  # Sender
         target = self.receiver1  # Receiver1
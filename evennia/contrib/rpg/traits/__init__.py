@@ -7,4 +7,4 @@ from .traits import MandatoryTraitKey  # noqa
 from .traits import TraitException  # noqa
 from .traits import TraitHandler  # noqa
 from .traits import TraitProperty  # noqa
-from .traits import CounterTrait, GaugeTrait, StaticTrait, Trait  # noqa
+from .traits import TRAIT_SAVER, CounterTrait, GaugeTrait, StaticTrait, Trait, modify_traits  # noqa
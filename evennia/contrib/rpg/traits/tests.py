@@ -1073,3 +1073,66 @@ class TraitPropertyTestCase(EvenniaTest):
 
     def test_round2(self):
         self.char1.HP.value = 2
+
+
+class TraitSaveTestCase(EvenniaTest):
+    """
+    Test immediate and deferred saving to the database.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        for char in (self.char1, self.char2):
+            handler = traits.TraitHandler(char)
+            handler.add("hp", "Health", trait_type="gauge", base=100)
+
+    def _stored_hp(self, char):
+        char.attributes.reset_cache()
+        return char.attributes.get("traits", category="traits")["hp"].get("current")
+
+    def test_immediate_save(self):
+        handler = traits.TraitHandler(self.char1)
+        handler.hp.current -= 10
+        self.assertEqual(self._stored_hp(self.char1), 90)
+        self.assertFalse(handler._unsaved)
+
+    @patch("evennia.contrib.rpg.traits.traits.delay")
+    def test_deferred_save(self, mock_delay):
+        handler = traits.TraitHandler(self.char1, deferred_save=True)
+        handler.hp.current -= 10
+        handler.hp.current -= 10
+        self.assertEqual(handler.hp.current, 80)
+        self.assertTrue(handler._unsaved)
+        self.assertNotEqual(self._stored_hp(self.char1), 80)
+        mock_delay.assert_called_once_with(0, traits.TRAIT_SAVER.flush)
+
+        traits.TRAIT_SAVER.flush()
+        self.assertEqual(self._stored_hp(self.char1), 80)
+        self.assertFalse(handler._unsaved)
+
+    @patch("evennia.contrib.rpg.traits.traits.delay")
+    @patch("evennia.contrib.rpg.traits.traits.reactor")
+    def test_flush_on_stop(self, mock_reactor, mock_delay):
+        saver = traits.TraitSaver()
+        handler = traits.TraitHandler(self.char1, deferred_save=True)
+        saver.add(handler)
+        saver.add(handler)
+        mock_reactor.addSystemEventTrigger.assert_called_once_with(
+            "before", "shutdown", saver.flush
+        )
+
+    def test_modify_traits(self):
+        self.char1.traits = traits.TraitHandler(self.char1)
+        self.char2.traits = traits.TraitHandler(self.char2)
+        with patch.object(
+            traits.TraitHandler, "save", autospec=True, side_effect=traits.TraitHandler.save
+        ) as mock_save:
+            values = traits.modify_traits([self.char1, self.char2, self.obj1], "hp", -5)
+        self.assertEqual(values, {self.char1: 95, self.char2: 95})
+        self.assertEqual(mock_save.call_count, 2)
+        self.assertEqual(self._stored_hp(self.char2), 95)
+
+        values = traits.modify_traits([self.char1, self.char2], "hp", {self.char1: -200})
+        self.assertEqual(values, {self.char1: 0, self.char2: 95})
+        self.assertEqual(self._stored_hp(self.char1), 0)
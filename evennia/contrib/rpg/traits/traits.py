@@ -139,6 +139,41 @@ obj.traits.strength.value
 
 ```
 
+### Saving traits in batches
+
+Normally every change to a trait (like `obj.traits.hp.current -= 5`) saves all the
+traits of that object to the database right away. For objects whose traits change
+a lot (like NPCs in combat), the `TraitHandler` can instead defer saving:
+
+```python
+class Character(DefaultCharacter):
+    ...
+    @lazy_property
+    def traits(self):
+        return TraitHandler(self, deferred_save=True)
+```
+
+Changes are then only kept in memory and the handler is marked as having unsaved
+changes. All such handlers are saved together, in one database transaction,
+`settings.TRAIT_SAVE_INTERVAL` seconds later (default 0, meaning right after the current
+command is done). Each save still stores all of the handler's traits (they are one
+Attribute), so this saves on the number of saves, not on their size. You can also save a
+handler with `.traits.save()`, or all pending handlers with `traits.TRAIT_SAVER.flush()`.
+Pending saves are also flushed when the server reloads or shuts down.
+
+To change the same trait on many objects at once, like applying damage or regeneration
+to everyone in a combat tick, use `modify_traits`. This defers saving for all of them and
+saves them together at the end:
+
+```python
+from evennia.contrib.rpg.traits import modify_traits
+
+# everyone loses 5 hp
+modify_traits(combatants, "hp", -5)
+# everyone gets their own amount
+modify_traits(combatants, "hp", {goblin: -3, troll: -10})
+```
+
 ## Trait types
 
 All default traits have a read-only `.value` property that shows the relevant or
@@ -452,15 +487,19 @@ class Character(DefaultCharacter):
 
 """
 
+from contextlib import contextmanager
 from functools import total_ordering
 from time import time
 
 from django.conf import settings
+from twisted.internet import reactor
 
 from evennia.utils import logger
 from evennia.utils.dbserialize import _SaverDict
+from evennia.utils.idmapper.models import save_session
 from evennia.utils.utils import (
     class_from_module,
+    delay,
     inherits_from,
     list_to_string,
     percent,
@@ -516,6 +555,10 @@ _DA = object.__delattr__
 # this is the default we offer in TraitHandler.add
 DEFAULT_TRAIT_TYPE = "static"
 
+# how long to wait before saving TraitHandlers with deferred saving. 0 means
+# right after the current command (or other code) is done.
+_TRAIT_SAVE_INTERVAL = getattr(settings, "TRAIT_SAVE_INTERVAL", 0)
+
 
 class TraitException(RuntimeError):
     """
@@ -539,6 +582,132 @@ class MandatoryTraitKey:
     """
 
 
+class TraitSaver:
+    """
+    Collects TraitHandlers with unsaved changes and saves them together, in one
+    database transaction. Use through the `TRAIT_SAVER` singleton.
+
+    """
+
+    def __init__(self):
+        # used as an ordered set
+        self.handlers = {}
+        self._deferring = 0
+        self._task = None
+        self._flush_on_stop = False
+
+    def add(self, handler):
+        """
+        Register a handler with unsaved changes. It will be saved after
+        `settings.TRAIT_SAVE_INTERVAL` seconds, or at the end of a `deferred` block.
+
+        Args:
+            handler (TraitHandler): The handler to save.
+
+        """
+        self.handlers[handler] = True
+        if not self._flush_on_stop:
+            # don't lose pending saves on a reload or shutdown
+            reactor.addSystemEventTrigger("before", "shutdown", self.flush)
+            self._flush_on_stop = True
+        if self._task is None and not self._deferring:
+            self._task = delay(_TRAIT_SAVE_INTERVAL, self.flush)
+
+    @contextmanager
+    def deferred(self):
+        """
+        Context manager deferring all trait-saves until the end of the block, also
+        for handlers not using deferred saving.
+
+        """
+        self._deferring += 1
+        try:
+            yield self
+        finally:
+            self._deferring -= 1
+            if not self._deferring:
+                self.flush()
+
+    @property
+    def deferring(self):
+        """If saves are currently deferred for all handlers."""
+        return self._deferring > 0
+
+    def flush(self):
+        """
+        Save all handlers with unsaved changes.
+
+        """
+        self._task = None
+        handlers, self.handlers = list(self.handlers), {}
+        if handlers:
+            with save_session():
+                for handler in handlers:
+                    handler.save()
+
+
+TRAIT_SAVER = TraitSaver()
+
+
+class _TraitStorage:
+    """
+    Stands in for the Attribute as the root of the TraitHandler's `_SaverDict`, so the
+    handler decides when the trait data is actually saved.
+
+    """
+
+    def __init__(self, handler, attr):
+        self.handler = handler
+        self.attr = attr
+
+    @property
+    def pk(self):
+        return self.attr.pk
+
+    @property
+    def value(self):
+        return self.attr.value
+
+    @value.setter
+    def value(self, trait_data):
+        self.handler._at_trait_data_change()
+
+
+def modify_traits(objs, trait_key, amount, prop="current", traithandler_name="traits"):
+    """
+    Change a numerical property of the same Trait on many objects at once, like
+    applying damage or regeneration to everyone in a combat tick. The changed
+    traits are all saved together at the end.
+
+    Args:
+        objs (iterable): Objects with a TraitHandler. Objects without the handler or
+            the Trait are skipped.
+        trait_key (str): The Trait to change, like "hp".
+        amount (int, float or dict): How much to add to the property (negative to
+            subtract). If a dict `{obj: amount}`, each object gets its own amount.
+        prop (str, optional): The Trait property to change, like "current", "base"
+            or "mod". The usual limits of the Trait apply.
+        traithandler_name (str, optional): Name of the TraitHandler on the objects.
+
+    Returns:
+        dict: `{obj: value}` with the new `.value` of the Trait for every object
+            having the Trait.
+
+    """
+    values = {}
+    with TRAIT_SAVER.deferred():
+        for obj in objs:
+            handler = getattr(obj, traithandler_name, None)
+            trait = handler.get(trait_key) if handler is not None else None
+            if trait is None:
+                continue
+            change = amount.get(obj, 0) if isinstance(amount, dict) else amount
+            if change:
+                setattr(trait, prop, getattr(trait, prop) + change)
+            values[obj] = trait.value
+    return values
+
+
 class TraitHandler:
     """
     Factory class that instantiates Trait objects. Must be assigned as a property
@@ -555,7 +724,13 @@ class TraitHandler:
 
     """
 
-    def __init__(self, obj, db_attribute_key="traits", db_attribute_category="traits"):
+    def __init__(
+        self,
+        obj,
+        db_attribute_key="traits",
+        db_attribute_category="traits",
+        deferred_save=False,
+    ):
         """
         Initialize the handler and set up its internal Attribute-based storage.
 
@@ -563,6 +738,8 @@ class TraitHandler:
             obj (Object): Parent Object typeclass for this TraitHandler
             db_attribute_key (str): Name of the DB attribute for trait data storage.
             db_attribute_category (str):  Name of DB attribute's category to trait data storage.
+            deferred_save (bool): If set, changes to the traits are not saved right away,
+                but together with other handlers' changes by `TRAIT_SAVER`.
 
         """
         # load the available classes, if necessary
@@ -578,6 +755,12 @@ class TraitHandler:
             obj.attributes.add(db_attribute_key, {}, category=db_attribute_category)
             self.trait_data = obj.attributes.get(db_attribute_key, category=db_attribute_category)
         self._cache = {}
+        self.deferred_save = deferred_save
+        self._unsaved = False
+        # take over saving from the Attribute
+        self._attr = getattr(self.trait_data, "_db_obj", None)
+        if self._attr is not None:
+            self.trait_data._db_obj = _TraitStorage(self, self._attr)
 
     def __len__(self):
         """Return number of Traits registered with the handler"""
@@ -591,7 +774,13 @@ class TraitHandler:
             trait_key (str): The Trait-key, like "hp".
             value (any): Data to store.
         """
-        if trait_key in ("trait_data", "_cache"):
+        if trait_key in (
+            "trait_data",
+            "_cache",
+            "deferred_save",
+            "_unsaved",
+            "_attr",
+        ):
             _SA(self, trait_key, value)
         else:
             trait_cls = self._get_trait_class(trait_key=trait_key)
@@ -733,6 +922,27 @@ class TraitHandler:
         for trait_key in self.all():
             self.remove(trait_key)
 
+    def _at_trait_data_change(self):
+        """
+        Called whenever the trait data changes and would be saved.
+
+        """
+        self._unsaved = True
+        if self.deferred_save or TRAIT_SAVER.deferring:
+            TRAIT_SAVER.add(self)
+        else:
+            self.save()
+
+    def save(self):
+        """
+        Save all trait data to the database, if it has unsaved changes. This
+        always saves all traits of the handler, as one Attribute.
+
+        """
+        if self._unsaved and self._attr is not None and self._attr.pk:
+            self._attr.value = self.trait_data
+        self._unsaved = False
+
 
 class TraitProperty:
     """
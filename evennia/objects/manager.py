@@ -6,11 +6,16 @@ import re
 
 from django.conf import settings
 from django.db import connection
-from django.db.models import Q
+from django.db.models import Case, Q, When
 from django.db.models.fields import exceptions
 
 from evennia.server import signals
-from evennia.typeclasses.managers import TypeclassManager, TypedObjectManager
+from evennia.typeclasses.managers import (
+    TypeclassManager,
+    TypedObjectManager,
+    _indexed_value_query,
+)
+from evennia.typeclasses.searchindex import MAX_INDEX_IDS, SEARCH_INDEX
 from evennia.utils.utils import (
     class_from_module,
     dbid_to_obj,
@@ -24,8 +29,10 @@ _GA = object.__getattribute__
 
 # delayed import
 _ATTR = None
+_CONTENTS_HANDLER = None
 
 _MULTIMATCH_REGEX = re.compile(settings.SEARCH_MULTIMATCH_REGEX, re.I + re.U)
+_SEARCH_NAME_INDEX = settings.SEARCH_NAME_INDEX
 
 # Try to use a custom way to parse id-tagged multimatches.
 
@@ -170,7 +177,7 @@ class ObjectDBManager(TypedObjectManager):
         )
 
     def get_objs_with_attr_value(
-        self, attribute_name, attribute_value, candidates=None, typeclasses=None
+        self, attribute_name, attribute_value, candidates=None, typeclasses=None, lookup=None
     ):
         """
         Get all objects having the given attrname set to the given value.
@@ -181,17 +188,25 @@ class ObjectDBManager(TypedObjectManager):
                 objects.
             candidates (list, optional): Candidate objects to limit search to.
             typeclasses (list, optional): Python pats to restrict matches with.
+            lookup (str, optional): If given, match using the indexed Attribute values
+                instead of the pickled value. This is a Django-style lookup, like `"gt"`,
+                `"in"` or `"range"` and requires `settings.ATTRIBUTE_VALUE_INDEXING`.
 
         Returns:
             Queryset: Iterable with 0, 1 or more matches fullfilling both the `attribute_name` and
                 `attribute_value` criterions.
 
         Notes:
-            This uses the Attribute's PickledField to transparently search the database by matching
-            the internal representation. This is reasonably effective but since Attribute values
-            cannot be indexed, searching by Attribute key is to be preferred whenever possible.
+            Without `lookup`, this uses the Attribute's PickledField to transparently search the
+            database by matching the internal representation. This is reasonably effective but
+            since pickled values cannot be indexed, searching by Attribute key is to be preferred
+            whenever possible.
 
         """
+        if lookup:
+            value_restriction = _indexed_value_query("db_attributes__", lookup, attribute_value)
+        else:
+            value_restriction = Q(db_attributes__db_value=attribute_value)
         cand_restriction = (
             candidates is not None
             and Q(pk__in=[_GA(obj, "id") for obj in make_iter(candidates) if obj])
@@ -203,7 +218,7 @@ class ObjectDBManager(TypedObjectManager):
             cand_restriction
             & type_restriction
             & Q(db_attributes__db_key=attribute_name)
-            & Q(db_attributes__db_value=attribute_value)
+            & value_restriction
         ).order_by("id")
         return results
 
@@ -317,6 +332,15 @@ class ObjectDBManager(TypedObjectManager):
         candidates_id = [_GA(obj, "id") for obj in make_iter(candidates) if obj]
         cand_restriction = candidates is not None and Q(pk__in=candidates_id) or Q()
         type_restriction = typeclasses and Q(db_typeclass_path__in=make_iter(typeclasses)) or Q()
+
+        if _SEARCH_NAME_INDEX:
+            # resolve the matching ids from the in-memory name index
+            pks = SEARCH_INDEX.search(self.model, ostring, mode="exact" if exact else "words")
+            if candidates is not None:
+                pks.intersection_update(candidates_id)
+            if len(pks) <= MAX_INDEX_IDS:
+                return self.filter(type_restriction & Q(pk__in=pks)).order_by("id")
+
         if exact:
             # exact matches only
             return (
@@ -355,8 +379,169 @@ class ObjectDBManager(TypedObjectManager):
             .order_by("id")
         )
 
+    def get_cached_objs_with_key_or_alias(
+        self, ostring, exact=True, candidates=None, typeclasses=None
+    ):
+        """
+        In-memory version of `get_objs_with_key_or_alias`, searching only among
+        the given candidates. Candidates are looked up using the key/alias index
+        of the contents-cache of their respective locations, so this will
+        normally not touch the database at all.
+
+        Args:
+            ostring (str): A search criterion.
+            exact (bool, optional): Require exact match of ostring
+                (still case-insensitive). If `False`, will do partial word-start matching.
+            candidates (list): Only match among these candidates.
+            typeclasses (list): Only match objects with typeclasses having these path strings.
+
+        Returns:
+            list: A list of 0, 1 or more matches, ordered by id.
+
+        """
+        global _CONTENTS_HANDLER
+        if not _CONTENTS_HANDLER:
+            from evennia.objects.models import ContentsHandler as _CONTENTS_HANDLER
+
+        if not isinstance(ostring, str):
+            if hasattr(ostring, "key"):
+                ostring = ostring.key
+            else:
+                return []
+        candidates = {_GA(obj, "id"): obj for obj in make_iter(candidates) if obj}
+        # group by location, to search each location's contents-index only once
+        locations = {}
+        matches = {}
+        for obj in candidates.values():
+            location = obj.db_location
+            if location:
+                locations[location.id] = location
+            else:
+                # not in a location, so not indexed anywhere; match directly
+                if _CONTENTS_HANDLER.match_names(obj, ostring, exact=exact):
+                    matches[obj.id] = obj
+        for location in locations.values():
+            matches.update(
+                (match.id, match)
+                for match in location.contents_cache.search(ostring, exact=exact)
+                if match.id in candidates
+            )
+        typeclasses = (
+            {
+                "%s.%s" % (tclass.__module__, tclass.__name__) if callable(tclass) else str(tclass)
+                for tclass in make_iter(typeclasses)
+            }
+            if typeclasses
+            else None
+        )
+        return [
+            obj
+            for pk, obj in sorted(matches.items())
+            if not typeclasses or obj.db_typeclass_path in typeclasses
+        ]
+
     # main search methods and helper functions
 
+    def search_object_in_candidates(
+        self,
+        searchdata,
+        candidates,
+        typeclass=None,
+        exact=True,
+        use_dbref=True,
+        tags=None,
+    ):
+        """
+        In-memory version of `search_object` for non-Attribute searches among a
+        known list of candidates (like when searching the current location). It
+        resolves keys and aliases via the contents-cache of the candidates'
+        locations instead of querying the database.
+
+        Args:
+            searchdata (str or Object): The entity to match for. Will be matched
+                against the candidates' key and aliases.
+            candidates (list): The objects to search among.
+            typeclass (str, TypeClass or list, optional): Restrict matches to objects
+                having this typeclass.
+            exact (bool): Match names/aliases exactly or partially.
+            use_dbref (bool): If False, bypass direct lookup of a string
+                on the form #dbref and treat it like any string.
+            tags (list): A list of tuples `(tagkey, tagcategory)` where the
+                matched object must have _all_ tags in order to be considered
+                a match.
+
+        Returns:
+            QuerySet: A QuerySet of 0, 1 or more matching objects, like from
+                `search_object`. The matching is done in memory; getting the
+                matches from the QuerySet is a single lookup by id.
+
+        """
+        candidates = [cand for cand in make_iter(candidates) if cand]
+        if not candidates:
+            return self.none()
+
+        dbref = exact and use_dbref and self.dbref(searchdata)
+        if dbref:
+            # dbref matching (always exact)
+            dbref = int(dbref)
+            dbref_match = [cand for cand in candidates if cand.id == dbref]
+            if dbref_match:
+                return self._queryset_of(dbref_match)
+            if self.model.get_cached_instance(dbref) or self.filter(id=dbref).exists():
+                # the object exists, but is not among the candidates
+                return self.none()
+
+        def _searcher(searchdata, exact):
+            matches = self.get_cached_objs_with_key_or_alias(
+                searchdata, exact=exact, candidates=candidates, typeclasses=typeclass
+            )
+            if matches and tags:
+                matches = [
+                    match
+                    for match in matches
+                    if all(match.tags.has(tagkey, category=tagcat) for tagkey, tagcat in tags)
+                ]
+            return matches
+
+        # always run exact check first - we don't want partial matches
+        # if on the form of 1-keyword etc.
+        match_number = None
+        matches = _searcher(searchdata, exact=True)
+
+        stripped_searchdata = searchdata
+        if not matches:
+            # check if we are dealing with N-keyword query - if so, strip it.
+            match_data = _MULTIMATCH_REGEX.match(str(searchdata))
+            if match_data:
+                match_number = int(match_data.group("number")) - 1
+                stripped_searchdata = match_data.group("name")
+                matches = _searcher(stripped_searchdata, exact=True)
+
+        if not exact and not matches:
+            matches = _searcher(stripped_searchdata, exact=False)
+
+        if match_number is not None:
+            matches = [matches[match_number]] if 0 <= match_number < len(matches) else []
+        return self._queryset_of(matches)
+
+    def _queryset_of(self, objs):
+        """
+        Make a QuerySet of objects we already have.
+
+        Args:
+            objs (list): The objects, in the order to return them.
+
+        Returns:
+            QuerySet: The QuerySet of the objects, ordered as given.
+
+        """
+        if not objs:
+            return self.none()
+        ids = [obj.id for obj in objs]
+        return self.filter(id__in=ids).order_by(
+            Case(*(When(id=pk, then=position) for position, pk in enumerate(ids)))
+        )
+
     def search_object(
         self,
         searchdata,
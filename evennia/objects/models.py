@@ -14,6 +14,7 @@ the database object. Like everything else, they can be accessed
 transparently through the decorating TypeClass.
 """
 
+import re
 from collections import defaultdict
 
 from django.conf import settings
@@ -26,6 +27,17 @@ from evennia.typeclasses.models import TypedObject
 from evennia.utils import logger
 from evennia.utils.utils import dbref, lazy_property, make_iter
 
+_RE_WORD = re.compile(r"\w+")
+
+
+def _build_search_regex(words):
+    """
+    Build a regex for partial word-start matching of (lowercase) search words,
+    in-memory equivalent of `ObjectDBManager._build_fuzzy_search_regex`.
+
+    """
+    return re.compile(r".* ".join(rf"\b{re.escape(word)}" for word in words) + r".*")
+
 
 class ContentsHandler:
     """
@@ -33,6 +45,14 @@ class ContentsHandler:
     lookups (this is done very often due to cmdhandler needing to look
     for object-cmdsets). It is stored on the 'contents_cache' property
     of the ObjectDB.
+
+    The contents are indexed by content-type and by typeclass, so that filtering
+    on those only needs to look at the matching objects. Tag-lookups are indexed
+    lazily; the index for a given tag is created the first time it is used and
+    is then kept up-to-date as objects and tags come and go. The same goes for the
+    key/alias index used by `search`, which allows for searching the contents
+    without querying the database.
+
     """
 
     def __init__(self, obj):
@@ -52,6 +72,14 @@ class ContentsHandler:
         self._pkcache = {}
         self._idcache = obj.__class__.__instance_cache__
         self._typecache = defaultdict(dict)
+        self._typeclasscache = defaultdict(dict)
+        self._tagcache = {}
+        # the index-keys each object was stored with, used for removal
+        self._indexkeys = {}
+        # key/alias search-indexes, created on first search
+        self._nameindex = None
+        self._wordindex = None
+        self._names = {}
         self.init()
 
     def load(self):
@@ -63,6 +91,160 @@ class ContentsHandler:
         """
         return list(self.obj.locations_set.all())
 
+    @staticmethod
+    def _tagkey(tag, tagtype=None):
+        """
+        Normalize tag-input to a key for the tag-index.
+
+        Args:
+            tag (str or tuple): A tag-key or a tuple `(tagkey, category)`.
+            tagtype (str, optional): The type of tag, like `"alias"`. `None` for
+                normal tags.
+
+        Returns:
+            tuple: The index key `(tagkey, category, tagtype)`.
+
+        """
+        key, category = tag if isinstance(tag, tuple) else (tag, None)
+        return (
+            str(key).strip().lower(),
+            category.strip().lower() if category else None,
+            tagtype,
+        )
+
+    @staticmethod
+    def _has_tag(obj, tagkey):
+        """
+        Check if an object has a tag matching an index key.
+
+        """
+        key, category, tagtype = tagkey
+        handler = obj.aliases if tagtype == "alias" else obj.tags
+        return handler.has(key, category=category)
+
+    def _index(self, obj):
+        """
+        Add an object to all indexes.
+
+        """
+        try:
+            ctypes = obj._content_types
+        except AttributeError:
+            logger.log_err(
+                f"Object {obj} has no `_content_types` property. Skipping content-cache setup. "
+                "This error suggests it is not a valid Evennia Typeclass but maybe a root model "
+                "like `ObjectDB`. Investigate the `db_typeclass_path` of the object and make sure "
+                "it points to a proper, existing Typeclass."
+            )
+            ctypes = ()
+        # index on the typeclass and all its parents, to allow for inheritance-lookups
+        tcpaths = tuple(
+            f"{cls.__module__}.{cls.__name__}" for cls in type(obj).__mro__ if cls is not object
+        )
+        pk = obj.pk
+        for ctype in ctypes:
+            self._typecache[ctype][pk] = True
+        for tcpath in tcpaths:
+            self._typeclasscache[tcpath][pk] = True
+        for tagkey, pks in self._tagcache.items():
+            if self._has_tag(obj, tagkey):
+                pks[pk] = True
+        self._indexkeys[pk] = (ctypes, tcpaths)
+        if self._nameindex is not None:
+            self._index_names(obj)
+
+    def _unindex(self, pk):
+        """
+        Remove an object (by pk) from all indexes.
+
+        """
+        ctypes, tcpaths = self._indexkeys.pop(pk, ((), ()))
+        for ctype in ctypes:
+            self._typecache[ctype].pop(pk, None)
+        for tcpath in tcpaths:
+            self._typeclasscache[tcpath].pop(pk, None)
+        for pks in self._tagcache.values():
+            pks.pop(pk, None)
+        self._unindex_names(pk)
+
+    @staticmethod
+    def _get_names(obj):
+        """
+        Get the lowercase names (key and aliases) an object can be searched by.
+
+        """
+        return tuple(
+            dict.fromkeys(
+                str(name).lower() for name in [obj.db_key] + obj.aliases.all() if name is not None
+            )
+        )
+
+    @classmethod
+    def match_names(cls, obj, searchdata, exact=True):
+        """
+        Check if an object's key or aliases match a search, without using an index.
+
+        Args:
+            obj (Object): The object to check.
+            searchdata (str): The key or alias to search for (case-insensitive).
+            exact (bool, optional): If unset, do partial word-start matching, like in `search`.
+
+        Returns:
+            bool: If the object matches.
+
+        """
+        names = cls._get_names(obj)
+        searchdata = searchdata.lower()
+        if exact:
+            return searchdata in names
+        words = searchdata.split()
+        if not words:
+            return True
+        regex = _build_search_regex(words)
+        return any(regex.search(name) for name in names)
+
+    def _index_names(self, obj):
+        """
+        Add an object's key and aliases to the search-indexes.
+
+        """
+        pk = obj.pk
+        names = self._get_names(obj)
+        self._names[pk] = names
+        for name in names:
+            self._nameindex[name][pk] = True
+            for word in _RE_WORD.findall(name):
+                self._wordindex[word][pk] = True
+
+    def _unindex_names(self, pk):
+        """
+        Remove an object (by pk) from the search-indexes.
+
+        """
+        for name in self._names.pop(pk, ()):
+            pks = self._nameindex.get(name)
+            if pks is not None:
+                pks.pop(pk, None)
+                if not pks:
+                    del self._nameindex[name]
+            for word in _RE_WORD.findall(name):
+                pks = self._wordindex.get(word)
+                if pks is not None:
+                    pks.pop(pk, None)
+                    if not pks:
+                        del self._wordindex[word]
+
+    def _build_name_index(self):
+        """
+        Create the key/alias search-indexes for all contents.
+
+        """
+        self._nameindex = defaultdict(dict)
+        self._wordindex = defaultdict(dict)
+        self._names = {}
+        for pk in self._pkcache:
+            self._index_names(self._idcache[pk])
+
     def init(self):
         """
         Re-initialize the content cache
@@ -70,52 +252,141 @@ class ContentsHandler:
         """
         objects = self.load()
         self._typecache = defaultdict(dict)
+        self._typeclasscache = defaultdict(dict)
+        self._tagcache = {}
+        self._indexkeys = {}
+        self._nameindex = None
+        self._wordindex = None
+        self._names = {}
         self._pkcache = {obj.pk: True for obj in objects}
         for obj in objects:
-            try:
-                ctypes = obj._content_types
-            except AttributeError:
-                logger.log_err(
-                    f"Object {obj} has no `_content_types` property. Skipping content-cache setup. "
-                    "This error suggests it is not a valid Evennia Typeclass but maybe a root model "
-                    "like `ObjectDB`. Investigate the `db_typeclass_path` of the object and make sure "
-                    "it points to a proper, existing Typeclass."
-                )
-            else:
-                for ctype in obj._content_types:
-                    self._typecache[ctype][obj.pk] = True
+            self._index(obj)
+
+    def _get_tag_index(self, tag, tagtype=None):
+        """
+        Get the index for a given tag, building it if needed.
+
+        """
+        tagkey = self._tagkey(tag, tagtype=tagtype)
+        if tagkey not in self._tagcache:
+            self._tagcache[tagkey] = {
+                pk: True for pk in self._pkcache if self._has_tag(self._idcache[pk], tagkey)
+            }
+        return self._tagcache[tagkey]
+
+    def _get_pks(self, content_type=None, typeclass=None, tag=None):
+        """
+        Get the pks of the contents matching all the given filters.
 
-    def get(self, exclude=None, content_type=None):
+        """
+        indexes = []
+        if content_type is not None:
+            indexes.append(self._typecache[content_type])
+        if typeclass is not None:
+            if not isinstance(typeclass, str):
+                typeclass = f"{typeclass.__module__}.{typeclass.__name__}"
+            indexes.append(self._typeclasscache[typeclass])
+        if tag is not None:
+            indexes.append(self._get_tag_index(tag))
+
+        if not indexes:
+            return self._pkcache.keys()
+        if len(indexes) == 1:
+            return indexes[0].keys()
+        # intersect, starting with the smallest index
+        indexes = sorted(indexes, key=len)
+        return [pk for pk in indexes[0] if all(pk in index for index in indexes[1:])]
+
+    def get(self, exclude=None, content_type=None, typeclass=None, tag=None):
         """
         Return the contents of the cache.
 
         Args:
             exclude (Object or list of Object): object(s) to ignore
             content_type (str or None): Filter list by a content-type. If None, don't filter.
+            typeclass (str or class, optional): Only return objects of this typeclass or
+                a child of it. Can be given as a class or as a python-path.
+            tag (str or tuple, optional): Only return objects with this tag. This is either
+                a tag-key or a tuple `(tagkey, category)`.
 
         Returns:
             objects (list): the Objects inside this location
 
         """
-        if content_type is not None:
-            pks = self._typecache[content_type].keys()
-        else:
-            pks = self._pkcache.keys()
-        if exclude:
-            pks = set(pks) - {excl.pk for excl in make_iter(exclude)}
+        exclude = {excl.pk for excl in make_iter(exclude)} if exclude else None
         try:
-            return [self._idcache[pk] for pk in pks]
+            pks = self._get_pks(content_type=content_type, typeclass=typeclass, tag=tag)
+            return [self._idcache[pk] for pk in pks if not (exclude and pk in exclude)]
         except KeyError:
             # this can happen if the idmapper cache was cleared for an object
             # in the contents cache. If so we need to re-initialize and try again.
             self.init()
             try:
-                return [self._idcache[pk] for pk in pks]
+                pks = self._get_pks(content_type=content_type, typeclass=typeclass, tag=tag)
+                return [self._idcache[pk] for pk in pks if not (exclude and pk in exclude)]
             except KeyError:
                 # this means an actual failure of caching. Return real database match.
                 logger.log_err("contents cache failed for %s." % self.obj.key)
                 return self.load()
 
+    def _search_pks(self, searchdata, exact=True):
+        """
+        Get the pks of the contents matching a key/alias search.
+
+        """
+        if self._nameindex is None:
+            self._build_name_index()
+        searchdata = searchdata.lower()
+        if exact:
+            return list(self._nameindex.get(searchdata, ()))
+
+        # partial word-start matching, same as ObjectDBManager.get_objs_with_key_or_alias
+        words = searchdata.split()
+        if not words:
+            return list(self._pkcache)
+        regex = _build_search_regex(words)
+        leading = _RE_WORD.match(words[0])
+        if leading:
+            # only objects having a word starting like the first search word can match
+            leading = leading.group()
+            candidates = {}
+            for word, pks in self._wordindex.items():
+                if word.startswith(leading):
+                    candidates.update(pks)
+        else:
+            candidates = self._pkcache
+        return [
+            pk for pk in candidates if any(regex.search(name) for name in self._names.get(pk, ()))
+        ]
+
+    def search(self, searchdata, exact=True):
+        """
+        Search the contents by key or alias. This uses an in-memory index and
+        will not query the database.
+
+        Args:
+            searchdata (str): The key or alias to search for (case-insensitive).
+            exact (bool, optional): If set, the key/alias must match exactly. Otherwise
+                the search-words must match the beginning of words in the key/alias, so
+                that e.g. "bi sw" will match "Big sword".
+
+        Returns:
+            list: The matching objects, in order of creation.
+
+        """
+        try:
+            pks = self._search_pks(searchdata, exact=exact)
+            return [self._idcache[pk] for pk in sorted(pks)]
+        except KeyError:
+            # idmapper cache was cleared for an object in the contents cache
+            self.init()
+            try:
+                pks = self._search_pks(searchdata, exact=exact)
+                return [self._idcache[pk] for pk in sorted(pks)]
+            except KeyError:
+                logger.log_err("contents cache failed for %s." % self.obj.key)
+                return []
+
     def add(self, obj):
         """
         Add a new object to this location
@@ -124,9 +395,9 @@ class ContentsHandler:
             obj (Object): object to add
 
         """
-        self._pkcache[obj.pk] = obj
-        for ctype in obj._content_types:
-            self._typecache[ctype][obj.pk] = True
+        self._pkcache[obj.pk] = True
+        self._unindex(obj.pk)
+        self._index(obj)
 
     def remove(self, obj):
         """
@@ -137,9 +408,44 @@ class ContentsHandler:
 
         """
         self._pkcache.pop(obj.pk, None)
-        for ctype in obj._content_types:
-            if obj.pk in self._typecache[ctype]:
-                self._typecache[ctype].pop(obj.pk, None)
+        self._unindex(obj.pk)
+
+    def update(self, obj):
+        """
+        Re-index an object already in this location. This is called when something
+        that is indexed (like its typeclass) changes.
+
+        Args:
+            obj (Object): The object to re-index.
+
+        """
+        if obj.pk in self._pkcache:
+            self._unindex(obj.pk)
+            self._index(obj)
+
+    def update_tags(self, obj, tagtype=None):
+        """
+        Update the tag-indexes for an object in this location. This is called by the
+        object's `TagHandler` whenever its tags change.
+
+        Args:
+            obj (Object): The object which had its tags changed.
+            tagtype (str, optional): The type of tag that changed, like `"alias"`.
+
+        """
+        pk = obj.pk
+        if pk not in self._pkcache:
+            return
+        if tagtype == "alias" and self._nameindex is not None:
+            self._unindex_names(pk)
+            self._index_names(obj)
+        for tagkey, pks in self._tagcache.items():
+            if tagkey[2] != tagtype:
+                continue
+            if self._has_tag(obj, tagkey):
+                pks[pk] = True
+            else:
+                pks.pop(pk, None)
 
     def clear(self):
         """
@@ -148,6 +454,12 @@ class ContentsHandler:
         """
         self._pkcache = {}
         self._typecache = defaultdict(dict)
+        self._typeclasscache = defaultdict(dict)
+        self._tagcache = {}
+        self._indexkeys = {}
+        self._nameindex = None
+        self._wordindex = None
+        self._names = {}
         self.init()
 
 
@@ -281,6 +593,15 @@ class ObjectDB(TypedObject):
     def contents_cache(self):
         return ContentsHandler(self)
 
+    def swap_typeclass(self, *args, **kwargs):
+        """
+        Swap the typeclass, making sure to update the contents-cache of our location.
+
+        """
+        super().swap_typeclass(*args, **kwargs)
+        if self.db_location:
+            self.db_location.contents_cache.update(self)
+
     # cmdset_storage property handling
     def __cmdset_storage_get(self):
         """getter"""
@@ -371,6 +692,18 @@ class ObjectDB(TypedObject):
 
     location = property(__location_get, __location_set, __location_del)
 
+    def at_db_key_postsave(self, new):
+        """
+        This is called automatically after the key field was saved. It makes
+        sure the key-index of our location's contents-cache stays up-to-date.
+
+        Args:
+            new (bool): Set if this object has not yet been saved before.
+
+        """
+        if not new and self.db_location:
+            self.db_location.contents_cache.update(self)
+
     def at_db_location_postsave(self, new):
         """
         This is called automatically after the location field was
@@ -474,7 +474,7 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
             and not self.db_account.attributes.get("_quell")
         )
 
-    def contents_get(self, exclude=None, content_type=None):
+    def contents_get(self, exclude=None, content_type=None, typeclass=None, tag=None):
         """
         Returns the contents of this object, i.e. all
         objects that has this object set as its location.
@@ -485,6 +485,10 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
                 contents list
             content_type (str): A content_type to filter by. None for no
                 filtering.
+            typeclass (str or class, optional): Only return contents of this
+                typeclass (or a child of it).
+            tag (str or tuple, optional): Only return contents with this Tag, given
+                as a tag-key or a tuple `(tagkey, category)`.
 
         Returns:
             list: List of contents of this Object.
@@ -494,7 +498,9 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
             filtering on content-types.
 
         """
-        return self.contents_cache.get(exclude=exclude, content_type=content_type)
+        return self.contents_cache.get(
+            exclude=exclude, content_type=content_type, typeclass=typeclass, tag=tag
+        )
 
     def contents_set(self, *args):
         "Makes sure `.contents` is read-only. Raises `AttributeError` if trying to set it."
@@ -642,6 +648,16 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
 
         """
 
+        if candidates is not None and not attribute_name:
+            # a local search of key/aliases can be resolved without the database
+            return ObjectDB.objects.search_object_in_candidates(
+                searchdata,
+                candidates,
+                typeclass=typeclass,
+                exact=exact,
+                use_dbref=use_dbref,
+                tags=tags,
+            )
         return ObjectDB.objects.search_object(
             searchdata,
             attribute_name=attribute_name,
@@ -683,7 +699,7 @@ class DefaultObject(ObjectDB, metaclass=TypeclassBase):
                 # we re-run exact match against one of the matches to make sure all are indeed
                 # equal and we were not catching partial matches not belonging to the stack
                 nstack = len(
-                    ObjectDB.objects.get_objs_with_key_or_alias(
+                    ObjectDB.objects.get_cached_objs_with_key_or_alias(
                         results[0].key,
                         exact=True,
                         candidates=list(results),
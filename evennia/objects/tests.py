@@ -342,6 +342,49 @@ class TestObjectManager(BaseEvenniaTest):
         query = ObjectDB.objects.get_objs_with_key_or_alias("sw b", exact=False)
         self.assertEqual(list(query), [])
 
+    def test_search_object_in_candidates(self):
+        def _search(*args, **kwargs):
+            return list(ObjectDB.objects.search_object_in_candidates(*args, **kwargs))
+
+        self.obj1.key = "big sword"
+        self.obj2.key = "shiny sword"
+        self.obj2.aliases.add("blade")
+        self.obj2.aliases.add(f"#{self.room1.id}")
+        self.obj1.aliases.add("#999999")
+        candidates = self.room1.contents
+        # building the index loads the aliases once, after which the matching needs
+        # no queries; only getting the matches from the QuerySet does
+        _search("sword", candidates + [self.room1])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(_search("sw", candidates, exact=False), [self.obj1, self.obj2])
+        with self.assertNumQueries(0):
+            self.assertEqual(_search("wor", candidates, exact=False), [])
+        self.assertEqual(_search("b sw", candidates, exact=False), [self.obj1])
+        self.assertEqual(_search("BLADE", candidates), [self.obj2])
+        self.assertEqual(_search("sword-2", candidates, exact=False), [self.obj2])
+        self.assertEqual(_search(f"#{self.obj1.id}", candidates), [self.obj1])
+        # an existing object not among the candidates is no match, even if an alias matches
+        self.assertEqual(_search(f"#{self.room1.id}", candidates), [])
+        # a dbref without an object is searched for as a name
+        self.assertEqual(_search("#999999", candidates), [self.obj1])
+        self.assertEqual(_search("sword", candidates, exact=False, typeclass=DefaultCharacter), [])
+        # candidates not in any location are matched directly
+        self.assertEqual(_search("room", [self.room1], exact=False), [self.room1])
+
+        # the result is a QuerySet like from search_object, ordered by id
+        result = ObjectDB.objects.search_object_in_candidates("sword", candidates, exact=False)
+        self.assertEqual(list(result.reverse()), [self.obj2, self.obj1])
+        self.assertEqual(list(result.filter(db_key__startswith="big")), [self.obj1])
+
+        # the index follows key- and alias-changes
+        self.obj1.key = "rusty axe"
+        self.obj2.aliases.remove("blade")
+        self.obj1.aliases.add("blade")
+        self.assertEqual(_search("sword", candidates, exact=False), [self.obj2])
+        self.assertEqual(_search("blade", candidates), [self.obj1])
+        self.assertEqual(list(self.char1.search("rusty", quiet=True)), [self.obj1])
+
     def test_search_object(self):
         self.char1.tags.add("test tag")
         self.obj1.tags.add("test tag")
@@ -434,6 +477,47 @@ class TestContentHandler(BaseEvenniaTest):
         )
         self.assertEqual(set(self.room1.contents_get(content_type="exit")), set([self.exit]))
 
+    def test_typeclass_index(self):
+        self.assertEqual(
+            set(self.room1.contents_get(typeclass=DefaultCharacter)), set([self.char1, self.char2])
+        )
+        # parents are indexed too
+        self.assertEqual(
+            set(self.room1.contents_get(typeclass="evennia.objects.objects.DefaultObject")),
+            set([self.char1, self.char2, self.obj1, self.obj2, self.exit]),
+        )
+        self.obj1.swap_typeclass(DefaultCharacter)
+        self.assertEqual(
+            set(self.room1.contents_get(typeclass=DefaultCharacter)),
+            set([self.char1, self.char2, self.obj1]),
+        )
+        self.assertEqual(
+            set(self.room1.contents_get(content_type="character")),
+            set([self.char1, self.char2, self.obj1]),
+        )
+
+    def test_tag_index(self):
+        self.obj1.tags.add("shiny")
+        self.char1.tags.add("shiny", category="looks")
+        self.assertEqual(self.room1.contents_get(tag="shiny"), [self.obj1])
+        self.assertEqual(self.room1.contents_get(tag=("shiny", "looks")), [self.char1])
+
+        # tag-changes and moves are tracked by the index
+        self.obj2.tags.add("shiny")
+        self.assertEqual(self.room1.contents_get(tag="shiny"), [self.obj1, self.obj2])
+        self.obj1.tags.remove("shiny")
+        self.assertEqual(self.room1.contents_get(tag="shiny"), [self.obj2])
+        self.obj2.move_to(self.room2)
+        self.assertEqual(self.room1.contents_get(tag="shiny"), [])
+        self.obj2.move_to(self.room1)
+        self.assertEqual(self.room1.contents_get(tag="shiny"), [self.obj2])
+
+        # combined filters
+        self.assertEqual(self.room1.contents_get(content_type="character", tag="shiny"), [])
+        self.assertEqual(
+            self.room1.contents_get(content_type="object", tag="shiny", exclude=self.obj2), []
+        )
+
     def test_contents_order(self):
         """Move object from room to room in various ways"""
         self.assertEqual(
@@ -101,6 +101,21 @@ class MonitorHandler(object):
         """
         return f"{fieldname}[{category}]" if category else fieldname
 
+    def is_monitored(self, obj):
+        """
+        Check if an entity has any active monitors. This is called on every
+        database save, so it must stay cheap.
+
+        Args:
+            obj (Typeclassed Entity or Attribute): The entity to check.
+
+        Returns:
+            bool: If any of the entity's fields are monitored.
+
+        """
+        fields = self.monitors.get(obj)
+        return bool(fields) and any(fields.values())
+
     def at_update(self, obj, fieldname):
         """
         Called by the field/attribute as it saves.
@@ -10,6 +10,7 @@ from django.conf import settings
 from twisted.internet import protocol
 
 import evennia
+from evennia.server import worker
 from evennia.server.portal import amp
 from evennia.utils import logger
 from evennia.utils.utils import class_from_module
@@ -64,7 +65,10 @@ class AMPClientFactory(protocol.ReconnectingClientFactory):
 
         """
         self.resetDelay()
-        self.server.amp_protocol = AMPServerClientProtocol()
+        if worker.WORKER_ID is None:
+            self.server.amp_protocol = AMPServerClientProtocol()
+        else:
+            self.server.amp_protocol = AMPWorkerClientProtocol()
         self.server.amp_protocol.factory = self
         return self.server.amp_protocol
 
@@ -252,3 +256,64 @@ class AMPServerClientProtocol(amp.AMPMultiConnectionProtocol):
             raise Exception("operation %(op)s not recognized." % {"op": operation})
 
         return {}
+
+
+class AMPWorkerClientProtocol(AMPServerClientProtocol):
+    """
+    The AMP-client of a Server worker (see `evennia.server.worker`). It registers
+    with the Portal as a worker and only mirrors the sessions of the main Server.
+
+    """
+
+    def connectionMade(self):
+        """
+        Called when a new connection is established.
+
+        """
+        info_dict = self.factory.server.get_info_dict()
+        amp.AMPMultiConnectionProtocol.connectionMade(self)
+        # register as a worker; the Portal answers with a PSYNC
+        self.send_AdminServer2Portal(
+            amp.DUMMYSESSION,
+            operation=amp.SWORKER,
+            worker_id=worker.WORKER_ID,
+            spid=os.getpid(),
+            info_dict=info_dict,
+        )
+
+    @amp.AdminPortal2Server.responder
+    @amp.catch_traceback
+    def server_receive_adminportal2server(self, packed_data):
+        """
+        Receives admin data from the Portal. A worker never calls any session
+        hooks, it only updates its mirror of the sessions.
+
+        Args:
+            packed_data (str): Incoming, pickled data.
+
+        """
+        sessid, kwargs = self.data_in(packed_data)
+        operation = kwargs.pop("operation", "")
+
+        if operation in (amp.PCONN, amp.PCONNSYNC):
+            worker.sync_session(kwargs.get("sessiondata"))
+
+        elif operation == amp.PDISCONN:
+            worker.remove_session(sessid)
+
+        elif operation == amp.PDISCONNALL:
+            worker.remove_all_sessions()
+
+        elif operation == amp.PSYNC:
+            worker.sync_sessions(kwargs.get("sessiondata"))
+            evennia.SERVER_SESSION_HANDLER.portal_start_time = kwargs.get("portal_start_time")
+
+        elif operation in (amp.SRELOAD, amp.SRESET, amp.SSHUTD):
+            # the Portal starts us again when needed
+            self.factory.stopTrying()
+            evennia.EVENNIA_SERVER_SERVICE.shutdown(mode="shutdown")
+
+        else:
+            raise Exception("operation %(op)s not recognized." % {"op": operation})
+
+        return {}
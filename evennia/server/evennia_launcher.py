@@ -70,6 +70,8 @@ PORTAL_PY_FILE = None
 SPROFILER_LOGFILE = None
 PPROFILER_LOGFILE = None
 
+ASYNCIO_REACTOR = False
+
 TEST_MODE = False
 ENFORCED_SETTING = False
 
@@ -531,6 +533,10 @@ def _get_twistd_cmdline(pprofiler, sprofiler):
         portal_cmd.append("--pidfile={}".format(PORTAL_PIDFILE))
         server_cmd.append("--pidfile={}".format(SERVER_PIDFILE))
 
+    if ASYNCIO_REACTOR:
+        # must be chosen before the Server imports the reactor
+        server_cmd.append("--reactor=asyncio")
+
     if pprofiler:
         portal_cmd.extend(
             ["--savestats", "--profiler=cprofile", "--profile={}".format(PPROFILER_LOGFILE)]
@@ -1812,6 +1818,7 @@ def init_game_directory(path, check_db=True, need_gamedir=True):
     global SERVER_LOGFILE, PORTAL_LOGFILE, HTTP_LOGFILE
     global SERVER_PIDFILE, PORTAL_PIDFILE
     global SPROFILER_LOGFILE, PPROFILER_LOGFILE
+    global ASYNCIO_REACTOR
     global EVENNIA_VERSION
 
     AMP_PORT = settings.AMP_PORT
@@ -1827,6 +1834,8 @@ def init_game_directory(path, check_db=True, need_gamedir=True):
     SPROFILER_LOGFILE = os.path.join(GAMEDIR, SERVERDIR, "logs", "server.prof")
     PPROFILER_LOGFILE = os.path.join(GAMEDIR, SERVERDIR, "logs", "portal.prof")
 
+    ASYNCIO_REACTOR = settings.ASYNCIO_REACTOR
+
     SERVER_LOGFILE = settings.SERVER_LOG_FILE
     PORTAL_LOGFILE = settings.PORTAL_LOG_FILE
     HTTP_LOGFILE = settings.HTTP_LOG_FILE
@@ -24,9 +24,11 @@ import importlib
 from codecs import lookup as codecs_lookup
 
 from django.conf import settings
+from twisted.internet import reactor
 
 from evennia.accounts.models import AccountDB
 from evennia.commands.cmdhandler import cmdhandler
+from evennia.utils.dbserialize import deserialize
 from evennia.utils.logger import log_err
 from evennia.utils.utils import to_str
 
@@ -415,6 +417,138 @@ def unrepeat(session, *args, **kwargs):
 _monitorable = {"name": "db_key", "location": "db_location", "desc": "desc"}
 
 
+def _get_monitor_delta(old, new):
+    """
+    Get the changes between two values of a monitored container.
+
+    Args:
+        old (any): The value last sent.
+        new (any): The current value.
+
+    Returns:
+        dict or None: `{"changed": {key: value, ...}, "removed": [key, ...]}` for dicts
+            and `{"appended": [item, ...]}` for lists that were only extended. None if
+            the full value must be sent.
+
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        return {
+            "changed": {key: val for key, val in new.items() if key not in old or old[key] != val},
+            "removed": [key for key in old if key not in new],
+        }
+    if isinstance(old, list) and isinstance(new, list) and new[: len(old)] == old:
+        return {"appended": new[len(old) :]}
+    return None
+
+
+class _MonitorPusher:
+    """
+    Sends the updates of monitors set up with `coalesce`, `delta` or `interval`.
+
+    All changes to the same field of an object are collected and sent to each
+    session once, at the end of the reactor tick or, if the monitor has an
+    `interval`, no sooner than `interval` seconds after the last update sent.
+    A value that ends up the same as the one last sent is not re-sent.
+
+    """
+
+    def __init__(self):
+        # {(sessid, obj, fieldname): (session, name, outputfunc_name, category, delta, interval)}
+        self.pending = {}
+        # {(sessid, obj, fieldname): (time_sent, value_sent, name)}
+        self.sent = {}
+        self._call = None
+
+    def _get_wait(self, key, interval):
+        if not interval or key not in self.sent:
+            return 0
+        return max(0, self.sent[key][0] + interval - reactor.seconds())
+
+    def _schedule(self, wait):
+        if self._call and self._call.active():
+            if self._call.getTime() - reactor.seconds() > wait:
+                self._call.reset(wait)
+        else:
+            self._call = reactor.callLater(wait, self.flush)
+
+    def add(self, session, obj, fieldname, name, outputfunc_name, category, delta, interval):
+        """
+        Queue an update of a monitored field.
+
+        Args:
+            session (Session): The session to send the update to.
+            obj (Object or Attribute): The entity that changed.
+            fieldname (str): The field that changed.
+            name (str): The name to report the update with.
+            outputfunc_name (str): The outputfunc to send with.
+            category (str or None): The Attribute category, if any.
+            delta (bool): Send only the changes of dicts/lists.
+            interval (float): The minimum time between two updates.
+
+        """
+        key = (session.sessid, obj, fieldname)
+        self.pending[key] = (session, name, outputfunc_name, category, delta, interval)
+        self._schedule(self._get_wait(key, interval))
+
+    def forget(self, sessid, name=None):
+        """
+        Drop the queued updates and sent-value history of a session.
+
+        Args:
+            sessid (int): The session id.
+            name (str, optional): Only forget the monitor with this name.
+
+        """
+        for key in list(self.pending):
+            if key[0] == sessid and (name is None or self.pending[key][1] == name):
+                del self.pending[key]
+        for key in list(self.sent):
+            if key[0] == sessid and (name is None or self.sent[key][2] == name):
+                del self.sent[key]
+
+    def flush(self):
+        """
+        Send all updates that are due.
+
+        """
+        self._call = None
+        pending, self.pending = self.pending, {}
+        waits = []
+        for key, update in pending.items():
+            session, name, outputfunc_name, category, delta, interval = update
+            wait = self._get_wait(key, interval)
+            if wait:
+                # not yet time to send this one
+                self.pending[key] = update
+                waits.append(wait)
+                continue
+            if not session.logged_in:
+                self.forget(session.sessid)
+                continue
+
+            _, obj, fieldname = key
+            value = deserialize(_GA(obj, fieldname))
+            last = self.sent.get(key)
+            if last and last[1] == value:
+                continue
+            self.sent[key] = (reactor.seconds(), value, name)
+
+            changes = _get_monitor_delta(last[1], value) if delta and last else None
+            callsign = {
+                outputfunc_name: {
+                    "name": name,
+                    **({"category": category} if category is not None else {}),
+                    **({"value": value} if changes is None else {"delta": changes}),
+                }
+            }
+            session.msg(**callsign)
+        if waits:
+            self._schedule(min(waits))
+
+
+_MONITOR_PUSHER = _MonitorPusher()
+
+
 def _on_monitor_change(**kwargs):
     fieldname = kwargs["fieldname"]
     obj = kwargs["obj"]
@@ -435,6 +569,18 @@ def _on_monitor_change(**kwargs):
     # else then edits the object
 
     if session:
+        if kwargs.get("coalesce") or kwargs.get("delta") or kwargs.get("interval"):
+            _MONITOR_PUSHER.add(
+                session,
+                obj,
+                fieldname,
+                name,
+                outputfunc_name,
+                category,
+                kwargs.get("delta", False),
+                kwargs.get("interval", 0),
+            )
+            return
         callsign = {
             outputfunc_name: {
                 "name": name,
@@ -458,6 +604,15 @@ def monitor(session, *args, **kwargs):
       outputfunc_name (str, optional): Change the name of
         the outputfunc name. This is used e.g. by MSDP which
         has its own specific output format.
+      coalesce (bool, optional): Send all changes made to the
+        field during the same server tick as one update.
+      delta (bool, optional): Implies `coalesce`. If the value is
+        a dict or list, only send what changed since the last
+        update, as `{"name": name, "delta": changes}`, where
+        `changes` is `{"changed": {...}, "removed": [...]}` for
+        dicts and `{"appended": [...]}` for extended lists.
+      interval (float, optional): Implies `coalesce`. Send at most
+        one update every `interval` seconds.
 
     """
     from evennia.scripts.monitorhandler import MONITOR_HANDLER
@@ -465,11 +620,17 @@ def monitor(session, *args, **kwargs):
     name = kwargs.get("name", None)
     outputfunc_name = kwargs.get("outputfunc_name", "monitor")
     category = kwargs.get("category", None)
+    try:
+        interval = max(0, float(kwargs.get("interval", 0) or 0))
+    except (TypeError, ValueError):
+        # malformed value from the client; don't rate-limit
+        interval = 0
     if name and name in _monitorable and session.puppet:
         field_name = _monitorable[name]
         obj = session.puppet
         if kwargs.get("stop", False):
             MONITOR_HANDLER.remove(obj, field_name, idstring=session.sessid)
+            _MONITOR_PUSHER.forget(session.sessid, name=name)
         else:
             # the handler will add fieldname and obj to the kwargs automatically
             MONITOR_HANDLER.add(
@@ -482,6 +643,9 @@ def monitor(session, *args, **kwargs):
                 session=session,
                 outputfunc_name=outputfunc_name,
                 category=category,
+                coalesce=bool(kwargs.get("coalesce", False)),
+                delta=bool(kwargs.get("delta", False)),
+                interval=interval,
             )
 
 
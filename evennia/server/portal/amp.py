@@ -41,6 +41,7 @@ PSHUTD = chr(16)  # portal (+server) shutdown
 SSHUTD = chr(17)  # server shutdown
 PSTATUS = chr(18)  # ping server or portal status
 SRESET = chr(19)  # server shutdown in reset mode
+SWORKER = chr(20)  # server worker registering with the portal
 
 NUL = b"\x00"
 NULNUL = b"\x00\x00"
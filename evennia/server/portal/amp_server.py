@@ -14,6 +14,8 @@ from twisted.internet import protocol
 
 import evennia
 from evennia.server.portal import amp
+from evennia.server.portal.worker_router import get_worker_cmd
+from evennia.server.worker import WORKER_ENV_VAR
 from evennia.utils import logger
 from evennia.utils.utils import class_from_module
 
@@ -69,6 +71,7 @@ class AMPServerFactory(protocol.ServerFactory):
         self.launcher_connection = None
         self.disconnect_callbacks = {}
         self.server_connect_callbacks = []
+        self.worker_router = class_from_module(settings.SERVER_WORKER_ROUTER_CLASS)()
 
     def buildProtocol(self, addr):
         """
@@ -104,6 +107,7 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             self.factory.portal.server_info_dict = {}
         if self.factory.launcher_connection == self:
             self.factory.launcher_connection = None
+        self.factory.worker_router.remove_worker(self)
 
         callback, args, kwargs = self.factory.disconnect_callbacks.pop(self, (None, None, None))
         if callback:
@@ -156,17 +160,42 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             # if no server connection is available, broadcast
             return self.broadcast(command, sessid, packed_data=amp.dumps((sessid, kwargs)))
 
-    def start_server(self, server_twistd_cmd):
+    def data_to_worker(self, command, sessid, **kwargs):
+        """
+        Send data across the wire to the Server worker on the other end of
+        this connection.
+
+        Args:
+            command (AMP Command): A protocol send command.
+            sessid (int): A unique Session id.
+            kwargs (any): Data to send. This will be pickled.
+
+        Returns:
+            deferred (deferred): A deferred with an errback.
+
+        """
+        return self.callRemote(command, packed_data=amp.dumps((sessid, kwargs))).addErrback(
+            self.errback, command.key
+        )
+
+    def start_server(self, server_twistd_cmd, worker_id=None):
         """
         (Re-)Launch the Evennia server.
 
         Args:
             server_twisted_cmd (list): The server start instruction
                 to pass to POpen to start the server.
+            worker_id (int, optional): If given, start a Server worker with this
+                id instead of the main Server.
 
         """
-        # start the Server
-        print("Portal starting server ... ")
+        env = getenv()
+        if worker_id is None:
+            # start the Server
+            print("Portal starting server ... ")
+        else:
+            env[WORKER_ENV_VAR] = str(worker_id)
+            server_twistd_cmd = get_worker_cmd(server_twistd_cmd, worker_id)
         process = None
         with open(settings.SERVER_LOG_FILE, "a") as logfile:
             # we link stdout to a file in order to catch
@@ -178,7 +207,7 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
                     create_no_window = 0x08000000
                     process = Popen(
                         server_twistd_cmd,
-                        env=getenv(),
+                        env=env,
                         bufsize=-1,
                         stdout=logfile,
                         stderr=STDOUT,
@@ -187,18 +216,30 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
 
                 else:
                     process = Popen(
-                        server_twistd_cmd, env=getenv(), bufsize=-1, stdout=logfile, stderr=STDOUT
+                        server_twistd_cmd, env=env, bufsize=-1, stdout=logfile, stderr=STDOUT
                     )
             except Exception:
                 logger.log_trace()
 
-            self.factory.portal.server_twistd_cmd = server_twistd_cmd
+            if worker_id is None:
+                self.factory.portal.server_twistd_cmd = server_twistd_cmd
             logfile.flush()
         if process and not _is_windows():
             # avoid zombie-process on Unix/BSD
             process.wait()
         return
 
+    def start_workers(self):
+        """
+        Launch the Server workers that are not running, if any are configured.
+        This is called once the main Server has connected.
+
+        """
+        server_twistd_cmd = getattr(self.factory.portal, "server_twistd_cmd", None)
+        if server_twistd_cmd:
+            for worker_id in self.factory.worker_router.missing_workers():
+                self.start_server(server_twistd_cmd, worker_id=worker_id)
+
     def wait_for_disconnect(self, callback, *args, **kwargs):
         """
         Add a callback for when this connection is lost.
@@ -241,6 +282,8 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             self.send_AdminPortal2Server(
                 amp.DUMMYSESSION, operation=amp.SSHUTD, server_restart_mode=mode
             )
+        # workers are restarted once the main server is back
+        self.factory.worker_router.stop_workers()
         # store the mode for use once server comes back up again
         self.factory.portal.server_restart_mode = mode
 
@@ -270,6 +313,9 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             deferred (Deferred): Asynchronous return.
 
         """
+        worker = self.factory.worker_router.route(session, kwargs)
+        if worker:
+            return worker.data_to_worker(amp.MsgPortal2Server, session.sessid, **kwargs)
         return self.data_to_server(amp.MsgPortal2Server, session.sessid, **kwargs)
 
     def send_AdminPortal2Server(self, session, operation="", **kwargs):
@@ -284,6 +330,8 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             data (str or dict, optional): Data used in the administrative operation.
 
         """
+        # workers need to know about connects and disconnects too
+        self.factory.worker_router.sync_session_admin(session.sessid, operation, **kwargs)
         return self.data_to_server(
             amp.AdminPortal2Server, session.sessid, operation=operation, **kwargs
         )
@@ -405,12 +453,26 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             packed_data (str): Data received, a pickled tuple (sessid, kwargs).
 
         """
-        self.factory.server_connection = self
-
         sessid, kwargs = self.data_in(packed_data)
 
         operation = kwargs.pop("operation")
         portal_sessionhandler = evennia.PORTAL_SESSION_HANDLER
+        worker_router = self.factory.worker_router
+
+        if operation == amp.SWORKER:  # server worker registering
+            # a worker has (re-)connected; give it all sessions to mirror
+            worker_router.add_worker(kwargs.get("worker_id"), self)
+            self.data_to_worker(
+                amp.AdminPortal2Server,
+                amp.DUMMYSESSION.sessid,
+                operation=amp.PSYNC,
+                sessiondata=portal_sessionhandler.get_all_sync_data(),
+                portal_start_time=self.factory.portal.start_time,
+            )
+            return {}
+
+        if not worker_router.is_worker(self):
+            self.factory.server_connection = self
 
         # logger.log_msg(f"Evennia Server->Portal admin data operation {ord(operation)}")
 
@@ -419,6 +481,7 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
             session = portal_sessionhandler.get(sessid)
             if session:
                 portal_sessionhandler.server_logged_in(session, kwargs.get("sessiondata"))
+                worker_router.sync_sessions([session])
 
         elif operation == amp.SDISCONN:  # server_session_disconnect
             # the server is ordering to disconnect the session
@@ -483,12 +546,19 @@ class AMPServerProtocol(amp.AMPMultiConnectionProtocol):
                     except Exception:
                         logger.log_trace()
                 self.factory.server_connect_callbacks = []
+            self.start_workers()
 
         elif operation == amp.SSYNC:  # server_session_sync
             # server wants to save session data to the portal,
             # maybe because it's about to shut down.
-            portal_sessionhandler.server_session_sync(
-                kwargs.get("sessiondata"), kwargs.get("clean", True)
+            sessiondata = kwargs.get("sessiondata")
+            portal_sessionhandler.server_session_sync(sessiondata, kwargs.get("clean", True))
+            worker_router.sync_sessions(
+                [
+                    portal_sessionhandler[sessid]
+                    for sessid in sessiondata
+                    if sessid in portal_sessionhandler
+                ]
             )
 
             # set a flag in case we are about to shut down soon
@@ -12,7 +12,7 @@ effect of MCCP unless you have extremely heavy traffic or sits on a
 terribly slow connection.
 
 This protocol is implemented by the telnet protocol importing
-mccp_compress and calling it from its write methods.
+mccp_compress and calling it when it writes its buffered output.
 """
 
 import weakref
@@ -72,6 +72,8 @@ class Mccp:
 
         """
         if hasattr(self.protocol(), "zlib"):
+            # send what was queued while still compressing
+            self.protocol().flush_output()
             del self.protocol().zlib
         self.protocol().protocol_flags["MCCP"] = False
         self.protocol().handshake_done()
@@ -87,5 +89,7 @@ class Mccp:
         """
         self.protocol().protocol_flags["MCCP"] = True
         self.protocol().requestNegotiation(MCCP, b"")
+        # the request must go out uncompressed, before anything compressed
+        self.protocol().flush_output()
         self.protocol().zlib = zlib.compressobj(9)
         self.protocol().handshake_done()
@@ -0,0 +1,199 @@
+"""
+Output queue
+
+All output from the Server to a Portal session passes through the session's
+`OutputQueue`. Text output is shaped as below. Prompts and OOB messages are
+always sent right away; they are only sent ahead of text output that is held
+back by the queue, otherwise everything is sent in the order given.
+
+- A token bucket limits the text sent to each session to
+  `settings.MAX_OUTPUT_RATE` bytes per second on average, allowing bursts of
+  up to `settings.MAX_OUTPUT_BURST` bytes. Text over the limit is queued.
+- The queue is registered as a streaming producer with the session's
+  transport. When the client does not read its output fast enough, Twisted
+  pauses the producer and text is queued until the transport has drained.
+  The session's `OUTPUT_PAUSED` protocol flag is synced to the Server
+  while this lasts, so the game can hold back non-essential output.
+
+At most `settings.MAX_OUTPUT_QUEUE` text messages are queued. When more
+arrive, the oldest are dropped and the client is told how many messages it
+missed once output resumes.
+
+"""
+
+from collections import deque
+
+from django.conf import settings
+from twisted.internet import reactor
+from twisted.internet.interfaces import IPushProducer
+from zope.interface import implementer
+
+_MAX_OUTPUT_RATE = float(settings.MAX_OUTPUT_RATE)
+_MAX_OUTPUT_BURST = int(settings.MAX_OUTPUT_BURST)
+_MAX_OUTPUT_QUEUE = int(settings.MAX_OUTPUT_QUEUE)
+_OUTPUT_SKIPPED_WARNING = settings.OUTPUT_SKIPPED_WARNING
+
+
+def _get_cost(cmdargs):
+    """
+    Estimate the size of a text output, in bytes.
+
+    """
+    return max(1, sum(len(arg) for arg in cmdargs if isinstance(arg, str)))
+
+
+@implementer(IPushProducer)
+class OutputQueue:
+    """
+    Shapes the output to one Portal session.
+
+    """
+
+    def __init__(self, session, send, rate=None, burst=None, maxlen=None):
+        """
+        Args:
+            session (PortalSession): The session whose output to queue.
+            send (callable): Called as `send(session, **kwargs)` to
+                actually send output to the session's protocol.
+            rate (float, optional): Average bytes of text per second to send. <= 0
+                turns off rate limiting. Defaults to `settings.MAX_OUTPUT_RATE`.
+            burst (int, optional): Max bytes of text to send at once. Defaults
+                to `settings.MAX_OUTPUT_BURST`.
+            maxlen (int, optional): Max text messages to queue. Defaults to
+                `settings.MAX_OUTPUT_QUEUE`.
+
+        """
+        self.session = session
+        self.send = send
+        self.rate = _MAX_OUTPUT_RATE if rate is None else rate
+        self.burst = _MAX_OUTPUT_BURST if burst is None else burst
+        self.maxlen = _MAX_OUTPUT_QUEUE if maxlen is None else maxlen
+
+        self.queue = deque()
+        self.tokens = self.burst
+        self.last_refill = reactor.seconds()
+        self.paused = False
+        self.nskipped = 0
+        self.stats = {"sent": 0, "queued": 0, "skipped": 0}
+        self._call = None
+
+    def register(self, transport):
+        """
+        Register with a transport, to be paused when the client falls behind.
+
+        Args:
+            transport (ITransport): The session's transport.
+
+        Returns:
+            bool: If the registration succeeded. It fails if the transport
+                does not support producers or already has one.
+
+        """
+        try:
+            transport.registerProducer(self, True)
+        except (AttributeError, RuntimeError):
+            return False
+        return True
+
+    def _refill(self):
+        now = reactor.seconds()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def _schedule(self):
+        if self._call and self._call.active():
+            return
+        wait = (1 - self.tokens) / self.rate if self.rate > 0 else 0
+        self._call = reactor.callLater(max(0, wait), self.drain)
+
+    def add(self, **kwargs):
+        """
+        Send output to the session, or queue it.
+
+        Keyword Args:
+            kwargs (any): Output on the form `cmdname=[[args], {kwargs}]`, as
+                passed to `PortalSessionHandler.data_out`.
+
+        """
+        text = kwargs.get("text")
+        if text is None:
+            self.send(self.session, **kwargs)
+            return
+
+        cost = _get_cost(text[0])
+        if self.rate > 0:
+            self._refill()
+        if not (self.queue or self.paused) and (self.rate <= 0 or self.tokens > 0):
+            # nothing held back; send everything in the order given
+            self.tokens -= cost
+            self.stats["sent"] += 1
+            self.send(self.session, **kwargs)
+            return
+
+        del kwargs["text"]
+        if kwargs:
+            # prompts and OOB skip the queued text
+            self.send(self.session, **kwargs)
+        self.queue.append((cost, text))
+        self.stats["queued"] += 1
+        while len(self.queue) > self.maxlen:
+            self.queue.popleft()
+            self.nskipped += 1
+            self.stats["skipped"] += 1
+        if not self.paused:
+            self._schedule()
+
+    def drain(self):
+        """
+        Send as much of the queued text as the rate limit allows.
+
+        """
+        self._call = None
+        if self.paused:
+            return
+        if self.nskipped:
+            self.send(self.session, text=[[_OUTPUT_SKIPPED_WARNING.format(num=self.nskipped)], {}])
+            self.nskipped = 0
+        if self.rate > 0:
+            self._refill()
+        while self.queue and (self.rate <= 0 or self.tokens > 0):
+            cost, text = self.queue.popleft()
+            self.tokens -= cost
+            self.stats["sent"] += 1
+            self.send(self.session, text=text)
+        if self.queue:
+            self._schedule()
+
+    def clear(self):
+        """
+        Drop all queued output.
+
+        """
+        if self._call and self._call.active():
+            self._call.cancel()
+        self._call = None
+        self.queue.clear()
+        self.nskipped = 0
+
+    def _set_paused(self, paused):
+        self.paused = paused
+        self.session.protocol_flags["OUTPUT_PAUSED"] = paused
+        sessionhandler = getattr(self.session, "sessionhandler", None)
+        if sessionhandler:
+            # tell the Server
+            sessionhandler.sync(self.session)
+
+    # IPushProducer, called by the transport
+
+    def pauseProducing(self):
+        if self._call and self._call.active():
+            self._call.cancel()
+        self._call = None
+        self._set_paused(True)
+
+    def resumeProducing(self):
+        self._set_paused(False)
+        self.drain()
+
+    def stopProducing(self):
+        self.clear()
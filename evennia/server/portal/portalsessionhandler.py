@@ -12,6 +12,7 @@ from twisted.internet import reactor
 
 import evennia
 from evennia.server.portal.amp import PCONN, PCONNSYNC, PDISCONN, PDISCONNALL
+from evennia.server.portal.output_queue import OutputQueue
 from evennia.server.sessionhandler import SessionHandler
 from evennia.utils.logger import log_trace
 from evennia.utils.utils import class_from_module
@@ -115,6 +116,11 @@ class PortalSessionHandler(SessionHandler):
                 # case of a webclient auto-reconnect), keep it
                 session.sessid = self.generate_sessid()
             session.server_connected = False
+            if not getattr(session, "output_queue", None):
+                session.output_queue = OutputQueue(session, self.send_data_out)
+                transport = getattr(session, "transport", None)
+                if transport:
+                    session.output_queue.register(transport)
             _CONNECTION_QUEUE.appendleft(session)
             if len(_CONNECTION_QUEUE) > 1:
                 session.data_out(
@@ -209,6 +215,9 @@ class PortalSessionHandler(SessionHandler):
 
         """
         global _CONNECTION_QUEUE
+        if getattr(session, "output_queue", None):
+            session.output_queue.clear()
+
         if session in _CONNECTION_QUEUE:
             # connection was already dropped before we had time
             # to forward this to the Server, so now we just remove it.
@@ -469,10 +478,33 @@ class PortalSessionHandler(SessionHandler):
                 call a method send_<key> on the protocol. If no such
                 method exits, it sends the data to a method send_default.
 
+        Notes:
+            Sessions with an `output_queue` (all sessions connecting through
+            `connect`) send their output through it, which may hold back text
+            output if the session is over its output rate or its client is
+            falling behind.
+
         """
         # from evennia.server.profiling.timetrace import timetrace  # DEBUG
         # text = timetrace(text, "portalsessionhandler.data_out")  # DEBUG
 
+        output_queue = getattr(session, "output_queue", None)
+        if output_queue:
+            output_queue.add(**kwargs)
+        else:
+            self.send_data_out(session, **kwargs)
+
+    def send_data_out(self, session, **kwargs):
+        """
+        Send data to the session protocol right away.
+
+        Args:
+            session (Session): Session sending data.
+
+        Keyword Args:
+            kwargs (any): As for `data_out`.
+
+        """
         # distribute outgoing data to the correct session methods.
         if session:
             for cmdname, (cmdargs, cmdkwargs) in kwargs.items():
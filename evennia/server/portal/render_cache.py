@@ -0,0 +1,83 @@
+"""
+Render cache
+
+The same text is often sent to many sessions at the same time, like channel
+messages, announcements or a say in a crowded room. How a protocol renders a
+text (ansi/mxp-parsing, html-conversion, encoding) only depends on the text and
+a few protocol flags, and most sessions share the same few flag combinations.
+The protocols use `RENDER_CACHE` to only render each such variant once. The
+cache is emptied at the end of every reactor tick, so it only ever holds the
+texts being sent out right now.
+
+"""
+
+from twisted.internet import reactor
+
+# max number of renderings to cache in one tick
+_MAX_ENTRIES = 1000
+
+
+class RenderCache:
+    """
+    Caches rendered texts until the end of the current reactor tick. Use through
+    the `RENDER_CACHE` singleton.
+
+    """
+
+    def __init__(self):
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        self._clear_call = None
+
+    def get(self, text, options, render, *args):
+        """
+        Get a rendered text, rendering and caching it if needed.
+
+        Args:
+            text (str): The text to render. Only plain strings are cached (an `ANSIString`
+                compares equal to other strings with the same text but other colors).
+            options (tuple): Everything else the rendering depends on, including
+                the protocol class.
+            render (callable): Called as `render(text, *args)` to render the text if
+                it is not cached.
+            *args: Passed on to `render`.
+
+        Returns:
+            any: The rendered text.
+
+        """
+        if type(text) is not str:
+            return render(text, *args)
+        key = (text, options)
+        try:
+            rendered = self.cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # an option is not hashable; can't cache
+            return render(text, *args)
+        else:
+            self.hits += 1
+            return rendered
+
+        self.misses += 1
+        rendered = render(text, *args)
+        if len(self.cache) < _MAX_ENTRIES:
+            self.cache[key] = rendered
+            if not self._clear_call:
+                self._clear_call = reactor.callLater(0, self.clear)
+        return rendered
+
+    def clear(self):
+        """
+        Empty the cache.
+
+        """
+        if self._clear_call and self._clear_call.active():
+            self._clear_call.cancel()
+        self._clear_call = None
+        self.cache = {}
+
+
+RENDER_CACHE = RenderCache()
@@ -14,6 +14,7 @@ from evennia.server.portal import mssp, naws, suppress_ga, telnet_oob, ttype
 from evennia.server.portal.mccp import MCCP, Mccp, mccp_compress
 from evennia.server.portal.mxp import Mxp, mxp_parse
 from evennia.server.portal.naws import NAWS
+from evennia.server.portal.render_cache import RENDER_CACHE
 from evennia.utils import ansi
 from evennia.utils.utils import class_from_module, to_bytes
 from twisted.conch.telnet import (
@@ -31,7 +32,7 @@ from twisted.conch.telnet import (
     StatefulTelnetProtocol,
     Telnet,
 )
-from twisted.internet import protocol
+from twisted.internet import protocol, reactor
 from twisted.internet.task import LoopingCall
 
 _RE_N = re.compile(r"\|n$")
@@ -42,6 +43,11 @@ _RE_SCREENREADER_REGEX = re.compile(
 )
 _IDLE_COMMAND = str.encode(settings.IDLE_COMMAND + "\n")
 
+_OUTPUT_MAX_LATENCY = settings.TELNET_OUTPUT_MAX_LATENCY
+# protocol flags affecting how a text is encoded, besides the send_text options
+_RENDER_FLAGS = ("ENCODING", "FORCEDENDLINE", "NOGOAHEAD", "NOPROMPTGOAHEAD")
+_OUTPUT_MAX_BYTES = settings.TELNET_OUTPUT_MAX_BYTES
+
 # identify HTTP indata
 _HTTP_REGEX = re.compile(
     r"(GET|HEAD|POST|PUT|DELETE|TRACE|OPTIONS|CONNECT|PATCH) (.*? HTTP/[0-9]\.[0-9])", re.I
@@ -83,6 +89,11 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
 
     def __init__(self, *args, **kwargs):
         self.protocol_key = "telnet"
+        # output waiting to be sent, see buffer_output
+        self.output_buffer = []
+        self.output_buffer_size = 0
+        self._output_flush = None
+        self.output_stats = {"sends": 0, "writes": 0, "bytes_raw": 0, "bytes_sent": 0}
         super().__init__(*args, **kwargs)
 
     def dataReceived(self, data):
@@ -304,6 +315,7 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
             reason (str): Motivation for losing connection.
 
         """
+        self.flush_output()
         self.sessionhandler.disconnect(self)
         if self.nop_keep_alive and self.nop_keep_alive.running:
             self.toggle_nop_keepalive()
@@ -356,7 +368,7 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
 
         """
         data = data.replace(b"\n", b"\r\n").replace(b"\r\r\n", b"\r\n")
-        super()._write(mccp_compress(self, data))
+        self.buffer_output(data)
 
     def sendLine(self, line):
         """
@@ -365,6 +377,19 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
         Args:
             line (str): Line to send.
 
+        """
+        self.buffer_output(self.encode_line(line))
+
+    def encode_line(self, line):
+        """
+        Encode a line for sending.
+
+        Args:
+            line (str): Line to encode.
+
+        Returns:
+            bytes: The line, ready to send.
+
         """
         line = to_bytes(line, self)
         # escape IAC in line mode, and correctly add \r\n (the TELNET end-of-line)
@@ -374,7 +399,63 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
             line += b"\r\n"
         if not self.protocol_flags.get("NOGOAHEAD", True):
             line += IAC + GA
-        return self.transport.write(mccp_compress(self, line))
+        return line
+
+    def buffer_output(self, data):
+        """
+        Queue data to send to the client. Everything queued within
+        `settings.TELNET_OUTPUT_MAX_LATENCY` seconds (by default, until the end of the
+        current reactor tick) is sent as a single write and, with MCCP, compressed as one
+        chunk with a single flush. This makes for fewer, better-compressed packets when
+        a lot of output is sent at once.
+
+        Args:
+            data (bytes): The data to send.
+
+        """
+        self.output_buffer.append(data)
+        self.output_buffer_size += len(data)
+        self.output_stats["sends"] += 1
+        if _OUTPUT_MAX_LATENCY is None or self.output_buffer_size >= _OUTPUT_MAX_BYTES:
+            self.flush_output()
+        elif not self._output_flush:
+            self._output_flush = reactor.callLater(_OUTPUT_MAX_LATENCY, self.flush_output)
+
+    def flush_output(self):
+        """
+        Send all queued output to the client.
+
+        """
+        if self._output_flush:
+            if self._output_flush.active():
+                self._output_flush.cancel()
+            self._output_flush = None
+        if not self.output_buffer:
+            return
+        data = b"".join(self.output_buffer)
+        self.output_buffer = []
+        self.output_buffer_size = 0
+        data_sent = mccp_compress(self, data)
+        stats = self.output_stats
+        stats["writes"] += 1
+        stats["bytes_raw"] += len(data)
+        stats["bytes_sent"] += len(data_sent)
+        self.transport.write(data_sent)
+
+    def get_output_stats(self):
+        """
+        Get statistics about the output sent to this client.
+
+        Returns:
+            dict: With the number of `sends` queued and actual `writes` made, the
+                `bytes_raw` queued and `bytes_sent` after compression, as well as the
+                `writes_saved` by coalescing and `bytes_saved` by compression.
+
+        """
+        stats = dict(self.output_stats)
+        stats["writes_saved"] = stats["sends"] - stats["writes"]
+        stats["bytes_saved"] = stats["bytes_raw"] - stats["bytes_sent"]
+        return stats
 
     # Session hooks
 
@@ -460,63 +541,89 @@ class TelnetProtocol(Telnet, StatefulTelnetProtocol, _BASE_SESSION_CLASS):
         echo = options.get("echo", None)
         mxp = options.get("mxp", flags.get("MXP", False))
         screenreader = options.get("screenreader", flags.get("SCREENREADER", False))
+        prompt = options.get("send_prompt")
+
+        if echo is not None and not prompt:
+            # turn on/off echo. Note that this is a bit turned around since we use
+            # echo as if we are "turning off the client's echo" when telnet really
+            # handles it the other way around.
+            if echo:
+                # by telling the client that WE WON'T echo, the client knows
+                # that IT should echo. This is the expected behavior from
+                # our perspective.
+                self.buffer_output(IAC + WONT + ECHO)
+            else:
+                # by telling the client that WE WILL echo, the client can
+                # safely turn OFF its OWN echo.
+                self.buffer_output(IAC + WILL + ECHO)
+
+        # the same text is often sent to many sessions at once; only render it
+        # once for every combination of flags affecting the result
+        render_options = (prompt, raw, nocolor, xterm256, truecolor, mxp, screenreader)
+        render_flags = tuple(flags.get(flag) for flag in _RENDER_FLAGS)
+        data = RENDER_CACHE.get(
+            text, (type(self), render_options, render_flags), self.render_text, *render_options
+        )
+        self.buffer_output(data)
+
+    def render_text(self, text, prompt, raw, nocolor, xterm256, truecolor, mxp, screenreader):
+        """
+        Render a text for sending. The result may only depend on the arguments and on the
+        `_RENDER_FLAGS` protocol flags, since it's reused for all sessions sending the
+        same text with the same options.
+
+        Args:
+            text (str): The text to render.
+            prompt (bool): If this is a prompt (without a line end).
+            raw (bool): Pass the string through without ansi processing.
+            nocolor (bool): Strip all color.
+            xterm256 (bool): Use xterm256 colors.
+            truecolor (bool): Use truecolor colors.
+            mxp (bool): Use MXP links.
+            screenreader (bool): Clean up the output for screenreaders.
 
+        Returns:
+            bytes: The text, ready to send.
+
+        """
         if screenreader:
             # screenreader mode cleans up output
             text = ansi.parse_ansi(text, strip_ansi=True, xterm256=False, mxp=False)
             text = _RE_SCREENREADER_REGEX.sub("", text)
 
-        if options.get("send_prompt"):
+        if prompt:
             # send a prompt instead.
-            prompt = text
             if not raw:
                 # processing
-                prompt = ansi.parse_ansi(
-                    _RE_N.sub("", prompt) + ("||n" if prompt.endswith("|") else "|n"),
+                text = ansi.parse_ansi(
+                    _RE_N.sub("", text) + ("||n" if text.endswith("|") else "|n"),
                     strip_ansi=nocolor,
                     xterm256=xterm256,
                     truecolor=truecolor,
                 )
                 if mxp:
-                    prompt = mxp_parse(prompt)
-            prompt = to_bytes(prompt, self)
-            prompt = prompt.replace(IAC, IAC + IAC).replace(b"\n", b"\r\n")
+                    text = mxp_parse(text)
+            text = to_bytes(text, self)
+            text = text.replace(IAC, IAC + IAC).replace(b"\n", b"\r\n")
             if not self.protocol_flags.get(
                 "NOPROMPTGOAHEAD", self.protocol_flags.get("NOGOAHEAD", True)
             ):
-                prompt += IAC + GA
-            self.transport.write(mccp_compress(self, prompt))
-        else:
-            if echo is not None:
-                # turn on/off echo. Note that this is a bit turned around since we use
-                # echo as if we are "turning off the client's echo" when telnet really
-                # handles it the other way around.
-                if echo:
-                    # by telling the client that WE WON'T echo, the client knows
-                    # that IT should echo. This is the expected behavior from
-                    # our perspective.
-                    self.transport.write(mccp_compress(self, IAC + WONT + ECHO))
-                else:
-                    # by telling the client that WE WILL echo, the client can
-                    # safely turn OFF its OWN echo.
-                    self.transport.write(mccp_compress(self, IAC + WILL + ECHO))
-            if raw:
-                # no processing
-                self.sendLine(text)
-                return
-            else:
-                # we need to make sure to kill the color at the end in order
-                # to match the webclient output.
-                linetosend = ansi.parse_ansi(
-                    _RE_N.sub("", text) + ("||n" if text.endswith("|") else "|n"),
-                    strip_ansi=nocolor,
-                    xterm256=xterm256,
-                    mxp=mxp,
-                    truecolor=truecolor,
-                )
-                if mxp:
-                    linetosend = mxp_parse(linetosend)
-                self.sendLine(linetosend)
+                text += IAC + GA
+            return text
+
+        if not raw:
+            # we need to make sure to kill the color at the end in order
+            # to match the webclient output.
+            text = ansi.parse_ansi(
+                _RE_N.sub("", text) + ("||n" if text.endswith("|") else "|n"),
+                strip_ansi=nocolor,
+                xterm256=xterm256,
+                mxp=mxp,
+                truecolor=truecolor,
+            )
+            if mxp:
+                text = mxp_parse(text)
+        return self.encode_line(text)
 
     def send_prompt(self, *args, **kwargs):
         """
@@ -12,11 +12,13 @@ import json
 import pickle
 import string
 import sys
+import zlib
 
 import mock
 from autobahn.twisted.websocket import WebSocketServerFactory
 from mock import MagicMock, Mock
 from twisted.conch.telnet import DO, DONT, IAC, NAWS, SB, SE, WILL
+from twisted.internet import task
 from twisted.internet.base import DelayedCall
 from twisted.test import proto_helpers
 from twisted.trial.unittest import TestCase as TwistedTestCase
@@ -24,11 +26,16 @@ from twisted.trial.unittest import TestCase as TwistedTestCase
 import evennia
 from evennia.server.portal import irc
 from evennia.server.portal.portalsessionhandler import PortalSessionHandler
+from evennia.server.portal.render_cache import RENDER_CACHE
 from evennia.server.portal.service import EvenniaPortalService
+from evennia.utils import ansi
 from evennia.utils.test_resources import BaseEvenniaTest
 
 from .amp import (
     AMP_MAXLEN,
+    PCONN,
+    SSHUTD,
+    AdminPortal2Server,
     AMPMultiConnectionProtocol,
     MsgPortal2Server,
     MsgServer2Portal,
@@ -38,11 +45,13 @@ from .mccp import MCCP
 from .mssp import MSSP
 from .mxp import MXP
 from .naws import DEFAULT_HEIGHT, DEFAULT_WIDTH
+from .output_queue import OutputQueue
 from .suppress_ga import SUPPRESS_GA
 from .telnet import TelnetProtocol, TelnetServerFactory
 from .telnet_oob import MSDP, MSDP_VAL, MSDP_VAR
 from .ttype import IS, TTYPE
 from .webclient import WebSocketClient
+from .worker_router import LocalWorker, WorkerRouter, get_worker_cmd
 
 
 class TestAMPServer(TwistedTestCase):
@@ -220,6 +229,155 @@ class TestIRC(TestCase):
         self.assertEqual(irc.parse_irc_to_ansi(irc.parse_ansi_to_irc(s)), s)
 
 
+class TestOutputQueue(TestCase):
+    def setUp(self):
+        self.clock = task.Clock()
+        self.patcher = mock.patch("evennia.server.portal.output_queue.reactor", self.clock)
+        self.patcher.start()
+        self.session = Mock(protocol_flags={})
+        self.send = Mock()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def _sent_texts(self):
+        return [
+            call.kwargs["text"][0][0] for call in self.send.call_args_list if "text" in call.kwargs
+        ]
+
+    def test_unlimited(self):
+        queue = OutputQueue(self.session, self.send, rate=0, burst=10, maxlen=10)
+        for num in range(20):
+            queue.add(text=[[f"line {num}"], {}])
+        self.assertEqual(self.send.call_count, 20)
+        self.assertFalse(queue.queue)
+
+    def test_unlimited_keeps_order(self):
+        queue = OutputQueue(self.session, self.send, rate=0, burst=10, maxlen=10)
+        queue.add(text=[["output"], {}], prompt=[["> "], {}])
+        self.send.assert_called_once_with(self.session, text=[["output"], {}], prompt=[["> "], {}])
+        self.assertEqual(list(self.send.call_args.kwargs), ["text", "prompt"])
+
+    def test_rate_limit(self):
+        queue = OutputQueue(self.session, self.send, rate=10, burst=10, maxlen=10)
+        queue.add(text=[["a" * 10], {}])
+        queue.add(text=[["b" * 10], {}])
+        queue.add(text=[["c" * 10], {}])
+        queue.add(prompt=[["> "], {}])
+        # the prompt skips the queue
+        self.assertEqual(self.send.call_count, 2)
+        self.send.assert_called_with(self.session, prompt=[["> "], {}])
+        self.assertEqual(len(queue.queue), 2)
+        self.clock.advance(0.1)
+        self.assertEqual(self._sent_texts(), ["a" * 10, "b" * 10])
+        self.clock.advance(0.5)
+        self.assertEqual(len(queue.queue), 1)
+        self.clock.advance(0.5)
+        self.assertEqual(self._sent_texts(), ["a" * 10, "b" * 10, "c" * 10])
+        self.assertFalse(queue.queue)
+        self.assertFalse(self.clock.getDelayedCalls())
+
+    def test_backpressure(self):
+        queue = OutputQueue(self.session, self.send, rate=0, burst=10, maxlen=3)
+        transport = proto_helpers.StringTransport()
+        self.assertTrue(queue.register(transport))
+        self.assertIs(transport.producer, queue)
+
+        queue.pauseProducing()
+        self.assertTrue(self.session.protocol_flags["OUTPUT_PAUSED"])
+        self.session.sessionhandler.sync.assert_called_with(self.session)
+        for num in range(5):
+            queue.add(text=[[f"line {num}"], {}], oob=[[], {}])
+        # oob is still sent
+        self.assertEqual(self.send.call_count, 5)
+        self.assertEqual(self._sent_texts(), [])
+        self.assertEqual(queue.stats["skipped"], 2)
+
+        queue.resumeProducing()
+        self.assertFalse(self.session.protocol_flags["OUTPUT_PAUSED"])
+        self.assertEqual(
+            self._sent_texts(),
+            ["[... 2 messages skipped ...]", "line 2", "line 3", "line 4"],
+        )
+
+        queue.pauseProducing()
+        queue.add(text=[["lost"], {}])
+        queue.stopProducing()
+        self.assertFalse(queue.queue)
+
+
+class TestWorkerRouter(TestCase):
+    def setUp(self):
+        self.router = WorkerRouter(commands=["@about", "leaderboard"], shard_key="account")
+        self.worker1 = LocalWorker()
+        self.worker2 = LocalWorker()
+
+    def test_route(self):
+        session = Mock(sessid=1, uid=5)
+        self.assertIsNone(self.router.route(session, {"text": [["@about"], {}]}))
+        self.router.add_worker(1, self.worker1)
+        self.router.add_worker(2, self.worker2)
+        self.assertIn(
+            self.router.route(session, {"text": [["@about me"], {}]}),
+            (self.worker1, self.worker2),
+        )
+        self.assertIsNotNone(self.router.route(session, {"text": [[b"LEADERBOARD\n"], {}]}))
+        self.assertIsNone(self.router.route(session, {"text": [["look"], {}]}))
+        self.assertIsNone(self.router.route(session, {"text": [[""], {}]}))
+        self.assertIsNone(self.router.route(session, {"client_options": [[], {}]}))
+
+        self.assertTrue(self.router.remove_worker(self.worker1))
+        self.assertFalse(self.router.remove_worker(self.worker1))
+        self.assertIs(self.router.route(session, {"text": [["@about"], {}]}), self.worker2)
+
+    def test_shard_key(self):
+        self.router.add_worker(1, self.worker1)
+        self.router.add_worker(2, self.worker2)
+        # all sessions of an account go to the same worker
+        workers = {self.router.get_worker(Mock(sessid=sessid, uid=5)) for sessid in range(20)}
+        self.assertEqual(len(workers), 1)
+        # unlogged-in sessions are spread out
+        workers = {self.router.get_worker(Mock(sessid=sessid, uid=None)) for sessid in range(20)}
+        self.assertEqual(workers, {self.worker1, self.worker2})
+
+        self.router.shard_key = "session"
+        workers = {self.router.get_worker(Mock(sessid=sessid, uid=5)) for sessid in range(20)}
+        self.assertEqual(workers, {self.worker1, self.worker2})
+
+    def test_amp_routing(self):
+        factory = AMPServerFactory(Mock())
+        proto = factory.buildProtocol(("localhost", 0))
+        factory.server_connection = Mock()
+        factory.worker_router = self.router
+        self.router.add_worker(1, self.worker1)
+        session = Mock(sessid=1, uid=None)
+
+        proto.send_MsgPortal2Server(session, text=[["@about"], {}])
+        self.assertEqual(self.worker1.messages(), [(1, {"text": [["@about"], {}]})])
+        factory.server_connection.callRemote.assert_not_called()
+        proto.send_MsgPortal2Server(session, text=[["look"], {}])
+        factory.server_connection.callRemote.assert_called_once()
+        self.assertEqual(len(self.worker1.messages()), 1)
+
+        # session admin operations go to the workers too
+        proto.send_AdminPortal2Server(session, operation=PCONN, sessiondata={"sessid": 1})
+        self.assertEqual(
+            self.worker1.received[-1],
+            (AdminPortal2Server, 1, {"operation": PCONN, "sessiondata": {"sessid": 1}}),
+        )
+
+        proto.stop_server(mode="reload")
+        self.assertEqual(self.worker1.received[-1], (AdminPortal2Server, 0, {"operation": SSHUTD}))
+        self.assertEqual(self.router.workers, {})
+
+    def test_get_worker_cmd(self):
+        cmd = ["twistd", "--python=server.py", "--pidfile=/game/server/server.pid"]
+        self.assertEqual(
+            get_worker_cmd(cmd, 2),
+            ["twistd", "--python=server.py", "--pidfile=/game/server/server-worker2.pid"],
+        )
+
+
 class TestTelnet(TwistedTestCase):
     def setUp(self):
         super().setUp()
@@ -290,6 +448,79 @@ class TestTelnet(TwistedTestCase):
         self.proto._handshake_delay.cancel()
         return d
 
+    @mock.patch("evennia.server.portal.portalsessionhandler.reactor", new=MagicMock())
+    def test_output_coalescing(self):
+        self.transport.client = ["localhost"]
+        self.transport.setTcpKeepAlive = Mock()
+        d = self.proto.makeConnection(self.transport)
+        # the handshake requests are buffered until the end of the reactor tick
+        self.assertEqual(self.transport.value(), b"")
+        self.proto.flush_output()
+        self.transport.clear()
+
+        self.proto.sendLine("line 1")
+        self.proto.sendLine("line 2")
+        self.assertEqual(self.transport.value(), b"")
+        self.proto.flush_output()
+        self.assertEqual(self.transport.value(), b"line 1\r\nline 2\r\n")
+
+        # with mccp, all buffered output is compressed as one chunk
+        self.transport.clear()
+        self.proto.zlib = zlib.compressobj(9)
+        stats = self.proto.get_output_stats()
+        self.proto.sendLine("line 3")
+        self.proto.sendLine("line 3")
+        self.proto.flush_output()
+        decompressed = zlib.decompressobj().decompress(self.transport.value())
+        self.assertEqual(decompressed, b"line 3\r\nline 3\r\n")
+        new_stats = self.proto.get_output_stats()
+        self.assertEqual(new_stats["sends"] - stats["sends"], 2)
+        self.assertEqual(new_stats["writes"] - stats["writes"], 1)
+        self.assertEqual(new_stats["bytes_raw"] - stats["bytes_raw"], 16)
+        self.assertEqual(new_stats["bytes_sent"] - stats["bytes_sent"], len(self.transport.value()))
+        self.assertEqual(new_stats["bytes_saved"], new_stats["bytes_raw"] - new_stats["bytes_sent"])
+
+        # output is sent right away when the buffer gets too big
+        self.transport.clear()
+        del self.proto.zlib
+        with mock.patch("evennia.server.portal.telnet._OUTPUT_MAX_BYTES", 10):
+            self.proto.sendLine("a long line")
+        self.assertEqual(self.transport.value(), b"a long line\r\n")
+        # clean up to prevent Unclean reactor
+        self.proto.nop_keep_alive.stop()
+        self.proto._handshake_delay.cancel()
+        return d
+
+    @mock.patch("evennia.server.portal.portalsessionhandler.reactor", new=MagicMock())
+    def test_render_cache(self):
+        self.transport.client = ["localhost"]
+        self.transport.setTcpKeepAlive = Mock()
+        d = self.proto.makeConnection(self.transport)
+        self.addCleanup(RENDER_CACHE.clear)
+        RENDER_CACHE.clear()
+        with mock.patch.object(
+            TelnetProtocol, "render_text", autospec=True, side_effect=TelnetProtocol.render_text
+        ) as mock_render:
+            self.proto.send_text("|rHello|n", options={})
+            self.proto.send_text("|rHello|n", options={})
+            self.assertEqual(mock_render.call_count, 1)
+            # other options are rendered separately
+            self.proto.send_text("|rHello|n", options={"nocolor": True})
+            self.assertEqual(mock_render.call_count, 2)
+            # ANSIStrings are never cached
+            self.proto.send_text(ansi.ANSIString("|rHello|n"), options={})
+            self.assertEqual(mock_render.call_count, 3)
+        self.proto.flush_output()
+        self.assertEqual(self.transport.value().count(b"Hello"), 4)
+        self.assertGreaterEqual(self.transport.value().count(b"\x1b[1m\x1b[31mHello"), 2)
+
+        RENDER_CACHE.clear()
+        self.assertEqual(RENDER_CACHE.cache, {})
+        # clean up to prevent Unclean reactor
+        self.proto.nop_keep_alive.stop()
+        self.proto._handshake_delay.cancel()
+        return d
+
 
 class TestWebSocket(BaseEvenniaTest):
     def setUp(self):
@@ -29,6 +29,7 @@ from twisted.internet.task import LoopingCall
 from twisted.web import resource, server
 
 from evennia.server import session
+from evennia.server.portal.render_cache import RENDER_CACHE
 from evennia.utils import utils
 from evennia.utils.ansi import parse_ansi
 from evennia.utils.text2html import parse_html
@@ -163,18 +164,39 @@ class AjaxWebClientSession(session.Session):
         screenreader = options.get("screenreader", flags.get("SCREENREADER", False))
         prompt = options.get("send_prompt", False)
 
+        cmd = "prompt" if prompt else "text"
+        # the same text is often sent to many sessions at once; only render it once
+        # for every combination of options
+        render_options = (raw, nocolor, screenreader)
+        args[0] = RENDER_CACHE.get(
+            text, (type(self), render_options), self.render_text, *render_options
+        )
+
+        # send to client on required form [cmdname, args, kwargs]
+        self.client.lineSend(self.csessid, [cmd, args, kwargs])
+
+    def render_text(self, text, raw, nocolor, screenreader):
+        """
+        Render a text for sending. The result may only depend on the arguments, since
+        it's reused for all sessions sending the same text with the same options.
+
+        Args:
+            text (str): The text to render.
+            raw (bool): No parsing at all (leave ansi-to-html markers unparsed).
+            nocolor (bool): Remove all color.
+            screenreader (bool): Use Screenreader mode.
+
+        Returns:
+            str: The rendered text.
+
+        """
         if screenreader:
             # screenreader mode cleans up output
             text = parse_ansi(text, strip_ansi=True, xterm256=False, mxp=False)
             text = _RE_SCREENREADER_REGEX.sub("", text)
-        cmd = "prompt" if prompt else "text"
         if raw:
-            args[0] = text
-        else:
-            args[0] = parse_html(text, strip_ansi=nocolor)
-
-        # send to client on required form [cmdname, args, kwargs]
-        self.client.lineSend(self.csessid, [cmd, args, kwargs])
+            return text
+        return parse_html(text, strip_ansi=nocolor)
 
     def send_prompt(self, *args, **kwargs):
         kwargs["options"].update({"send_prompt": True})
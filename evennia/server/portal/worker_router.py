@@ -0,0 +1,293 @@
+"""
+Worker router
+
+This runs on the Portal and decides which Server process should handle the
+input from a session. The main Server handles everything except the commands
+listed in `settings.SERVER_WORKER_COMMANDS`. These are sent to one of the
+`settings.SERVER_WORKERS` worker Servers (see `evennia.server.worker`), picked
+by a shard key, so that the same account is always handled by the same worker.
+
+Workers connect to the Portal's AMP server like the main Server does, but
+register with the `SWORKER` admin operation instead of asking for a `PSYNC`.
+Session connects, syncs and disconnects are passed on to all workers so they
+can keep their mirror of the sessions up to date.
+
+Any object with a `data_to_worker(command, sessid, **kwargs)` method can be
+added as a worker. `LocalWorker` is a stand-in that just stores what it gets,
+to test routing without starting any processes.
+
+"""
+
+import zlib
+
+from django.conf import settings
+
+from evennia.server.portal import amp
+
+_SERVER_WORKERS = settings.SERVER_WORKERS
+_SERVER_WORKER_COMMANDS = {cmd.lower() for cmd in settings.SERVER_WORKER_COMMANDS}
+_SERVER_WORKER_SHARD_KEY = settings.SERVER_WORKER_SHARD_KEY
+
+# admin operations the workers need to keep their sessions in sync
+_WORKER_ADMIN_OPS = (amp.PCONN, amp.PCONNSYNC, amp.PDISCONN, amp.PDISCONNALL)
+
+
+def get_worker_cmd(server_twistd_cmd, worker_id):
+    """
+    Get the command line for starting a worker Server.
+
+    Args:
+        server_twistd_cmd (list): The command line used to start the main Server.
+        worker_id (int): The id of the worker.
+
+    Returns:
+        list: The same command line, with a separate pid file for the worker.
+
+    """
+    cmd = []
+    for arg in server_twistd_cmd:
+        if arg.startswith("--pidfile="):
+            root, ext = arg.rsplit(".", 1) if "." in arg else (arg, "pid")
+            arg = f"{root}-worker{worker_id}.{ext}"
+        cmd.append(arg)
+    return cmd
+
+
+class LocalWorker:
+    """
+    A stand-in for a worker Server connection, for testing. It stores
+    everything sent to it.
+
+    """
+
+    def __init__(self):
+        self.received = []
+
+    def data_to_worker(self, command, sessid, **kwargs):
+        """
+        Store data sent to this worker.
+
+        Args:
+            command (AMP Command): The AMP command used.
+            sessid (int): The session id.
+            kwargs (any): The data.
+
+        """
+        self.received.append((command, sessid, kwargs))
+
+    def messages(self):
+        """
+        Get the session input sent to this worker.
+
+        Returns:
+            list: A list of `(sessid, kwargs)`.
+
+        """
+        return [
+            (sessid, kwargs)
+            for command, sessid, kwargs in self.received
+            if command is amp.MsgPortal2Server
+        ]
+
+
+class WorkerRouter:
+    """
+    Routes session input between the main Server and its workers.
+
+    """
+
+    def __init__(self, commands=None, shard_key=None):
+        """
+        Args:
+            commands (iterable, optional): The commands to route to workers.
+                Defaults to `settings.SERVER_WORKER_COMMANDS`.
+            shard_key (str, optional): One of "account" or "session". Defaults
+                to `settings.SERVER_WORKER_SHARD_KEY`.
+
+        """
+        self.commands = (
+            _SERVER_WORKER_COMMANDS if commands is None else {cmd.lower() for cmd in commands}
+        )
+        self.shard_key = _SERVER_WORKER_SHARD_KEY if shard_key is None else shard_key
+        self.workers = {}
+
+    def add_worker(self, worker_id, connection):
+        """
+        Add a worker. A worker reconnecting with the same id replaces the old one.
+
+        Args:
+            worker_id (int): The worker's id.
+            connection (AMPServerProtocol or LocalWorker): The worker's connection.
+
+        """
+        self.workers[worker_id] = connection
+
+    def remove_worker(self, connection):
+        """
+        Remove a worker, usually because its connection was lost.
+
+        Args:
+            connection (AMPServerProtocol or LocalWorker): The worker's connection.
+
+        Returns:
+            bool: If the connection was a worker.
+
+        """
+        for worker_id, worker in list(self.workers.items()):
+            if worker is connection:
+                del self.workers[worker_id]
+                return True
+        return False
+
+    def is_worker(self, connection):
+        """
+        Check if a connection is a worker.
+
+        Args:
+            connection (AMPServerProtocol): The connection to check.
+
+        Returns:
+            bool: If this is a worker connection.
+
+        """
+        return any(worker is connection for worker in self.workers.values())
+
+    def get_shard_key(self, session):
+        """
+        Get the key deciding which worker handles a session. Override this to
+        shard by something else, such as a zone stored in the session's
+        `server_data`.
+
+        Args:
+            session (PortalSession): The session sending input.
+
+        Returns:
+            str: The shard key.
+
+        """
+        if self.shard_key == "account" and session.uid:
+            return f"account-{session.uid}"
+        return f"session-{session.sessid}"
+
+    def get_worker(self, session):
+        """
+        Get the worker to handle a session's input.
+
+        Args:
+            session (PortalSession): The session.
+
+        Returns:
+            AMPServerProtocol, LocalWorker or None: The worker, or `None` if
+                there are no workers.
+
+        """
+        if not self.workers:
+            return None
+        worker_ids = sorted(self.workers)
+        # crc32 is stable between processes, unlike hash()
+        index = zlib.crc32(self.get_shard_key(session).encode("utf-8")) % len(worker_ids)
+        return self.workers[worker_ids[index]]
+
+    def get_cmdname(self, kwargs):
+        """
+        Get the command name of text input.
+
+        Args:
+            kwargs (dict): Input on the form `{cmdname: [[args], {kwargs}]}`.
+
+        Returns:
+            str or None: The first word of the text, lowercased, or `None` if
+                this is not text input.
+
+        """
+        try:
+            text = kwargs["text"][0][0]
+        except (KeyError, IndexError, TypeError):
+            return None
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", errors="replace")
+        if not isinstance(text, str):
+            return None
+        words = text.split(None, 1)
+        return words[0].lower() if words else None
+
+    def route(self, session, kwargs):
+        """
+        Decide where to send input from a session.
+
+        Args:
+            session (PortalSession): The session sending input.
+            kwargs (dict): The input.
+
+        Returns:
+            AMPServerProtocol, LocalWorker or None: The worker to send the input to,
+                or `None` to send it to the main Server.
+
+        """
+        if not self.workers or len(kwargs) != 1 or self.get_cmdname(kwargs) not in self.commands:
+            return None
+        return self.get_worker(session)
+
+    def broadcast(self, command, sessid, **kwargs):
+        """
+        Send data to all workers.
+
+        Args:
+            command (AMP Command): The AMP command to use.
+            sessid (int): The session id.
+            kwargs (any): The data to send.
+
+        """
+        for worker in self.workers.values():
+            worker.data_to_worker(command, sessid, **kwargs)
+
+    def sync_session_admin(self, sessid, operation, **kwargs):
+        """
+        Pass a session admin operation on to all workers, if they need it.
+
+        Args:
+            sessid (int): The session id.
+            operation (str): The admin operation sent to the main Server.
+            kwargs (any): The operation's data.
+
+        """
+        if self.workers and operation in _WORKER_ADMIN_OPS:
+            self.broadcast(amp.AdminPortal2Server, sessid, operation=operation, **kwargs)
+
+    def sync_sessions(self, sessions):
+        """
+        Send the current state of sessions to all workers, for example after
+        the main Server logged them in.
+
+        Args:
+            sessions (list): The `PortalSession`s to sync.
+
+        """
+        for session in sessions:
+            self.sync_session_admin(
+                session.sessid, amp.PCONNSYNC, sessiondata=session.get_sync_data()
+            )
+
+    def missing_workers(self):
+        """
+        Get the workers that should be running but are not connected.
+
+        Returns:
+            list: The ids of the missing workers.
+
+        """
+        return [
+            worker_id
+            for worker_id in range(1, _SERVER_WORKERS + 1)
+            if worker_id not in self.workers
+        ]
+
+    def stop_workers(self):
+        """
+        Tell all workers to shut down. They are started again once the main
+        Server has reconnected.
+
+        """
+        self.broadcast(amp.AdminPortal2Server, amp.DUMMYSESSION.sessid, operation=amp.SSHUTD)
+        # stop routing to them right away
+        self.workers = {}
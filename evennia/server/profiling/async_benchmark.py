@@ -0,0 +1,200 @@
+"""
+Async command benchmark
+
+Compares giving many slow commands at the same time, with the slow part
+written in different ways:
+
+- `blocking` - a plain `func` that blocks, like a `time.sleep` or an HTTP
+  request made with a blocking library.
+- `pool` - a `func` that yields `run_in_pool` with the blocking call (see
+  `evennia.utils.pools`).
+- `async` - an `async def func` awaiting `aio.sleep`, standing in for an I/O
+  wait that doesn't block (see `evennia.utils.aio`).
+- `asyncio` - an `async def func` awaiting `asyncio.sleep`. This is only run
+  if the Server uses the asyncio reactor (`settings.ASYNCIO_REACTOR`).
+
+For each model, the commands are given through the cmdhandler one right after
+the other and each waits for `duration` seconds. The time until all of them
+are done is reported, as well as the longest time the reactor was stalled
+(measured by a timer that should fire every 10 ms). A stall means no other
+player got any commands or output handled.
+
+Run it on the running Server (it reports to the caller when done):
+
+    py from evennia.server.profiling import async_benchmark; async_benchmark.run(me)
+
+or from `evennia shell`, where it runs the reactor until it's done (so it can
+only be run once per shell):
+
+    from evennia.server.profiling import async_benchmark
+    async_benchmark.run(evennia.search_object("#1")[0])
+
+"""
+
+import asyncio
+import time
+
+from twisted.internet import reactor, task
+from twisted.internet.defer import Deferred, inlineCallbacks
+
+from evennia.commands.cmdset import CmdSet
+from evennia.commands.command import Command
+from evennia.utils import aio
+from evennia.utils.pools import run_in_pool
+
+# how often the stall timer should fire
+_HEARTBEAT = 0.01
+
+
+class _Benchmark:
+    """
+    Tracks one model being benchmarked.
+
+    """
+
+    def __init__(self, ncommands, duration):
+        self.ncommands = ncommands
+        self.duration = duration
+        self.finished = 0
+        self.deferred = Deferred()
+        self.max_stall = 0
+        self.last_beat = time.perf_counter()
+
+    def command_done(self):
+        self.finished += 1
+        if self.finished == self.ncommands:
+            self.deferred.callback(None)
+
+    def heartbeat(self):
+        now = time.perf_counter()
+        self.max_stall = max(self.max_stall, now - self.last_beat - _HEARTBEAT)
+        self.last_beat = now
+
+
+class CmdBenchmarkBlocking(Command):
+    key = "benchmark_blocking"
+    benchmark = None
+
+    def func(self):
+        time.sleep(self.benchmark.duration)
+        self.benchmark.command_done()
+
+
+class CmdBenchmarkPool(Command):
+    key = "benchmark_pool"
+    benchmark = None
+
+    def func(self):
+        yield run_in_pool(time.sleep, self.benchmark.duration)
+        self.benchmark.command_done()
+
+
+class CmdBenchmarkAsync(Command):
+    key = "benchmark_async"
+    benchmark = None
+
+    async def func(self):
+        await aio.sleep(self.benchmark.duration)
+        self.benchmark.command_done()
+
+
+class CmdBenchmarkAsyncio(Command):
+    key = "benchmark_asyncio"
+    benchmark = None
+
+    async def func(self):
+        await asyncio.sleep(self.benchmark.duration)
+        self.benchmark.command_done()
+
+
+class BenchmarkCmdSet(CmdSet):
+    key = "async_benchmark"
+    priority = 200
+
+    def at_cmdset_creation(self):
+        self.add(CmdBenchmarkBlocking())
+        self.add(CmdBenchmarkPool())
+        self.add(CmdBenchmarkAsync())
+        self.add(CmdBenchmarkAsyncio())
+
+
+@inlineCallbacks
+def _run_model(caller, model, ncommands, duration):
+    benchmark = _Benchmark(ncommands, duration)
+    # give up if commands fail instead of waiting forever
+    benchmark.deferred.addTimeout(ncommands * duration + 30, reactor)
+    heartbeat = task.LoopingCall(benchmark.heartbeat)
+    heartbeat.start(_HEARTBEAT, now=True)
+    t0 = time.perf_counter()
+    try:
+        for _ in range(ncommands):
+            caller.execute_cmd(f"benchmark_{model}", benchmark=benchmark)
+        yield benchmark.deferred
+        total = time.perf_counter() - t0
+        # let the timer see the stall of the last command
+        yield task.deferLater(reactor, _HEARTBEAT * 2, lambda: None)
+    finally:
+        heartbeat.stop()
+    return total, benchmark.max_stall
+
+
+@inlineCallbacks
+def _run(caller, ncommands, duration, models):
+    results = {}
+    caller.cmdset.add(BenchmarkCmdSet, persistent=False)
+    try:
+        for model in models:
+            if model == "asyncio" and not aio.is_asyncio_reactor():
+                continue
+            results[model] = yield _run_model(caller, model, ncommands, duration)
+    finally:
+        caller.cmdset.remove(BenchmarkCmdSet)
+    return results
+
+
+def _report(results, ncommands, duration):
+    lines = [f"Async command benchmark: {ncommands} commands waiting {duration}s each"]
+    for model, (total, max_stall) in results.items():
+        lines.append(f"  {model:<10} all done in {total:7.3f}s, reactor stalled {max_stall:7.3f}s")
+    if "asyncio" not in results:
+        lines.append("  (asyncio skipped; set ASYNCIO_REACTOR to run it)")
+    return "\n".join(lines)
+
+
+def run(caller, ncommands=20, duration=0.2, models=("blocking", "pool", "async", "asyncio")):
+    """
+    Run the benchmark.
+
+    Args:
+        caller (Object or Account): Runs the benchmark commands. A cmdset with
+            them is added to it for the duration of the benchmark.
+        ncommands (int, optional): How many commands to give for every model.
+        duration (float, optional): How long each command waits.
+        models (tuple, optional): Which models to benchmark.
+
+    Returns:
+        Deferred: Fires with `{model: (seconds, max_stall_seconds), ...}`.
+
+    """
+
+    def _done(results):
+        report = _report(results, ncommands, duration)
+        if reactor.running and caller.sessions.count():
+            caller.msg(report)
+        else:
+            print(report)
+        return results
+
+    if reactor.running:
+        return _run(caller, ncommands, duration, models).addCallback(_done)
+
+    # from a shell, run the reactor just for the benchmark
+    deferred = Deferred()
+
+    def _start():
+        _run(caller, ncommands, duration, models).addCallback(_done).chainDeferred(deferred)
+
+    deferred.addBoth(lambda result: reactor.stop() or result)
+    reactor.callWhenRunning(_start)
+    reactor.run()
+    return deferred
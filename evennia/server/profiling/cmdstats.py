@@ -0,0 +1,349 @@
+"""
+Command statistics
+
+The cmdhandler times every command it runs and counts its database queries,
+using the `COMMAND_STATS` handler in this module (turn it off with
+`settings.COMMAND_STATS = False`). For every command key, it keeps a histogram
+of the time spent in each phase of running it:
+
+- `merge` - getting and merging the cmdsets of the caller.
+- `match` - matching the input to a command in the merged cmdset.
+- `at_pre_cmd`, `parse`, `func`, `at_post_cmd` - the Command's methods.
+- `total` - all of the above.
+
+It also keeps a histogram of the number of database queries made by the
+command.
+
+A `func` that yields or is an `async def` runs on its own after the cmdhandler
+is done with it, waiting for delays, input or other work in between. For such
+commands, the `func` and `at_post_cmd` phases are not recorded at all (so they
+are not part of `total` either), and only the queries made before the first
+`yield`/`await` are counted.
+
+The histograms are HDR-style (see `Histogram`): they use little memory and
+give percentiles with about 1% precision, whatever the values. Use the
+`cmdstats` command to view them in-game, or read them in Prometheus' text
+format from the `/metrics/` page of the webserver.
+
+"""
+
+import math
+import time
+
+from django.conf import settings
+from django.db import connection
+
+_COMMAND_STATS_ENABLED = settings.COMMAND_STATS
+
+# the phases of running a command, in order
+PHASES = ("merge", "match", "at_pre_cmd", "parse", "func", "at_post_cmd")
+
+# the percentiles reported as Prometheus quantiles
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# queries made in the reactor thread since the Server started
+_NQUERIES = 0
+
+
+def _count_query(execute, sql, params, many, context):
+    global _NQUERIES
+    _NQUERIES += 1
+    return execute(sql, params, many, context)
+
+
+def count_queries():
+    """
+    Get the number of database queries made by this thread's connection since
+    we started counting them.
+
+    Returns:
+        int: The number of queries.
+
+    """
+    wrappers = connection.execute_wrappers
+    if _count_query not in wrappers:
+        # first in line, so that `connection.execute_wrapper` contexts
+        # still pop their own wrapper when they are done
+        wrappers.insert(0, _count_query)
+    return _NQUERIES
+
+
+class Histogram:
+    """
+    A histogram with log-linear buckets, as in HdrHistogram. Values are
+    recorded as integer multiples of `unit`. Values below `2**sub_bucket_bits`
+    get a bucket each. Above that, each power of two is split into
+    `2**(sub_bucket_bits - 1)` buckets, so a bucket is never wider than about
+    `1 / 2**(sub_bucket_bits - 1)` of its values. Only buckets with values in
+    them are stored.
+
+    """
+
+    def __init__(self, unit=1, sub_bucket_bits=8):
+        """
+        Args:
+            unit (float, optional): The smallest difference between values
+                that is kept track of, like `1e-6` for microseconds.
+            sub_bucket_bits (int, optional): The precision. The default of 8
+                gives under 1% error.
+
+        """
+        self.unit = unit
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 2**sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all recorded values.
+
+        """
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _get_index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return (
+            self.sub_bucket_count
+            + (shift - 1) * self.sub_bucket_half
+            + (value >> shift)
+            - self.sub_bucket_half
+        )
+
+    def _get_highest_value(self, index):
+        if index < self.sub_bucket_count:
+            return index
+        shift, sub_bucket = divmod(index - self.sub_bucket_count, self.sub_bucket_half)
+        return ((sub_bucket + self.sub_bucket_half + 1) << (shift + 1)) - 1
+
+    def record(self, value):
+        """
+        Record a value.
+
+        Args:
+            value (int or float): The value, in the same unit as the values
+                returned (not in multiples of `unit`). Negative values are
+                recorded as 0.
+
+        """
+        value = max(0, value)
+        index = self._get_index(int(value / self.unit))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self):
+        """
+        Returns:
+            float: The mean of all values, or 0 if there are none.
+
+        """
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, percentile):
+        """
+        Get the value that the given percentage of values are at or below.
+
+        Args:
+            percentile (float): The percentile, from 0 to 100.
+
+        Returns:
+            float: The value (the highest value of its bucket, but never more
+                than the largest value recorded), or 0 if there are no values.
+
+        """
+        if not self.count:
+            return 0
+        target = max(1, min(self.count, math.ceil(percentile / 100 * self.count)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._get_highest_value(index) * self.unit, self.max)
+        return self.max
+
+
+class _NoTimer:
+    """
+    Used when command stats are turned off.
+
+    """
+
+    def lap(self, phase):
+        pass
+
+    def finish(self, key):
+        pass
+
+
+class CommandTimer:
+    """
+    Times the phases of running one command.
+
+    """
+
+    __slots__ = ("stats", "phases", "last", "nqueries")
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.phases = {}
+        self.nqueries = count_queries()
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Record the time since the last lap as the time of a phase.
+
+        Args:
+            phase (str): The phase that just ended.
+
+        """
+        now = time.perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+
+    def finish(self, key):
+        """
+        Store the times of this command run.
+
+        Args:
+            key (str): The key of the command that was run.
+
+        """
+        self.stats.record(key, self.phases, count_queries() - self.nqueries)
+
+
+class CommandStats:
+    """
+    Keeps histograms of the phase times and query counts of all commands.
+
+    """
+
+    def __init__(self, enabled=None):
+        """
+        Args:
+            enabled (bool, optional): If commands should be timed. Defaults
+                to `settings.COMMAND_STATS`.
+
+        """
+        self.enabled = _COMMAND_STATS_ENABLED if enabled is None else enabled
+        self.stats = {}
+        self.started = time.time()
+
+    def timer(self):
+        """
+        Start timing a command. Call `lap(phase)` on the returned timer at
+        the end of each phase and `finish(cmdkey)` when the command is done.
+
+        Returns:
+            CommandTimer: The timer (which does nothing if stats are off).
+
+        """
+        return CommandTimer(self) if self.enabled else _NoTimer()
+
+    def record(self, key, phases, nqueries):
+        """
+        Record a command run.
+
+        Args:
+            key (str): The command's key.
+            phases (dict): `{phase: seconds, ...}` for the phases that were run.
+            nqueries (int): The number of database queries made.
+
+        """
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = {
+                "total": Histogram(unit=1e-6),
+                "queries": Histogram(),
+                **{phase: Histogram(unit=1e-6) for phase in PHASES},
+            }
+        for phase, duration in phases.items():
+            stats[phase].record(duration)
+        stats["total"].record(sum(phases.values()))
+        stats["queries"].record(nqueries)
+
+    def get(self, key):
+        """
+        Get the histograms of a command.
+
+        Args:
+            key (str): The command's key.
+
+        Returns:
+            dict or None: `{"total": Histogram, "queries": Histogram, phase:
+                Histogram, ...}`, or `None` if the command was not run.
+
+        """
+        return self.stats.get(key)
+
+    def all(self):
+        """
+        Returns:
+            dict: `{cmdkey: {name: Histogram, ...}, ...}` for all commands.
+
+        """
+        return self.stats
+
+    def reset(self):
+        """
+        Forget all recorded command runs.
+
+        """
+        self.stats = {}
+        self.started = time.time()
+
+    def prometheus(self):
+        """
+        Get all stats in the Prometheus text format, as summaries.
+
+        Returns:
+            str: The metrics.
+
+        """
+        lines = [
+            "# HELP evennia_command_seconds Time spent in each phase of running a command.",
+            "# TYPE evennia_command_seconds summary",
+        ]
+        for key, stats in sorted(self.stats.items()):
+            for phase in ("total",) + PHASES:
+                if stats[phase].count:
+                    labels = f'command="{_escape(key)}",phase="{phase}"'
+                    lines.extend(_summary("evennia_command_seconds", labels, stats[phase]))
+        lines.extend(
+            [
+                "# HELP evennia_command_queries Database queries made by a command.",
+                "# TYPE evennia_command_queries summary",
+            ]
+        )
+        for key, stats in sorted(self.stats.items()):
+            labels = f'command="{_escape(key)}"'
+            lines.extend(_summary("evennia_command_queries", labels, stats["queries"]))
+        return "\n".join(lines) + "\n"
+
+
+def _escape(label):
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _summary(name, labels, histogram):
+    lines = [
+        f'{name}{{{labels},quantile="{quantile}"}} {histogram.percentile(quantile * 100):g}'
+        for quantile in QUANTILES
+    ]
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total:g}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+COMMAND_STATS = CommandStats()
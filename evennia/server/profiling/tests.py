@@ -2,6 +2,7 @@ from anything import Something
 from django.test import TestCase
 from mock import Mock, mock_open, patch
 
+from . import cmdstats
 from .dummyrunner_settings import (
     c_creates_button,
     c_creates_obj,
@@ -158,3 +159,53 @@ class TestMemPlot(TestCase):
         handle = mocked_open()
         handle.write.assert_called_with("100.0, 0.001, 0.001, 9\n")
         script.stop()
+
+
+class TestCommandStats(TestCase):
+    def test_histogram(self):
+        histogram = cmdstats.Histogram(unit=1e-6)
+        for value in range(1, 1001):
+            histogram.record(value / 1000)
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.mean(), 0.5005)
+        # HDR-style buckets keep percentiles within 1%
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.005)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.01)
+        self.assertEqual(histogram.percentile(100), 1.0)
+        self.assertLess(len(histogram.counts), 1000)
+
+    def test_histogram_exact_small_values(self):
+        histogram = cmdstats.Histogram()
+        for value in (0, 1, 1, 2, 3):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(40), 1)
+        self.assertEqual(histogram.percentile(60), 1)
+        self.assertEqual(histogram.percentile(80), 2)
+        self.assertEqual(cmdstats.Histogram().percentile(50), 0)
+
+    def test_record_and_prometheus(self):
+        stats = cmdstats.CommandStats(enabled=True)
+        stats.record("look", {"merge": 0.001, "func": 0.002}, 4)
+        stats.record('say"', {"func": 0.001}, 0)
+        look = stats.get("look")
+        self.assertEqual(look["total"].count, 1)
+        self.assertAlmostEqual(look["total"].max, 0.003)
+        self.assertEqual(look["parse"].count, 0)
+        self.assertEqual(look["queries"].max, 4)
+
+        text = stats.prometheus()
+        self.assertIn("# TYPE evennia_command_seconds summary", text)
+        self.assertIn('evennia_command_seconds_count{command="look",phase="func"} 1', text)
+        self.assertNotIn('command="look",phase="parse"', text)
+        self.assertIn('evennia_command_queries{command="look",quantile="0.5"} 4', text)
+        self.assertIn('command="say\\""', text)
+
+        stats.reset()
+        self.assertEqual(stats.all(), {})
+
+    def test_disabled(self):
+        stats = cmdstats.CommandStats(enabled=False)
+        timer = stats.timer()
+        timer.lap("func")
+        timer.finish("look")
+        self.assertEqual(stats.all(), {})
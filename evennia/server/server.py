@@ -23,6 +23,12 @@ evennia._init()
 from django.conf import settings
 
 from evennia.utils import logger
+from evennia.utils.aio import is_asyncio_reactor
+
+if is_asyncio_reactor():
+    # we query the database from the reactor thread, where the asyncio loop
+    # also runs; Django would otherwise refuse this
+    os.environ.setdefault("DJANGO_ALLOW_ASYNC_UNSAFE", "true")
 
 # twistd requires us to define the variable 'application' so it knows
 # what to execute from.
@@ -32,8 +38,15 @@ application = evennia.TWISTED_APPLICATION
 
 if "--nodaemon" not in sys.argv and "test" not in sys.argv:
     # activate logging for interactive/testing mode
+    from evennia.server.worker import WORKER_ID
+
+    logfilename = os.path.basename(settings.SERVER_LOG_FILE)
+    if WORKER_ID is not None:
+        # each worker logs to its own file, like server-worker1.log
+        root, ext = os.path.splitext(logfilename)
+        logfilename = f"{root}-worker{WORKER_ID}{ext}"
     logfile = logger.WeeklyLogFile(
-        os.path.basename(settings.SERVER_LOG_FILE),
+        logfilename,
         os.path.dirname(settings.SERVER_LOG_FILE),
         day_rotation=settings.SERVER_LOG_DAY_ROTATION,
         max_size=settings.SERVER_LOG_MAX_SIZE,
@@ -15,6 +15,7 @@ from django.utils import timezone
 from evennia.commands.cmdsethandler import CmdSetHandler
 from evennia.comms.models import ChannelDB
 from evennia.scripts.monitorhandler import MONITOR_HANDLER
+from evennia.server.worker import WORKER_ID
 from evennia.typeclasses.attributes import (
     AttributeHandler,
     DbHolder,
@@ -30,6 +31,11 @@ _ANSI = None
 
 _BASE_SESSION_CLASS = class_from_module(settings.BASE_SESSION_CLASS)
 
+# the properties the sessionhandler indexes sessions by
+_INDEXED_PROPERTIES = frozenset(("uid", "puid", "csessid", "logged_in"))
+# the main Server tells the Portal about puppet changes, for the Server workers
+_SYNC_PUID = settings.SERVER_WORKERS > 0 and WORKER_ID is None
+
 
 # -------------------------------------------------------------
 # Server Session
@@ -63,6 +69,27 @@ class ServerSession(_BASE_SESSION_CLASS):
         self.cmdset_storage_string = ""
         self.cmdset = CmdSetHandler(self, True)
 
+    def __setattr__(self, propname, value):
+        """
+        Keep the sessionhandler's indexes up to date.
+
+        """
+        if propname not in _INDEXED_PROPERTIES:
+            _SA(self, propname, value)
+            return
+        old_value = self.__dict__.get(propname)
+        _SA(self, propname, value)
+        sessionhandler = self.__dict__.get("sessionhandler")
+        if sessionhandler is not None and hasattr(sessionhandler, "update_index"):
+            sessionhandler.update_index(self)
+            if (
+                _SYNC_PUID
+                and propname == "puid"
+                and value != old_value
+                and sessionhandler.get(getattr(self, "sessid", None)) is self
+            ):
+                sessionhandler.session_portal_partial_sync({self.sessid: {"puid": value}})
+
     def __cmdset_storage_get(self):
         return [path.strip() for path in self.cmdset_storage_string.split(",")]
 
@@ -172,6 +199,10 @@ class ServerSession(_BASE_SESSION_CLASS):
             # remove any webclient settings monitors associated with this
             # session
             MONITOR_HANDLER.remove(account, "_saved_webclient_options", self.sessid)
+        # drop coalesced monitor updates and sent values kept for this session
+        from evennia.server.inputfuncs import _MONITOR_PUSHER
+
+        _MONITOR_PUSHER.forget(self.sessid)
 
     def get_account(self):
         """
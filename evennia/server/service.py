@@ -19,6 +19,7 @@ from twisted.internet.defer import Deferred
 from twisted.internet.task import LoopingCall
 
 import evennia
+from evennia.server.worker import WORKER_ID
 from evennia.utils import logger
 from evennia.utils.utils import get_evennia_version, make_iter, mod_import
 
@@ -128,14 +129,9 @@ class EvenniaServerService(MultiService):
     def process_idle_timeouts(self):
         # handle idle timeouts
         if settings.IDLE_TIMEOUT > 0:
-            now = time.time()
             reason = _("idle timeout exceeded")
             to_disconnect = []
-            for session in (
-                sess
-                for sess in evennia.SESSION_HANDLER.values()
-                if (now - sess.cmd_last) > settings.IDLE_TIMEOUT
-            ):
+            for session in evennia.SESSION_HANDLER.get_idle_sessions(settings.IDLE_TIMEOUT):
                 if not session.account or not session.account.access(
                     session.account, "noidletimeout", default=False
                 ):
@@ -148,6 +144,13 @@ class EvenniaServerService(MultiService):
     def privilegedStartService(self):
         self.start_time = time.time()
 
+        if WORKER_ID is not None:
+            # a worker only runs commands for the Portal, see evennia.server.worker
+            self.info_dict["info"] = f"Server worker {WORKER_ID}."
+            self.register_amp()
+            super().privilegedStartService()
+            return
+
         # Tell the system the server is starting up; some things are not available yet
         try:
             evennia.ServerConfig.objects.conf("server_starting_mode", True)
@@ -507,6 +510,13 @@ class EvenniaServerService(MultiService):
             # once; we don't need to run the shutdown procedure again.
             defer.returnValue(None)
 
+        if WORKER_ID is not None:
+            # workers have no state of their own to save
+            if not _reactor_stopping:
+                self.shutdown_complete = True
+                reactor.callLater(0, reactor.stop)
+            defer.returnValue(None)
+
         if mode == "reload":
             # call restart hooks
             evennia.ServerConfig.objects.conf("server_restart_mode", "reload")
@@ -560,6 +570,14 @@ class EvenniaServerService(MultiService):
         except Exception as err:
             logger.log_trace(f"Error saving TickerHandler state: {err}")
 
+        # save the current node of compiled, persistent menus
+        from evennia.utils.evmenu import MENU_CURSOR_SAVER
+
+        try:
+            MENU_CURSOR_SAVER.flush()
+        except Exception as err:
+            logger.log_trace(f"Error saving EvMenu state: {err}")
+
         # on-demand handler state should always be saved.
         from evennia.scripts.ondemandhandler import ON_DEMAND_HANDLER
 
@@ -664,6 +682,12 @@ class EvenniaServerService(MultiService):
 
         ON_DEMAND_HANDLER.load()
 
+        # build the global key/alias search index
+        if settings.SEARCH_NAME_INDEX:
+            from evennia.typeclasses.searchindex import SEARCH_INDEX
+
+            SEARCH_INDEX.load()
+
         # create/update channels
         self.create_default_channels()
 
@@ -13,6 +13,7 @@ There are two similar but separate stores of sessions:
 
 """
 
+import heapq
 import time
 from codecs import decode as codecs_decode
 
@@ -311,6 +312,118 @@ class ServerSessionHandler(SessionHandler):
         evennia.server_data = {"servername": _SERVERNAME}
         # will be set on psync
         self.portal_start_time = 0.0
+        # secondary indexes, {key: {sessid: session}}, kept up to date by update_index
+        self._uid_index = {}
+        self._puid_index = {}
+        self._csessid_index = {}
+        # {sessid: (uid, puid, csessid)}, the keys each session is indexed under
+        self._index_keys = {}
+        # heap of (cmd_last, sessid), for finding idle sessions
+        self._idle_heap = []
+        self._idle_sessids = set()
+
+    # secondary indexes
+
+    def __setitem__(self, sessid, session):
+        """
+        Index new sessions.
+
+        """
+        if sessid is None:
+            return
+        self._unindex(sessid)
+        super().__setitem__(sessid, session)
+        self._index(sessid, session)
+        cmd_last = getattr(session, "cmd_last", None)
+        if sessid not in self._idle_sessids and isinstance(cmd_last, (int, float)):
+            self._idle_sessids.add(sessid)
+            heapq.heappush(self._idle_heap, (cmd_last, sessid))
+
+    def __delitem__(self, sessid):
+        """
+        Remove sessions from the indexes.
+
+        """
+        super().__delitem__(sessid)
+        self._unindex(sessid)
+
+    def pop(self, sessid, *args):
+        """
+        Remove sessions from the indexes.
+
+        """
+        session = super().pop(sessid, *args)
+        self._unindex(sessid)
+        return session
+
+    def _index(self, sessid, session):
+        keys = (
+            getattr(session, "uid", None) if getattr(session, "logged_in", False) else None,
+            getattr(session, "puid", None),
+            getattr(session, "csessid", None),
+        )
+        for index, key in zip((self._uid_index, self._puid_index, self._csessid_index), keys):
+            if key is not None:
+                index.setdefault(key, {})[sessid] = session
+        self._index_keys[sessid] = keys
+
+    def _unindex(self, sessid):
+        keys = self._index_keys.pop(sessid, None)
+        if not keys:
+            return
+        for index, key in zip((self._uid_index, self._puid_index, self._csessid_index), keys):
+            if key is not None:
+                sessions = index.get(key)
+                if sessions:
+                    sessions.pop(sessid, None)
+                    if not sessions:
+                        del index[key]
+
+    def update_index(self, session):
+        """
+        Update the indexes of a session after its `uid`, `puid`, `csessid` or
+        `logged_in` changed. `ServerSession` calls this automatically.
+
+        Args:
+            session (Session): The session that changed.
+
+        """
+        sessid = session.sessid
+        if sessid is not None and dict.get(self, sessid) is session:
+            self._unindex(sessid)
+            self._index(sessid, session)
+
+    def get_idle_sessions(self, timeout):
+        """
+        Get the sessions that have not sent a command for a while.
+
+        Args:
+            timeout (float): The number of seconds without commands after
+                which a session counts as idle.
+
+        Returns:
+            list: The idle sessions, logged in or not.
+
+        Notes:
+            This only checks the sessions that were last checked more than
+            `timeout` seconds ago, so it does not need to go through all sessions.
+
+        """
+        now = time.time()
+        heap = self._idle_heap
+        idle, checked = [], []
+        while heap and now - heap[0][0] > timeout:
+            _, sessid = heapq.heappop(heap)
+            session = dict.get(self, sessid)
+            if session is None:
+                self._idle_sessids.discard(sessid)
+                continue
+            checked.append((sessid, session))
+            if now - session.cmd_last > timeout:
+                idle.append(session)
+        for sessid, session in checked:
+            heapq.heappush(heap, (session.cmd_last, sessid))
+        return idle
 
     def _run_cmd_login(self, session):
         """
@@ -660,7 +773,7 @@ class ServerSessionHandler(SessionHandler):
         # mean connecting from the same host would not catch duplicates
         sid = id(curr_session)
         doublet_sessions = [
-            sess for sess in self.values() if sess.logged_in and sess.uid == uid and id(sess) != sid
+            sess for sess in self._uid_index.get(uid, {}).values() if id(sess) != sid
         ]
 
         for session in doublet_sessions:
@@ -672,16 +785,12 @@ class ServerSessionHandler(SessionHandler):
         see if any are dead or idle.
 
         """
-        tcurr = time.time()
+        if _IDLE_TIMEOUT <= 0:
+            return
         reason = _("Idle timeout exceeded, disconnecting.")
-        for session in (
-            session
-            for session in self.values()
-            if session.logged_in
-            and _IDLE_TIMEOUT > 0
-            and (tcurr - session.cmd_last) > _IDLE_TIMEOUT
-        ):
-            self.disconnect(session, reason=reason)
+        for session in self.get_idle_sessions(_IDLE_TIMEOUT):
+            if session.logged_in:
+                self.disconnect(session, reason=reason)
 
     def account_count(self):
         """
@@ -693,7 +802,7 @@ class ServerSessionHandler(SessionHandler):
             naccount (int): Number of connected accounts
 
         """
-        return len(set(session.uid for session in self.values() if session.logged_in))
+        return len(self._uid_index)
 
     def all_connected_accounts(self):
         """
@@ -704,13 +813,8 @@ class ServerSessionHandler(SessionHandler):
                 amount of Sessions due to multi-playing).
 
         """
-        return list(
-            set(
-                session.account
-                for session in self.values()
-                if session.logged_in and session.account
-            )
-        )
+        accounts = (next(iter(sessions.values())).account for sessions in self._uid_index.values())
+        return list(set(account for account in accounts if account))
 
     def session_from_sessid(self, sessid):
         """
@@ -759,8 +863,7 @@ class ServerSessionHandler(SessionHandler):
             sessions (list): All Sessions associated with this account.
 
         """
-        uid = account.uid
-        return [session for session in self.values() if session.logged_in and session.uid == uid]
+        return list(self._uid_index.get(account.uid, {}).values())
 
     def sessions_from_puppet(self, puppet):
         """
@@ -774,7 +877,7 @@ class ServerSessionHandler(SessionHandler):
                 one Session (MULTISESSION_MODE > 1).
 
         """
-        sessions = puppet.sessid.get()
+        sessions = list(self._puid_index.get(puppet.id, {}).values())
         return sessions[0] if len(sessions) == 1 else sessions
 
     sessions_from_character = sessions_from_puppet
@@ -793,9 +896,7 @@ class ServerSessionHandler(SessionHandler):
         """
         if not csessid:
             return []
-        return [
-            session for session in self.values() if session.csessid and session.csessid == csessid
-        ]
+        return list(self._csessid_index.get(csessid, {}).values())
 
     def announce_all(self, message):
         """
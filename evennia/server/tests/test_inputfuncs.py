@@ -3,6 +3,9 @@ Tests for server input functions.
 """
 
 import pickle
+from unittest import mock
+
+from twisted.internet import task
 
 import evennia
 from evennia.server import inputfuncs
@@ -32,3 +35,106 @@ class TestMonitoredInputfunc(BaseEvenniaTest):
         self.assertIn("session", monitor_kwargs)
         self.assertIsInstance(monitor_kwargs["session"], str)
         pickle.dumps((self.session.sessid, sent_kwargs), pickle.HIGHEST_PROTOCOL)
+
+
+class TestMonitorCoalescing(BaseEvenniaTest):
+    """
+    Test monitors set up with coalesce/delta/interval.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.clock = task.Clock()
+        self.patcher = mock.patch("evennia.server.inputfuncs.reactor", self.clock)
+        self.patcher.start()
+        self.old_pusher = inputfuncs._MONITOR_PUSHER
+        self.pusher = inputfuncs._MONITOR_PUSHER = inputfuncs._MonitorPusher()
+        self.session.puppet = self.char1
+        self.session.msg = mock.MagicMock()
+
+    def tearDown(self):
+        inputfuncs.unmonitor(self.session, name="name")
+        inputfuncs.unmonitor(self.session, name="desc")
+        self.patcher.stop()
+        inputfuncs._MONITOR_PUSHER = self.old_pusher
+        super().tearDown()
+
+    def test_get_monitor_delta(self):
+        self.assertEqual(
+            inputfuncs._get_monitor_delta({"a": 1, "b": 2}, {"a": 1, "b": 3, "c": 4}),
+            {"changed": {"b": 3, "c": 4}, "removed": []},
+        )
+        self.assertEqual(
+            inputfuncs._get_monitor_delta({"a": 1, "b": 2}, {"b": 2}),
+            {"changed": {}, "removed": ["a"]},
+        )
+        self.assertEqual(inputfuncs._get_monitor_delta([1, 2], [1, 2, 3]), {"appended": [3]})
+        self.assertIsNone(inputfuncs._get_monitor_delta([1, 2], [2, 3]))
+        self.assertIsNone(inputfuncs._get_monitor_delta(1, 2))
+
+    def test_coalesce(self):
+        inputfuncs.monitor(self.session, name="name", coalesce=True)
+        self.char1.key = "Foo"
+        self.char1.key = "Bar"
+        self.session.msg.assert_not_called()
+        self.clock.advance(0)
+        self.session.msg.assert_called_once_with(monitor={"name": "name", "value": "Bar"})
+
+        # changed back and forth within a tick; nothing to send
+        self.session.msg.reset_mock()
+        self.char1.key = "Baz"
+        self.char1.key = "Bar"
+        self.clock.advance(0)
+        self.session.msg.assert_not_called()
+
+    def test_interval(self):
+        inputfuncs.monitor(self.session, name="name", interval=10)
+        self.char1.key = "Foo"
+        self.clock.advance(0)
+        self.assertEqual(self.session.msg.call_count, 1)
+        self.char1.key = "Bar"
+        self.clock.advance(5)
+        self.char1.key = "Baz"
+        self.assertEqual(self.session.msg.call_count, 1)
+        self.clock.advance(5)
+        self.assertEqual(self.session.msg.call_count, 2)
+        self.session.msg.assert_called_with(monitor={"name": "name", "value": "Baz"})
+        self.assertFalse(self.clock.getDelayedCalls())
+
+    def test_delta(self):
+        self.char1.db.desc = {"hp": 10, "mp": 5}
+        inputfuncs.monitor(self.session, name="desc", delta=True)
+        self.char1.db.desc = {"hp": 8, "mp": 5}
+        self.clock.advance(0)
+        self.session.msg.assert_called_with(monitor={"name": "desc", "value": {"hp": 8, "mp": 5}})
+        self.char1.db.desc["hp"] = 6
+        self.char1.db.desc["sp"] = 1
+        self.clock.advance(0)
+        self.session.msg.assert_called_with(
+            monitor={"name": "desc", "delta": {"changed": {"hp": 6, "sp": 1}, "removed": []}}
+        )
+        self.assertEqual(self.session.msg.call_count, 2)
+
+    def test_stop(self):
+        inputfuncs.monitor(self.session, name="name", coalesce=True)
+        self.char1.key = "Foo"
+        inputfuncs.unmonitor(self.session, name="name")
+        self.clock.advance(0)
+        self.session.msg.assert_not_called()
+        self.assertEqual(self.pusher.sent, {})
+
+    def test_bad_interval(self):
+        for interval in ("fast", None, [1]):
+            inputfuncs.monitor(self.session, name="name", coalesce=True, interval=interval)
+            self.char1.key = f"Foo{interval}"
+            self.clock.advance(0)
+            self.session.msg.assert_called_with(monitor={"name": "name", "value": f"Foo{interval}"})
+
+    def test_disconnect(self):
+        inputfuncs.monitor(self.session, name="name", coalesce=True)
+        self.char1.key = "Foo"
+        self.clock.advance(0)
+        self.assertTrue(self.pusher.sent)
+        self.session.at_disconnect()
+        self.assertEqual(self.pusher.sent, {})
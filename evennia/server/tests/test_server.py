@@ -111,10 +111,12 @@ class TestServer(TestCase):
             mocks["time"].time = MagicMock(return_value=1000)
 
             mockconf.objects.conf = MagicMock(return_value=100)
-            mocksess.values = MagicMock(return_value=[sess1, sess2, sess3, sess4])
+            # sess2 is not idle
+            mocksess.get_idle_sessions = MagicMock(return_value=[sess1, sess3, sess4])
             mocksess.disconnect = MagicMock()
 
             self.server.server_maintenance()
+            mocksess.get_idle_sessions.assert_called_with(10)
             reason = "idle timeout exceeded"
             calls = [call(sess1, reason=reason), call(sess4, reason=reason)]
             mocksess.disconnect.assert_has_calls(calls, any_order=True)
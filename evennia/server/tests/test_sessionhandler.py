@@ -0,0 +1,101 @@
+"""
+Tests for the server sessionhandler.
+"""
+
+from unittest import mock
+
+from evennia.server.serversession import ServerSession
+from evennia.server.sessionhandler import ServerSessionHandler
+from evennia.utils.test_resources import BaseEvenniaTest
+
+
+class TestSessionIndexes(BaseEvenniaTest):
+    """
+    Test the secondary session indexes of the ServerSessionHandler.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.handler = ServerSessionHandler()
+        self.sessions = []
+        for sessid in range(1, 4):
+            session = ServerSession()
+            session.init_session("telnet", ("localhost", "testmode"), self.handler)
+            session.sessid = sessid
+            self.handler[sessid] = session
+            self.sessions.append(session)
+
+    def _login(self, session, account):
+        session.account = account
+        session.uid = account.id
+        session.logged_in = True
+
+    def test_account_index(self):
+        sess1, sess2, sess3 = self.sessions
+        self.assertEqual(self.handler.account_count(), 0)
+        self._login(sess1, self.account)
+        self._login(sess2, self.account)
+        self._login(sess3, self.account2)
+
+        self.assertEqual(self.handler.sessions_from_account(self.account), [sess1, sess2])
+        self.assertEqual(self.handler.sessions_from_account(self.account2), [sess3])
+        self.assertEqual(self.handler.account_count(), 2)
+        self.assertEqual(set(self.handler.all_connected_accounts()), {self.account, self.account2})
+
+        sess2.logged_in = False
+        self.assertEqual(self.handler.sessions_from_account(self.account), [sess1])
+        del self.handler[sess3.sessid]
+        self.assertEqual(self.handler.sessions_from_account(self.account2), [])
+        self.assertEqual(self.handler.account_count(), 1)
+        self.assertEqual(self.handler.all_connected_accounts(), [self.account])
+
+    def test_puppet_index(self):
+        sess1, sess2, _ = self.sessions
+        sess1.puid = self.char1.id
+        self.assertEqual(self.handler.sessions_from_puppet(self.char1), sess1)
+        sess2.puid = self.char1.id
+        self.assertEqual(self.handler.sessions_from_puppet(self.char1), [sess1, sess2])
+        sess1.puid = None
+        sess2.puid = self.char2.id
+        self.assertEqual(self.handler.sessions_from_puppet(self.char1), [])
+        self.assertEqual(self.handler.sessions_from_puppet(self.char2), sess2)
+
+    def test_csessid_index(self):
+        sess1, sess2, sess3 = self.sessions
+        sess1.csessid = "abc"
+        sess3.csessid = "abc"
+        self.assertEqual(self.handler.sessions_from_csessid("abc"), [sess1, sess3])
+        self.assertEqual(self.handler.sessions_from_csessid(None), [])
+        self.handler.pop(sess1.sessid)
+        self.assertEqual(self.handler.sessions_from_csessid("abc"), [sess3])
+
+    def test_replaced_session(self):
+        sess1 = self.sessions[0]
+        self._login(sess1, self.account)
+        new_sess1 = ServerSession()
+        new_sess1.init_session("telnet", ("localhost", "testmode"), self.handler)
+        new_sess1.sessid = sess1.sessid
+        self.handler[sess1.sessid] = new_sess1
+        self.assertEqual(self.handler.sessions_from_account(self.account), [])
+        # the old session no longer updates the indexes
+        sess1.uid = self.account2.id
+        self.assertEqual(self.handler.account_count(), 0)
+
+    @mock.patch("evennia.server.sessionhandler.time")
+    def test_get_idle_sessions(self, mocktime):
+        sess1, sess2, sess3 = self.sessions
+        now = sess1.cmd_last
+        mocktime.time.return_value = now + 5
+        self.assertEqual(self.handler.get_idle_sessions(10), [])
+
+        sess2.cmd_last = now + 8
+        mocktime.time.return_value = now + 11
+        self.assertEqual(self.handler.get_idle_sessions(10), [sess1, sess3])
+        # the idle sessions are reported until they are removed or active again
+        sess3.cmd_last = now + 11
+        self.assertEqual(self.handler.get_idle_sessions(10), [sess1])
+        del self.handler[sess1.sessid]
+        mocktime.time.return_value = now + 19
+        self.assertEqual(self.handler.get_idle_sessions(10), [sess2])
+        self.assertEqual(len(self.handler._idle_heap), 2)
@@ -0,0 +1,74 @@
+"""
+Tests for the session mirrors of Server workers.
+
+"""
+
+from unittest import mock
+
+from django.conf import settings
+
+from evennia.server import worker
+from evennia.server.sessionhandler import ServerSessionHandler
+from evennia.utils.test_resources import BaseEvenniaTest
+
+
+class TestWorkerSessions(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        self.handler = ServerSessionHandler()
+        self.patcher = mock.patch("evennia.SERVER_SESSION_HANDLER", self.handler)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        super().tearDown()
+
+    def _sessiondata(self, sessid, **kwargs):
+        data = {
+            "sessid": sessid,
+            "protocol_key": "telnet",
+            "address": "localhost",
+            "uid": None,
+            "uname": None,
+            "csessid": None,
+            "logged_in": False,
+            "puid": None,
+            "protocol_flags": {},
+            "cmdset_storage_string": "",
+        }
+        data.update(kwargs)
+        return data
+
+    def test_sync_session(self):
+        sessid_string = self.char1.db_sessid
+        session = worker.sync_session(
+            self._sessiondata(
+                1, uid=self.account.id, logged_in=True, puid=self.char1.id, uname="TestAccount"
+            )
+        )
+        self.assertIs(self.handler.get(1), session)
+        self.assertEqual(session.account, self.account)
+        self.assertEqual(session.get_puppet(), self.char1)
+        self.assertEqual(self.handler.sessions_from_account(self.account), [session])
+        self.assertEqual(session.cmdset_storage, [settings.CMDSET_SESSION])
+        # mirroring does not touch the database
+        self.assertEqual(self.char1.db_sessid, sessid_string)
+
+        # an update reuses the session
+        self.assertIs(worker.sync_session(self._sessiondata(1, puid=None)), session)
+        self.assertIsNone(session.puppet)
+
+    def test_unloggedin_session(self):
+        session = worker.sync_session(self._sessiondata(2))
+        self.assertIsNone(session.account)
+        self.assertEqual(session.cmdset_storage, [settings.CMDSET_UNLOGGEDIN])
+
+    def test_sync_and_remove_sessions(self):
+        worker.sync_session(self._sessiondata(1))
+        worker.sync_sessions({2: self._sessiondata(2), 3: self._sessiondata(3)})
+        self.assertEqual(sorted(self.handler), [2, 3])
+        worker.remove_session(2)
+        worker.remove_session(4)
+        self.assertEqual(list(self.handler), [3])
+        worker.remove_all_sessions()
+        self.assertEqual(len(self.handler), 0)
@@ -0,0 +1,129 @@
+"""
+Server workers
+
+A Portal can run `settings.SERVER_WORKERS` extra Server processes next to the
+main Server. The Portal routes the commands in `settings.SERVER_WORKER_COMMANDS`
+to the workers and all other input to the main Server (see
+`evennia.server.portal.worker_router`).
+
+A worker is a normal Server process started with the `EVENNIA_SERVER_WORKER`
+environment variable set to its worker id. It does not run the initial setup,
+the server hooks, global scripts, tickers or the webserver. It also does not own
+its sessions. Instead it keeps a mirror of the main Server's sessions, updated
+by the Portal, and never calls any session hooks on them. This means that a
+worker is only suitable for read-heavy commands. Each worker has its own
+idmapper cache, so changes made in another process may not be visible in a
+worker until its cached copy is flushed.
+
+"""
+
+import os
+
+from django.conf import settings
+
+import evennia
+
+_AccountDB = None
+_ObjectDB = None
+
+WORKER_ENV_VAR = "EVENNIA_SERVER_WORKER"
+
+
+def get_worker_id():
+    """
+    Get the worker id of this Server process.
+
+    Returns:
+        int or None: The worker id, or `None` if this is the main Server.
+
+    """
+    worker_id = os.environ.get(WORKER_ENV_VAR)
+    return int(worker_id) if worker_id else None
+
+
+WORKER_ID = get_worker_id()
+
+
+def _mirror_session(session):
+    """
+    Set up the account, puppet and cmdsets of a mirrored session. Unlike
+    `ServerSession.at_sync`, this does not write anything to the database.
+
+    """
+    global _AccountDB, _ObjectDB
+    if not _AccountDB:
+        from evennia.accounts.models import AccountDB as _AccountDB
+        from evennia.objects.models import ObjectDB as _ObjectDB
+
+    session.account = _AccountDB.objects.get_account_from_uid(session.uid) if session.uid else None
+    if session.logged_in and session.account:
+        session.cmdset_storage = settings.CMDSET_SESSION
+    else:
+        session.cmdset_storage = settings.CMDSET_UNLOGGEDIN
+    session.cmdset.update(init_mode=True)
+
+    puppet = None
+    if session.puid:
+        puppet = _ObjectDB.objects.filter(id=session.puid).first()
+    session.puppet = puppet
+
+
+def sync_session(sessiondata):
+    """
+    Create or update the mirror of a session.
+
+    Args:
+        sessiondata (dict): The session's sync data, from the Portal.
+
+    Returns:
+        ServerSession: The mirrored session.
+
+    """
+    from evennia.server.serversession import ServerSession
+
+    sessionhandler = evennia.SERVER_SESSION_HANDLER
+    session = sessionhandler.get(sessiondata.get("sessid"))
+    if not session:
+        session = ServerSession()
+        session.sessionhandler = sessionhandler
+        session.load_sync_data(sessiondata)
+        sessionhandler[session.sessid] = session
+    else:
+        session.load_sync_data(sessiondata)
+    _mirror_session(session)
+    return session
+
+
+def sync_sessions(sessionsdata):
+    """
+    Replace all mirrored sessions. This is called when the worker connects
+    to the Portal.
+
+    Args:
+        sessionsdata (dict): `{sessid: sessiondata, ...}` for all sessions.
+
+    """
+    remove_all_sessions()
+    for sessiondata in sessionsdata.values():
+        sync_session(sessiondata)
+
+
+def remove_session(sessid):
+    """
+    Remove the mirror of a session that was disconnected.
+
+    Args:
+        sessid (int): The id of the session to remove.
+
+    """
+    evennia.SERVER_SESSION_HANDLER.pop(sessid, None)
+
+
+def remove_all_sessions():
+    """
+    Remove all mirrored sessions.
+
+    """
+    sessionhandler = evennia.SERVER_SESSION_HANDLER
+    for sessid in list(sessionhandler.keys()):
+        sessionhandler.pop(sessid, None)
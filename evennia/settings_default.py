@@ -67,6 +67,12 @@ SSL_CERTIFICATE_ISSUER = {
 # server-side (see INPUT_FUNC_MODULES). TELNET_ENABLED is required for this
 # to work.
 TELNET_OOB_ENABLED = False
+# Telnet output sent within this many seconds is collected and sent to the client
+# as one write (and, with MCCP, compressed as one chunk). 0 sends it at the end of
+# the current reactor tick. None sends every line right away, without buffering.
+TELNET_OUTPUT_MAX_LATENCY = 0
+# Buffered telnet output is sent right away once it grows to this many bytes.
+TELNET_OUTPUT_MAX_BYTES = 64 * 1024
 # Activate SSH protocol communication (SecureShell)
 SSH_ENABLED = False
 # Ports to use for SSH
@@ -132,6 +138,23 @@ EVENNIA_ADMIN = True
 AMP_HOST = "localhost"
 AMP_PORT = 4006
 AMP_INTERFACE = "127.0.0.1"
+# Number of extra Server worker processes the Portal runs next to the main
+# Server. Workers only run the commands in SERVER_WORKER_COMMANDS; everything
+# else still runs in the main Server. Workers keep their own database cache, so
+# only read-only commands should be listed there.
+SERVER_WORKERS = 0
+# Commands (as typed, so include any aliases) the Portal sends to a worker.
+# Only list commands that don't change anything and don't need state kept
+# between inputs: `help` pages long output with EvMore, whose `next`/`quit`
+# input would go to the main Server, and `who` would show idle times from the
+# worker's stale copy of the sessions.
+SERVER_WORKER_COMMANDS = []
+# Decides which worker handles a session's commands. "account" sends all sessions
+# of an account to the same worker, "session" spreads sessions evenly.
+SERVER_WORKER_SHARD_KEY = "account"
+# Class deciding where the Portal sends session input. Override its
+# get_shard_key method to shard by something else.
+SERVER_WORKER_ROUTER_CLASS = "evennia.server.portal.worker_router.WorkerRouter"
 
 
 # Path to the lib directory containing the bulk of the codebase's code.
@@ -253,6 +276,18 @@ MAX_CONNECTION_RATE = 2
 MAX_COMMAND_RATE = 80
 # The warning to echo back to users if they send commands too fast
 COMMAND_RATE_WARNING = "You entered commands too fast. Wait a moment and try again."
+# Limit the text output the Portal sends to each session to this many bytes
+# per second on average, allowing bursts of up to MAX_OUTPUT_BURST bytes.
+# Text over the limit is queued. Prompts and OOB data are never held back.
+# To turn the limiter off, set to <= 0.
+MAX_OUTPUT_RATE = 0
+MAX_OUTPUT_BURST = 64 * 1024
+# How many text messages to queue for a session that is over its output rate,
+# or whose client does not read its output fast enough. Beyond this, the
+# oldest messages are dropped and the client is told how many it missed.
+MAX_OUTPUT_QUEUE = 200
+# The message telling the client how many messages were dropped
+OUTPUT_SKIPPED_WARNING = "[... {num} messages skipped ...]"
 # custom, extra commands to add to the `evennia` launcher. This is a dict
 # of {'cmdname': 'path.to.callable', ...}, where the callable will be passed
 # any extra args given on the command line. For example `evennia cmdname foo bar`.
@@ -545,6 +580,21 @@ COMMAND_DEFAULT_ARG_REGEX = r"^[ /]|\n|$"
 COMMAND_DEFAULT_MSG_ALL_SESSIONS = False
 # The default lockstring of a command.
 COMMAND_DEFAULT_LOCKS = ""
+# Commands can offload blocking work with `result = yield run_in_pool(func, ...)`
+# (see evennia.utils.pools). These are the (min, max) threads of that pool.
+COMMAND_THREADPOOL_LIMITS = (1, 4)
+# Number of processes used by `yield run_in_process(func, ...)`, for pure-Python
+# work heavy enough to be worth sending to another process.
+COMMAND_PROCESS_POOL_SIZE = 2
+# A Command's `func` can be an `async def` (see evennia.utils.aio). Such commands
+# can always await Deferreds. Set this to run the Server on Twisted's asyncio
+# reactor, so they can also await asyncio libraries (like aiohttp). This needs a
+# full server restart (not a reload) to take effect.
+ASYNCIO_REACTOR = False
+# Time each phase of every command (cmdset merge, parse, at_pre_cmd, func,
+# at_post_cmd) and count its database queries. See the `cmdstats` command and
+# evennia.server.profiling.cmdstats.
+COMMAND_STATS = True
 
 ######################################################################
 # Typeclasses and other paths
@@ -594,6 +644,31 @@ START_LOCATION = "#2"
 # out of sync between the processes. Keep on unless you face such
 # issues.
 TYPECLASS_AGGRESSIVE_CACHE = True
+# When the caches above are active, the command handler will group the entities
+# involved in each Command (the caller, its location and everything in it).
+# When one of them first needs to load its Tags or Attributes from the
+# database, the same is done for all entities in the group in one query,
+# instead of one (or more) query per entity. Handlers with a full cache then
+# also answer lookups of missing Tags/Attributes without a query. Set to False
+# to turn all of this off.
+HANDLER_CACHE_PREFETCH = True
+# Attribute values are normally stored pickled, which means they can only be
+# searched for by exact (pickled) equality. If this is set, primitive values
+# (int, float, bool and strings up to 255 characters) will also be stored in
+# indexed database columns whenever an Attribute is saved. This allows for
+# efficient look-ups like `get_by_attribute("hp", value__gt=10)` at the cost of
+# a little extra storage. If turning this on for an existing game, run
+# `evennia.typeclasses.attributes.update_attribute_value_index()` once (e.g.
+# from `evennia shell`) to index already existing Attributes.
+ATTRIBUTE_VALUE_INDEXING = False
+# Global searches for objects and accounts by (partial) key or alias are done
+# with regex/icontains queries that must scan the entire table. If this is set,
+# the keys and aliases of all objects and accounts are instead held in an
+# in-memory trigram index (loaded at server start and kept updated on save),
+# used to find the matching ids before going to the database. This speeds up
+# `search_object`, `search_account` and builder-commands like `find` on large
+# games, at the cost of some memory (roughly a few hundred bytes per entity).
+SEARCH_NAME_INDEX = False
 # These are fallbacks for BASE typeclasses failing to load. Usually needed only
 # during doc building. The system expects these to *always* load correctly, so
 # only modify if you are making fundamental changes to how objects/accounts
@@ -808,6 +883,9 @@ LOGIN_THROTTLE_TIMEOUT = 5 * 60
 # (and higher) that bypass this stripping. It is used as a fallback if a
 # specific list of perms are not given to the helper function.
 INPUT_CLEANUP_BYPASS_PERMISSIONS = ["Builder"]
+# Persistent EvMenus in compiled mode save which node they are on in batches,
+# this many seconds after the first node change, instead of on every change.
+EVMENU_CURSOR_SAVE_INTERVAL = 5
 
 
 ######################################################################
@@ -1179,6 +1257,15 @@ REST_FRAMEWORK = {
 # To enable the REST api, turn this to True
 REST_API_ENABLED = False
 
+# Serve the command stats (see COMMAND_STATS) in Prometheus' text format at
+# /metrics/. Logged-in staff accounts can read it. For a Prometheus server to
+# scrape it, set METRICS_TOKEN to a secret string and configure Prometheus to
+# send it as a bearer token (`Authorization: Bearer <token>`). Note that the
+# source IP can't be used to limit access, since the Portal proxies all web
+# requests to the Server from localhost.
+METRICS_ENABLED = False
+METRICS_TOKEN = None
+
 ######################################################################
 # Networking Replaceables
 ######################################################################
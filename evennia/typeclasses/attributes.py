@@ -19,12 +19,50 @@ from django.db import models
 from django.utils.encoding import smart_str
 
 from evennia.locks.lockhandler import LockHandler
+from evennia.typeclasses.prefetch import HANDLER_PREFETCH
 from evennia.utils.dbserialize import from_pickle, to_pickle
 from evennia.utils.idmapper.models import SharedMemoryModel
 from evennia.utils.picklefield import PickledObjectField
 from evennia.utils.utils import is_iter, lazy_property, make_iter, to_str
 
 _TYPECLASS_AGGRESSIVE_CACHE = settings.TYPECLASS_AGGRESSIVE_CACHE
+_ATTRIBUTE_VALUE_INDEXING = settings.ATTRIBUTE_VALUE_INDEXING
+_INDEXED_STRVALUE_MAXLEN = 255
+
+
+def to_indexed_value(value):
+    """
+    Convert an Attribute value to its representation in the indexed
+    side-columns of the Attribute table. Only primitive values (int, float,
+    bool and reasonably short strings) can be indexed.
+
+    Args:
+        value (any): The (unpickled) value to index.
+
+    Returns:
+        tuple: `(numvalue, textvalue)`, where `numvalue` is a float or `None` and
+            `textvalue` is a str or `None`. Both are `None` if the value cannot
+            be indexed.
+
+    Notes:
+        Numbers and bools are all stored as floats, so `True`, `1` and `1.0` will
+        all match each other in an indexed lookup.
+
+    """
+    if isinstance(value, (bool, int, float)):
+        try:
+            numvalue = float(value)
+        except OverflowError:
+            # a very big int
+            return None, None
+        if numvalue != numvalue:
+            # NaN can't be compared against anyway
+            return None, None
+        return numvalue, None
+    if isinstance(value, str) and len(value) <= _INDEXED_STRVALUE_MAXLEN:
+        return None, value
+    return None, None
+
 
 # -------------------------------------------------------------
 #
@@ -371,6 +409,24 @@ class Attribute(IAttribute, SharedMemoryModel):
     db_strvalue = models.TextField(
         "strvalue", null=True, blank=True, help_text="String-specific storage for quick look-up"
     )
+    # indexed copies of primitive values, only set if settings.ATTRIBUTE_VALUE_INDEXING is active
+    db_numvalue = models.FloatField(
+        "numvalue",
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Indexed copy of a numerical (int, float, bool) value, for range look-ups.",
+    )
+    db_textvalue = models.CharField(
+        "textvalue",
+        max_length=_INDEXED_STRVALUE_MAXLEN,
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Indexed copy of a short string value, for look-ups.",
+    )
     db_category = models.CharField(
         "category",
         max_length=128,
@@ -455,7 +511,11 @@ class Attribute(IAttribute, SharedMemoryModel):
         see self.__value_get.
         """
         self.db_value = to_pickle(new_value)
-        self.save(update_fields=["db_value"])
+        if _ATTRIBUTE_VALUE_INDEXING:
+            self.db_numvalue, self.db_textvalue = to_indexed_value(new_value)
+            self.save(update_fields=["db_value", "db_numvalue", "db_textvalue"])
+        else:
+            self.save(update_fields=["db_value"])
 
     @value.deleter
     def value(self):
@@ -463,6 +523,45 @@ class Attribute(IAttribute, SharedMemoryModel):
         self.delete()
 
 
+def update_attribute_value_index(queryset=None, batch_size=1000):
+    """
+    (Re)build the indexed side-columns for existing Attributes. This is only
+    needed when turning on `settings.ATTRIBUTE_VALUE_INDEXING` on a game that
+    already has Attributes stored; new Attribute-saves will keep the index
+    updated from then on.
+
+    Args:
+        queryset (QuerySet, optional): Only re-index these Attributes. If not
+            given, all Attributes in the database will be re-indexed.
+        batch_size (int, optional): How many Attributes to update per query.
+
+    Returns:
+        int: The number of Attributes that were re-indexed.
+
+    """
+    if queryset is None:
+        queryset = Attribute.objects.all()
+    fields = ["db_numvalue", "db_textvalue"]
+    batch = []
+    nupdated = 0
+    for attr in queryset.iterator(chunk_size=batch_size):
+        if attr.db_strvalue is not None:
+            numvalue, textvalue = None, None
+        else:
+            numvalue, textvalue = to_indexed_value(from_pickle(attr.db_value, db_obj=attr))
+        if (attr.db_numvalue, attr.db_textvalue) != (numvalue, textvalue):
+            attr.db_numvalue, attr.db_textvalue = numvalue, textvalue
+            batch.append(attr)
+        if len(batch) >= batch_size:
+            nupdated += len(batch)
+            Attribute.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        nupdated += len(batch)
+        Attribute.objects.bulk_update(batch, fields)
+    return nupdated
+
+
 #
 # Handlers making use of the Attribute model
 #
@@ -528,15 +627,36 @@ class IAttributeBackend:
 
     def _full_cache(self):
         """Cache all attributes of this object"""
-        if not _TYPECLASS_AGGRESSIVE_CACHE:
+        if not _TYPECLASS_AGGRESSIVE_CACHE or self._prefetch():
             return
-        attrs = self.query_all()
+        self._set_full_cache(self.query_all())
+
+    def _set_full_cache(self, attrs):
+        """
+        Set the full cache from all attributes of this object.
+
+        Args:
+            attrs (list): All Attributes (of this backend's attrtype) on the object.
+
+        """
         self._cache = {
             f"{to_str(attr.key).lower()}-{attr.category.lower() if attr.category else None}": attr
             for attr in attrs
         }
         self._cache_complete = True
 
+    def _prefetch(self):
+        """
+        Fill the full cache together with that of related entities, if
+        this object is part of the current prefetch-group. Only backends
+        storing Attributes in the database support this.
+
+        Returns:
+            bool: If the cache was filled.
+
+        """
+        return False
+
     def _get_cache_key(self, key, category):
         """
         Fetch cache key.
@@ -555,6 +675,10 @@ class IAttributeBackend:
             cachefound = True
         except KeyError:
             attr = None
+            if HANDLER_PREFETCH.enabled and (self._cache_complete or self._prefetch()):
+                # the cache holds all attributes, so if it's not there, it doesn't exist
+                attr = self._cache.get(cachekey)
+                cachefound = True
 
         if attr and (not hasattr(attr, "pk") and attr.pk is None):
             # clear out Attributes deleted from elsewhere. We must search this anew.
@@ -592,7 +716,10 @@ class IAttributeBackend:
             attrs (list): The discovered Attributes.
         """
         catkey = "-%s" % category
-        if _TYPECLASS_AGGRESSIVE_CACHE and catkey in self._catcache:
+        if _TYPECLASS_AGGRESSIVE_CACHE and (
+            catkey in self._catcache
+            or (HANDLER_PREFETCH.enabled and (self._cache_complete or self._prefetch()))
+        ):
             return [attr for key, attr in self._cache.items() if key.endswith(catkey) and attr]
         else:
             # we have to query to make this category up-date in the cache
@@ -1028,6 +1155,7 @@ class ModelAttributeBackend(IAttributeBackend):
         self._model = to_str(handler.obj.__dbclass__.__name__.lower())
 
     def query_all(self):
+        HANDLER_PREFETCH.count_query()
         query = {
             "%s__id" % self._model: self._objid,
             "attribute__db_model__iexact": self._model,
@@ -1038,6 +1166,46 @@ class ModelAttributeBackend(IAttributeBackend):
             for conn in getattr(self.obj, self._m2m_fieldname).through.objects.filter(**query)
         ]
 
+    @staticmethod
+    def _full_cache_many(handlers):
+        """
+        Fill the full caches of many AttributeHandlers of the same type (on
+        the same type of entity) using a single query.
+
+        Args:
+            handlers (list): The AttributeHandlers to fill. Those with already
+                complete caches are skipped.
+
+        """
+        backends = [
+            handler.backend
+            for handler in handlers
+            if isinstance(handler.backend, ModelAttributeBackend)
+            and not handler.backend._cache_complete
+        ]
+        if not backends:
+            return
+        first = backends[0]
+        query = {
+            "%s__id__in" % first._model: [backend._objid for backend in backends],
+            "attribute__db_model__iexact": first._model,
+            "attribute__db_attrtype": first._attrtype,
+        }
+        attrs = defaultdict(list)
+        for conn in (
+            getattr(first.obj, first._m2m_fieldname)
+            .through.objects.filter(**query)
+            .select_related("attribute")
+        ):
+            attrs[getattr(conn, "%s_id" % first._model)].append(conn.attribute)
+        for backend in backends:
+            backend._set_full_cache(attrs[backend._objid])
+
+    def _prefetch(self):
+        return _TYPECLASS_AGGRESSIVE_CACHE and HANDLER_PREFETCH.prefetch(
+            self.handler, self._full_cache_many
+        )
+
     def query_key(self, key, category):
         query = {
             "%s__id" % self._model: self._objid,
@@ -1048,9 +1216,11 @@ class ModelAttributeBackend(IAttributeBackend):
         }
         if not self.obj.pk:
             return []
+        HANDLER_PREFETCH.count_query()
         return getattr(self.obj, self._m2m_fieldname).through.objects.filter(**query)
 
     def query_category(self, category):
+        HANDLER_PREFETCH.count_query()
         query = {
             "%s__id" % self._model: self._objid,
             "attribute__db_model__iexact": self._model,
@@ -1076,6 +1246,8 @@ class ModelAttributeBackend(IAttributeBackend):
         else:
             kwargs["db_value"] = to_pickle(value)
             kwargs["db_strvalue"] = None
+            if _ATTRIBUTE_VALUE_INDEXING:
+                kwargs["db_numvalue"], kwargs["db_textvalue"] = to_indexed_value(value)
         new_attr = self._attrclass(**kwargs)
         new_attr.save()
         getattr(self.obj, self._m2m_fieldname).add(new_attr)
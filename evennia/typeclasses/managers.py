@@ -10,7 +10,8 @@ import shlex
 from django.db.models import Count, ExpressionWrapper, F, FloatField, Q
 from django.db.models.functions import Cast
 
-from evennia.typeclasses.attributes import Attribute
+from evennia.typeclasses import attributes as _attributes
+from evennia.typeclasses.attributes import Attribute, to_indexed_value
 from evennia.typeclasses.tags import Tag
 from evennia.utils import idmapper
 from evennia.utils.utils import class_from_module, make_iter, variable_from_module
@@ -19,6 +20,76 @@ __all__ = ("TypedObjectManager",)
 _GA = object.__getattribute__
 _Tag = None
 
+# lookups supported by get_by_attribute(value__<lookup>=...) on the indexed value columns
+_INDEXED_VALUE_LOOKUPS = (
+    "exact",
+    "iexact",
+    "gt",
+    "gte",
+    "lt",
+    "lte",
+    "in",
+    "range",
+    "contains",
+    "icontains",
+    "startswith",
+    "istartswith",
+    "endswith",
+    "iendswith",
+)
+
+
+def _indexed_value_query(fieldprefix, lookup, value):
+    """
+    Build a query on the indexed Attribute value-columns.
+
+    Args:
+        fieldprefix (str): The query path to the Attribute, like `"db_attributes__"`.
+        lookup (str): A Django lookup, like `"gt"` or `"in"`.
+        value (any): The value (or values, for `in` and `range`) to compare with.
+
+    Returns:
+        Q: The query object.
+
+    Raises:
+        ValueError: If the lookup or value is not possible to use with the index.
+
+    """
+    if not _attributes._ATTRIBUTE_VALUE_INDEXING:
+        raise ValueError(
+            f"Attribute lookup 'value__{lookup}' requires settings.ATTRIBUTE_VALUE_INDEXING."
+        )
+    if lookup not in _INDEXED_VALUE_LOOKUPS:
+        raise ValueError(f"Attribute lookup 'value__{lookup}' is not supported.")
+
+    if lookup == "in":
+        # values may be of mixed types, so split them over the two columns
+        numvalues, textvalues = [], []
+        for val in make_iter(value):
+            numvalue, textvalue = to_indexed_value(val)
+            if numvalue is not None:
+                numvalues.append(numvalue)
+            elif textvalue is not None:
+                textvalues.append(textvalue)
+            else:
+                raise ValueError(f"Attribute value {val!r} cannot be used in an indexed lookup.")
+        query = Q(pk__in=[])
+        if numvalues:
+            query |= Q(**{f"{fieldprefix}db_numvalue__in": numvalues})
+        if textvalues:
+            query |= Q(**{f"{fieldprefix}db_textvalue__in": textvalues})
+        return query
+
+    values = make_iter(value) if lookup == "range" else [value]
+    indexed = [to_indexed_value(val) for val in values]
+    if all(numvalue is not None for numvalue, _ in indexed):
+        field, values = "db_numvalue", [numvalue for numvalue, _ in indexed]
+    elif all(textvalue is not None for _, textvalue in indexed):
+        field, values = "db_textvalue", [textvalue for _, textvalue in indexed]
+    else:
+        raise ValueError(f"Attribute value {value!r} cannot be used in an indexed lookup.")
+    return Q(**{f"{fieldprefix}{field}__{lookup}": values if lookup == "range" else values[0]})
+
 
 # Managers
 
@@ -126,11 +197,25 @@ class TypedObjectManager(idmapper.manager.SharedMemoryManager):
             attrype (str, optional): An attribute-type to search for.
                 By default this is either `None` (normal Attributes) or
                 `"nick"`.
-            kwargs (any): Currently unused. Reserved for future use.
+            **kwargs: Lookups on the Attribute value, on the form `value__<lookup>`,
+                such as `value__gt=10`, `value__in=["red", "blue"]` or
+                `value__range=(1, 5)`. These are efficient, indexed lookups
+                but require `settings.ATTRIBUTE_VALUE_INDEXING` to be active
+                and only match Attributes storing primitive values (int,
+                float, bool or strings up to 255 characters long).
 
         Returns:
             obj (list): Objects having the matching Attributes.
 
+        Raises:
+            ValueError: If a `value__<lookup>` is given that can't be resolved
+                using the indexed Attribute values.
+
+        Example:
+        ::
+
+            strong_mobs = Character.objects.get_by_attribute("strength", value__gte=15)
+
         """
         dbmodel = self.model.__dbclass__.__name__.lower()
         query = [
@@ -146,7 +231,12 @@ class TypedObjectManager(idmapper.manager.SharedMemoryManager):
         elif value:
             # strvalue and value are mutually exclusive
             query.append(("db_attributes__db_value", value))
-        return self.filter(**dict(query))
+        value_query = Q()
+        for kwarg, val in kwargs.items():
+            if kwarg.startswith("value__"):
+                value_query &= _indexed_value_query("db_attributes__", kwarg.split("__", 1)[1], val)
+        # the value-query must be in the same filter-call to match the same Attribute
+        return self.filter(value_query, **dict(query))
 
     def get_by_nick(self, key=None, nick=None, category="inputline"):
         """
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.9 on 2026-10-18 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("typeclasses", "0017_use_index_instead_of_index_together_in_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attribute",
+            name="db_numvalue",
+            field=models.FloatField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Indexed copy of a numerical (int, float, bool) value, for range look-ups.",
+                null=True,
+                verbose_name="numvalue",
+            ),
+        ),
+        migrations.AddField(
+            model_name="attribute",
+            name="db_textvalue",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Indexed copy of a short string value, for look-ups.",
+                max_length=255,
+                null=True,
+                verbose_name="textvalue",
+            ),
+        ),
+    ]
@@ -0,0 +1,177 @@
+"""
+Prefetching of Tag- and Attribute-handler caches
+
+With `settings.TYPECLASS_AGGRESSIVE_CACHE` active, the `TagHandler` and
+`AttributeHandler` of each entity caches its Tags/Attributes, but each handler
+fills its cache on its own, with one or more queries per entity. During a
+Command, the same kind of handler is however often used on many related
+entities - the caller, its location, the other objects in the room (for
+example to check locks or to display the room).
+
+The `HANDLER_PREFETCH` scheduler is told by the command handler which entities
+are involved in each Command (if `settings.HANDLER_CACHE_PREFETCH` is set).
+Nothing is loaded up front. Only when a handler on one of those entities would
+have to go to the database, the caches of that kind of handler are filled for
+all the entities in the group, using a single `IN (...)` query. Handlers with
+a filled cache then also know that a Tag or Attribute not in their cache
+doesn't exist, without asking the database.
+
+Commands can wait (with `yield`) and let other Commands run in the meantime, so
+each group is removed with the token it was added with. The latest group still
+there is the one used.
+
+`HANDLER_PREFETCH.stats` counts the cache-fill queries done by the handlers
+while Commands run, so you can see how many queries each command causes on
+average. This is shown by the `server` command.
+
+"""
+
+from collections import defaultdict
+from itertools import count
+
+from django.conf import settings
+
+_HANDLER_CACHE_PREFETCH = settings.TYPECLASS_AGGRESSIVE_CACHE and settings.HANDLER_CACHE_PREFETCH
+
+
+class HandlerPrefetchScheduler:
+    """
+    Keeps track of groups of entities whose handler-caches should be filled
+    together.
+
+    """
+
+    def __init__(self, enabled=None):
+        """
+        Args:
+            enabled (bool, optional): If caches should be prefetched. Defaults to
+                `settings.HANDLER_CACHE_PREFETCH` (if `settings.TYPECLASS_AGGRESSIVE_CACHE`
+                is also set).
+
+        """
+        self.enabled = _HANDLER_CACHE_PREFETCH if enabled is None else enabled
+        # {token: (group, filled) or None}, in the order they were added. The group is
+        # {dbclass: {id: obj}}, filled is the (dbclass, handlername) already batch-filled
+        self._groups = {}
+        self._tokens = count(1)
+        self.stats = {"commands": 0, "queries": 0, "prefetches": 0, "last_command": 0}
+
+    def push(self, objs, include_locations=True):
+        """
+        Register a new group of related entities, usually at the start of a
+        Command. Nothing is loaded at this point.
+
+        Args:
+            objs (list): Entities (like the cmdset-providers of a Command). Anything
+                that is not a database entity (like a Session) is ignored.
+            include_locations (bool, optional): Also add the location of each
+                entity and everything in that location.
+
+        Returns:
+            int: A token to give to `pop` to remove the group again.
+
+        """
+        self.stats["commands"] += 1
+        self.stats["last_command"] = 0
+        token = next(self._tokens)
+        if not self.enabled:
+            # only used to count queries
+            self._groups[token] = None
+            return token
+        group = defaultdict(dict)
+        for obj in list(objs):
+            if not getattr(obj, "pk", None) or not hasattr(obj, "__dbclass__"):
+                continue
+            group[obj.__dbclass__][obj.pk] = obj
+            location = getattr(obj, "db_location", None) if include_locations else None
+            if location:
+                group[location.__dbclass__][location.pk] = location
+                for content in location.contents_cache.get():
+                    group[content.__dbclass__][content.pk] = content
+        self._groups[token] = (group, set())
+        return token
+
+    def pop(self, token):
+        """
+        Forget a group, usually at the end of a Command.
+
+        Args:
+            token (int): The token returned by `push` when adding the group.
+
+        """
+        self._groups.pop(token, None)
+
+    def clear(self):
+        """
+        Forget all groups.
+
+        """
+        self._groups = {}
+
+    def count_query(self):
+        """
+        Called by the handlers whenever they query the database to fill their
+        caches. Only queries done while a Command runs are counted.
+
+        """
+        if self._groups:
+            self.stats["queries"] += 1
+            self.stats["last_command"] += 1
+
+    def queries_per_command(self):
+        """
+        Get the average number of handler cache-fill queries per Command.
+
+        Returns:
+            float: The average number of queries.
+
+        """
+        return self.stats["queries"] / max(1, self.stats["commands"])
+
+    def prefetch(self, handler, fill_many):
+        """
+        Called by a handler about to query the database. If its entity is part
+        of the current group, fill the caches of the same handler on all
+        entities of the group at once.
+
+        Args:
+            handler (TagHandler or AttributeHandler): The handler needing its cache filled.
+            fill_many (callable): Called as `fill_many(handlers)` to batch-fill the full
+                caches of a list of handlers of the same type. It should skip handlers
+                whose caches are already complete.
+
+        Returns:
+            bool: If the handler's cache was filled.
+
+        """
+        if not self.enabled or not self._groups:
+            return False
+        current = next(reversed(self._groups.values()))
+        if not current:
+            return False
+        groups, filled = current
+        obj = handler.obj
+        dbclass = getattr(obj, "__dbclass__", None)
+        group = groups.get(dbclass)
+        if not group or obj.pk not in group:
+            return False
+        # find what the handler is called on the entity
+        handlername = next((name for name, value in vars(obj).items() if value is handler), None)
+        if not handlername or (dbclass, handlername) in filled:
+            return False
+        filled.add((dbclass, handlername))
+
+        handlers = [handler]
+        for other in group.values():
+            if other is obj or other._is_deleted:
+                continue
+            other_handler = getattr(other, handlername, None)
+            if other_handler is not None:
+                handlers.append(other_handler)
+        fill_many(handlers)
+        self.stats["prefetches"] += 1
+        self.count_query()
+        return True
+
+
+HANDLER_PREFETCH = HandlerPrefetchScheduler()
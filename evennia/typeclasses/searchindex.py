@@ -0,0 +1,379 @@
+"""
+Search index for keys and aliases
+
+Global searches for objects and accounts by (partial) name normally go to the
+database as `icontains`/regex queries, which can't use a database index and
+so must scan the whole table. This module offers an optional in-memory trigram
+index of the keys and aliases of all objects and accounts, used to resolve such
+non-exact searches to a set of ids before querying the database.
+
+The index is turned on with `settings.SEARCH_NAME_INDEX`. It is loaded when the
+server starts (or on first use) and is then kept up-to-date by listening to
+Django's save/delete signals, so it will see all changes done in the Server
+process.
+
+Use it via the `SEARCH_INDEX` singleton:
+::
+
+    from evennia.typeclasses.searchindex import SEARCH_INDEX
+
+    pks = SEARCH_INDEX.search(ObjectDB, "bi sw", mode="words")
+
+"""
+
+import re
+from collections import defaultdict
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from evennia.utils import logger
+
+_RE_WORD = re.compile(r"\w+")
+
+# the different ways to match a search-string
+SEARCH_MODES = ("exact", "startswith", "contains", "words")
+
+# above this many matches from the index, it's better to let the database do
+# the matching than to query for all the matching ids
+MAX_INDEX_IDS = 1000
+
+
+def build_partial_match_regex(searchstring):
+    """
+    Build a regex for partial word-start matching; each word in the
+    search-string must match the beginning of a word in the name, in order. So
+    "bi sw" will match "Big sword". This is the in-memory equivalent of
+    `ObjectDBManager._build_fuzzy_search_regex`.
+
+    Args:
+        searchstring (str): The string to match, assumed to be in lower case.
+
+    Returns:
+        re.Pattern: The compiled regex. Use with `.search()`.
+
+    """
+    words = searchstring.split()
+    if not words:
+        return re.compile(r".*")
+    return re.compile(r".* ".join(rf"\b{re.escape(word)}" for word in words) + r".*")
+
+
+def _sliding_trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _name_trigrams(name):
+    """
+    Get the trigrams to index a name by. Beyond all trigrams of the name itself,
+    the start of the name and the start of every word is padded with spaces, so
+    that prefix-searches can be resolved by the index too.
+
+    """
+    grams = _sliding_trigrams("  " + name)
+    for word in _RE_WORD.findall(name):
+        grams.update(_sliding_trigrams("  " + word[:2]))
+    return grams
+
+
+def _query_trigrams(searchstring, mode):
+    """
+    Get the trigrams all names matching a search must have.
+
+    """
+    if mode == "contains":
+        return _sliding_trigrams(searchstring)
+    if mode == "startswith":
+        return _sliding_trigrams("  " + searchstring)
+    # words-mode - every word-part of the search must start a word in the name
+    grams = set()
+    for word in _RE_WORD.findall(searchstring):
+        grams.update(_sliding_trigrams("  " + word))
+    return grams
+
+
+class NameIndex:
+    """
+    An in-memory trigram index mapping names (like keys or aliases) to
+    database ids.
+
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, pk):
+        return pk in self._names
+
+    def clear(self):
+        """
+        Empty the index.
+
+        """
+        # {id: (name, ...)}
+        self._names = {}
+        # {name: {id, ...}}
+        self._exact = defaultdict(set)
+        # {trigram: {id, ...}}
+        self._trigrams = defaultdict(set)
+
+    def add(self, pk, *names):
+        """
+        Index names for an id. This replaces any names previously indexed for it.
+
+        Args:
+            pk (int): The id of the entity.
+            *names (str): One or more names to index.
+
+        """
+        self.remove(pk)
+        names = tuple(dict.fromkeys(str(name).lower() for name in names if name is not None))
+        if not names:
+            return
+        self._names[pk] = names
+        for name in names:
+            self._exact[name].add(pk)
+            for gram in _name_trigrams(name):
+                self._trigrams[gram].add(pk)
+
+    def remove(self, pk):
+        """
+        Remove an id from the index.
+
+        Args:
+            pk (int): The id to remove.
+
+        """
+        for name in self._names.pop(pk, ()):
+            self._exact[name].discard(pk)
+            if not self._exact[name]:
+                del self._exact[name]
+            for gram in _name_trigrams(name):
+                self._trigrams[gram].discard(pk)
+                if not self._trigrams[gram]:
+                    del self._trigrams[gram]
+
+    def search(self, searchstring, mode="words"):
+        """
+        Search the index.
+
+        Args:
+            searchstring (str): The string to search for (case-insensitive).
+            mode (str, optional): One of
+                - "exact": The name must match exactly.
+                - "startswith": The name must start with the search-string.
+                - "contains": The search-string must be found somewhere in the name.
+                - "words": Each word in the search-string must match the beginning of
+                  a word in the name, in order.
+
+        Returns:
+            set: The ids with names matching the search.
+
+        """
+        searchstring = str(searchstring).lower()
+        if mode == "exact":
+            return set(self._exact.get(searchstring, ()))
+
+        if mode == "contains":
+            match = lambda name: searchstring in name  # noqa: E731
+        elif mode == "startswith":
+            match = lambda name: name.startswith(searchstring)  # noqa: E731
+        elif mode == "words":
+            match = build_partial_match_regex(searchstring).search
+        else:
+            raise ValueError(f"Search-mode must be one of {SEARCH_MODES}.")
+
+        grams = _query_trigrams(searchstring, mode)
+        if grams:
+            # narrow the candidates down to those having all the trigrams, starting
+            # with the rarest ones
+            gramsets = sorted((self._trigrams.get(gram, set()) for gram in grams), key=len)
+            candidates = set(gramsets[0]).intersection(*gramsets[1:])
+        else:
+            # too short to use the trigrams
+            candidates = self._names
+        return {pk for pk in candidates if any(match(name) for name in self._names[pk])}
+
+
+class SearchIndexHandler:
+    """
+    Manages the key- and alias-indexes for objects and accounts and keeps them
+    in sync with the database.
+
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._models = None
+        # {tag_id: bool}, if a Tag is an alias
+        self._alias_tags = {}
+        self.loaded = False
+
+    def _get_models(self):
+        """
+        Get the indexed models, mapped to the field holding their key.
+
+        """
+        if self._models is None:
+            from evennia.accounts.models import AccountDB
+            from evennia.objects.models import ObjectDB
+
+            self._models = {ObjectDB: "db_key", AccountDB: "username"}
+        return self._models
+
+    def _get_dbmodel(self, model):
+        """
+        Get which of the indexed database-models a model or instance belongs to.
+
+        """
+        for dbmodel in self._get_models():
+            if isinstance(model, dbmodel) or (
+                isinstance(model, type) and issubclass(model, dbmodel)
+            ):
+                return dbmodel
+        return None
+
+    def _get_alias_names(self, dbmodel, pk):
+        return [
+            key
+            for key in dbmodel.db_tags.through.objects.filter(
+                **{f"{dbmodel.__name__.lower()}_id": pk, "tag__db_tagtype": "alias"}
+            ).values_list("tag__db_key", flat=True)
+        ]
+
+    def _has_alias_tag(self, tag_pks):
+        """
+        Check if any of the given Tags are aliases. The answer is remembered per
+        Tag, so changes of other tag-types don't cost a query every time.
+
+        """
+        unknown = [pk for pk in tag_pks if pk not in self._alias_tags]
+        if unknown:
+            from evennia.typeclasses.tags import Tag
+
+            aliases = set(
+                Tag.objects.filter(pk__in=unknown, db_tagtype="alias").values_list("pk", flat=True)
+            )
+            for pk in unknown:
+                self._alias_tags[pk] = pk in aliases
+        return any(self._alias_tags[pk] for pk in tag_pks)
+
+    def load(self):
+        """
+        Build all indexes from the database and start listening for changes.
+
+        """
+        for dbmodel, keyfield in self._get_models().items():
+            keyindex, aliasindex = NameIndex(), NameIndex()
+            for pk, key in dbmodel.objects.values_list("id", keyfield).iterator():
+                keyindex.add(pk, key)
+            aliases = defaultdict(list)
+            for pk, alias in (
+                dbmodel.db_tags.through.objects.filter(tag__db_tagtype="alias")
+                .values_list(f"{dbmodel.__name__.lower()}_id", "tag__db_key")
+                .iterator()
+            ):
+                aliases[pk].append(alias)
+            for pk, names in aliases.items():
+                aliasindex.add(pk, *names)
+            self._indexes[dbmodel] = (keyindex, aliasindex)
+
+        if not self.loaded:
+            post_save.connect(self._at_post_save, dispatch_uid="searchindex_post_save")
+            post_delete.connect(self._at_post_delete, dispatch_uid="searchindex_post_delete")
+            m2m_changed.connect(self._at_m2m_changed, dispatch_uid="searchindex_m2m_changed")
+        self.loaded = True
+        logger.log_info(
+            "Search index: "
+            + ", ".join(
+                f"{len(keyindex)} {dbmodel.__name__} keys, {len(aliasindex)} with aliases"
+                for dbmodel, (keyindex, aliasindex) in self._indexes.items()
+            )
+        )
+
+    def unload(self):
+        """
+        Stop tracking changes and empty all indexes.
+
+        """
+        post_save.disconnect(dispatch_uid="searchindex_post_save")
+        post_delete.disconnect(dispatch_uid="searchindex_post_delete")
+        m2m_changed.disconnect(dispatch_uid="searchindex_m2m_changed")
+        self._indexes = {}
+        self._alias_tags = {}
+        self.loaded = False
+
+    def _update_aliases(self, dbmodel, pk):
+        self._indexes[dbmodel][1].add(pk, *self._get_alias_names(dbmodel, pk))
+
+    def _at_post_save(self, sender, instance, created=False, update_fields=None, **kwargs):
+        dbmodel = self._get_dbmodel(instance)
+        if dbmodel:
+            keyfield = self._get_models()[dbmodel]
+            if update_fields is None or keyfield in update_fields:
+                self._indexes[dbmodel][0].add(instance.pk, getattr(instance, keyfield))
+
+    def _at_post_delete(self, sender, instance, **kwargs):
+        from evennia.typeclasses.tags import Tag
+
+        if isinstance(instance, Tag):
+            # a new Tag could get the same id
+            self._alias_tags.pop(instance.pk, None)
+            return
+        dbmodel = self._get_dbmodel(instance)
+        if dbmodel:
+            keyindex, aliasindex = self._indexes[dbmodel]
+            keyindex.remove(instance.pk)
+            aliasindex.remove(instance.pk)
+
+    def _at_m2m_changed(self, sender, instance, action, reverse=False, pk_set=None, **kwargs):
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        for dbmodel in self._get_models():
+            if sender is not dbmodel.db_tags.through:
+                continue
+            if reverse:
+                # the change was done from the Tag's side
+                if instance.db_tagtype != "alias":
+                    continue
+                pks = pk_set
+                if pks is None:
+                    # cleared from all entities; re-read those indexed with this alias
+                    pks = self._indexes[dbmodel][1].search(instance.db_key, mode="exact")
+                for pk in pks:
+                    self._update_aliases(dbmodel, pk)
+            elif action == "post_clear":
+                # all tags are gone, aliases too
+                self._indexes[dbmodel][1].remove(instance.pk)
+            elif self._has_alias_tag(pk_set or ()):
+                self._update_aliases(dbmodel, instance.pk)
+
+    def search(self, model, searchstring, mode="words", keys=True, aliases=True):
+        """
+        Search the index for a model.
+
+        Args:
+            model (class): The model to search, like `ObjectDB` or `AccountDB`, or a
+                typeclass based on either.
+            searchstring (str): What to search for.
+            mode (str, optional): How to match the names, one of "exact", "startswith",
+                "contains" or "words". See `NameIndex.search` for details.
+            keys (bool, optional): If matching keys.
+            aliases (bool, optional): If matching aliases.
+
+        Returns:
+            set: The ids matching the search.
+
+        """
+        if not self.loaded:
+            self.load()
+        keyindex, aliasindex = self._indexes[self._get_dbmodel(model)]
+        pks = keyindex.search(searchstring, mode=mode) if keys else set()
+        if aliases:
+            pks |= aliasindex.search(searchstring, mode=mode)
+        return pks
+
+
+SEARCH_INDEX = SearchIndexHandler()
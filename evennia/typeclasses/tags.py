@@ -14,8 +14,10 @@ from collections import defaultdict
 
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import m2m_changed
 
 from evennia.locks.lockfuncs import perm as perm_lockfunc
+from evennia.typeclasses.prefetch import HANDLER_PREFETCH
 from evennia.utils.utils import make_iter, to_str
 
 _TYPECLASS_AGGRESSIVE_CACHE = settings.TYPECLASS_AGGRESSIVE_CACHE
@@ -334,9 +336,19 @@ class TagHandler(object):
         Cache all tags of this object.
 
         """
-        if not _TYPECLASS_AGGRESSIVE_CACHE:
+        if not _TYPECLASS_AGGRESSIVE_CACHE or self._prefetch():
             return
-        tags = self._query_all()
+        HANDLER_PREFETCH.count_query()
+        self._set_fullcache(self._query_all())
+
+    def _set_fullcache(self, tags):
+        """
+        Set the full cache from all tags of this object.
+
+        Args:
+            tags (list): All Tags (of this handler's tagtype) on the object.
+
+        """
         self._cache = dict(
             (
                 "%s-%s"
@@ -350,6 +362,47 @@ class TagHandler(object):
         )
         self._cache_complete = True
 
+    @staticmethod
+    def _fullcache_many(handlers):
+        """
+        Fill the full caches of many TagHandlers of the same type (on the
+        same type of entity) using a single query.
+
+        Args:
+            handlers (list): The TagHandlers to fill. Those with already complete
+                caches are skipped.
+
+        """
+        handlers = [handler for handler in handlers if not handler._cache_complete]
+        if not handlers:
+            return
+        first = handlers[0]
+        query = {
+            "%s__id__in" % first._model: [handler._objid for handler in handlers],
+            "tag__db_model": first._model,
+            "tag__db_tagtype": first._tagtype,
+        }
+        tags = defaultdict(list)
+        for conn in (
+            getattr(first.obj, first._m2m_fieldname)
+            .through.objects.filter(**query)
+            .select_related("tag")
+        ):
+            tags[getattr(conn, "%s_id" % first._model)].append(conn.tag)
+        for handler in handlers:
+            handler._set_fullcache(tags[handler._objid])
+
+    def _prefetch(self):
+        """
+        Fill the full cache together with that of related entities, if
+        this object is part of the current prefetch-group.
+
+        Returns:
+            bool: If the cache was filled.
+
+        """
+        return _TYPECLASS_AGGRESSIVE_CACHE and HANDLER_PREFETCH.prefetch(self, self._fullcache_many)
+
     def _getcache(self, key=None, category=None):
         """
         Retrieve from cache or database (always caches)
@@ -384,7 +437,12 @@ class TagHandler(object):
                 del self._cache[cachekey]
             if tag:
                 return [tag]  # return cached entity
+            elif HANDLER_PREFETCH.enabled and (self._cache_complete or self._prefetch()):
+                # the cache holds all tags, so if it's not there, it doesn't exist
+                tag = self._cache.get(cachekey, None)
+                return [tag] if tag else []
             else:
+                HANDLER_PREFETCH.count_query()
                 query = {
                     "%s__id" % self._model: self._objid,
                     "tag__db_model": self._model,
@@ -403,10 +461,14 @@ class TagHandler(object):
             # assume the cache to be complete unless we have queried
             # for this category before
             catkey = "-%s" % category
-            if _TYPECLASS_AGGRESSIVE_CACHE and catkey in self._catcache:
+            if _TYPECLASS_AGGRESSIVE_CACHE and (
+                catkey in self._catcache
+                or (HANDLER_PREFETCH.enabled and (self._cache_complete or self._prefetch()))
+            ):
                 return [tag for key, tag in self._cache.items() if key.endswith(catkey)]
             else:
                 # we have to query to make this category up-date in the cache
+                HANDLER_PREFETCH.count_query()
                 query = {
                     "%s__id" % self._model: self._objid,
                     "tag__db_model": self._model,
@@ -476,6 +538,16 @@ class TagHandler(object):
         self._catcache.pop(catkey, None)
         self._cache_complete = False
 
+    def _update_location_index(self):
+        """
+        Let the contents-cache of the object's location (if any) know that the tags
+        of this object changed, so it can keep its tag-indexes up-to-date.
+
+        """
+        location = getattr(self.obj, "db_location", None)
+        if location:
+            location.contents_cache.update_tags(self.obj, tagtype=self._tagtype)
+
     def reset_cache(self):
         """
         Reset the cache from the outside.
@@ -521,6 +593,7 @@ class TagHandler(object):
             )
             getattr(self.obj, self._m2m_fieldname).add(tagobj)
             self._setcache(tagstr, category, tagobj)
+        self._update_location_index()
 
     def has(self, key=None, category=None, return_list=False):
         """
@@ -644,6 +717,7 @@ class TagHandler(object):
             if tagobj:
                 getattr(self.obj, self._m2m_fieldname).remove(tagobj[0])
             self._delcache(key, category)
+        self._update_location_index()
 
     def clear(self, category=None):
         """
@@ -664,10 +738,28 @@ class TagHandler(object):
         }
         if category:
             query["tag__db_category"] = category.strip().lower()
-        getattr(self.obj, self._m2m_fieldname).through.objects.filter(**query).delete()
+        through = getattr(self.obj, self._m2m_fieldname).through
+        queryset = through.objects.filter(**query)
+        if m2m_changed.has_listeners(through):
+            # bulk-deleting the through-rows doesn't send any signals, so we must
+            # tell eventual listeners (like the search-index) about the change
+            pk_set = set(queryset.values_list("tag_id", flat=True))
+            queryset.delete()
+            m2m_changed.send(
+                sender=through,
+                instance=self.obj,
+                action="post_remove",
+                reverse=False,
+                model=Tag,
+                pk_set=pk_set,
+                using=queryset.db,
+            )
+        else:
+            queryset.delete()
         self._cache = {}
         self._catcache = {}
         self._cache_complete = False
+        self._update_location_index()
 
     def all(self, return_key_and_category=False, return_objs=False):
         """
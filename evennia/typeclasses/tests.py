@@ -218,6 +218,52 @@ class TestTypedObjectManager(BaseEvenniaTest):
         self.assertEqual(tagobj.db_category, "category4")
         self.assertEqual(tagobj.db_data, "data4")
 
+    @patch("evennia.typeclasses.attributes._ATTRIBUTE_VALUE_INDEXING", True)
+    def test_get_by_attribute_indexed_value(self):
+        self.obj1.db.strength = 10
+        self.obj2.db.strength = 15.5
+        self.obj1.db.color = "red"
+        self.obj2.db.color = "blue"
+        self.obj2.db.flag = True
+        self.assertEqual(self._manager("get_by_attribute", "strength", value__gt=12), [self.obj2])
+        self.assertEqual(
+            self._manager("get_by_attribute", "strength", value__range=(5, 20)),
+            [self.obj1, self.obj2],
+        )
+        self.assertEqual(
+            self._manager("get_by_attribute", "color", value__in=["blue", "green"]), [self.obj2]
+        )
+        self.assertEqual(
+            self._manager("get_by_attribute", "color", value__startswith="re"), [self.obj1]
+        )
+        self.assertEqual(self._manager("get_by_attribute", "flag", value__exact=True), [self.obj2])
+        # updating the value updates the index
+        self.obj1.db.strength = 20
+        self.assertEqual(
+            self._manager("get_by_attribute", "strength", value__gt=12), [self.obj1, self.obj2]
+        )
+        # non-primitive values are not indexed
+        self.obj1.db.color = ["red"]
+        self.assertEqual(self._manager("get_by_attribute", "color", value__in=["red"]), [])
+        with self.assertRaises(ValueError):
+            self._manager("get_by_attribute", "color", value__in=[["red"]])
+
+    def test_get_by_attribute_indexed_value_not_active(self):
+        self.obj1.db.strength = 10
+        with self.assertRaises(ValueError):
+            self._manager("get_by_attribute", "strength", value__gt=5)
+
+    def test_update_attribute_value_index(self):
+        from evennia.typeclasses.attributes import update_attribute_value_index
+
+        self.obj1.db.strength = 10
+        with patch("evennia.typeclasses.attributes._ATTRIBUTE_VALUE_INDEXING", True):
+            self.assertEqual(self._manager("get_by_attribute", "strength", value__gte=10), [])
+            self.assertGreaterEqual(update_attribute_value_index(), 1)
+            self.assertEqual(
+                self._manager("get_by_attribute", "strength", value__gte=10), [self.obj1]
+            )
+
 
 # setting up testing typeclass with child- and parent class
 class TestSearchManagerTypeclassParent(DefaultObject):
@@ -463,3 +509,182 @@ class TestNickHandler(BaseEvenniaTest):
             re.escape("OOC["), "ooc", pattern_is_regex=True
         )
         re.compile(nick_regex, re.I + re.DOTALL + re.U)
+
+
+class TestNameIndex(EvenniaTestCase):
+    def setUp(self):
+        from evennia.typeclasses.searchindex import NameIndex
+
+        self.index = NameIndex()
+        self.index.add(1, "Big sword", "blade")
+        self.index.add(2, "Small Sword")
+        self.index.add(3, "swordfish")
+
+    def test_search_modes(self):
+        self.assertEqual(self.index.search("big sword", mode="exact"), {1})
+        self.assertEqual(self.index.search("sword", mode="exact"), set())
+        self.assertEqual(self.index.search("sw"), {1, 2, 3})
+        self.assertEqual(self.index.search("bi sw"), {1})
+        self.assertEqual(self.index.search("word"), set())
+        self.assertEqual(self.index.search("word", mode="contains"), {1, 2, 3})
+        self.assertEqual(self.index.search("all", mode="contains"), {2})
+        self.assertEqual(self.index.search("s", mode="contains"), {1, 2, 3})
+        self.assertEqual(self.index.search("sw", mode="startswith"), {3})
+        self.assertEqual(self.index.search("BLA", mode="startswith"), {1})
+        with self.assertRaises(ValueError):
+            self.index.search("sword", mode="regex")
+
+    def test_update(self):
+        self.index.add(1, "dagger")
+        self.assertEqual(self.index.search("sw"), {2, 3})
+        self.assertEqual(self.index.search("da"), {1})
+        self.index.remove(2)
+        self.assertEqual(self.index.search("sword", mode="contains"), {3})
+        self.assertEqual(len(self.index), 2)
+
+
+class TestSearchIndex(BaseEvenniaTest):
+    def setUp(self):
+        from evennia.typeclasses.searchindex import SEARCH_INDEX
+
+        super().setUp()
+        self.search_index = SEARCH_INDEX
+        self.search_index.load()
+
+    def tearDown(self):
+        self.search_index.unload()
+        super().tearDown()
+
+    def test_track_changes(self):
+        from evennia.objects.models import ObjectDB
+
+        self.assertIn(self.obj1.id, self.search_index.search(ObjectDB, "obj"))
+        self.obj1.key = "Rusty sword"
+        self.obj2.aliases.add("old blade")
+        self.assertEqual(self.search_index.search(ObjectDB, "ru sw"), {self.obj1.id})
+        self.assertEqual(self.search_index.search(ObjectDB, "ol bl"), {self.obj2.id})
+        self.assertEqual(self.search_index.search(ObjectDB, "ol bl", aliases=False), set())
+        self.obj2.aliases.clear()
+        self.assertEqual(self.search_index.search(ObjectDB, "ol bl"), set())
+        obj1_id = self.obj1.id
+        self.obj1.delete()
+        self.assertNotIn(obj1_id, self.search_index.search(ObjectDB, "ru sw"))
+
+    def test_ignore_other_tags(self):
+        from evennia.objects.models import ObjectDB
+
+        self.obj1.tags.add("sharp")
+        with patch.object(self.search_index, "_update_aliases") as mock_update:
+            self.obj1.tags.remove("sharp")
+            self.obj1.tags.add("sharp")
+            self.obj1.tags.add("blade", category="type")
+            mock_update.assert_not_called()
+            self.obj1.aliases.add("blade")
+            mock_update.assert_called_once_with(ObjectDB, self.obj1.id)
+
+    def test_clear_from_tag(self):
+        from evennia.objects.models import ObjectDB
+
+        self.obj1.aliases.add("blade")
+        self.obj2.aliases.add("blade")
+        self.obj2.aliases.add("sword")
+        self.assertEqual(self.search_index.search(ObjectDB, "blade"), {self.obj1.id, self.obj2.id})
+        tag = self.obj1.aliases.get("blade", return_tagobj=True)
+        tag.objectdb_set.clear()
+        self.assertEqual(self.search_index.search(ObjectDB, "blade"), set())
+        self.assertEqual(self.search_index.search(ObjectDB, "sword"), {self.obj2.id})
+
+    def test_search_with_index(self):
+        from evennia.accounts.models import AccountDB
+        from evennia.objects.models import ObjectDB
+
+        self.obj1.key = "Rusty sword"
+        self.obj1.aliases.add("blade")
+        with (
+            patch("evennia.objects.manager._SEARCH_NAME_INDEX", True),
+            patch("evennia.accounts.manager._SEARCH_NAME_INDEX", True),
+        ):
+            self.assertEqual(
+                list(ObjectDB.objects.search_object("ru sw", exact=False)), [self.obj1]
+            )
+            self.assertEqual(list(ObjectDB.objects.search_object("BLADE")), [self.obj1])
+            self.assertEqual(
+                list(ObjectDB.objects.search_object("sw", exact=False, candidates=[self.obj2])), []
+            )
+            self.assertIn(
+                self.account,
+                AccountDB.objects.search_account(self.account.key[1:-1], exact=False),
+            )
+
+
+class TestHandlerPrefetch(BaseEvenniaTest):
+    def setUp(self):
+        from evennia.typeclasses.prefetch import HANDLER_PREFETCH
+
+        super().setUp()
+        self.prefetch = HANDLER_PREFETCH
+        self.obj1.tags.add("foo")
+        self.obj2.tags.add("bar", category="cat")
+        self.obj1.db.test = 1
+        self.obj2.db.test = 2
+        for obj in (self.char1, self.room1, self.obj1, self.obj2):
+            obj.tags.reset_cache()
+            obj.attributes.reset_cache()
+        self.token = self.prefetch.push([self.char1])
+
+    def tearDown(self):
+        self.prefetch.pop(self.token)
+        super().tearDown()
+
+    def test_prefetch_tags(self):
+        nqueries = self.prefetch.stats["queries"]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.obj1.tags.get("foo"), "foo")
+            self.assertEqual(self.obj2.tags.get("bar", category="cat"), "bar")
+            self.assertEqual(self.obj2.tags.get("foo"), None)
+            self.assertEqual(self.char1.tags.get(category="cat"), None)
+        self.assertEqual(self.prefetch.stats["queries"], nqueries + 1)
+
+    def test_prefetch_attributes(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.obj1.db.test, 1)
+            self.assertEqual(self.obj2.db.test, 2)
+            self.assertEqual(self.room1.db.test, None)
+
+    def test_not_in_group(self):
+        self.prefetch.pop(self.token)
+        self.token = self.prefetch.push([])
+        nqueries = self.prefetch.stats["queries"]
+        self.assertEqual(self.obj1.db.test, 1)
+        self.assertEqual(self.obj2.db.test, 2)
+        self.assertEqual(self.prefetch.stats["queries"], nqueries + 2)
+
+    def test_interleaved_groups(self):
+        # a command waiting while another one runs and finishes
+        token = self.prefetch.push([])
+        self.prefetch.pop(self.token)
+        self.token = token
+        prefetches = self.prefetch.stats["prefetches"]
+        self.assertEqual(self.obj1.db.test, 1)
+        self.assertEqual(self.prefetch.stats["prefetches"], prefetches)
+        # the remaining group is used
+        self.prefetch.pop(self.token)
+        self.token = self.prefetch.push([self.char1])
+        token = self.prefetch.push([])
+        self.prefetch.pop(token)
+        self.obj1.attributes.reset_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.obj1.db.test, 1)
+            self.assertEqual(self.obj2.db.test, 2)
+
+    def test_disabled(self):
+        self.prefetch.enabled = False
+        try:
+            prefetches = self.prefetch.stats["prefetches"]
+            self.assertEqual(self.obj1.tags.all(), ["foo"])
+            self.assertEqual(self.prefetch.stats["prefetches"], prefetches)
+            # a full cache is not trusted for misses when prefetch is off
+            with self.assertNumQueries(1):
+                self.assertEqual(self.obj1.tags.get("nothing"), None)
+        finally:
+            self.prefetch.enabled = True
@@ -0,0 +1,256 @@
+"""
+Async Commands
+
+A Command's `func` can be an `async def`. The cmdhandler starts it and moves on,
+so other commands keep running while it awaits something. When `func` returns,
+`at_post_cmd` is called as usual.
+
+```python
+from evennia.utils import aio
+
+class CmdFetch(Command):
+    key = "fetch"
+
+    async def func(self):
+        await self.amsg("Fetching ...")
+        text = await aio.to_thread(read_big_file, self.args)
+        target = await self.asearch(self.lhs)
+        if not target:
+            return
+        await aio.sleep(2)
+        await self.amsg(f"{target.key} reads: {text}")
+```
+
+What `func` can await depends on the reactor the Server runs on:
+
+- By default, it can await Deferreds (like those from `run_in_pool`) and other
+  coroutines awaiting Deferreds. Awaiting asyncio objects (`asyncio.sleep` or
+  libraries like aiohttp) fails with "no running event loop".
+- With `settings.ASYNCIO_REACTOR = True`, the Server runs on Twisted's asyncio
+  reactor and `func` runs as an asyncio Task. It can await asyncio libraries
+  directly. Deferreds must then be wrapped in `aio.awaitable(deferred)` (the
+  helpers in this module do this for you).
+
+The helpers below work with either reactor:
+
+- `sleep(seconds)` - pause without stopping the Server.
+- `to_thread(func, *args, **kwargs)` - run blocking code (like reading a file)
+  in a thread of the `run_in_pool` thread pool.
+- `search(caller, searchdata, **kwargs)` - `caller.search`, with global searches
+  run in a thread.
+- `msg(receiver, text, **kwargs)` - `receiver.msg` that waits while the
+  receiver's client is not keeping up with its output.
+- `awaitable(deferred)` - make a Deferred awaitable.
+
+Just like for a Command yielding a Deferred, a Command given while an async
+`func` is waiting may finish before it.
+
+"""
+
+import asyncio
+import time
+
+from django.conf import settings
+from twisted.internet import reactor
+from twisted.internet.defer import Deferred
+from twisted.internet.task import deferLater
+
+from evennia.utils.pools import run_in_pool
+from evennia.utils.utils import make_iter, variable_from_module
+
+_AT_SEARCH_RESULT = None
+
+# how often msg checks if output is still paused
+_MSG_POLL_INTERVAL = 0.2
+
+
+def is_asyncio_reactor():
+    """
+    Check if the Server runs on Twisted's asyncio reactor.
+
+    Returns:
+        bool: If asyncio objects can be awaited.
+
+    """
+    try:
+        from twisted.internet.asyncioreactor import AsyncioSelectorReactor
+    except ImportError:
+        return False
+    return isinstance(reactor, AsyncioSelectorReactor)
+
+
+def run_coroutine(coroutine):
+    """
+    Start running a coroutine, such as the one returned by an `async def func`.
+
+    Args:
+        coroutine (coroutine): The coroutine to run.
+
+    Returns:
+        Deferred: Fires with the coroutine's return value.
+
+    """
+    if is_asyncio_reactor():
+        return Deferred.fromFuture(asyncio.ensure_future(coroutine))
+    return Deferred.fromCoroutine(coroutine)
+
+
+def awaitable(deferred):
+    """
+    Make a Deferred awaitable from the running coroutine.
+
+    Args:
+        deferred (Deferred): The Deferred to wait for.
+
+    Returns:
+        Deferred or asyncio.Future: An object the coroutine can `await`.
+
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # run by Deferred.fromCoroutine, which awaits Deferreds
+        return deferred
+    return deferred.asFuture(loop)
+
+
+async def sleep(seconds):
+    """
+    Pause the running coroutine without pausing the Server.
+
+    Args:
+        seconds (int or float): How long to sleep.
+
+    """
+    await awaitable(deferLater(reactor, seconds, lambda: None))
+
+
+async def to_thread(func, *args, **kwargs):
+    """
+    Run blocking code in a thread and wait for the result. See
+    `evennia.utils.pools.run_in_pool` for what the code may and may not do.
+
+    Args:
+        func (callable): The function to run, as `func(*args, **kwargs)`.
+        *args: Arguments to `func`.
+
+    Keyword Args:
+        any: Keyword arguments to `func`.
+
+    Returns:
+        any: The return value of `func`.
+
+    """
+    return await awaitable(run_in_pool(func, *args, **kwargs))
+
+
+async def search(caller, searchdata, **kwargs):
+    """
+    Search like `caller.search`, without stopping the Server while the database
+    is queried. Global searches and searches by Accounts are run in a thread.
+    Local searches are answered from memory, so they are run right away. Any
+    error messages are sent to the caller from the reactor.
+
+    Args:
+        caller (Object or Account): The one searching.
+        searchdata (str): The search criterion.
+
+    Keyword Args:
+        quiet (bool): Return a list of all matches and send no error messages.
+        nofound_string (str): Error message if nothing was found.
+        multimatch_string (str): Error message if there were multiple matches.
+        any: Other keyword arguments to `caller.search`.
+
+    Returns:
+        Object, Account, list or None: As for `caller.search`.
+
+    """
+    global _AT_SEARCH_RESULT
+    if not _AT_SEARCH_RESULT:
+        _AT_SEARCH_RESULT = variable_from_module(*settings.SEARCH_AT_RESULT.rsplit(".", 1))
+
+    quiet = kwargs.pop("quiet", False)
+    nofound_string = kwargs.pop("nofound_string", None)
+    multimatch_string = kwargs.pop("multimatch_string", None)
+    in_thread = kwargs.get("global_search") or not hasattr(caller, "get_stacked_results")
+    if in_thread and reactor.running:
+        results = await to_thread(caller.search, searchdata, quiet=True, **kwargs)
+    else:
+        # without a running reactor (like when testing) we can't get a result
+        # back from a thread
+        results = caller.search(searchdata, quiet=True, **kwargs)
+    results = list(make_iter(results)) if results is not None else []
+    if quiet:
+        return results
+    if kwargs.get("stacked"):
+        is_stacked, results = caller.get_stacked_results(results, **kwargs)
+        if is_stacked:
+            return results
+    return _AT_SEARCH_RESULT(
+        results,
+        caller,
+        query=searchdata,
+        nofound_string=nofound_string,
+        multimatch_string=multimatch_string,
+    )
+
+
+def _get_sessions(receiver):
+    sessions = getattr(receiver, "sessions", None)
+    if sessions is None:
+        # a Session (or a list of them)
+        return make_iter(receiver)
+    return sessions.all()
+
+
+def output_paused(receiver):
+    """
+    Check if the client of any of the receiver's sessions is not keeping up
+    with its output (see the `OUTPUT_PAUSED` protocol flag).
+
+    Args:
+        receiver (Object, Account or Session): The one to check.
+
+    Returns:
+        bool: If output to the receiver is paused.
+
+    """
+    return any(
+        session.protocol_flags.get("OUTPUT_PAUSED")
+        for session in _get_sessions(receiver)
+        if session
+    )
+
+
+async def msg(receiver, text=None, timeout=10, **kwargs):
+    """
+    Send a message and wait while the receiver's output is paused. Use this to
+    not flood a client when sending a lot of text from a coroutine.
+
+    Args:
+        receiver (Object, Account or Session): The one to send to.
+        text (str or tuple, optional): The message to send.
+        timeout (int or float, optional): Wait at most this many seconds.
+
+    Keyword Args:
+        session (Session or list): Only send to (and check) these sessions.
+        any: Other keyword arguments to `receiver.msg`.
+
+    """
+    receiver.msg(text=text, **kwargs)
+    session = kwargs.get("session")
+    await wait_for_output(session if session else receiver, timeout=timeout)
+
+
+async def wait_for_output(receiver, timeout=10):
+    """
+    Wait until output to the receiver is no longer paused.
+
+    Args:
+        receiver (Object, Account or Session): The one to wait for.
+        timeout (int or float, optional): Wait at most this many seconds.
+
+    """
+    end = time.time() + timeout
+    while output_paused(receiver) and time.time() < end:
+        await sleep(_MSG_POLL_INTERVAL)
@@ -30,6 +30,11 @@ excludes e.g. callables that are class methods or functions defined
 dynamically or as part of another function. In non-persistent mode
 no such restrictions exist.
 
+For static menus used by many at the same time (like character generation or
+a shop), pass `compiled=True`. The menu module is then only parsed once and
+shared by everyone, rendered option lists are cached and, if persistent, the
+current node is saved in batches rather than on every step.
+
 The menu is defined in a module (this can be the same module as the
 command definition too) with function definitions:
 
@@ -268,9 +273,11 @@ they will be tested in sequence.
 import inspect
 import re
 from ast import literal_eval
+from collections import OrderedDict
 from fnmatch import fnmatch
 from inspect import getfullargspec, isfunction
 from math import ceil
+from weakref import WeakKeyDictionary
 
 from django.conf import settings
 
@@ -283,9 +290,11 @@ from evennia.commands import cmdhandler
 from evennia.utils import logger
 from evennia.utils.ansi import strip_ansi
 from evennia.utils.evtable import EvColumn, EvTable
+from evennia.utils.idmapper.models import save_session
 from evennia.utils.utils import (
     crop,
     dedent,
+    delay,
     inherits_from,
     is_iter,
     m_len,
@@ -298,6 +307,10 @@ from evennia.utils.utils import (
 # read from protocol NAWS later?
 _MAX_TEXT_WIDTH = settings.CLIENT_DEFAULT_WIDTH
 
+_MENU_CURSOR_SAVE_INTERVAL = settings.EVMENU_CURSOR_SAVE_INTERVAL
+# max number of rendered option blocks to cache per compiled menu
+_OPTIONS_CACHE_SIZE = 500
+
 # we use cmdhandler instead of evennia.syscmdkeys to
 # avoid some cases of loading before evennia init'd
 _CMD_NOMATCH = cmdhandler.CMD_NOMATCH
@@ -355,6 +368,177 @@ class EvMenuGotoAbortMessage(RuntimeError):
     """
 
 
+# -------------------------------------------------------------
+#
+# Compiled menus
+#
+# -------------------------------------------------------------
+
+
+class CompiledMenu:
+    """
+    A menu tree parsed once and shared by everyone using the menu. Get it with
+    `compile_menu`. Apart from the node functions, this caches how to call each
+    node/goto-callable and the rendered option blocks of the nodes, so this work
+    is not redone for every user of a popular menu.
+
+    """
+
+    def __init__(self, menudata):
+        """
+        Args:
+            menudata (str, module or dict): The menu as accepted by `EvMenu`.
+
+        """
+        if isinstance(menudata, dict):
+            self.menudata = menudata
+            self.nodes = menudata
+        else:
+            module = mod_import(menudata)
+            # store the path rather than the module, so a persistent menu can be saved
+            self.menudata = module.__name__
+            self.nodes = {
+                key: func
+                for key, func in module.__dict__.items()
+                if isfunction(func) and not key.startswith("_")
+            }
+        self.callspecs = WeakKeyDictionary()
+        self.options_cache = OrderedDict()
+
+    def get_callspec(self, callback):
+        """
+        Get how a node- or goto-callable should be called.
+
+        Args:
+            callback (callable): The callable to inspect.
+
+        Returns:
+            tuple: `(nargs, supports_kwargs)`.
+
+        Raises:
+            TypeError: If `callback` can't be inspected.
+
+        """
+        try:
+            return self.callspecs[callback]
+        except (KeyError, TypeError):
+            pass
+        argspec = getfullargspec(callback)
+        callspec = (len(argspec.args), bool(argspec.varkw))
+        try:
+            self.callspecs[callback] = callspec
+        except TypeError:
+            # can't be weak-referenced, so we don't cache it
+            pass
+        return callspec
+
+    def get_options_text(self, key, formatter, optionlist):
+        """
+        Get a rendered option block, from cache if possible.
+
+        Args:
+            key (tuple): Everything the rendering depends on.
+            formatter (callable): Called as `formatter(optionlist)` to render the
+                options if they are not cached.
+            optionlist (list): List of (key, desc) pairs.
+
+        Returns:
+            str: The rendered options.
+
+        """
+        try:
+            optionstext = self.options_cache.pop(key)
+        except KeyError:
+            optionstext = formatter(optionlist)
+            if len(self.options_cache) >= _OPTIONS_CACHE_SIZE:
+                self.options_cache.popitem(last=False)
+        except TypeError:
+            # unhashable option descs; can't cache
+            return formatter(optionlist)
+        self.options_cache[key] = optionstext
+        return optionstext
+
+
+_COMPILED_MENUS = {}
+
+
+def compile_menu(menudata):
+    """
+    Get the compiled version of a menu. Menus given as a module or python-path
+    are only compiled once, and then shared by all users. A menu given as a dict is
+    compiled anew on every call, so to share it, compile it once and pass the result
+    to `EvMenu` instead of the dict.
+
+    Args:
+        menudata (str, module, dict or CompiledMenu): The menu to compile.
+
+    Returns:
+        CompiledMenu: The compiled menu.
+
+    """
+    if isinstance(menudata, CompiledMenu):
+        return menudata
+    if isinstance(menudata, dict):
+        return CompiledMenu(menudata)
+    path = menudata if isinstance(menudata, str) else menudata.__name__
+    compiled = _COMPILED_MENUS.get(path)
+    if not compiled:
+        compiled = _COMPILED_MENUS[path] = CompiledMenu(menudata)
+    return compiled
+
+
+class MenuCursorSaver:
+    """
+    Saves which node persistent, compiled menus are on (their 'cursor'), in batches.
+    Instead of saving on every node change, the menus are saved together, in one
+    transaction, `settings.EVMENU_CURSOR_SAVE_INTERVAL` seconds after the first
+    change. Use through the `MENU_CURSOR_SAVER` singleton.
+
+    """
+
+    def __init__(self):
+        # used as an ordered set
+        self.menus = {}
+        self._task = None
+
+    def add(self, menu):
+        """
+        Register a menu whose cursor changed.
+
+        Args:
+            menu (EvMenu): The menu to save.
+
+        """
+        self.menus[menu] = True
+        if self._task is None:
+            self._task = delay(_MENU_CURSOR_SAVE_INTERVAL, self.flush)
+
+    def remove(self, menu):
+        """
+        Forget about a menu, like when it closes.
+
+        Args:
+            menu (EvMenu): The menu to not save.
+
+        """
+        self.menus.pop(menu, None)
+
+    def flush(self):
+        """
+        Save the cursor of all menus with unsaved changes.
+
+        """
+        self._task = None
+        menus, self.menus = list(self.menus), {}
+        if menus:
+            with save_session():
+                for menu in menus:
+                    menu.save_cursor()
+
+
+MENU_CURSOR_SAVER = MenuCursorSaver()
+
+
 # -------------------------------------------------------------
 #
 # Menu command and command set
@@ -502,6 +686,7 @@ class EvMenu:
         startnode_input="",
         session=None,
         debug=False,
+        compiled=False,
         **kwargs,
     ):
         """
@@ -509,14 +694,15 @@ class EvMenu:
 
         Args:
             caller (Object, Account or Session): The user of the menu.
-            menudata (str, module or dict): The full or relative path to the module
+            menudata (str, module, dict or CompiledMenu): The full or relative path to the module
                 holding the menu tree data. All global functions in this module
                 whose name doesn't start with '_ ' will be parsed as menu nodes.
                 Also the module itself is accepted as input. Finally, a dictionary
                 menu tree can be given directly. This must then be a mapping
                 `{"nodekey":callable,...}` where `callable` must be called as
                 and return the data expected of a menu node. This allows for
-                dynamic menu creation.
+                dynamic menu creation. A menu from `compile_menu` runs the menu
+                in compiled mode.
             startnode (str, optional): The starting node name in the menufile.
             cmdset_mergetype (str, optional): 'Replace' (default) means the menu
                 commands will be exclusive - no other normal commands will
@@ -573,6 +759,14 @@ class EvMenu:
                 by default in all nodes of the menu. This will print out the current state of
                 the menu. Deactivate for production use! When the debug flag is active, the
                 `persistent` flag is deactivated.
+            compiled (bool, optional): Run the menu in compiled mode. The menu tree is then
+                only parsed once and shared with all other users of the same menu, and the
+                rendered option blocks are cached. Rendering the options may then only depend
+                on the options themselves and on if the caller uses a screenreader. In
+                persistent mode, the node the menu is on is not saved on every node change
+                but in batches (see `MENU_CURSOR_SAVER`), so a reload may restore the menu
+                on a node visited a few seconds earlier. This is useful for static menus used
+                by many at the same time, like character generation or shops.
             **kwargs: All kwargs will become initialization variables on `caller.ndb._evmenu`,
                 to be available at run.
 
@@ -593,7 +787,15 @@ class EvMenu:
 
         """
         self._startnode = startnode
-        self._menutree = self._parse_menudata(menudata)
+        if compiled or isinstance(menudata, CompiledMenu):
+            self._compiled = compile_menu(menudata)
+            self._menutree = self._compiled.nodes
+            menudata = self._compiled.menudata
+        else:
+            self._compiled = None
+            self._menutree = self._parse_menudata(menudata)
+        # the latest node, and its input, not yet saved in compiled persistent mode
+        self._cursor = None
         self._persistent = persistent if not debug else False
         self._quitting = False
 
@@ -637,6 +839,7 @@ class EvMenu:
             (
                 "_startnode",
                 "_menutree",
+                "_compiled",
                 "_session",
                 "_persistent",
                 "cmd_on_exit",
@@ -681,6 +884,7 @@ class EvMenu:
                 "auto_help": auto_help,
                 "cmd_on_exit": cmd_on_exit,
                 "persistent": persistent,
+                "compiled": bool(self._compiled),
             }
             calldict.update(kwargs)
             try:
@@ -768,7 +972,14 @@ class EvMenu:
         nodetext = self.nodetext_formatter(nodetext)
 
         # handle the options
-        optionstext = self.options_formatter(optionlist)
+        if self._compiled:
+            optionstext = self._compiled.get_options_text(
+                (type(self), tuple(optionlist), self._get_screenreader_mode()),
+                self.options_formatter,
+                optionlist,
+            )
+        else:
+            optionstext = self.options_formatter(optionlist)
 
         # format the entire node
         return self.node_formatter(nodetext, optionstext)
@@ -781,10 +992,13 @@ class EvMenu:
         """
         try:
             try:
-                nargs = len(getfullargspec(callback).args)
+                if self._compiled:
+                    nargs, supports_kwargs = self._compiled.get_callspec(callback)
+                else:
+                    argspec = getfullargspec(callback)
+                    nargs, supports_kwargs = len(argspec.args), bool(argspec.varkw)
             except TypeError:
                 raise EvMenuError("Callable {} doesn't accept any arguments!".format(callback))
-            supports_kwargs = bool(getfullargspec(callback).varkw)
             if nargs <= 0:
                 raise EvMenuError("Callable {} doesn't accept any arguments!".format(callback))
 
@@ -926,9 +1140,11 @@ class EvMenu:
             return
 
         if self._persistent:
-            self.caller.attributes.add(
-                "_menutree_saved_startnode", (nodename, (raw_string, kwargs))
-            )
+            self._cursor = (nodename, (raw_string, kwargs))
+            if self._compiled:
+                MENU_CURSOR_SAVER.add(self)
+            else:
+                self.save_cursor()
 
         # validation of the node return values
 
@@ -1010,6 +1226,7 @@ class EvMenu:
             del self.caller.ndb._evmenu
             del self.caller.ndb._menutree  # TODO Deprecated
             if self._persistent:
+                MENU_CURSOR_SAVER.remove(self)
                 self.caller.attributes.remove("_menutree_saved")
                 self.caller.attributes.remove("_menutree_saved_startnode")
             if self.cmd_on_exit is not None:
@@ -1017,6 +1234,14 @@ class EvMenu:
             # special for template-generated menues
             del self.caller.db._evmenu_template_contents
 
+    def save_cursor(self):
+        """
+        Save the node a persistent menu is on, to restore the menu there after a reload.
+
+        """
+        if self._persistent and self._cursor and not self._quitting:
+            self.caller.attributes.add("_menutree_saved_startnode", self._cursor)
+
     def print_debug_info(self, arg):
         """
         Messages the caller with the current menu state, for debug purposes.
@@ -1145,6 +1370,18 @@ class EvMenu:
     def display_tooltip(self, cmd):
         self.msg(self.helptext.get(cmd))
 
+    def _get_screenreader_mode(self):
+        """
+        Check if the caller is using a screenreader.
+
+        """
+        if sessions := getattr(self.caller, "sessions", None):
+            return any(sess.protocol_flags.get("SCREENREADER") for sess in sessions.all())
+        # the caller doesn't have a session; check it directly
+        elif hasattr(self.caller, "protocol_flags"):
+            return bool(self.caller.protocol_flags.get("SCREENREADER"))
+        return False
+
     # formatters - override in a child class
 
     def nodetext_formatter(self, nodetext):
@@ -1213,17 +1450,7 @@ class EvMenu:
                     # add a default white color to key
                     table.append(f" |lc{raw_key}|lt|w{key}|n|le{desc_string}")
 
-        # check if the caller is using a screenreader
-        screenreader_mode = False
-        if sessions := getattr(self.caller, "sessions", None):
-            screenreader_mode = any(
-                sess.protocol_flags.get("SCREENREADER") for sess in sessions.all()
-            )
-        # the caller doesn't have a session; check it directly
-        elif hasattr(self.caller, "protocol_flags"):
-            screenreader_mode = self.caller.protocol_flags.get("SCREENREADER")
-
-        ncols = 1 if screenreader_mode else _MAX_TEXT_WIDTH // table_width_max
+        ncols = 1 if self._get_screenreader_mode() else _MAX_TEXT_WIDTH // table_width_max
 
         if ncols < 0:
             # no visible options at all
@@ -33,9 +33,29 @@ to and `justify_kwargs` are kwargs to pass to utils.utils.justify in order to
 change the formatting of the text. The remaining `**kwargs` will be passed on to
 the `caller.msg()` construct every time the page is updated.
 
+Iterators (like generators) are paged in streaming mode, where items are only
+pulled from the iterator as pages are shown. Set `streaming=True` to also stream
+other iterables; querysets are then fetched one page at a time using keyset
+pagination (no `count` and no growing `OFFSET`):
+
+```python
+
+    EvMore(caller, (obj.key for obj in big_list), always_page=True)
+    EvMore(
+        caller,
+        ObjectDB.objects.all(),
+        streaming=True,
+        page_formatter=lambda page: "\n".join(obj.get_display_name(caller) for obj in page),
+    )
+```
+
 ----
 
 """
+from collections.abc import Iterator
+from itertools import islice
+from math import ceil
+
 from django.conf import settings
 from django.core.paginator import Paginator
 from django.db.models.query import QuerySet
@@ -143,6 +163,180 @@ def queryset_maxsize(qs):
     return qs.count()
 
 
+def _join_lines(page):
+    """Default formatter for streamed pages, one item per line."""
+    return "\n".join(str(item) for item in page)
+
+
+class _IteratorPager:
+    """
+    Pulls pages lazily from an iterator. Pages already shown are kept so one can page
+    back, but nothing is pulled from the iterator until it's needed, apart from a
+    one-item look-ahead used to know if there is a next page.
+
+    """
+
+    def __init__(self, iterable, pagesize):
+        self._iterator = iter(iterable)
+        self.pagesize = pagesize
+        self.pages = []
+        self.complete = False
+        self._lookahead = list(islice(self._iterator, 1))
+        self._load_page()
+
+    @property
+    def npages(self):
+        """The number of pages known to exist."""
+        return len(self.pages) + (1 if self._lookahead else 0)
+
+    def _load_page(self):
+        items = self._lookahead + list(islice(self._iterator, self.pagesize - len(self._lookahead)))
+        self._lookahead = list(islice(self._iterator, 1))
+        if items:
+            self.pages.append(items)
+        if not self._lookahead:
+            self.complete = True
+
+    def get_page(self, pageno):
+        """
+        Get a page, pulling it from the iterator if needed.
+
+        Args:
+            pageno (int): The page to get, from 0...N-1.
+
+        Returns:
+            list: The items on the page.
+
+        """
+        while len(self.pages) <= pageno and not self.complete:
+            self._load_page()
+        return self.pages[pageno] if pageno < len(self.pages) else []
+
+    def seek_end(self):
+        """
+        Pull all remaining pages, to find the last one.
+
+        Returns:
+            int: The number of the last page.
+
+        """
+        while not self.complete:
+            self._load_page()
+        return self.npages - 1
+
+
+class _KeysetPager:
+    """
+    Fetches pages of a queryset ordered by primary key, using keyset pagination:
+    every page is fetched with a `pk > last pk of previous page` (or `pk < first pk of
+    next page`) filter, so each page costs one query of the page size, however deep
+    into the results it is. Only the first and last pk of the pages seen are kept.
+
+    """
+
+    def __init__(self, queryset, pagesize):
+        ordering = self.get_ordering(queryset)
+        self.descending = bool(ordering) and ordering[0].startswith("-")
+        self.queryset = queryset.order_by("-pk" if self.descending else "pk")
+        self.pagesize = pagesize
+        # {pageno: (first_pk, last_pk)}
+        self.bounds = {}
+        self.npages = 0
+        self.complete = False
+        self._page = (None, [])
+        self.get_page(0)
+
+    @staticmethod
+    def get_ordering(queryset):
+        """Get the ordering of a queryset as a tuple of field names."""
+        query = queryset.query
+        if query.order_by:
+            return tuple(query.order_by)
+        if query.default_ordering:
+            return tuple(queryset.model._meta.ordering)
+        return ()
+
+    @classmethod
+    def supports(cls, queryset):
+        """
+        Check if a queryset can be keyset-paginated; it must not be sliced and must be
+        unordered or ordered by primary key only.
+
+        """
+        if queryset.query.is_sliced:
+            return False
+        pkname = queryset.model._meta.pk.name
+        return cls.get_ordering(queryset) in ((), ("pk",), ("-pk",), (pkname,), (f"-{pkname}",))
+
+    def _after(self, pk):
+        return self.queryset.filter(**{"pk__lt" if self.descending else "pk__gt": pk})
+
+    def _before(self, pk):
+        # this is in reverse order
+        return self.queryset.filter(**{"pk__gt" if self.descending else "pk__lt": pk}).reverse()
+
+    def get_page(self, pageno):
+        """
+        Get a page, fetching it from the database if needed.
+
+        Args:
+            pageno (int): The page to get, from 0...N-1.
+
+        Returns:
+            list: The items on the page.
+
+        """
+        if self._page[0] == pageno:
+            return self._page[1]
+        if self.complete and pageno >= self.npages:
+            return []
+
+        size = self.pagesize
+        if pageno == 0 or pageno - 1 in self.bounds:
+            queryset = self._after(self.bounds[pageno - 1][1]) if pageno else self.queryset
+            # fetch one more, to know if there is a next page
+            items = list(queryset[: size + 1])
+            if len(items) > size:
+                items = items[:size]
+                self.npages = max(self.npages, pageno + 2)
+            else:
+                self.npages = pageno + 1 if items else pageno
+                self.complete = True
+        elif pageno + 1 in self.bounds:
+            items = list(self._before(self.bounds[pageno + 1][0])[:size])[::-1]
+        else:
+            # not next to a page we've seen; step there from the closest one before it
+            start = max((pno for pno in self.bounds if pno < pageno), default=0)
+            for pno in range(start, pageno):
+                if not self.get_page(pno):
+                    return []
+            return self.get_page(pageno)
+
+        if items:
+            self.bounds[pageno] = (items[0].pk, items[-1].pk)
+        self._page = (pageno, items)
+        return items
+
+    def seek_end(self):
+        """
+        Find the last page, fetching it directly from the end of the queryset.
+
+        Returns:
+            int: The number of the last page.
+
+        """
+        if not self.complete:
+            count = self.queryset.count()
+            self.npages = ceil(count / self.pagesize)
+            self.complete = True
+            if count:
+                lastsize = count - (self.npages - 1) * self.pagesize
+                items = list(self.queryset.reverse()[:lastsize])[::-1]
+                self.bounds[self.npages - 1] = (items[0].pk, items[-1].pk)
+                self._page = (self.npages - 1, items)
+        return self.npages - 1
+
+
 class EvMore(object):
     """
     The main pager object
@@ -159,6 +353,7 @@ class EvMore(object):
         exit_on_lastpage=False,
         exit_cmd=None,
         page_formatter=str,
+        streaming=False,
         **kwargs,
     ):
         """
@@ -176,7 +371,8 @@ class EvMore(object):
                   decorations will be considered in the size of the page.
                 - Otherwise `inp` is converted to an iterator, where each step is
                   expected to be a line in the final display. Each line
-                  will be run through `iter_callable`.
+                  will be run through `iter_callable`. If `inp` is already an
+                  iterator (like a generator), it is paged in streaming mode.
 
             always_page (bool, optional): If `False`, the
                 pager will only kick in if `inp` is too big
@@ -196,6 +392,14 @@ class EvMore(object):
                 the caller when the more page exits. Note that this will be using whatever
                 cmdset the user had *before* the evmore pager was activated (so none of
                 the evmore commands will be available when this is run).
+            page_formatter (callable, optional): Called with the data of each page (like a
+                list of items when streaming) to turn it into the text to show. Defaults to
+                `str`, or to one item per line when streaming.
+            streaming (bool, optional): Page any non-string `inp` in streaming mode: items
+                are only pulled from `inp` when their page is shown, and the total number of
+                pages is not known until the end is reached. Querysets ordered by primary
+                key (or not at all) are fetched one page at a time with keyset pagination,
+                other querysets are iterated over in chunks. Each page is a list of items.
             kwargs (any, optional): These will be passed on to the `caller.msg` method. Notably,
                 one can pass additional outputfuncs this way. There is one special kwarg:
                 - `text_kwargs` - extra kwargs to pass with the text outputfunc, e.g.
@@ -248,13 +452,15 @@ class EvMore(object):
         self._kwargs = kwargs
 
         self._data = None
+        self._streaming = streaming
+        self._stream = None
 
         self._pages = []
         self._npos = 0
 
         self._npages = 1
         self._paginator = self.paginator_index
-        self._page_formatter = str
+        self._page_formatter = page_formatter
 
         # set up individual pages for different sessions
         height = max(4, session.protocol_flags.get("SCREENHEIGHT", {0: _SCREEN_HEIGHT})[0] - 4)
@@ -280,7 +486,9 @@ class EvMore(object):
             pos = self._npos
             text = self.page_formatter(self.paginator(pos))
         if show_footer:
-            page = _DISPLAY.format(text=text, pageno=pos + 1, pagemax=self._npages)
+            # a stream's total size is not known until we reach its end
+            pagemax = "?" if self._stream and not self._stream.complete else self._npages
+            page = _DISPLAY.format(text=text, pageno=pos + 1, pagemax=pagemax)
         else:
             page = text
         # check to make sure our session is still valid
@@ -305,6 +513,8 @@ class EvMore(object):
         """
         Display the bottom page.
         """
+        if self._stream:
+            self._npages = self._stream.seek_end() + 1
         self._npos = self._npages - 1
         self.display()
 
@@ -318,6 +528,9 @@ class EvMore(object):
             self.page_quit()
         else:
             self._npos += 1
+            if self._stream:
+                # load the page, to know if there is another one after it
+                self.paginator(self._npos)
             if self.exit_on_lastpage and self._npos >= (self._npages - 1):
                 self.display(show_footer=False)
                 self.page_quit(quiet=True)
@@ -378,6 +591,15 @@ class EvMore(object):
         """
         return self._data.page(pageno + 1)
 
+    def paginator_stream(self, pageno):
+        """
+        Paginate a stream, pulling in pages as they are needed.
+
+        """
+        page = self._stream.get_page(pageno)
+        self._npages = self._stream.npages
+        return page
+
     # default helpers to set up particular input types
 
     def init_evtable(self, table):
@@ -412,6 +634,29 @@ class EvMore(object):
         self._npages = nsize // self.height + (0 if nsize % self.height == 0 else 1)
         self._data = inp
 
+    def init_stream(self, inp, pagesize=None):
+        """
+        The input is streamed; an iterator or, in streaming mode, any iterable or queryset.
+
+        Args:
+            inp (iterable or QuerySet): The data to stream.
+            pagesize (int, optional): Items per page, if not the height of the screen.
+
+        """
+        pagesize = max(1, pagesize or self.height)
+        if isinstance(inp, QuerySet):
+            if _KeysetPager.supports(inp):
+                self._stream = _KeysetPager(inp, pagesize)
+            else:
+                self._stream = _IteratorPager(inp.iterator(), pagesize)
+        else:
+            self._stream = _IteratorPager(inp, pagesize)
+        self._data = self._stream
+        self._npages = self._stream.npages
+        if self._page_formatter is str:
+            # not given; show each item of the page on its own line
+            self._page_formatter = _join_lines
+
     def init_f_str(self, text):
         """
         The input contains `\\f` markers. We use `\\f` to indicate the user wants to
@@ -464,7 +709,8 @@ class EvMore(object):
 
         Args:
             inp (any): Incoming data to be paginated. By default, handles pagination of
-                strings, querysets, django.Paginator, EvTables and any iterables with strings.
+                strings, querysets, django.Paginator, EvTables, any iterables with strings
+                and (streaming) iterators.
 
         Notes:
             If overridden, this method must perform the following  actions:
@@ -487,6 +733,12 @@ class EvMore(object):
             # an EvTable
             self.init_evtable(inp)
             self._paginator = self.paginator_index
+        elif isinstance(inp, Iterator) or (
+            self._streaming and not isinstance(inp, (str, Paginator))
+        ):
+            # stream the data, only pulling in what is shown
+            self.init_stream(inp)
+            self._paginator = self.paginator_stream
         elif isinstance(inp, QuerySet):
             # a queryset
             self.init_queryset(inp)
@@ -549,6 +801,7 @@ def msg(
     justify=False,
     justify_kwargs=None,
     exit_on_lastpage=True,
+    streaming=False,
     **kwargs,
 ):
     """
@@ -563,6 +816,7 @@ def msg(
         justify=justify,
         justify_kwargs=justify_kwargs,
         exit_on_lastpage=exit_on_lastpage,
+        streaming=streaming,
         **kwargs,
     )
 
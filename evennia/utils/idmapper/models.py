@@ -11,7 +11,8 @@ import gc
 import os
 import threading
 import time
-from weakref import WeakValueDictionary
+from contextlib import contextmanager, nullcontext
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
 from django.core.exceptions import FieldError, ObjectDoesNotExist
 from django.db.models.base import Model, ModelBase
@@ -21,6 +22,7 @@ from django.db.utils import DatabaseError
 from twisted.internet.reactor import callFromThread
 
 from evennia.utils import logger
+from evennia.utils.pools import PoolWriteError, in_pool_thread
 from evennia.utils.utils import dbref, get_evennia_pids, to_str
 
 from .manager import SharedMemoryManager
@@ -45,6 +47,100 @@ _SERVER_PID, _PORTAL_PID = get_evennia_pids()
 _IS_SUBPROCESS = (_SERVER_PID and _PORTAL_PID) and _SELF_PID not in (_SERVER_PID, _PORTAL_PID)
 _IS_MAIN_THREAD = threading.current_thread().name == "MainThread"
 
+# the postsave hooks of each model class, {class: {fieldname: hookname}}
+_POSTSAVE_HOOKS = WeakKeyDictionary()
+# the currently open save session, if any
+_SAVE_SESSION = None
+
+
+def _get_postsave_hooks(cls):
+    """
+    Get the `at_<fieldname>_postsave` hooks defined on a model class. This
+    is looked up once per class.
+
+    Args:
+        cls (class): The model class (or typeclass).
+
+    Returns:
+        dict: `{fieldname: hookname}` for the fields having a hook, in field order.
+
+    """
+    try:
+        return _POSTSAVE_HOOKS[cls]
+    except KeyError:
+        hooks = {}
+        for field in cls._meta.fields:
+            hookname = "at_%s_postsave" % field.name
+            if callable(getattr(cls, hookname, None)):
+                hooks[field.name] = hookname
+        _POSTSAVE_HOOKS[cls] = hooks
+        return hooks
+
+
+class _SaveSession:
+    """
+    Collects the field updates made during a `save_session`.
+
+    """
+
+    def __init__(self):
+        self.nsaves = 0
+        # {obj: {fieldname: None, ...}}, dicts to keep the order
+        self.updates = {}
+
+    def add(self, obj, fieldnames):
+        self.updates.setdefault(obj, {}).update(dict.fromkeys(fieldnames))
+
+    def deliver(self):
+        """
+        Fire the monitors of all updated fields, once per object and field.
+
+        """
+        for obj, fieldnames in self.updates.items():
+            if not obj.pk:
+                # deleted during the session
+                continue
+            for fieldname in fieldnames:
+                _MONITOR_HANDLER.at_update(obj, fieldname)
+        self.updates = {}
+
+
+@contextmanager
+def save_session():
+    """
+    Group many database saves into one transaction. Use as
+
+    ```python
+    with save_session():
+        for obj in objs:
+            obj.db_desc = "..."
+            obj.save(update_fields=["db_desc"])
+    ```
+
+    Saves inside the session are not wrapped in an `atomic` block each, and
+    the `MonitorHandler` callbacks of the updated fields are called once per
+    object and field when the session ends, instead of on every save. The
+    `at_<fieldname>_postsave` hooks are still called at once. If an error is
+    raised inside the session, the whole session is rolled back and no
+    monitors are called. Nested sessions join the outermost session.
+
+    Yields:
+        _SaveSession: The session; `.nsaves` counts the saves done in it.
+
+    """
+    global _SAVE_SESSION
+    if _SAVE_SESSION is not None:
+        yield _SAVE_SESSION
+        return
+
+    session = _SAVE_SESSION = _SaveSession()
+    try:
+        with atomic():
+            yield session
+    finally:
+        _SAVE_SESSION = None
+    session.deliver()
+
 
 class SharedMemoryModelBase(ModelBase):
     # CL: upstream had a __new__ method that skipped ModelBase's __new__ if
@@ -417,6 +513,9 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
         Delete the object, clearing cache.
 
         """
+        if in_pool_thread():
+            # the cache is only changed from the reactor thread
+            raise PoolWriteError(f"Can't delete {self!r} from a run_in_pool job.")
         self.flush_from_cache()
         self._is_deleted = True
         super().delete(*args, **kwargs)
@@ -438,6 +537,11 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
                 MONITOR_HANDLER as _MONITOR_HANDLER,
             )
 
+        if in_pool_thread():
+            # the cache, the save-hooks and the monitors are only ever used from
+            # the reactor thread
+            raise PoolWriteError(f"Can't save {self!r} from a run_in_pool job.")
+
         if _IS_SUBPROCESS:
             # we keep a store of objects modified in subprocesses so
             # we know to update their caches in the central process
@@ -447,15 +551,21 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
 
         if _IS_MAIN_THREAD:
             # in main thread - normal operation
+            if _SAVE_SESSION is None:
+                _atomic = atomic
+            else:
+                # the save session's transaction covers this save
+                _atomic = nullcontext
+                _SAVE_SESSION.nsaves += 1
             try:
-                with atomic():
+                with _atomic():
                     super().save(*args, **kwargs)
             except DatabaseError:
                 # we handle the 'update_fields did not update any rows' error that
                 # may happen due to timing issues with attributes
                 ufields_removed = kwargs.pop("update_fields", None)
                 if ufields_removed:
-                    with atomic():
+                    with _atomic():
                         super().save(*args, **kwargs)
                 else:
                     raise
@@ -471,24 +581,33 @@ class SharedMemoryModel(Model, metaclass=SharedMemoryModelBase):
             # delete the object (an example are Scripts that start and die immediately)
             return
 
-        # update field-update hooks and eventual OOB watchers
-        new = False
-        if "update_fields" in kwargs and kwargs["update_fields"]:
-            # get field objects from their names
-            update_fields = (
-                self._meta.get_field(fieldname) for fieldname in kwargs.get("update_fields")
-            )
+        # update field-update hooks and eventual OOB watchers. Only fields with
+        # a hook are visited, unless the object is monitored.
+        hooks = _get_postsave_hooks(type(self))
+        monitored = _MONITOR_HANDLER.is_monitored(self)
+        if not (hooks or monitored):
+            return
+
+        update_fields = kwargs.get("update_fields")
+        new = not update_fields
+        if new:
+            # all fields were saved
+            fieldnames = [field.name for field in self._meta.fields] if monitored else list(hooks)
         else:
-            # meta.fields are already field objects; get them all
-            new = True
-            update_fields = self._meta.fields
-        for field in update_fields:
-            fieldname = field.name
-            # trigger eventual monitors
-            _MONITOR_HANDLER.at_update(self, fieldname)
+            fieldnames = [self._meta.get_field(fieldname).name for fieldname in update_fields]
+
+        if monitored and _SAVE_SESSION is not None:
+            # monitors are called when the session ends
+            _SAVE_SESSION.add(self, fieldnames)
+            monitored = False
+
+        for fieldname in fieldnames:
+            if monitored:
+                # trigger eventual monitors
+                _MONITOR_HANDLER.at_update(self, fieldname)
             # if a hook is defined it must be named exactly on this form
-            hookname = "at_%s_postsave" % fieldname
-            if hasattr(self, hookname) and callable(_GA(self, hookname)):
+            hookname = hooks.get(fieldname)
+            if hookname:
                 _GA(self, hookname)(new)
 
         #            # if a trackerhandler is set on this object, update it with the
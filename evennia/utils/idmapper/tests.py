@@ -1,7 +1,12 @@
+from unittest import mock
+
 from django.db import models
 from django.test import TestCase
 
-from .models import SharedMemoryModel
+from evennia.scripts.monitorhandler import MONITOR_HANDLER
+from evennia.utils.test_resources import BaseEvenniaTest
+
+from .models import SharedMemoryModel, _get_postsave_hooks, save_session
 
 
 class Category(SharedMemoryModel):
@@ -76,3 +81,63 @@ class SharedMemorysTest(TestCase):
         pk = article.pk
         article.delete()
         self.assertEqual(pk not in Article.__instance_cache__, True)
+
+
+_MONITOR_CALLS = []
+
+
+def _monitor_callback(obj=None, fieldname=None, **kwargs):
+    _MONITOR_CALLS.append((obj, fieldname))
+
+
+class TestSaveHooks(BaseEvenniaTest):
+    def setUp(self):
+        super().setUp()
+        _MONITOR_CALLS.clear()
+        MONITOR_HANDLER.add(self.obj1, "db_key", _monitor_callback)
+
+    def tearDown(self):
+        MONITOR_HANDLER.remove(self.obj1, "db_key")
+        super().tearDown()
+
+    def test_postsave_hooks(self):
+        hooks = _get_postsave_hooks(type(self.obj1))
+        self.assertEqual(
+            hooks,
+            {"db_key": "at_db_key_postsave", "db_location": "at_db_location_postsave"},
+        )
+        self.assertIs(_get_postsave_hooks(type(self.obj1)), hooks)
+
+    def test_unmonitored_save(self):
+        self.assertTrue(MONITOR_HANDLER.is_monitored(self.obj1))
+        self.assertFalse(MONITOR_HANDLER.is_monitored(self.obj2))
+        with mock.patch.object(MONITOR_HANDLER, "at_update") as at_update:
+            self.obj2.key = "Foo"
+            self.obj2.save()
+            at_update.assert_not_called()
+            self.obj1.key = "Foo"
+            at_update.assert_called_once_with(self.obj1, "db_key")
+
+    def test_monitor(self):
+        self.obj1.key = "Foo"
+        self.assertEqual(_MONITOR_CALLS, [(self.obj1, "db_key")])
+
+    def test_save_session(self):
+        with save_session() as session:
+            self.obj1.key = "Foo"
+            self.obj1.key = "Bar"
+            with save_session() as inner_session:
+                self.assertIs(inner_session, session)
+                self.obj2.key = "Baz"
+            self.assertEqual(_MONITOR_CALLS, [])
+            # postsave hooks are still called at once
+            self.assertEqual(self.room1.search("Bar"), self.obj1)
+        self.assertEqual(session.nsaves, 3)
+        self.assertEqual(_MONITOR_CALLS, [(self.obj1, "db_key")])
+
+    def test_save_session_rollback(self):
+        with self.assertRaises(RuntimeError):
+            with save_session():
+                self.obj1.key = "Foo"
+                raise RuntimeError
+        self.assertEqual(_MONITOR_CALLS, [])
@@ -0,0 +1,271 @@
+"""
+Pools for running blocking work outside the reactor
+
+Everything in the Server runs in one thread, so a Command doing a lot of work
+(searching a big database, formatting a huge Attribute, diffing prototypes)
+stops all other players until it is done. With the functions in this module,
+a Command can run that work in a thread or a separate process. A Command's
+`func` yields the result, and the rest of `func` runs back in the reactor
+thread once the work is done:
+
+```python
+from evennia.utils.pools import run_in_pool
+
+class CmdFindMany(Command):
+    key = "findmany"
+
+    def func(self):
+        matches = yield run_in_pool(expensive_search, self.args)
+        self.msg(f"Found {len(matches)} matches.")
+```
+
+- `run_in_pool(func, *args, **kwargs)` runs `func` in a thread. The function
+  may read from the database; it gets its own database connection, which is
+  closed when it is done. It must not write to the database: saving or
+  deleting an Evennia model raises `PoolWriteError`, since the idmapper cache,
+  save-hooks and monitors may only be used from the reactor thread (and a
+  transaction in the thread could block the reactor on SQLite's write lock).
+  Other writes, like `QuerySet.update`, are not caught but are just as unsafe.
+  The function should also not call `msg` or other Twisted code. Return a
+  result and save or `msg` after the `yield` instead.
+- `run_in_process(func, *args, **kwargs)` runs `func` in one of a pool of
+  processes, which avoids the GIL. `func`, its arguments and the result must
+  be picklable (so pass database ids rather than objects). Objects saved in
+  the process are refreshed from the database in the Server's cache when the
+  result arrives, through the same field setters as normal assignments (so
+  things like the contents of locations are kept up to date). Their
+  Attribute and Tag caches are reset.
+
+Both return a `Deferred`, so they can also be used outside of Commands.
+Don't use either for work that must happen in order with other commands; a
+command given while the work runs may finish before it.
+
+"""
+
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from twisted.internet import reactor, threads
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+from twisted.python.threadpool import ThreadPool
+
+_THREAD_POOL = None
+_PROCESS_POOL = None
+_POOL_THREAD = threading.local()
+
+
+class PoolWriteError(RuntimeError):
+    """
+    Raised when a `run_in_pool` job tries to save or delete a database model.
+
+    """
+
+    pass
+
+
+def in_pool_thread():
+    """
+    Check if the current thread is running a `run_in_pool` job.
+
+    Returns:
+        bool: If we are in a pool thread.
+
+    """
+    return getattr(_POOL_THREAD, "active", False)
+
+
+def _get_thread_pool():
+    global _THREAD_POOL
+    if _THREAD_POOL is None:
+        minthreads, maxthreads = settings.COMMAND_THREADPOOL_LIMITS
+        _THREAD_POOL = ThreadPool(
+            minthreads=max(1, minthreads), maxthreads=max(1, maxthreads), name="CommandPool"
+        )
+        _THREAD_POOL.start()
+        reactor.addSystemEventTrigger("during", "shutdown", _THREAD_POOL.stop)
+    return _THREAD_POOL
+
+
+def _run_in_thread(func, args, kwargs):
+    """
+    Run a function in a pool thread, with a fresh database connection.
+
+    """
+    _POOL_THREAD.active = True
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _POOL_THREAD.active = False
+        # database connections are per-thread; don't leave this one open
+        connections.close_all()
+
+
+def run_in_pool(func, *args, **kwargs):
+    """
+    Run a function in a thread, outside of the reactor.
+
+    Args:
+        func (callable): The function to run, as `func(*args, **kwargs)`.
+        *args: Arguments to `func`.
+
+    Keyword Args:
+        any: Keyword arguments to `func`.
+
+    Returns:
+        Deferred: Fires with the return value of `func` in the reactor thread.
+            Yield this from a Command's `func` to get the value back.
+
+    """
+    return threads.deferToThreadPool(
+        reactor, _get_thread_pool(), _run_in_thread, func, args, kwargs
+    )
+
+
+def _init_process():
+    """
+    Set up Django and Evennia's flat API in a new pool process.
+
+    """
+    import django
+
+    django.setup()
+
+    import evennia
+
+    evennia._init()
+
+    from evennia.utils.idmapper import models
+
+    # track the objects saved in this process
+    models._IS_SUBPROCESS = True
+
+
+def _get_process_pool():
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        # twistd replaces stderr with a log file without a file descriptor, which
+        # multiprocessing can't pass on to its resource tracker process
+        stderr = sys.stderr
+        sys.stderr = sys.__stderr__
+        try:
+            resource_tracker.ensure_running()
+        finally:
+            sys.stderr = stderr
+        _PROCESS_POOL = ProcessPoolExecutor(
+            max_workers=max(1, settings.COMMAND_PROCESS_POOL_SIZE),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process,
+        )
+        reactor.addSystemEventTrigger(
+            "during", "shutdown", _PROCESS_POOL.shutdown, wait=False, cancel_futures=True
+        )
+    return _PROCESS_POOL
+
+
+def _run_in_process(func, args, kwargs):
+    """
+    Run a function in a pool process.
+
+    Returns:
+        tuple: `(result, modified)`, where `modified` is a set of
+            `(model_label, pk)` for all objects the function saved.
+
+    """
+    from evennia.utils.idmapper import models
+
+    models.PROC_MODIFIED_OBJS.clear()
+    try:
+        result = func(*args, **kwargs)
+        modified = {
+            (obj._meta.concrete_model._meta.label, obj.pk)
+            for obj in models.PROC_MODIFIED_OBJS.values()
+            if obj.pk
+        }
+    finally:
+        models.PROC_MODIFIED_OBJS.clear()
+    return result, modified
+
+
+def refresh_modified(modified):
+    """
+    Refresh cached objects that were saved in another process.
+
+    Args:
+        modified (iterable): `(model_label, pk)` of each saved object.
+
+    """
+    from django.apps import apps
+
+    for label, pk in modified:
+        model = apps.get_model(label)
+        instance = model.get_cached_instance(pk) if hasattr(model, "get_cached_instance") else None
+        if not instance:
+            # not cached here; it will be loaded fresh when needed
+            continue
+        # refresh_from_db would just get the cached instance back, so we read the values
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        values = model.objects.filter(pk=pk).values(*fields).first()
+        if values is None:
+            # deleted in the meantime
+            instance.flush_from_cache(force=True)
+            continue
+        for attname, value in values.items():
+            if getattr(instance, attname) == value:
+                continue
+            field = fields[attname]
+            wrapper = getattr(type(instance), field.name[3:], None)
+            if field.name.startswith("db_") and field.editable and isinstance(wrapper, property):
+                if field.is_relation and value is not None:
+                    value = field.related_model.objects.filter(pk=value).first()
+                # use the normal setter (like `obj.location = ...`), so caches and
+                # save-hooks are updated as for a change made in this process
+                setattr(instance, field.name[3:], value)
+            else:
+                setattr(instance, attname, value)
+        for handlername in ("attributes", "tags"):
+            handler = instance.__dict__.get(handlername)
+            if handler:
+                handler.reset_cache()
+
+
+def _process_done(future, deferred):
+    if future.cancelled():
+        deferred.errback(Failure(RuntimeError("The pool process was shut down.")))
+        return
+    error = future.exception()
+    if error:
+        deferred.errback(Failure(error))
+        return
+    result, modified = future.result()
+    refresh_modified(modified)
+    deferred.callback(result)
+
+
+def run_in_process(func, *args, **kwargs):
+    """
+    Run a function in a separate process.
+
+    Args:
+        func (callable): The function to run, as `func(*args, **kwargs)`. This
+            must be importable by the process (defined at module level).
+        *args: Arguments to `func`. Must be picklable.
+
+    Keyword Args:
+        any: Keyword arguments to `func`. Must be picklable.
+
+    Returns:
+        Deferred: Fires with the return value of `func` in the reactor thread.
+            Yield this from a Command's `func` to get the value back.
+
+    """
+    deferred = Deferred()
+    future = _get_process_pool().submit(_run_in_process, func, args, kwargs)
+    future.add_done_callback(lambda future: reactor.callFromThread(_process_done, future, deferred))
+    return deferred
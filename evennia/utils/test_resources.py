@@ -23,6 +23,7 @@ Other:
 
 """
 
+import inspect
 import re
 import sys
 import types
@@ -30,7 +31,8 @@ import types
 from django.conf import settings
 from django.test import TestCase, override_settings
 from mock import MagicMock, Mock, patch
-from twisted.internet.defer import Deferred
+from twisted.internet.defer import Deferred, succeed
+from twisted.python.failure import Failure
 
 import evennia
 from evennia import settings_default
@@ -165,6 +167,10 @@ def _mock_deferlater(reactor, timedelay, callback, *args, **kwargs):
     return Deferred()
 
 
+def _mock_deferlater_fired(reactor, timedelay, callback, *args, **kwargs):
+    return succeed(callback(*args, **kwargs))
+
+
 class EvenniaTestMixin:
     """
     Evennia test environment mixin
@@ -479,6 +485,14 @@ class EvenniaCommandTestMixin:
                                 next(ret)
                         except StopIteration:
                             break
+                elif inspect.iscoroutine(ret):
+                    # an async func; like for yield(10) above, aio.sleep
+                    # does not pause. Other awaits must already have fired.
+                    result = []
+                    with patch("evennia.utils.aio.deferLater", _mock_deferlater_fired):
+                        Deferred.fromCoroutine(ret).addBoth(result.append)
+                    if result and isinstance(result[0], Failure):
+                        result[0].raiseException()
 
                 cmdobj.at_post_cmd()
             except StopIteration:
@@ -0,0 +1,114 @@
+"""
+Test async Commands and the helpers in evennia.utils.aio.
+
+"""
+
+from unittest import mock
+
+from twisted.internet import defer
+
+from evennia.commands.cmdhandler import _async_cmd_run
+from evennia.commands.command import Command, InterruptCommand
+from evennia.utils import aio
+from evennia.utils.test_resources import BaseEvenniaCommandTest, BaseEvenniaTest
+
+
+class _CmdAsync(Command):
+    key = "async"
+
+    async def func(self):
+        result = await defer.succeed(5)
+        self.msg(f"result {result}")
+        await aio.sleep(1)
+        target = await self.asearch(self.args)
+        if not target:
+            return
+        await self.amsg(f"found {target.key}")
+
+
+class _CmdAsyncFail(Command):
+    key = "asyncfail"
+
+    async def func(self):
+        await defer.succeed(None)
+        if self.args == "interrupt":
+            raise InterruptCommand
+        raise ValueError("async error")
+
+
+class TestAsyncCommand(BaseEvenniaCommandTest):
+    def test_call(self):
+        self.call(_CmdAsync(), "Obj", "result 5|found Obj")
+        self.call(_CmdAsync(), "Nothing", "result 5|Could not find 'Nothing'.")
+
+    def test_async_cmd_run(self):
+        cmd = _CmdAsync()
+        cmd.caller = self.char1
+        cmd.args = "Obj"
+        cmd.msg = mock.Mock()
+        cmd.at_post_cmd = mock.Mock()
+        sleeping = defer.Deferred()
+        with mock.patch("evennia.utils.aio.deferLater", return_value=sleeping):
+            _async_cmd_run(cmd, cmd.func())
+            # waiting for aio.sleep; the cmdhandler is free to go on
+            cmd.msg.assert_called_once_with("result 5")
+            cmd.at_post_cmd.assert_not_called()
+            sleeping.callback(None)
+        self.assertEqual(cmd.msg.call_args.kwargs["text"], "found Obj")
+        cmd.at_post_cmd.assert_called_once()
+
+    @mock.patch("evennia.utils.aio.wait_for_output", return_value=defer.succeed(None))
+    def test_amsg_waits_for_receiver(self, mock_wait):
+        cmd = _CmdAsync()
+        cmd.caller = self.char1
+        cmd.session = None
+        cmd.msg = mock.Mock()
+        with self.assertRaises(StopIteration):
+            cmd.amsg("hello", from_obj=self.obj1).send(None)
+        cmd.msg.assert_called_once_with(
+            text="hello", to_obj=self.char1, from_obj=self.obj1, session=None
+        )
+        mock_wait.assert_called_once_with(self.char1)
+
+    @mock.patch("evennia.commands.cmdhandler._msg_err")
+    def test_async_cmd_errors(self, mock_msg_err):
+        cmd = _CmdAsyncFail()
+        cmd.caller = self.char1
+        cmd.args = "interrupt"
+        _async_cmd_run(cmd, cmd.func())
+        mock_msg_err.assert_not_called()
+        cmd.args = ""
+        _async_cmd_run(cmd, cmd.func())
+        mock_msg_err.assert_called_once()
+
+
+class TestAio(BaseEvenniaTest):
+    def test_awaitable(self):
+        deferred = defer.Deferred()
+        # outside of an asyncio loop, Deferreds are awaited as they are
+        self.assertIs(aio.awaitable(deferred), deferred)
+        self.assertFalse(aio.is_asyncio_reactor())
+
+    def test_search(self):
+        result = []
+        aio.run_coroutine(aio.search(self.char1, "Obj")).addCallback(result.append)
+        self.assertEqual(result, [self.obj1])
+        result = []
+        aio.run_coroutine(aio.search(self.char1, "Obj", quiet=True)).addCallback(result.append)
+        self.assertEqual(result, [[self.obj1]])
+
+    def test_msg_waits_for_output(self):
+        self.session.protocol_flags["OUTPUT_PAUSED"] = True
+        self.assertTrue(aio.output_paused(self.char1))
+        sleeping = defer.Deferred()
+        done = []
+        with (
+            mock.patch("evennia.utils.aio.deferLater", return_value=sleeping),
+            mock.patch.object(self.char1, "msg") as mock_msg,
+        ):
+            aio.run_coroutine(aio.msg(self.char1, "hello")).addCallback(done.append)
+            mock_msg.assert_called_once_with(text="hello")
+            self.assertEqual(done, [])
+            self.session.protocol_flags["OUTPUT_PAUSED"] = False
+            sleeping.callback(None)
+        self.assertEqual(done, [None])
@@ -18,6 +18,7 @@ To help debug the menu, turn on `debug_output`, which will print the traversal p
 """
 
 import copy
+from unittest import mock
 
 from anything import Anything
 from django.test import TestCase
@@ -373,3 +374,69 @@ class TestEvMenuPersistentReloadRegression(BaseEvenniaTest):
         menu_cmdsets = [cmdset for cmdset in self.char1.cmdset.get() if cmdset.key == "menu_cmdset"]
         self.assertEqual(len(menu_cmdsets), 1)
         self.assertEqual(self.char1.cmdset_storage.count("evennia.utils.evmenu.EvMenuCmdSet"), 1)
+
+
+class TestEvMenuExampleCompiled(TestEvMenuExample):
+    kwargs = {"testval": "val", "testval2": "val2", "compiled": True}
+
+
+class TestCompiledEvMenu(BaseEvenniaTest):
+    """
+    Test EvMenu in compiled mode.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.menutree = evmenu.compile_menu({"start": _reload_menu_start, "end": _reload_menu_end})
+
+    def tearDown(self):
+        evmenu.MENU_CURSOR_SAVER.menus = {}
+        super().tearDown()
+
+    def test_compile_menu(self):
+        path = "evennia.utils.tests.data.evmenu_example"
+        compiled = evmenu.compile_menu(path)
+        self.assertIs(compiled, evmenu.compile_menu(path))
+        self.assertIs(compiled, evmenu.compile_menu(compiled))
+        self.assertEqual(compiled.menudata, path)
+        self.assertIn("test_start_node", compiled.nodes)
+
+        kwargs = {"startnode": "test_start_node", "testval": "val", "testval2": "val2"}
+        menu1 = evmenu.EvMenu(self.char1, path, compiled=True, **kwargs)
+        menu2 = evmenu.EvMenu(self.char2, path, compiled=True, **kwargs)
+        self.assertIs(menu1._menutree, menu2._menutree)
+
+    def test_options_cache(self):
+        with mock.patch.object(
+            evmenu.EvMenu, "options_formatter", autospec=True, return_value="options"
+        ) as mock_formatter:
+            menu1 = evmenu.EvMenu(self.char1, self.menutree, session=self.session)
+            menu2 = evmenu.EvMenu(self.char2, self.menutree, session=self.session)
+            self.assertEqual(mock_formatter.call_count, 1)
+            self.assertEqual(menu1.nodetext, menu2.nodetext)
+            menu1.parse_input("next")
+            self.assertEqual(mock_formatter.call_count, 2)
+            menu1.parse_input("back")
+            self.assertEqual(mock_formatter.call_count, 2)
+        self.assertEqual(len(self.menutree.options_cache), 2)
+
+    @mock.patch("evennia.utils.evmenu.delay")
+    def test_persistent_cursor(self, mock_delay):
+        menu = evmenu.EvMenu(self.char1, self.menutree, persistent=True, session=self.session)
+        saved = self.char1.attributes.get("_menutree_saved")
+        self.assertEqual(saved[1][0], self.menutree.menudata)
+        self.assertTrue(saved[2]["compiled"])
+
+        menu.parse_input("next")
+        self.assertEqual(menu.nodename, "end")
+        mock_delay.assert_called_once_with(5, evmenu.MENU_CURSOR_SAVER.flush)
+        # not saved yet
+        self.assertEqual(self.char1.attributes.get("_menutree_saved_startnode")[0], "start")
+
+        evmenu.MENU_CURSOR_SAVER.flush()
+        self.assertEqual(self.char1.attributes.get("_menutree_saved_startnode")[0], "end")
+
+        menu.parse_input("back")
+        menu.close_menu()
+        self.assertFalse(evmenu.MENU_CURSOR_SAVER.menus)
+        self.assertFalse(self.char1.attributes.has("_menutree_saved_startnode"))
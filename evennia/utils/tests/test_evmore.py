@@ -0,0 +1,112 @@
+"""
+Test evmore
+
+"""
+
+from unittest import mock
+
+from evennia.objects.models import ObjectDB
+from evennia.utils import evmore
+from evennia.utils.test_resources import BaseEvenniaTest
+
+
+class TestEvMoreStreaming(BaseEvenniaTest):
+    def test_iterator_pager(self):
+        pager = evmore._IteratorPager((num for num in range(25)), 10)
+        self.assertEqual(pager.npages, 2)
+        self.assertFalse(pager.complete)
+        self.assertEqual(pager.get_page(0), list(range(10)))
+
+        self.assertEqual(pager.get_page(1), list(range(10, 20)))
+        self.assertEqual(pager.npages, 3)
+        self.assertFalse(pager.complete)
+
+        self.assertEqual(pager.get_page(2), list(range(20, 25)))
+        self.assertTrue(pager.complete)
+        self.assertEqual(pager.get_page(3), [])
+        self.assertEqual(pager.seek_end(), 2)
+
+        pager = evmore._IteratorPager(iter([]), 10)
+        self.assertEqual(pager.npages, 0)
+        self.assertTrue(pager.complete)
+
+    def test_keyset_pager(self):
+        objs = list(ObjectDB.objects.order_by("pk"))
+        self.assertGreater(len(objs), 4)
+
+        with self.assertNumQueries(1):
+            pager = evmore._KeysetPager(ObjectDB.objects.all(), 2)
+        self.assertEqual(pager.get_page(0), objs[:2])
+        self.assertEqual(pager.npages, 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(pager.get_page(1), objs[2:4])
+        with self.assertNumQueries(0):
+            self.assertEqual(pager.get_page(1), objs[2:4])
+
+        npages = (len(objs) + 1) // 2
+        self.assertEqual(pager.seek_end(), npages - 1)
+        self.assertTrue(pager.complete)
+        self.assertEqual(pager.get_page(npages - 1), objs[(npages - 1) * 2 :])
+        # paging back from the end
+        with self.assertNumQueries(1):
+            self.assertEqual(pager.get_page(npages - 2), objs[(npages - 2) * 2 : (npages - 1) * 2])
+
+        pager = evmore._KeysetPager(ObjectDB.objects.order_by("-id"), 2)
+        self.assertEqual(pager.get_page(0), objs[::-1][:2])
+        self.assertEqual(pager.get_page(1), objs[::-1][2:4])
+
+    def test_keyset_supports(self):
+        self.assertTrue(evmore._KeysetPager.supports(ObjectDB.objects.all()))
+        self.assertTrue(evmore._KeysetPager.supports(ObjectDB.objects.order_by("-pk")))
+        self.assertFalse(evmore._KeysetPager.supports(ObjectDB.objects.order_by("db_key")))
+        self.assertFalse(evmore._KeysetPager.supports(ObjectDB.objects.all()[:5]))
+
+    def test_evmore_generator(self):
+        self.char1.msg = mock.MagicMock()
+        height = 10
+        self.session.protocol_flags["SCREENHEIGHT"] = {0: height + 4}
+        more = evmore.EvMore(self.char1, (f"line {num}" for num in range(25)), session=self.session)
+
+        text = self.char1.msg.call_args.kwargs["text"][0]
+        self.assertTrue(text.startswith("line 0\nline 1\n"))
+        self.assertIn("[1/?]", text)
+
+        more.page_next()
+        text = self.char1.msg.call_args.kwargs["text"][0]
+        self.assertTrue(text.startswith("line 10\n"))
+        self.assertIn("[2/?]", text)
+
+        more.page_end()
+        text = self.char1.msg.call_args.kwargs["text"][0]
+        self.assertTrue(text.startswith("line 20\n"))
+        self.assertIn("[3/3]", text)
+
+        more.page_top()
+        text = self.char1.msg.call_args.kwargs["text"][0]
+        self.assertTrue(text.startswith("line 0\n"))
+        self.assertIn("[1/3]", text)
+
+    def test_evmore_streaming_queryset(self):
+        self.char1.msg = mock.MagicMock()
+        self.session.protocol_flags["SCREENHEIGHT"] = {0: 6}
+        more = evmore.EvMore(
+            self.char1, ObjectDB.objects.all(), session=self.session, streaming=True
+        )
+        self.assertIsInstance(more._stream, evmore._KeysetPager)
+        objs = list(ObjectDB.objects.order_by("pk"))
+        text = self.char1.msg.call_args.kwargs["text"][0]
+        self.assertTrue(text.startswith(f"{objs[0]}\n{objs[1]}\n"))
+
+    def test_evmore_streaming_page_formatter(self):
+        self.char1.msg = mock.MagicMock()
+        self.session.protocol_flags["SCREENHEIGHT"] = {0: 6}
+        evmore.EvMore(
+            self.char1,
+            ObjectDB.objects.all(),
+            session=self.session,
+            streaming=True,
+            page_formatter=lambda page: ", ".join(obj.key for obj in page),
+        )
+        objs = list(ObjectDB.objects.order_by("pk"))
+        text = self.char1.msg.call_args.kwargs["text"][0]
+        self.assertTrue(text.startswith(f"{objs[0].key}, {objs[1].key}, "))
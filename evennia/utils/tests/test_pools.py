@@ -0,0 +1,96 @@
+"""
+Test the pools for offloading work from Commands.
+
+"""
+
+import threading
+from unittest import mock
+
+from twisted.internet import defer
+
+from evennia.commands.cmdhandler import _progressive_cmd_run
+from evennia.commands.command import Command
+from evennia.utils import pools
+from evennia.utils.test_resources import BaseEvenniaTest
+
+
+class _CmdPooled(Command):
+    key = "pooled"
+
+    def func(self):
+        result = yield defer.succeed(5)
+        self.msg(f"result {result}")
+        try:
+            yield defer.fail(ValueError("pool error"))
+        except ValueError as err:
+            self.msg(f"caught {err}")
+        yield defer.fail(KeyError("not caught"))
+        self.msg("never reached")
+
+
+class TestPools(BaseEvenniaTest):
+    def _run_in_thread(self, func, *args):
+        result = {}
+
+        def _target():
+            result["value"] = pools._run_in_thread(func, args, {})
+
+        thread = threading.Thread(target=_target)
+        thread.start()
+        thread.join()
+        return result["value"]
+
+    def test_save_in_pool_thread(self):
+        obj = self.obj1
+
+        def _work():
+            obj.db_key = "Changed"
+            try:
+                obj.save(update_fields=["db_key"])
+            except pools.PoolWriteError:
+                return pools.in_pool_thread()
+
+        self.assertTrue(self._run_in_thread(_work))
+        self.assertFalse(pools.in_pool_thread())
+        obj.db_key = "Obj"
+        # the save never reached the database
+        self.assertEqual(obj.__class__.objects.filter(pk=obj.pk, db_key="Changed").count(), 0)
+
+    def test_yield_deferred(self):
+        cmd = _CmdPooled()
+        cmd.caller = mock.Mock()
+        cmd.msg = mock.Mock()
+        with mock.patch("evennia.commands.cmdhandler._msg_err") as mock_msg_err:
+            _progressive_cmd_run(cmd, cmd.func())
+        cmd.msg.assert_has_calls([mock.call("result 5"), mock.call("caught pool error")])
+        self.assertEqual(cmd.msg.call_count, 2)
+        mock_msg_err.assert_called_once()
+
+    @mock.patch("evennia.utils.idmapper.models._IS_SUBPROCESS", True)
+    def test_process_modified(self):
+        obj = self.obj1
+
+        def _work():
+            obj.db_key = "Changed"
+            obj.save(update_fields=["db_key"])
+            return "done"
+
+        result, modified = pools._run_in_process(_work, (), {})
+        self.assertEqual(result, "done")
+        self.assertEqual(modified, {("objects.ObjectDB", obj.pk)})
+
+        # the Server's cached copy is refreshed from the database
+        obj.db_key = "Stale"
+        pools.refresh_modified(modified)
+        self.assertEqual(obj.db_key, "Changed")
+
+    def test_refresh_modified_location(self):
+        obj, room1, room2 = self.obj1, self.room1, self.room2
+        self.assertIn(obj, room1.contents)
+        # as if moved in another process
+        obj.__class__.objects.filter(pk=obj.pk).update(db_location=room2)
+
+        pools.refresh_modified({("objects.ObjectDB", obj.pk)})
+        self.assertEqual(obj.location, room2)
+        self.assertNotIn(obj, room1.contents)
+        self.assertIn(obj, room2.contents)
@@ -378,3 +378,40 @@ class CharacterDeleteView(EvenniaWebTest):
         kwargs = {"pk": self.char2.pk, "slug": slugify(self.char2.name)}
         response = self.client.get(reverse(self.url_name, kwargs=kwargs), follow=True)
         self.assertEqual(response.status_code, 403)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN="secret")
+class MetricsTest(EvenniaWebTest):
+    url_name = "metrics"
+    unauthenticated_response = 403
+    # only for staff
+    authenticated_response = 403
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        self.client.force_login(self.account)
+        response = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, 404)
+
+    def test_get(self):
+        from evennia.server.profiling.cmdstats import COMMAND_STATS
+
+        COMMAND_STATS.record("look", {"func": 0.002}, 3)
+        response = self.client.get(reverse(self.url_name), HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('evennia_command_queries_count{command="look"}', response.content.decode())
+
+    def test_get_not_allowed(self):
+        # not staff, and no or the wrong token
+        self.client.force_login(self.account)
+        response = self.client.get(reverse(self.url_name), REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(reverse(self.url_name), HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_get_staff(self):
+        self.account.is_staff = True
+        self.account.save()
+        self.client.force_login(self.account)
+        response = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, 200)
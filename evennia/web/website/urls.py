@@ -9,7 +9,7 @@ from django.urls import include, path
 
 from .views import accounts, channels, characters, errors
 from .views import help as helpviews
-from .views import index
+from .views import index, metrics
 
 urlpatterns = [
     # website front page
@@ -53,9 +53,10 @@ urlpatterns = [
         characters.CharacterDeleteView.as_view(),
         name="character-delete",
     ),
+    # command stats for Prometheus (404 unless settings.METRICS_ENABLED)
+    path("metrics/", metrics.metrics, name="metrics"),
 ]
 
-
 # This sets up the server if the user want to run the Django test server (this
 # is not recommended and is usually unnecessary).
 if settings.SERVE_MEDIA:
@@ -0,0 +1,46 @@
+"""
+Metrics view, for a Prometheus server to scrape.
+
+"""
+
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from twisted.internet import reactor
+from twisted.internet.threads import blockingCallFromThread
+from twisted.python.threadable import isInIOThread
+
+from evennia.server.profiling.cmdstats import COMMAND_STATS
+
+
+def _has_token(request):
+    """
+    Check if the request gives `settings.METRICS_TOKEN` as a bearer token.
+
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        return False
+    scheme, _, given = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(given.strip(), str(token))
+
+
+def metrics(request):
+    """
+    The command stats (see `evennia.server.profiling.cmdstats`) in Prometheus'
+    text format. Only staff and requests with the `settings.METRICS_TOKEN`
+    bearer token may read them.
+
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404("Metrics are not enabled.")
+    if not request.user.is_staff and not _has_token(request):
+        return HttpResponseForbidden("Not allowed.")
+
+    if reactor.running and not isInIOThread():
+        # the stats are updated in the reactor thread, so read them there
+        text = blockingCallFromThread(reactor, COMMAND_STATS.prometheus)
+    else:
+        text = COMMAND_STATS.prometheus()
+    return HttpResponse(text, content_type="text/plain; version=0.0.4; charset=utf-8")